@@ -4,6 +4,7 @@ DB (Python's sqlite.)
 
 import sys
 import sqlite3
+import time
 import uuid
 from cPickle import dumps, loads, HIGHEST_PROTOCOL, UnpicklingError
 from optparse import OptionParser
@@ -18,6 +19,126 @@ _casetable_attrs = set(['id', 'uuid', 'parent', 'label', 'msg', 'retries', \
                         'model_id', 'timeEnter'])
 _vartable_attrs = set(['var_id', 'name', 'case_id', 'sense', 'value'])
 
+_casetable_cols = 'cases.id,uuid,parent,label,msg,retries,model_id,timeEnter'
+
+# sqlite limits the number of columns in a table (2000) and the number of
+# terms in a compound SELECT (500) by default.
+_MAX_WIDE_COLUMNS = 1999
+_MAX_COMPOUND = 400
+
+
+def _quote(name):
+    """Return `name` quoted for use as an SQL identifier."""
+    return '"%s"' % name.replace('"', '""')
+
+def _literal(value):
+    """Return string `value` quoted for use as an SQL literal."""
+    return "'%s'" % value.replace("'", "''")
+
+def _wide_columns(connection):
+    """Return a list of ``(sense, name, column)`` for the variable columns
+    of the ``casewide`` table, or an empty list if there is no such table.
+    """
+    cur = connection.execute("SELECT name FROM sqlite_master"
+                             " WHERE type='table' AND name='casewide'")
+    if cur.fetchone() is None:
+        return []
+    columns = []
+    for row in connection.execute("PRAGMA table_info(casewide)"):
+        col = str(row[1])
+        if col != 'case_id':
+            sense, name = col.split(':', 1)
+            columns.append((sense, name, col))
+    return columns
+
+def _var_source(connection):
+    """Return an SQL table expression with the columns of ``casevars``
+    that also contains the values stored in ``casewide``, so that queries
+    on variable attributes work regardless of the table layout.
+    """
+    columns = _wide_columns(connection)
+    if not columns:
+        return 'casevars'
+    selects = ['SELECT var_id,name,case_id,sense,value FROM casevars']
+    for sense, name, col in columns:
+        selects.append("SELECT NULL,%s,case_id,%s,%s FROM casewide"
+                       " WHERE %s IS NOT NULL"
+                       % (_literal(name), _literal(sense), _quote(col),
+                          _quote(col)))
+    groups = []
+    for i in range(0, len(selects), _MAX_COMPOUND):
+        groups.append('SELECT * FROM (%s)'
+                      % ' UNION ALL '.join(selects[i:i+_MAX_COMPOUND]))
+    return '(%s)' % ' UNION ALL '.join(groups)
+
+def _unpickle(value, vname):
+    """Return `value`, unpickling it if it isn't a built-in scalar."""
+    if isinstance(value, (float, int, long, str, unicode)) or value is None:
+        return value
+    try:
+        return loads(str(value))
+    except UnpicklingError as err:
+        raise UnpicklingError("can't unpickle value '%s' from database: %s" %
+                              (vname, str(err)))
+
+def _select_cases(connection, case_where=(), var_where=(), varnames=None):
+    """Generator which returns ``(caserow, variables)`` for each case
+    satisfying all of the SQL conditions in `case_where`, where `caserow`
+    holds the columns of the ``cases`` table and `variables` is a list of
+    ``(name, sense, value)`` satisfying all of the conditions in
+    `var_where`. If `varnames` is not None, only those variables are
+    retrieved (and unpickled).
+
+    A single query ordered by case id is used, so cases are streamed from
+    the DB rather than being read into memory.
+    """
+    # Scalars in a wide table are read along with their case unless
+    # they have to be filtered by variable conditions.
+    var_where = list(var_where)
+    if var_where:
+        wide = []
+        varsrc = _var_source(connection)
+    else:
+        wide = _wide_columns(connection)
+        varsrc = 'casevars'
+    if varnames is not None:
+        varnames = set(varnames)
+        wide = [w for w in wide if w[1] in varnames]
+        var_where.append("v.name IN (%s)"
+                         % ','.join([_literal(name) for name in varnames]))
+
+    sql = ["SELECT %s" % _casetable_cols]
+    sql.extend([",%s" % _quote(col) for sense, name, col in wide])
+    sql.append(",v.name,v.sense,v.value FROM cases")
+    if wide:
+        sql.append("LEFT JOIN casewide ON casewide.case_id=cases.id")
+    sql.append("LEFT JOIN %s AS v ON v.case_id=cases.id" % varsrc)
+    sql.extend(["AND (%s)" % cond for cond in var_where])
+    if case_where:
+        sql.append("WHERE %s" % ' AND '.join(["(%s)" % cond
+                                             for cond in case_where]))
+    sql.append("ORDER BY cases.id")
+
+    cur = connection.cursor()
+    cur.execute(' '.join(sql))
+
+    nwide = len(wide)
+    caserow = None
+    variables = None
+    for row in cur:
+        if caserow is None or row[0] != caserow[0]:
+            if caserow is not None:
+                yield caserow, variables
+            caserow = row[:8]
+            variables = [(name, sense, value) for (sense, name, col), value
+                                              in zip(wide, row[8:8+nwide])
+                                              if value is not None]
+        name, sense, value = row[8+nwide:]
+        if name is not None:
+            variables.append((name, sense, _unpickle(value, name)))
+    if caserow is not None:
+        yield caserow, variables
+
 def _query_split(query):
     """Return a tuple of lhs, relation, rhs after splitting on 
     a list of allowed operators.
@@ -34,12 +155,15 @@ def _query_split(query):
 class DBCaseIterator(object):
     """Pulls Cases from a relational DB (sqlite). It doesn't support
     general sql queries, but it does allow for a series of boolean
-    selectors, e.g., 'x<=y', that are ANDed together.
+    selectors, e.g., 'x<=y', that are ANDed together. Selectors are
+    evaluated by the DB. If `varnames` is not None, only the named
+    variables are retrieved.
     """
     
     implements(ICaseIterator)
     
-    def __init__(self, dbfile=':memory:', selectors=None, connection=None):
+    def __init__(self, dbfile=':memory:', selectors=None, connection=None,
+                 varnames=None):
         if connection is not None:
             self._dbfile = dbfile
             self._connection = connection
@@ -47,6 +171,7 @@ class DBCaseIterator(object):
             self._connection = None
             self.dbfile = dbfile
         self.selectors = selectors
+        self.varnames = varnames
         self._connection.text_factory = sqlite3.OptimizedUnicode
 
     @property
@@ -70,39 +195,22 @@ class DBCaseIterator(object):
     def _next_case(self):
         """ Generator which returns Cases one at a time. """
         # figure out which selectors are for cases and which are for variables
-        sql = ["SELECT * FROM cases"]
+        case_sel = []
+        var_sel = []
         if self.selectors is not None:
             for sel in self.selectors:
                 rhs,rel,lhs = _query_split(sel)
                 if rhs in _casetable_attrs:
-                    if len(sql) == 1:
-                        sql.append("WHERE %s%s%s" % (rhs,rel,lhs))
-                    else:
-                        sql.append("AND %s%s%s" % (rhs,rel,lhs))
-            
-        casecur = self._connection.cursor()
-        casecur.execute(' '.join(sql))
-          
-        sql = ['SELECT var_id,name,case_id,sense,value from casevars WHERE case_id=%s']
-        if self.selectors is not None:
-            for sel in self.selectors:
-                rhs,rel,lhs = _query_split(sel)
-                if rhs in _vartable_attrs:
-                    sql.append("AND %s%s%s" % (rhs,rel,lhs))
-        combined = ' '.join(sql)
-        varcur = self._connection.cursor()
-        
-        for cid,text_id,parent,label,msg,retries,model_id,timeEnter in casecur:
-            varcur.execute(combined % cid)
+                    case_sel.append("%s%s%s" % (rhs,rel,lhs))
+                elif rhs in _vartable_attrs:
+                    var_sel.append("%s%s%s" % (rhs,rel,lhs))
+
+        for caserow, variables in _select_cases(self._connection, case_sel,
+                                                var_sel, self.varnames):
+            cid,text_id,parent,label,msg,retries,model_id,timeEnter = caserow
             inputs = []
             outputs = []
-            for var_id, vname, case_id, sense, value in varcur:
-                if not isinstance(value, (float,int,str)):
-                    try:
-                        value = loads(str(value))
-                    except UnpicklingError as err:
-                        raise UnpicklingError("can't unpickle value '%s' for case '%s' from database: %s" %
-                                              (vname, cname, str(err)))
+            for vname, sense, value in variables:
                 if sense=='i':
                     inputs.append((vname, value))
                 else:
@@ -138,6 +246,15 @@ class DBCaseIterator(object):
         attr['desc'] = 'String of additional SQL queries to apply to the case selection.'
         variables.append(attr)
             
+        attr = {}
+        attr['name'] = "varnames"
+        attr['type'] = type(self.varnames).__name__
+        attr['value'] = str(self.varnames)
+        attr['connected'] = ''
+        attr['desc'] = 'Names of the variables to be retrieved. Default ' + \
+                       'is None, which retrieves all variables.'
+        variables.append(attr)
+            
         attrs["Inputs"] = variables
         return attrs
         
@@ -145,19 +262,40 @@ class DBCaseIterator(object):
 class DBCaseRecorder(object):
     """Records Cases to a relational DB (sqlite). Values other than floats,
     ints or strings are pickled and are opaque to SQL queries.
+
+    By default each Case is committed as soon as it's recorded. To reduce
+    the number of transactions, Cases can be buffered and written in bulk
+    once `buffer_size` Cases are pending or `commit_interval` seconds have
+    passed since the last commit (checked when a Case is recorded).
+    Pending Cases are written by :meth:`close` and :meth:`get_iterator`.
+
+    `journal_mode` sets the sqlite journal mode of the DB, for example
+    'WAL'. If `wide` is True, scalar values are stored in a ``casewide``
+    table having one column per variable rather than one ``casevars`` row
+    per variable.
     """
     
     implements(ICaseRecorder)
     
-    def __init__(self, dbfile=':memory:', model_id='', append=False):
+    def __init__(self, dbfile=':memory:', model_id='', append=False,
+                 buffer_size=None, commit_interval=None, journal_mode=None,
+                 wide=False):
         self.dbfile = dbfile  # this creates the connection
         self.model_id = model_id
+        self.buffer_size = buffer_size
+        self.commit_interval = commit_interval
+        self.wide = wide
+        self._buffer = []
+        self._last_commit = time.time()
         
         if append:
             exstr = 'if not exists'
         else:
             exstr = ''
         
+        if journal_mode:
+            self._connection.execute('PRAGMA journal_mode=%s' % journal_mode)
+
         self._connection.execute("""
         create table %s cases(
          id INTEGER PRIMARY KEY,
@@ -179,6 +317,20 @@ class DBCaseRecorder(object):
          value BLOB
          )""" % exstr)
 
+        self._connection.execute("""
+        create index if not exists casevars_name on casevars(name)""")
+        self._connection.execute("""
+        create index if not exists casevars_case_id on casevars(case_id)""")
+
+        self._wide_cols = set()
+        if wide:
+            self._connection.execute("""
+            create table %s casewide(
+             case_id INTEGER PRIMARY KEY
+             )""" % exstr)
+            self._wide_cols.update([col for sense, name, col
+                                         in _wide_columns(self._connection)])
+
     @property
     def dbfile(self):
         """The name of the database. This can be a filename or :memory: for
@@ -202,52 +354,103 @@ class DBCaseRecorder(object):
         if self._connection is None:
             raise RuntimeError('Attempt to record on closed recorder')
 
-        cur = self._connection.cursor()
-        
-        cur.execute("""insert into cases(id,uuid,parent,label,msg,retries,model_id,timeEnter) 
-                           values (?,?,?,?,?,?,?,DATETIME('NOW'))""", 
-                                     (None, case.uuid, case.parent_uuid, case.label,
-                                      case.msg or '', case.retries, 
-                                      self.model_id))
-        case_id = cur.lastrowid
-        # insert the inputs and outputs into the vars table.  Pickle them if they're not one of the
-        # built-in types int, float, or str.
-        
-        for name,value in case.items(iotype='in'):
-            if isinstance(value, (float,int,str)):
-                v = (None, name, case_id, 'i', value)
-            else:
-                if isinstance(value, TraitDictObject):
-                    value = dict(value)
-                elif isinstance(value, TraitListObject):
-                    value = list(value)
-                v = (None, name, case_id, 'i', 
-                     sqlite3.Binary(dumps(value,HIGHEST_PROTOCOL)))
-            cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)", 
-                        v)
-        for name,value in case.items(iotype='out'):
-            if isinstance(value, (float,int,str)):
-                v = (None, name, case_id, 'o', value)
+        caserow = (case.uuid, case.parent_uuid, case.label, case.msg or '',
+                   case.retries, self.model_id,
+                   time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime()))
+
+        # Collect the inputs and outputs for the vars table.  Pickle them if
+        # they're not one of the built-in types int, float, or str.
+        # In wide mode those built-in types go to the wide table instead.
+        varrows = []
+        widerow = {}
+        for sense, iotype in (('i', 'in'), ('o', 'out')):
+            for name,value in case.items(iotype=iotype):
+                if isinstance(value, (float,int,str)):
+                    if self.wide:
+                        col = self._wide_column(sense, name)
+                        if col is not None:
+                            widerow[col] = value
+                            continue
+                else:
+                    if isinstance(value, TraitDictObject):
+                        value = dict(value)
+                    elif isinstance(value, TraitListObject):
+                        value = list(value)
+                    value = sqlite3.Binary(dumps(value,HIGHEST_PROTOCOL))
+                varrows.append((name, sense, value))
+
+        self._buffer.append((caserow, varrows, widerow))
+
+        if self.commit_interval is not None and \
+           time.time() - self._last_commit >= self.commit_interval:
+            self._flush()
+        elif self.buffer_size is None:
+            if self.commit_interval is None:
+                self._flush()
+        elif len(self._buffer) >= self.buffer_size:
+            self._flush()
+
+    def _wide_column(self, sense, name):
+        """Return the wide table column for the given variable, adding it if
+        necessary. Returns None if the table has no room for another column.
+        """
+        col = '%s:%s' % (sense, name)
+        if col not in self._wide_cols:
+            if len(self._wide_cols) >= _MAX_WIDE_COLUMNS:
+                return None
+            try:
+                self._connection.execute('ALTER TABLE casewide ADD COLUMN %s'
+                                         % _quote(col))
+            except sqlite3.OperationalError:
+                # Possibly added by another recorder on the same DB.
+                self._wide_cols.update([c for s, n, c
+                                          in _wide_columns(self._connection)])
+                if col not in self._wide_cols:
+                    raise
             else:
-                if isinstance(value, TraitDictObject):
-                    value = dict(value)
-                elif isinstance(value, TraitListObject):
-                    value = list(value)
-                v = (None, name, case_id, 'o', 
-                     sqlite3.Binary(dumps(value,HIGHEST_PROTOCOL)))
-            cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)", 
-                        v)
+                self._wide_cols.add(col)
+        return col
+
+    def _flush(self):
+        """Write any buffered Cases to the DB and commit."""
+        if self._buffer:
+            cur = self._connection.cursor()
+            varrows = []
+            widerows = {}
+            for caserow, cvars, wide in self._buffer:
+                cur.execute("""insert into cases(uuid,parent,label,msg,retries,model_id,timeEnter) 
+                                   values (?,?,?,?,?,?,?)""", caserow)
+                case_id = cur.lastrowid
+                varrows.extend([(name, case_id, sense, value)
+                                for name, sense, value in cvars])
+                if wide:
+                    cols = tuple(sorted(wide.keys()))
+                    widerows.setdefault(cols, []).append(
+                        [case_id] + [wide[col] for col in cols])
+
+            cur.executemany("insert into casevars(name,case_id,sense,value) values(?,?,?,?)", 
+                            varrows)
+            for cols, rows in widerows.items():
+                cur.executemany("insert into casewide(case_id,%s) values(%s)"
+                                % (','.join([_quote(col) for col in cols]),
+                                   ','.join(['?']*(len(cols)+1))), rows)
+            self._buffer = []
         self._connection.commit()
+        self._last_commit = time.time()
     
     def close(self):
-        """Commit and close DB connection if not using ``:memory:``."""
-        if self._connection is not None and self._dbfile != ':memory:':
-            self._connection.commit()
-            self._connection.close()
-            self._connection = None
+        """Write any buffered Cases, commit, and close DB connection if not
+        using ``:memory:``."""
+        if self._connection is not None:
+            self._flush()
+            if self._dbfile != ':memory:':
+                self._connection.close()
+                self._connection = None
 
     def get_iterator(self):
         """Return a DBCaseIterator that points to our current DB."""
+        if self._connection is not None:
+            self._flush()
         return DBCaseIterator(dbfile=self._dbfile, connection=self._connection)
 
     def get_attributes(self, io_only=True):
@@ -289,6 +492,7 @@ def list_db_vars(dbname):
     varcur = connection.cursor()
     varcur.execute("SELECT name from casevars")
     varnames = set([v for v in varcur])
+    varnames.update([(name,) for sense, name, col in _wide_columns(connection)])
     return varnames
 
 def case_db_to_dict(dbname, varnames, case_sql='', var_sql='', include_errors=False):
@@ -322,47 +526,18 @@ def case_db_to_dict(dbname, varnames, case_sql='', var_sql='', include_errors=Fa
     connection = sqlite3.connect(dbname)
     vardict = dict([(name,[]) for name in varnames])
 
-    sql = ["SELECT id FROM cases"]
-    qlist = []
+    case_where = []
     if case_sql:
-        qlist.append(case_sql)
+        case_where.append(case_sql)
     if not include_errors:
-        qlist.append("msg = ''")
-            
-    if qlist:
-        sql.append("WHERE %s" % ' AND '.join(qlist))
-        
-    casecur = connection.cursor()
-    casecur.execute(' '.join(sql))
-    
-    sql = ["SELECT name, value from casevars WHERE case_id=%s"]
-    vars_added = False
-    for i,name in enumerate(vardict.keys()):
-        if i==0:
-            sql.append("AND (")
-        else:
-            sql.append("OR")
-        sql.append("name='%s'" % name)
-        vars_added = True
-    if vars_added: sql.append(")")
-    
+        case_where.append("msg = ''")
+    var_where = []
     if var_sql:
-        sql.append(" AND %s" % var_sql)
-    combined = ' '.join(sql)
-    
-    varcur = connection.cursor()
-    
-    for case_id in casecur:
-        casedict = {}
-        varcur.execute(combined % case_id)
-        for vname, value in varcur:
-            if not isinstance(value, (float,int,str)):
-                try:
-                    value = loads(str(value))
-                except UnpicklingError as err:
-                    raise UnpicklingError("can't unpickle value '%s' from database: %s" %
-                                          (vname, str(err)))
-            casedict[vname] = value
+        var_where.append(var_sql)
+
+    for caserow, variables in _select_cases(connection, case_where,
+                                            var_where, vardict.keys()):
+        casedict = dict([(vname, value) for vname, sense, value in variables])
         
         if len(casedict) != len(vardict):
             continue   # case doesn't contain a complete set of specified vars, so skip it to avoid data mismatches
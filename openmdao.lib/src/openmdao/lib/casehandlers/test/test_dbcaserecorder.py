@@ -20,6 +20,7 @@ from openmdao.main.datatypes.api import List, Dict
 from openmdao.util.testutil import assert_raises
 from openmdao.util.fileutil import onerror
 
+from openmdao.lib.casehandlers.dbcase import list_db_vars
 from openmdao.main.caseiter import caseiter_to_dict
 
 
@@ -127,6 +128,24 @@ class DBCaseRecorderTestCase(unittest.TestCase):
                 self.assertTrue(value >= 0 and value < 3)
         self.assertEqual(count, 3)
 
+    def test_varnames(self):
+        for wide in (False, True):
+            recorder = DBCaseRecorder(wide=wide)
+            for i in range(10):
+                inputs = [('comp1.x', i), ('comp1.y', i*2.)]
+                outputs = [('comp1.z', i*1.5), ('comp2.normal', NormalDistribution(float(i), 0.5))]
+                recorder.record(Case(inputs=inputs, outputs=outputs, label='case%s' % i))
+            iterator = recorder.get_iterator()
+            iterator.varnames = ['comp1.x', 'comp2.normal']
+            iterator.selectors = ["id>5"]
+            cases = list(iterator)
+            self.assertEqual(len(cases), 5)
+            for i, case in enumerate(cases):
+                self.assertEqual(case.label, 'case%s' % (i+5))
+                self.assertEqual(sorted(case.keys()), iterator.varnames)
+                self.assertEqual(case['comp1.x'], i+5)
+                self.assertEqual(case['comp2.normal'].mu, float(i+5))
+
     def test_tables_already_exist(self):
         dbdir = tempfile.mkdtemp()
         dbname = os.path.join(dbdir, 'junk_dbfile')
@@ -186,6 +205,67 @@ class DBCaseRecorderTestCase(unittest.TestCase):
         except OSError:
             logging.error("problem removing directory %s" % tmpdir)
 
+    def test_buffered(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            dfile = os.path.join(tmpdir, 'junk.db')
+            recorder = DBCaseRecorder(dfile, buffer_size=4, journal_mode='WAL')
+            for i in range(10):
+                inputs = [('comp1.x', i), ('comp1.y', i*2.)]
+                outputs = [('comp1.z', i*1.5)]
+                recorder.record(Case(inputs=inputs, outputs=outputs,
+                                     label='case%s' % i))
+            # Only complete buffers have been written so far.
+            self.assertEqual(len(list(DBCaseIterator(dfile))), 8)
+            recorder.close()
+            cases = list(DBCaseIterator(dfile))
+            self.assertEqual(len(cases), 10)
+            for i, case in enumerate(cases):
+                self.assertEqual(case.label, 'case%s' % i)
+                self.assertEqual(case['comp1.z'], i*1.5)
+        finally:
+            try:
+                shutil.rmtree(tmpdir, onerror=onerror)
+            except OSError:
+                logging.error("problem removing directory %s" % tmpdir)
+
+    def test_wide(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            dfile = os.path.join(tmpdir, 'junk.db')
+            recorder = DBCaseRecorder(dfile, wide=True)
+            for i in range(10):
+                inputs = [('comp1.x', i), ('comp1.y', i*2.),
+                          ('comp1.a_list', ['a', i])]
+                if i < 5:
+                    inputs.append(('comp1.y2', i*3))
+                outputs = [('comp1.z', i*1.5)]
+                recorder.record(Case(inputs=inputs, outputs=outputs,
+                                     label='case%s' % i))
+            iterator = recorder.get_iterator()
+            for i, case in enumerate(iterator):
+                self.assertEqual(case['comp1.y'], i*2.)
+                self.assertEqual(case['comp1.z'], i*1.5)
+                self.assertEqual(case['comp1.a_list'], ['a', i])
+            iterator.selectors = ["value>=0", "value<3"]
+            self.assertEqual(len(list(iterator)), 3)
+            recorder.close()
+
+            varinfo = case_db_to_dict(dfile, ['comp1.x', 'comp1.y2'])
+            self.assertEqual(varinfo['comp1.x'], range(5))
+            self.assertEqual(varinfo['comp1.y2'], range(0, 15, 3))
+            varinfo = case_db_to_dict(dfile, ['comp1.x', 'comp1.y'],
+                                      var_sql='value<10')
+            self.assertEqual(varinfo['comp1.x'], range(5))
+            self.assertEqual(list_db_vars(dfile),
+                             set([('comp1.x',), ('comp1.y',), ('comp1.y2',),
+                                  ('comp1.z',), ('comp1.a_list',)]))
+        finally:
+            try:
+                shutil.rmtree(tmpdir, onerror=onerror)
+            except OSError:
+                logging.error("problem removing directory %s" % tmpdir)
+
     def test_dbcaseiterator_get_attributes(self):
 
         caseiter = DBCaseIterator()
@@ -203,6 +283,12 @@ class DBCaseRecorderTestCase(unittest.TestCase):
                          'connected': '',
                          'value': 'None',
                          'desc': 'String of additional SQL queries to apply to the case selection.'} in attrs['Inputs'])
+        self.assertTrue({'name': 'varnames',
+                         'type': 'NoneType',
+                         'connected': '',
+                         'value': 'None',
+                         'desc': 'Names of the variables to be retrieved. Default ' +
+                       'is None, which retrieves all variables.'} in attrs['Inputs'])
 
     def test_string(self):
         recorder = DBCaseRecorder()
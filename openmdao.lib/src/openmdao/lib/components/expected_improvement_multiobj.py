@@ -3,16 +3,19 @@
 import logging
 
 try:
-    from numpy import exp, pi, array, isnan, diag, random
+    from numpy import exp, pi, array, empty, isnan, newaxis, random, sqrt, \
+                      vectorize
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 _check=['numpy']
 try:
-    from math import erf
+    # vectorized erf
+    from scipy.special import erf
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
     try:
-        from scipy.special import erf
+        from math import erf as _erf
+        erf = vectorize(_erf)
     except ImportError as err:
         logging.warn("In %s: %r" % (__file__, err))
         _check.append('scipy')
@@ -25,6 +28,10 @@ from openmdao.util.decorators import stub_if_missing_deps
 from openmdao.lib.casehandlers.api import CaseSet
 from openmdao.main.uncertain_distributions import NormalDistribution
 
+# Maximum number of (candidate, Pareto point, sample) comparisons made at
+# once by the Monte Carlo probability of improvement.
+_MAX_COMPARISONS = 1 << 24
+
 
 @stub_if_missing_deps(*_check)
 class MultiObjExpectedImprovement(Component):
@@ -59,132 +66,150 @@ class MultiObjExpectedImprovement(Component):
     def _reset_y_star_fired(self):
         self.y_star = None
 
-    def get_y_star(self):
-        criteria_count = len(self.criteria)
+    def _best_cases_changed(self, old, new):
+        self.y_star = None
 
-        flat_crit = self.criteria.ravel()
+    def _criteria_changed(self, old, new):
+        self.y_star = None
 
+    def get_y_star(self):
         try:
-            y_star = zip(*[self.best_cases[crit] for crit in self.criteria])
+            y_star = array(zip(*[self.best_cases[crit]
+                                 for crit in self.criteria]), dtype=float)
         except KeyError:
             self.raise_exception('no cases in the provided case_set had output '
                  'matching the provided criteria, %s' % self.criteria, ValueError)
 
         #sort list on first objective
-        y_star = array(y_star)[array([i[0] for i in y_star]).argsort()]
+        y_star = y_star[y_star[:, 0].argsort()]
         return y_star
 
+    def _cdf(self, y, mu, sigma):
+        """Normal cumulative distribution of each candidate (rows of the
+        column vectors `mu` and `sigma`) at each of the values `y`."""
+        return 0.5+0.5*erf((1/(2**0.5))*((y-mu)/sigma))
+
+    def _partial_mean(self, y, mu, sigma):
+        """Integral of x*pdf(x) up to each of the values `y` for the normal
+        distribution of each candidate."""
+        return mu*self._cdf(y, mu, sigma) \
+               -sigma*(1/((2*pi)**0.5))*exp(-0.5*((y-mu)**2/sigma**2))
+
     def _2obj_PI(self, mu, sigma):
         """Calculates the multi-objective probability of improvement
-        for a new point with two responses. Takes as input a
-        pareto frontier, mean and sigma of new point."""
+        for new points with two responses. Takes as input arrays with
+        the mean and sigma of each new point as rows, and returns an array
+        of the probabilities. The pareto frontier is self.y_star."""
 
-        y_star = self.y_star
+        y1, y2 = self.y_star[:, 0], self.y_star[:, 1]
+        cdf1 = self._cdf(y1, mu[:, :1], sigma[:, :1])
+        cdf2 = self._cdf(y2, mu[:, 1:], sigma[:, 1:])
 
-        PI1 = (0.5+0.5*erf((1/(2**0.5))*((y_star[0][0]-mu[0])/sigma[0])))
-        PI3 = (1-(0.5+0.5*erf((1/(2**0.5))*((y_star[-1][0]-mu[0])/sigma[0]))))\
-        *(0.5+0.5*erf((1/(2**0.5))*((y_star[-1][1]-mu[1])/sigma[1])))
+        PI1 = cdf1[:, 0]
+        PI2 = ((cdf1[:, 1:]-cdf1[:, :-1])*cdf2[:, 1:]).sum(axis=1)
+        PI3 = (1-cdf1[:, -1])*cdf2[:, -1]
+        return PI1 + PI2 + PI3
 
-        PI2 = 0
-        if len(y_star)>1:
-            for i in range(len(y_star) - 1):
-                PI2=PI2+((0.5+0.5*erf((1/(2**0.5))*((y_star[i+1][0]-mu[0])/sigma[0])))\
-                -(0.5+0.5*erf((1/(2**0.5))*((y_star[i][0]-mu[0])/sigma[0]))))\
-                *(0.5+0.5*erf((1/(2**0.5))*((y_star[i+1][1]-mu[1])/sigma[1])))
-        mcpi = PI1 + PI2 + PI3
-        return mcpi
-
-    def _2obj_EI(self, mu, sigma):
+    def _2obj_EI(self, mu, sigma, PI):
         """Calculates the multi-criteria expected improvement
-        for a new point with two responses. Takes as input a
-        pareto frontier, mean and sigma of new point."""
-
-        y_star = self.y_star
-        ybar11 = mu[0]*(0.5+0.5*erf((1/(2**0.5))*((y_star[0][0]-mu[0])/sigma[0])))\
-        -sigma[0]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[0][0]-mu[0])**2/sigma[0]**2))
-        ybar13 = (mu[0]*(0.5+0.5*erf((1/(2**0.5))*((y_star[-1][0]-mu[0])/sigma[0])))\
-        -sigma[0]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[-1][0]-mu[0])**2/sigma[0]**2)))\
-        *(0.5+0.5*erf((1/(2**0.5))*((y_star[-1][1]-mu[1])/sigma[1])))
-
-        ybar12 = 0
-        if len(y_star) > 1:
-            for i in range(len(y_star) - 1):
-                ybar12 = ybar12+((mu[0]*(0.5+0.5*erf((1/(2**0.5))*((y_star[i+1][0]-mu[0])/sigma[0])))\
-                -sigma[0]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[i+1][0]-mu[0])**2/sigma[0]**2)))\
-                -(mu[0]*(0.5+0.5*erf((1/(2**0.5))*((y_star[i][0]-mu[0])/sigma[0])))\
-                -sigma[0]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[i][0]-mu[0])**2/sigma[0]**2))))\
-                *(0.5+0.5*erf((1/(2**0.5))*((y_star[i+1][1]-mu[1])/sigma[1])))
-
-        ybar1 = (ybar11+ybar12+ybar13)/self.PI
-
-        ybar21 = mu[1]*(0.5+0.5*erf((1/(2**0.5))*((y_star[0][1]-mu[1])/sigma[1])))\
-        -sigma[1]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[0][1]-mu[1])**2/sigma[1]**2))
-        ybar23 = (mu[1]*(0.5+0.5*erf((1/(2**0.5))*((y_star[-1][1]-mu[1])/sigma[1])))\
-        -sigma[1]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[-1][1]-mu[1])**2/sigma[1]**2)))\
-        *(0.5+0.5*erf((1/(2**0.5))*((y_star[-1][0]-mu[0])/sigma[0])))
-
-        ybar22 = 0
-        if len(y_star)>1:
-            for i in range(len(y_star) - 1):
-                ybar22 = ybar22+((mu[1]*(0.5+0.5*erf((1/(2**0.5))*((y_star[i+1][1]-mu[1])/sigma[1])))\
-                -sigma[1]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[i+1][1]-mu[1])**2/sigma[1]**2)))\
-                -(mu[1]*(0.5+0.5*erf((1/(2**0.5))*((y_star[i][1]-mu[1])/sigma[1])))\
-                -sigma[1]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[i][1]-mu[1])**2/sigma[1]**2))))\
-                *(0.5+0.5*erf((1/(2**0.5))*((y_star[i+1][0]-mu[0])/sigma[0])))
-
-        ybar2 = (ybar21+ybar22+ybar23)/self.PI
-        dists = [((ybar1-point[0])**2+(ybar2-point[1])**2)**0.5 for point in y_star]
-        mcei = self.PI*min(dists)
-        if isnan(mcei):
-            mcei = 0
+        for new points with two responses, given their probability of
+        improvement `PI`. Takes as input arrays with the mean and sigma of
+        each new point as rows, and returns an array of the expected
+        improvements. The pareto frontier is self.y_star."""
+
+        y1, y2 = self.y_star[:, 0], self.y_star[:, 1]
+        mu1, sigma1 = mu[:, :1], sigma[:, :1]
+        mu2, sigma2 = mu[:, 1:], sigma[:, 1:]
+        cdf1 = self._cdf(y1, mu1, sigma1)
+        cdf2 = self._cdf(y2, mu2, sigma2)
+        mean1 = self._partial_mean(y1, mu1, sigma1)
+        mean2 = self._partial_mean(y2, mu2, sigma2)
+
+        ybar1 = (mean1[:, 0]
+                 +((mean1[:, 1:]-mean1[:, :-1])*cdf2[:, 1:]).sum(axis=1)
+                 +mean1[:, -1]*cdf2[:, -1])/PI
+        ybar2 = (mean2[:, 0]
+                 +((mean2[:, 1:]-mean2[:, :-1])*cdf1[:, 1:]).sum(axis=1)
+                 +mean2[:, -1]*cdf1[:, -1])/PI
+
+        dists = sqrt((ybar1[:, newaxis]-y1)**2+(ybar2[:, newaxis]-y2)**2)
+        mcei = PI*dists.min(axis=1)
+        mcei[isnan(mcei)] = 0
         return mcei
 
-    def _dom(self, a, b):
-        """determines if a completely dominates b
-       returns True is if does
-    """
-        comp = [c1 < c2 for c1, c2 in zip(a, b)]
-        if sum(comp) == len(self.criteria):
-            return True
-        return False
-
     def _nobj_PI(self, mu, sigma):
-        cov = diag(array(sigma)**2)
-        rands = random.multivariate_normal(mu, cov, self.n)
-        num = 0  # number of cases that dominate the current Pareto set
-
-        for random_sample in rands:
-            for par_point in self.y_star:
-                #par_point = [p[2] for p in par_point.outputs]
-                if self._dom(par_point, random_sample):
-                    num = num + 1
-                    break
-        pi = (self.n-num)/float(self.n)
+        """Monte Carlo estimate of the probability of improvement for new
+        points with any number of responses, from self.n samples of each.
+        Takes as input arrays with the mean and sigma of each new point as
+        rows, and returns an array of the probabilities. Candidates are
+        sampled and compared together, in chunks so the comparison array
+        stays within _MAX_COMPARISONS."""
+        n_cands, n_objs = mu.shape
+        chunk = max(1, _MAX_COMPARISONS // (self.n*len(self.y_star)))
+        pi = empty(n_cands)
+        for start in range(0, n_cands, chunk):
+            mu_c = mu[start:start+chunk, newaxis]
+            sigma_c = sigma[start:start+chunk, newaxis]
+            rands = random.normal(mu_c, sigma_c, (len(mu_c), self.n, n_objs))
+
+            # samples completely dominated by any point of the Pareto set,
+            # indexed by (candidate, Pareto point, sample)
+            y_star = self.y_star[newaxis, :, newaxis]
+            rands = rands[:, newaxis]
+            dom = y_star[..., 0] < rands[..., 0]
+            for i in range(1, n_objs):
+                dom &= y_star[..., i] < rands[..., i]
+            num = dom.any(axis=1).sum(axis=1)
+
+            pi[start:start+chunk] = (self.n-num)/float(self.n)
         return pi
 
-    def execute(self):
-        """ Calculates the expected improvement or
-        probability of improvement of a candidate
-        point given by a normal distribution.
-        """
-        mu = [objective.mu for objective in self.predicted_values]
-        sig = [objective.sigma for objective in self.predicted_values]
+    def calc_batch(self, mu, sigma):
+        """Calculates the probability of improvement, and the expected
+        improvement if calc_switch is 'EI', of many candidate points in a
+        single vectorized call.
 
-        if self.y_star == None:
+        mu, sigma: 2D array-like
+            Mean and sigma of each response, one row per candidate point.
+            For a surrogate of each response, these are the columns
+            returned by :meth:`KrigingSurrogate.predict_batch`.
+
+        Returns a tuple of arrays (PI, EI), each with one entry per
+        candidate point. EI is None if calc_switch is 'PI'.
+        """
+        if self.y_star is None:
             self.y_star = self.get_y_star()
 
         n_objs = len(self.criteria)
+        mu = array(mu, dtype=float).reshape(-1, n_objs)
+        sigma = array(sigma, dtype=float).reshape(-1, n_objs)
 
+        PI = EI = None
         if n_objs == 2:
             """biobjective optimization"""
-            self.PI = self._2obj_PI(mu, sig)
+            PI = self._2obj_PI(mu, sigma)
             if self.calc_switch == 'EI':
                 """execute EI calculations"""
-                self.EI = self._2obj_EI(mu, sig)
+                EI = self._2obj_EI(mu, sigma, PI)
         if n_objs > 2:
             """n objective optimization"""
-            self.PI = self._nobj_PI(mu, sig)
+            PI = self._nobj_PI(mu, sigma)
             if self.calc_switch == 'EI':
                 """execute EI calculations"""
                 self.raise_exception("EI calculations not supported"
                                         " for more than 2 objectives", ValueError)
+        return PI, EI
+
+    def execute(self):
+        """ Calculates the expected improvement or
+        probability of improvement of a candidate
+        point given by a normal distribution.
+        """
+        mu = [objective.mu for objective in self.predicted_values]
+        sig = [objective.sigma for objective in self.predicted_values]
+
+        PI, EI = self.calc_batch([mu], [sig])
+        if PI is not None:
+            self.PI = PI[0]
+        if EI is not None:
+            self.EI = EI[0]
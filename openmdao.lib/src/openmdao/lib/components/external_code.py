@@ -18,7 +18,7 @@ from openmdao.main.exceptions import RunInterrupted, RunStopped
 from openmdao.main.rbac import AccessController, RoleError, rbac, remote_access
 from openmdao.main.resource import ResourceAllocationManager as RAM
 
-from openmdao.util.filexfer import filexfer, pack_zipfile, unpack_zipfile
+from openmdao.util.filexfer import retrieve_files, send_files
 from openmdao.util import shellproc
 
 
@@ -391,55 +391,28 @@ class ExternalCode(ComponentWithDerivatives):
         return (return_code, error_msg)
 
     def _send_inputs(self, patterns, textfiles):
-        """ Sends input files matching `patterns`. """
+        """
+        Sends input files matching `patterns`. Files already in the server's
+        file cache are not transferred again.
+        """
         self._logger.info('sending inputs...')
         start_time = time.time()
 
-        filename = 'inputs.zip'
-        pfiles, pbytes = pack_zipfile(patterns, filename, self._logger)
-        try:
-            filexfer(None, filename, self._server, filename, 'b')
-            ufiles, ubytes = self._server.unpack_zipfile(filename,
-                                                         textfiles=textfiles)
-        finally:
-            os.remove(filename)
-            self._server.remove(filename)
-
-        # Difficult to force file transfer error.
-        if ufiles != pfiles or ubytes != pbytes:  #pragma no cover
-            msg = 'Inputs xfer error: %d:%d vs. %d:%d' \
-                  % (ufiles, ubytes, pfiles, pbytes)
-            self.raise_exception(msg, RuntimeError)
+        send_files(self._server, patterns, textfiles, self._logger)
 
         et = time.time() - start_time
         if et >= 60:  #pragma no cover
             self._logger.info('elapsed time: %f sec.', et)
 
     def _retrieve_results(self, patterns, textfiles):
-        """ Retrieves result files matching `patterns`. """
+        """
+        Retrieves result files matching `patterns`. Files identical to the
+        local file of the same name are not transferred.
+        """
         self._logger.info('retrieving results...')
         start_time = time.time()
 
-        filename = 'outputs.zip'
-        pfiles, pbytes = self._server.pack_zipfile(patterns, filename)
-        filexfer(self._server, filename, None, filename, 'b')
-
-        # Valid, but empty, file causes unpack_zipfile() problems.
-        try:
-            if os.path.getsize(filename) > 0:
-                ufiles, ubytes = unpack_zipfile(filename, logger=self._logger,
-                                                textfiles=textfiles)
-            else:
-                ufiles, ubytes = 0, 0
-        finally:
-            os.remove(filename)
-            self._server.remove(filename)
-
-        # Difficult to force file transfer error.
-        if ufiles != pfiles or ubytes != pbytes:  #pragma no cover
-            msg = 'Results xfer error: %d:%d vs. %d:%d' \
-                  % (ufiles, ubytes, pfiles, pbytes)
-            self.raise_exception(msg, RuntimeError)
+        retrieve_files(self._server, patterns, textfiles, self._logger)
 
         et = time.time() - start_time
         if et >= 60:  #pragma no cover
@@ -69,6 +69,8 @@ class MetaModel(Component):
         self._failed_training_msgs = []
         self._default_surrogate_copies = {} # need to maintain separate copy of default surrogate for each sur_* that doesn't
                                             # have a surrogate defined
+        self._trained_sizes = {} # output name -> (surrogate, constant input indices, number of training
+                                 # points it was trained on), used to decide if a surrogate can be updated
         
         # the following line will work for classes that inherit from MetaModel
         # as long as they declare their traits in the class body and not in
@@ -85,6 +87,7 @@ class MetaModel(Component):
         self._training_input_history = []
         self._const_inputs = {}
         self._failed_training_msgs = []
+        self._trained_sizes = {}
 
         # remove output history from training_data
         for name in self._training_data:
@@ -199,10 +202,12 @@ class MetaModel(Component):
                                                        if i not in self._const_inputs])
                 else:
                     training_input_history = self._training_input_history
+                const_idxs = set(self._const_inputs)
                 for name, output_history in self._training_data.items():
                     surrogate = self._get_surrogate(name)
                     if surrogate is not None:
-                        surrogate.train(training_input_history, output_history)
+                        self._train_surrogate(name, surrogate, const_idxs,
+                                              training_input_history, output_history)
 
                 self._new_train_data = False
 
@@ -225,6 +230,20 @@ class MetaModel(Component):
                 else:
                     setattr(self, name, surrogate.predict(inputs))
 
+    def _train_surrogate(self, name, surrogate, const_idxs, input_history, output_history):
+        """Train the given surrogate. If it supports incremental updates and
+        the only change since it was last trained is that new training points
+        were appended, just update it with the new points.
+        """
+        ntrain = len(output_history)
+        old_sur, old_idxs, old_ntrain = self._trained_sizes.get(name, (None, None, 0))
+        if old_sur is surrogate and old_idxs == const_idxs and 0 < old_ntrain < ntrain \
+           and hasattr(surrogate, 'update'):
+            surrogate.update(input_history[old_ntrain:], output_history[old_ntrain:])
+        else:
+            surrogate.train(input_history, output_history)
+        self._trained_sizes[name] = (surrogate, const_idxs, ntrain)
+
     def _post_run(self):
         self._train = False
         super(MetaModel, self)._post_run()
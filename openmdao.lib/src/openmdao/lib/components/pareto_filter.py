@@ -1,13 +1,215 @@
 """ Pareto Filter -- finds non-dominated cases. """
 
+import logging
+from bisect import bisect_right
+
 # pylint: disable-msg=E0611,F0401
-from openmdao.main.datatypes.api import Slot, List, Str
+try:
+    from numpy import array, asarray, concatenate, empty, arange, inf, \
+                      lexsort, maximum, minimum, newaxis, ones, triu, where, \
+                      zeros
+except ImportError as err:
+    logging.warn("In %s: %r" % (__file__, err))
+
+from openmdao.main.datatypes.api import Slot, List, Str, Bool, Array
 from openmdao.lib.casehandlers.api import CaseSet, caseiter_to_caseset
 
 from openmdao.main.component import Component
 from openmdao.main.interfaces import ICaseIterator
+from openmdao.util.decorators import stub_if_missing_deps
+
+# Number of sorted points compared with the fronts found so far at once.
+_BLOCK = 1024
+# Maximum number of elements in one broadcast dominance comparison.
+_CHUNK = 1 << 20
+
+
+def _as_points(y):
+    """Returns `y` as a 2D float array with one row per point."""
+    y = asarray(y, dtype=float)
+    if y.ndim == 1:
+        y = y.reshape(-1, 1)
+    return y
+
+
+def _unique_sorted(y):
+    """Sorts the rows of `y` lexicographically and drops duplicate rows.
+    Returns the unique rows and, for each row of `y`, the index of its
+    unique row.
+
+    In the result a point can only be dominated by one that precedes it, and
+    it is dominated by a preceding point if it is no better in all but the
+    first objective.
+    """
+    order = lexsort(y.T[::-1])
+    ys = y[order]
+    first = ones(len(ys), dtype=bool)
+    first[1:] = (ys[1:] != ys[:-1]).any(axis=1)
+    index = empty(len(y), dtype=int)
+    index[order] = first.cumsum() - 1
+    return ys[first], index
+
+
+def _dominated_by(front, points):
+    """Returns a boolean array which is True for each of `points` that is
+    dominated by at least one point in `front`. Both hold all but the first
+    objective of unique sorted points, and every point in `front` must
+    precede all of `points`.
+    """
+    dominated = zeros(len(points), dtype=bool)
+    alive = arange(len(points))
+    i = 0
+    while i < len(front) and len(alive):
+        # points already known to be dominated are not compared again
+        step = max(1, _CHUNK // len(alive))
+        f = front[i:i+step]
+        p = points[alive]
+        # compare one objective at a time to avoid a 3D temporary
+        le = f[:, newaxis, 0] <= p[:, 0]
+        for k in range(1, p.shape[1]):
+            le &= f[:, newaxis, k] <= p[:, k]
+        hit = le.any(axis=0)
+        dominated[alive[hit]] = True
+        alive = alive[~hit]
+        i += step
+    return dominated
+
+
+def _dominated_within(block):
+    """Returns a boolean (n, n) array which is True at [i, j] if point i of
+    `block` dominates point j, for unique sorted points without their first
+    objective.
+    """
+    le = block[:, newaxis, 0] <= block[:, 0]
+    for k in range(1, block.shape[1]):
+        le &= block[:, newaxis, k] <= block[:, k]
+    return triu(le, 1)
+
+
+def pareto_mask(y):
+    """Returns a boolean array which is True for each row of the (npoints,
+    nobjectives) array `y` that is not dominated by any other row. Smaller
+    is better for all objectives. A point is dominated by another if it is
+    no better in every objective and the two points are not equal, so
+    duplicate points are either all kept or all dropped.
+
+    With two objectives a lexicographically sorted point is dominated if the
+    running minimum of the second objective over the preceding points
+    reaches it, which is O(n log n). With more objectives the sorted points
+    are checked in blocks against the non-dominated points found so far,
+    which is O(n * npareto) but runs in NumPy.
+    """
+    y = _as_points(y)
+    n, m = y.shape
+    if n == 0 or m == 0:
+        return ones(n, dtype=bool)
+    if m == 1:
+        return y[:, 0] == y[:, 0].min()
+
+    ys, index = _unique_sorted(y)
+    ys = ys[:, 1:]
+    if m == 2:
+        before = concatenate(([inf], minimum.accumulate(ys[:-1, 0])))
+        optimal = before > ys[:, 0]
+    else:
+        optimal = zeros(len(ys), dtype=bool)
+        front = empty((0, m-1))
+        for i in range(0, len(ys), _BLOCK):
+            block = ys[i:i+_BLOCK]
+            keep = ~_dominated_by(front, block)
+            keep[keep] = ~_dominated_within(block[keep]).any(axis=0)
+            optimal[i:i+_BLOCK] = keep
+            front = concatenate((front, block[keep]))
+    return optimal[index]
 
 
+def _ranks_2d(ys):
+    """Non-dominated ranks of unique sorted points with two objectives,
+    given their second objective `ys`.
+
+    The lowest second objective of the points of each rank found so far
+    increases with rank, and a point has the rank of the first of those
+    which exceeds its own second objective.
+    """
+    ranks = empty(len(ys), dtype=int)
+    lowest = []
+    for i, y2 in enumerate(ys.tolist()):
+        rank = bisect_right(lowest, y2)
+        if rank == len(lowest):
+            lowest.append(y2)
+        else:
+            lowest[rank] = y2
+        ranks[i] = rank
+    return ranks
+
+
+def _ranks_nd(ys):
+    """Non-dominated ranks of unique sorted points with more than two
+    objectives, given all but their first objective `ys`.
+
+    If a point is dominated by a point of some rank, it is also dominated by
+    a point of every lower rank, so the number of ranks dominating each point
+    of a block is found by a binary search over the points of each rank
+    found so far. Dominance within the block is then resolved by raising
+    the ranks of dominated points until they no longer change.
+    """
+    ranks = empty(len(ys), dtype=int)
+    fronts = []
+    for start in range(0, len(ys), _BLOCK):
+        block = ys[start:start+_BLOCK]
+        lo = zeros(len(block), dtype=int)
+        hi = zeros(len(block), dtype=int) + len(fronts)
+        searching = arange(len(block))
+        while True:
+            searching = searching[lo[searching] < hi[searching]]
+            if not len(searching):
+                break
+            mid = (lo[searching] + hi[searching]) // 2
+            for rank in set(mid.tolist()):
+                pts = searching[mid == rank]
+                dominated = _dominated_by(fronts[rank], block[pts])
+                lo[pts[dominated]] = rank + 1
+                hi[pts[~dominated]] = rank
+
+        dominates = _dominated_within(block)
+        block_ranks = lo
+        while True:
+            raised = where(dominates, block_ranks[:, newaxis] + 1,
+                           0).max(axis=0)
+            if (raised <= block_ranks).all():
+                break
+            block_ranks = maximum(block_ranks, raised)
+        ranks[start:start+_BLOCK] = block_ranks
+
+        for rank in set(block_ranks.tolist()):
+            new = block[block_ranks == rank]
+            if rank < len(fronts):
+                fronts[rank] = concatenate((fronts[rank], new))
+            else:
+                fronts.append(new)
+    return ranks
+
+
+def nondominated_ranks(y):
+    """Returns the non-dominated rank of each row of the (npoints,
+    nobjectives) array `y`. Rank 0 is the Pareto front, rank 1 the front of
+    the remaining points, and so on.
+    """
+    y = _as_points(y)
+    n, m = y.shape
+    if n == 0 or m == 0:
+        return zeros(n, dtype=int)
+    ys, index = _unique_sorted(y)
+    if m == 1:
+        ranks = arange(len(ys))
+    elif m == 2:
+        ranks = _ranks_2d(ys[:, 1])
+    else:
+        ranks = _ranks_nd(ys[:, 1:])
+    return ranks[index]
+
+
+@stub_if_missing_deps('numpy')
 class ParetoFilter(Component):
     """Takes a set of cases and filters out the subset of cases which are
     pareto optimal. Assumes that smaller values for model responses are
@@ -33,6 +235,15 @@ class ParetoFilter(Component):
     dominated_set = Slot(CaseSet, iotype="out",
                            desc="Resulting collection of dominated cases.", copy="shallow")
 
+    compute_ranks = Bool(False, iotype="in",
+                         desc="If True, also compute the non-dominated rank "
+                              "of every case.")
+
+    ranks = Array(iotype="out",
+                  desc="Non-dominated rank of each case (0 for pareto "
+                       "optimal cases), in the order of the union of "
+                       "case_sets. Only set if compute_ranks is True.")
+
     def _is_dominated(self, y1, y2):
         """Tests to see if the point y1 is dominated by the point y2.
         True if y1 is dominated by y2, False otherwise.
@@ -58,35 +269,33 @@ class ParetoFilter(Component):
             else:
                 case_sets.append(ci)
 
-        y_list = []
         if len(case_sets) > 1:
             case_set = case_sets[0].union(*case_sets[1:])
         else:
             case_set = case_sets[0]
-        criteria_count = len(self.criteria)
 
         try:
-            # need to transpose the list of outputs
-            y_list = zip(*[case_set[crit] for crit in self.criteria])
+            # one row per case, one column per criterion
+            y = array([case_set[crit] for crit in self.criteria],
+                      dtype=float).T
         except KeyError:
             self.raise_exception('no cases provided had all of the outputs '
                  'matching the provided criteria, %s' % self.criteria, ValueError)
 
-        y_temp = list(y_list)
+        if self.compute_ranks:
+            self.ranks = nondominated_ranks(y)
+            optimal = self.ranks == 0
+        else:
+            optimal = pareto_mask(y)
 
         self.dominated_set = CaseSet()
         self.pareto_set = CaseSet()  # TODO: need a way to copy casesets
 
-        for point1, case in zip(y_list, iter(case_set)):
-            dominated = False
-            for point2 in y_temp:
-                if self._is_dominated(point1, point2):
-                    self.dominated_set.record(case)
-                    y_temp.remove(point1)
-                    dominated = True
-                    break
-            if not dominated:
+        for case, is_optimal in zip(case_set, optimal):
+            if is_optimal:
                 self.pareto_set.record(case)
+            else:
+                self.dominated_set.record(case)
 
 if __name__ == "__main__":  # pragma: no cover
 
@@ -0,0 +1,92 @@
+"""
+Compare the original pairwise-loop pareto filtering of ParetoFilter with the
+vectorized pareto_mask and nondominated_ranks on random point clouds of
+10k and 100k points. Both must find the same pareto optimal points.
+"""
+
+import sys
+import time
+
+from numpy import random, sqrt
+
+from openmdao.lib.components.pareto_filter import pareto_mask, \
+                                                  nondominated_ranks
+
+
+def is_dominated(y1, y2):
+    """ Original implementation of the dominance test, for reference. """
+    if y1 == y2:
+        return False
+    for a, b in zip(y1, y2):
+        if a < b:
+            return False
+    return True
+
+
+def loop_mask(y):
+    """ Original filtering loop of ParetoFilter.execute, for reference. """
+    y_list = [tuple(row) for row in y.tolist()]
+    y_temp = list(y_list)
+    mask = []
+    for point1 in y_list:
+        dominated = False
+        for point2 in y_temp:
+            if is_dominated(point1, point2):
+                y_temp.remove(point1)
+                dominated = True
+                break
+        mask.append(not dominated)
+    return mask
+
+
+def point_cloud(n, m):
+    """ `n` random points inside the positive part of a unit `m`-sphere,
+    reflected so that the pareto front lies on the sphere and is sizeable.
+    Every hundredth point is duplicated.
+    """
+    y = random.random((n, m))
+    y /= sqrt((y**2).sum(axis=1)).reshape(-1, 1)
+    y *= random.random((n, 1))**(1./m)
+    y[1::100] = y[::100][:len(y[1::100])]
+    return 1. - y
+
+
+def run_test(n, m, loop=True):
+    """ Filter an `n` point cloud with `m` objectives. """
+    y = point_cloud(n, m)
+
+    start = time.time()
+    mask = pareto_mask(y)
+    vec_time = time.time() - start
+
+    start = time.time()
+    ranks = nondominated_ranks(y)
+    rank_time = time.time() - start
+    assert ((ranks == 0) == mask).all()
+
+    print '%d points, %d objectives: %d pareto optimal, %d fronts' \
+          % (n, m, mask.sum(), ranks.max()+1)
+    print '    vectorized %g sec, ranks %g sec' % (vec_time, rank_time)
+    sys.stdout.flush()
+
+    if loop:
+        start = time.time()
+        expected = loop_mask(y)
+        loop_time = time.time() - start
+        assert expected == list(mask), \
+               '%d points, %d objectives: pareto sets differ' % (n, m)
+        print '    loop %g sec, speedup %g' % (loop_time, loop_time / vec_time)
+
+
+def main():
+    """ Run timing on 10k and 100k point clouds. The original loop is only
+    timed for 10k points.
+    """
+    random.seed(10)
+    for m in (2, 3, 5):
+        run_test(10000, m)
+        run_test(100000, m, loop='--loop' in sys.argv)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,12 @@
 # pylint: disable-msg=C0111,C0103
 
 import unittest
-from numpy import array
+from numpy import array, column_stack, random
 from openmdao.lib.components.expected_improvement_multiobj import MultiObjExpectedImprovement
 from openmdao.lib.casehandlers.api import CaseSet, ListCaseIterator
 from openmdao.main.uncertain_distributions import NormalDistribution
 from openmdao.main.case import Case
+from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate
 
 class MultiObjExpectedImprovementTests(unittest.TestCase):
     
@@ -77,6 +78,90 @@ class MultiObjExpectedImprovementTests(unittest.TestCase):
         ei.execute()
         self.assertEqual(ei.y_star.all(),array([2,2,2]).all())
         
+    def test_calc_batch(self):
+        ei = MultiObjExpectedImprovement()
+        bests = CaseSet()
+        for y1, y2 in [(1, 10), (2, 5), (4, 2), (8, 1)]:
+            bests.record(Case(outputs=[("y1",y1),("y2",y2)]))
+        ei.best_cases = bests
+        ei.criteria = ["y1","y2"]
+        ei.calc_switch = "EI"
+        mu = [[1., 1.], [3., 4.], [10., 10.], [0., 0.]]
+        sigma = [[1., 1.], [0.5, 2.], [1., 1.], [3., 0.1]]
+        PI, EI = ei.calc_batch(mu, sigma)
+        # reference values from the original one point at a time loops
+        PI_ref = [0.9743569189871184, 0.1686969046511872,
+                  1.7563837872577657e-22, 1.0]
+        EI_ref = [3.0190874485560766, 0.579180567032769,
+                  4.601057719598563, 4.533396364212006]
+        for i in range(len(mu)):
+            self.assertAlmostEqual(PI[i], PI_ref[i], 10)
+            self.assertAlmostEqual(EI[i], EI_ref[i], 10)
+            ei.predicted_values = [NormalDistribution(mu=m,sigma=s)
+                                   for m, s in zip(mu[i], sigma[i])]
+            ei.execute()
+            self.assertAlmostEqual(ei.PI, PI_ref[i], 10)
+            self.assertAlmostEqual(ei.EI, EI_ref[i], 10)
+
+        ei.calc_switch = "PI"
+        PI2, EI2 = ei.calc_batch(mu, sigma)
+        self.assertTrue((PI == PI2).all())
+        self.assertEqual(EI2, None)
+
+    def test_calc_batch_nobj(self):
+        ei = MultiObjExpectedImprovement()
+        bests = CaseSet()
+        for y in [(1, 5, 3), (2, 2, 2), (4, 1, 6), (3, 3, 1)]:
+            bests.record(Case(outputs=zip(["y1","y2","y3"], y)))
+        ei.best_cases = bests
+        ei.criteria = ["y1","y2","y3"]
+
+        # candidate means and sigmas predicted in one call per response
+        X = [[0.], [1.], [2.], [3.], [4.]]
+        candidates = [[0.5], [1.5], [2.5], [3.5], [5.]]
+        mu, sigma = [], []
+        for Y in ([1., 4., 2., 5., 3.], [5., 1., 3., 2., 4.],
+                  [2., 2., 6., 1., 0.]):
+            surrogate = KrigingSurrogate()
+            surrogate.train(X, Y)
+            f, RMSE = surrogate.predict_batch(candidates)
+            mu.append(f)
+            sigma.append(RMSE)
+        mu = column_stack(mu)
+        sigma = column_stack(sigma)
+
+        random.seed(10)
+        PI, EI = ei.calc_batch(mu, sigma)
+        self.assertEqual(EI, None)
+
+        # same samples as evaluating one candidate at a time
+        random.seed(10)
+        for i in range(len(candidates)):
+            ei.predicted_values = [NormalDistribution(mu=m,sigma=s)
+                                   for m, s in zip(mu[i], sigma[i])]
+            ei.execute()
+            self.assertEqual(ei.PI, PI[i])
+
+    def test_best_cases_changed(self):
+        ei = MultiObjExpectedImprovement()
+        bests = CaseSet()
+        bests.record(Case(outputs=[("y1",1),("y2",1),("y3",1)]))
+        ei.best_cases = bests
+        ei.criteria = ['y1','y2','y3']
+        ei.predicted_values = [NormalDistribution(mu=1,sigma=1),
+                               NormalDistribution(mu=1,sigma=1),
+                               NormalDistribution(mu=1,sigma=1)]
+        ei.execute()
+        y_star = ei.y_star
+        ei.execute()
+        self.assertTrue(ei.y_star is y_star)
+
+        bests = CaseSet()
+        bests.record(Case(outputs=[("y1",2),("y2",2),("y3",2)]))
+        ei.best_cases = bests
+        ei.execute()
+        self.assertEqual([[2, 2, 2]], ei.y_star.tolist())
+
     def test_bad_criteria(self):
         ei = MultiObjExpectedImprovement()
         bests = CaseSet()
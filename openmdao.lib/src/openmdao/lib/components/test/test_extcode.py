@@ -7,6 +7,7 @@ import os.path
 import pkg_resources
 import shutil
 import sys
+import tempfile
 import time
 import unittest
 import nose
@@ -90,6 +91,10 @@ class TestCase(unittest.TestCase):
     """ Test the ExternalCode component. """
 
     def setUp(self):
+        # Keep files sent to remote servers out of the user's file cache.
+        self.orig_cache = os.environ.get('OPENMDAO_FILE_CACHE')
+        self.cache_dir = tempfile.mkdtemp()
+        os.environ['OPENMDAO_FILE_CACHE'] = self.cache_dir
         SimulationRoot.chroot(DIRECTORY)
         with open(INP_FILE, 'w') as out:
             out.write(INP_DATA)
@@ -115,6 +120,11 @@ class TestCase(unittest.TestCase):
                 pass
 
         SimulationRoot.chroot(ORIG_DIR)
+        if self.orig_cache is None:
+            del os.environ['OPENMDAO_FILE_CACHE']
+        else:
+            os.environ['OPENMDAO_FILE_CACHE'] = self.orig_cache
+        shutil.rmtree(self.cache_dir, onerror=onerror)
 
     def test_normal(self):
         logging.debug('')
@@ -14,6 +14,7 @@ from openmdao.lib.casehandlers.api import ListCaseIterator
 from openmdao.lib.components.metamodel import MetaModel
 from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate
 from openmdao.lib.surrogatemodels.logistic_regression import LogisticRegression
+from openmdao.lib.surrogatemodels.response_surface import ResponseSurface
 
 from openmdao.util.testutil import assert_rel_error
 
@@ -113,6 +114,21 @@ class Sim(Assembly):
         self.mm.model = Dummy()
 
 
+class CountingSurrogate(ResponseSurface):
+    def __init__(self):
+        super(CountingSurrogate, self).__init__()
+        self.ntrain = 0
+        self.nupdate = 0
+        
+    def train(self, X, Y):
+        self.ntrain += 1
+        super(CountingSurrogate, self).train(X, Y)
+        
+    def update(self, X, Y):
+        self.nupdate += 1
+        super(CountingSurrogate, self).update(X, Y)
+
+
 class MetaModelTestCase(unittest.TestCase):
 
     def test_model_change(self):
@@ -483,6 +499,43 @@ class MetaModelTestCase(unittest.TestCase):
         self.assertTrue(isinstance(metamodel.d,NormalDistribution))
         self.assertTrue(isinstance(metamodel.c,float))
         
+    def test_incremental_training(self):
+        metamodel = MetaModel()
+        metamodel.default_surrogate = ResponseSurface()
+        metamodel.model = Simple()
+        metamodel.sur_c = CountingSurrogate()
+        
+        def train(a, b):
+            metamodel.a = a
+            metamodel.b = b
+            metamodel.train_next = True
+            metamodel.run()
+            
+        for a, b in [(1., 2.), (2., 1.), (3., 5.), (4., 2.), (5., 4.), (6., 1.)]:
+            train(a, b)
+        metamodel.a = 2.5
+        metamodel.b = 3.5
+        metamodel.run()
+        self.assertEqual(metamodel.sur_c.ntrain, 1)
+        self.assertEqual(metamodel.sur_c.nupdate, 0)
+        
+        # one new training point only requires an update
+        train(7., 3.)
+        metamodel.a = 2.5
+        metamodel.b = 3.5
+        metamodel.run()
+        self.assertEqual(metamodel.sur_c.ntrain, 1)
+        self.assertEqual(metamodel.sur_c.nupdate, 1)
+        assert_rel_error(self, metamodel.c, 6., 0.001)
+        
+        # new training data after a reset requires full training
+        metamodel.reset_training_data = True
+        for a, b in [(1., 2.), (2., 1.), (3., 5.)]:
+            train(a, b)
+        metamodel.run()
+        self.assertEqual(metamodel.sur_c.ntrain, 2)
+        self.assertEqual(metamodel.sur_c.nupdate, 1)
+        
     def test_includes(self):
         metamodel = MyMetaModel()
         metamodel.default_surrogate = KrigingSurrogate()
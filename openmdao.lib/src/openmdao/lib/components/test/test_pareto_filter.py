@@ -2,7 +2,10 @@
 
 import unittest
 
-from openmdao.lib.components.pareto_filter import ParetoFilter
+from numpy import array, random
+
+from openmdao.lib.components.pareto_filter import ParetoFilter, pareto_mask, \
+                                                  nondominated_ranks
 from openmdao.lib.casehandlers.api import ListCaseIterator
 from openmdao.main.case import Case
 
@@ -81,6 +84,43 @@ class ParetoFilterTests(unittest.TestCase):
         else: 
             self.fail("expected ValueError")
 
+    def test_ranks(self):
+        pf = ParetoFilter()
+        x = [1,1,2,2,2,3,3,3,]
+        y = [2,3,1,2,3,1,2,3]
+        cases = []
+        for x_0,y_0 in zip(x,y):
+            cases.append(Case(outputs=[("x",x_0),("y",y_0)]))
+
+        pf.case_sets = [ListCaseIterator(cases),]
+        pf.criteria = ['x','y']
+        pf.compute_ranks = True
+        pf.execute()
+
+        self.assertEqual([0, 1, 0, 1, 2, 1, 2, 3], list(pf.ranks))
+        x_p,y_p = zip(*[(case['x'],case['y']) for case in pf.pareto_set])
+        self.assertEqual((1,2),x_p)
+        self.assertEqual((2,1),y_p)
+
+    def test_pareto_mask(self):
+        # compare against the pairwise definition, including duplicates
+        random.seed(10)
+        pf = ParetoFilter()
+        for m in (1, 2, 3, 4):
+            for y in (random.randint(0, 4, (300, m)), random.random((300, m))):
+                expected = [not any(pf._is_dominated(tuple(p), tuple(q))
+                                    for q in y) for p in y]
+                self.assertEqual(expected, list(pareto_mask(y)))
+
+                ranks = nondominated_ranks(y)
+                remaining = array(range(len(y)))
+                rank = 0
+                while len(remaining):
+                    mask = pareto_mask(y[remaining])
+                    self.assertTrue((ranks[remaining[mask]] == rank).all())
+                    remaining = remaining[~mask]
+                    rank += 1
+
         
 if __name__ == "__main__":
     unittest.main()
@@ -7,44 +7,24 @@ try:
 except ImportError as err:
     import logging
     logging.warn("In %s: %r" % (__file__, err))
+
+try:
+    from scipy.sparse import lil_matrix
+    from scipy.sparse.linalg import splu, gmres
+except ImportError as err:
+    import logging
+    logging.warn("In %s: %r" % (__file__, err))
+    lil_matrix = None
     
-from openmdao.lib.datatypes.api import Enum, Bool
-from openmdao.lib.differentiators.chain_rule import ChainRule
+from openmdao.lib.datatypes.api import Enum, Bool, Float
+from openmdao.lib.differentiators.chain_rule import ChainRule, _d_conn
 from openmdao.main.api import Driver, Assembly
 from openmdao.main.driver import Run_Once
 from openmdao.main.interfaces import implements, IDifferentiator, ISolver
 from openmdao.main.mp_support import has_interface
-from openmdao.units import convert_units
 from openmdao.util.decorators import stub_if_missing_deps
 
 
-def _d_conn(expr_txt, target, ascope):
-    """ Evaluates the derivative of a source-target variable connection.
-    This includes the derivative of the expression as well as the
-    derivative of the unit conversion factor."""
-    
-    expr = ascope._exprmapper.get_expr(expr_txt)
-    source = expr.refs().pop()
-        
-    # Need derivative of the expression
-    expr_deriv = expr.evaluate_gradient(scope=ascope,
-                                        wrt=source)
-    
-    # We also need the derivative of the unit
-    # conversion factor if there is one
-    metadata = expr.get_metadata('units')
-    source_unit = [x[1] for x in metadata if x[0] == source]
-    if source_unit and source_unit[0]:
-        dest_expr = ascope._exprmapper.get_expr(target)
-        metadata = dest_expr.get_metadata('units')
-        target_unit = [x[1] for x in metadata if x[0] == target]
-
-        expr_deriv[source] = expr_deriv[source] * \
-            convert_units(1.0, source_unit[0], target_unit[0])
-        
-    return source, expr_deriv
-
-
 @stub_if_missing_deps('numpy')
 class Analytic(ChainRule):
     """ Differentiates a driver's workflow using one of the analytic
@@ -53,8 +33,10 @@ class Analytic(ChainRule):
     implements(IDifferentiator)
     
     # pylint: disable-msg=E1101
-    mode = Enum('direct', ['direct', 'adjoint'], iotype = 'in',
-                 desc='Choose forward or adjoint mode.')
+    mode = Enum('direct', ['direct', 'adjoint', 'auto'], iotype = 'in',
+                 desc='Choose forward or adjoint mode. auto uses adjoint ' + \
+                 'mode when there are fewer objectives and constraints ' + \
+                 'than parameters.')
     
     approach = Enum('functional', ['functional', 'residual', 'hybrid'],
                      iotype = 'in', desc = 'Approach for assembling the ' + \
@@ -66,6 +48,14 @@ class Analytic(ChainRule):
     sparse = Bool(False, iotype = 'in', desc='Set to True for sparse ' + \
                   'storage of matrices.')
     
+    sparse_solver = Enum('splu', ['splu', 'gmres'], iotype = 'in',
+                         desc='Solver for the sparse system. splu - ' + \
+                         'sparse LU factorization; gmres - iterative ' + \
+                         'solution of each right hand side.')
+    
+    sparse_tol = Float(1.0e-10, iotype = 'in', desc='Relative tolerance ' + \
+                       'of the gmres sparse solver.')
+    
     def __init__(self):
         
         super(Analytic, self).__init__()
@@ -83,6 +73,12 @@ class Analytic(ChainRule):
         
         # Bookkeeping index/name
         self.var_list = []
+        self.var_index = {}
+        
+    def _sparse_changed(self):
+        """Matrix storage changed, so force setup to run again."""
+        
+        self.edge_dicts.clear()
         
     def get_derivative(self, output_name, wrt):
         """Returns the derivative of output_name with respect to wrt.
@@ -131,18 +127,28 @@ class Analytic(ChainRule):
         # Count recursively to get n_var and var_list
         self._edge_counter(self._parent, self._parent, index)
         n_var = len(self.var_list)
+        
+        # Row/column of each unknown, in the order _edge_counter found them
+        self.var_index = {}
+        for i_var, name in enumerate(self.var_list):
+            self.var_index.setdefault(name, i_var)
                 
         n_param = len(self.param_names)
         n_eq = len(self.function_names)
         
-        self.LHS = zeros((n_var, n_var), 'd')
-        
-        #if self.mode == 'adjoint':
-        #    self.EQS = zeros((n_var, n_param), 'd')
-        #    self.RHS = zeros((n_var, n_eq), 'd')
-        #else:
-        self.EQS = zeros((n_eq, n_var), 'd')
-        self.RHS = zeros((n_var, n_param), 'd')
+        # Each equation only couples an output to the inputs of its own
+        # component, so the system is as sparse as the dataflow graph.
+        if self.sparse:
+            if lil_matrix is None:
+                msg = "Sparse storage requires scipy."
+                self.raise_exception(msg, RuntimeError)
+            self.LHS = lil_matrix((n_var, n_var))
+            self.EQS = lil_matrix((n_eq, n_var))
+            self.RHS = lil_matrix((n_var, n_param))
+        else:
+            self.LHS = zeros((n_var, n_var), 'd')
+            self.EQS = zeros((n_eq, n_var), 'd')
+            self.RHS = zeros((n_var, n_param), 'd')
             
         self.EQS_zero = zeros((n_eq, n_param), 'd')
         
@@ -164,18 +170,18 @@ class Analytic(ChainRule):
                 if input_name in self.param_names:
                     
                     i_param = self.param_names.index(input_name)
-                    self.EQS_zero[i_eq][i_param] = val
+                    self.EQS_zero[i_eq, i_param] = val
                     
                 elif input_name in self.grouped_param_names:
                         
                     grouped = self.grouped_param_names[input_name]
                     i_param = self.param_names.index(grouped)
-                    self.EQS_zero[i_eq][i_param] = val
+                    self.EQS_zero[i_eq, i_param] = val
                         
-                elif input_name in self.var_list:
+                elif input_name in self.var_index:
                     
-                    i_var = self.var_list.index(input_name)
-                    self.EQS[i_eq][i_var] = val
+                    i_var = self.var_index[input_name]
+                    self.EQS[i_eq, i_var] = val
                     
             i_eq += 1
             
@@ -194,18 +200,18 @@ class Analytic(ChainRule):
                 if input_name in self.param_names:
                     
                     i_param = self.param_names.index(input_name)
-                    self.EQS_zero[i_eq][i_param] += val
+                    self.EQS_zero[i_eq, i_param] += val
                     
                 elif input_name in self.grouped_param_names:
                         
                     grouped = self.grouped_param_names[input_name]
                     i_param = self.param_names.index(grouped)
-                    self.EQS_zero[i_eq][i_param] += val
+                    self.EQS_zero[i_eq, i_param] += val
 
-                elif input_name in self.var_list:
+                elif input_name in self.var_index:
                     
-                    i_var = self.var_list.index(input_name)
-                    self.EQS[i_eq][i_var] += val
+                    i_var = self.var_index[input_name]
+                    self.EQS[i_eq, i_var] += val
                         
             for input_name, val in rhs.iteritems():
                 val = -sign*val
@@ -213,18 +219,18 @@ class Analytic(ChainRule):
                 if input_name in self.param_names:
                     
                     i_param = self.param_names.index(input_name)
-                    self.EQS_zero[i_eq][i_param] += val
+                    self.EQS_zero[i_eq, i_param] += val
                     
                 elif input_name in self.grouped_param_names:
                         
                     grouped = self.grouped_param_names[input_name]
                     i_param = self.param_names.index(grouped)
-                    self.EQS_zero[i_eq][i_param] += val
+                    self.EQS_zero[i_eq, i_param] += val
 
-                elif input_name in self.var_list:
+                elif input_name in self.var_index:
                     
-                    i_var = self.var_list.index(input_name)
-                    self.EQS[i_eq][i_var] += val
+                    i_var = self.var_index[input_name]
+                    self.EQS[i_eq, i_var] += val
                         
             i_eq += 1
         
@@ -382,7 +388,7 @@ class Analytic(ChainRule):
                 # Assembly inputs are unknowns, so they get equations
                 for input_name in edge_dict[0]:
                     
-                    self.LHS[i_eq][i_eq] = 1.0
+                    self.LHS[i_eq, i_eq] = 1.0
                     input_full = "%s.%s" % (node_name, input_name)
                 
                     # Assy input conected to parameter goes in RHS
@@ -390,14 +396,14 @@ class Analytic(ChainRule):
                          
                         i_param = self.param_names.index(input_full)
                          
-                        self.RHS[i_eq][i_param] = 1.0
+                        self.RHS[i_eq, i_param] = 1.0
                          
                     elif input_full in self.grouped_param_names:
                              
                         grouped = self.grouped_param_names[input_full]
                         i_param = self.param_names.index(grouped)
                              
-                        self.RHS[i_eq][i_param] = 1.0
+                        self.RHS[i_eq, i_param] = 1.0
                              
                     # Assy Input connected to other outputs goes in LHS
                     else:
@@ -416,9 +422,9 @@ class Analytic(ChainRule):
                                                      ascope)
                         
                         # Chain together deriv from var connection and comp
-                        i_var = self.var_list.index("%s%s" % (head, source))
+                        i_var = self.var_index["%s%s" % (head, source)]
                          
-                        self.LHS[i_eq][i_var] = -expr_deriv[source]
+                        self.LHS[i_eq, i_var] = -expr_deriv[source]
                  
                     i_eq += 1
                 
@@ -431,7 +437,7 @@ class Analytic(ChainRule):
                 sub_scope = ascope.get(node_name)
                 for output_name in edge_dict[1]:
                     
-                    self.LHS[i_eq][i_eq] = 1.0
+                    self.LHS[i_eq, i_eq] = 1.0
                 
                     sources = sub_scope._depgraph.connections_to(output_name)
                     for connect in sources:
@@ -449,11 +455,11 @@ class Analytic(ChainRule):
                                                  sub_scope)
                     
                     # Chain together deriv from var connection and comp
-                    i_var = self.var_list.index("%s%s.%s" % (head, 
+                    i_var = self.var_index["%s%s.%s" % (head, 
                                                              node_name, 
-                                                             source))
+                                                             source)]
                      
-                    self.LHS[i_eq][i_var] = -expr_deriv[source]
+                    self.LHS[i_eq, i_var] = -expr_deriv[source]
                  
                     i_eq += 1
                 
@@ -495,14 +501,14 @@ class Analytic(ChainRule):
                                                      ascope)
                         
                         # Chain together deriv from var connection and comp
-                        i_var = self.var_list.index("%s%s" % (head, source))
+                        i_var = self.var_index["%s%s" % (head, source)]
                          
                         conn_data[input_full] = (i_var, expr_deriv[source])
     
                 # Each output gives us an equation
                 for output_name in edge_dict[1]:
                      
-                    self.LHS[i_eq][i_eq] = 1.0
+                    self.LHS[i_eq, i_eq] = 1.0
                      
                     if fdblock:
                         local_out = "%s.%s" % (item, output_name)
@@ -523,7 +529,7 @@ class Analytic(ChainRule):
                              
                             i_param = self.param_names.index(input_full)
                              
-                            self.RHS[i_eq][i_param] = \
+                            self.RHS[i_eq, i_param] = \
                                 local_derivs[local_out][local_in]
                              
                         elif input_full in self.grouped_param_names:
@@ -531,16 +537,16 @@ class Analytic(ChainRule):
                             grouped = self.grouped_param_names[input_full]
                             i_param = self.param_names.index(grouped)
                                  
-                            self.RHS[i_eq][i_param] = \
+                            self.RHS[i_eq, i_param] = \
                                 local_derivs[local_out][local_in]
                                  
                         # Input is a dependent in a solver loop
                         elif input_full in solver_conns:
                             
                             source = solver_conns[input_full]
-                            i_dep = self.var_list.index(source)
+                            i_dep = self.var_index[source]
                              
-                            self.LHS[i_eq][i_dep] = \
+                            self.LHS[i_eq, i_dep] = \
                                 -local_derivs[local_out][local_in]
                             
                         # Input connected to other outputs goes in LHS
@@ -550,7 +556,7 @@ class Analytic(ChainRule):
                             i_var = conn_data[input_full][0]
                             expr_deriv = conn_data[input_full][1]
                             
-                            self.LHS[i_eq][i_var] = \
+                            self.LHS[i_eq, i_var] = \
                                 -local_derivs[local_out][local_in] * \
                                  expr_deriv
                      
@@ -563,12 +569,53 @@ class Analytic(ChainRule):
         
         Direct mode: solves for dy/d(param)
         Adjoint mode: solves for d(obj,constr)/dx
+        Auto mode: adjoint if there are fewer functions than parameters
         """
         
-        if self.mode == 'adjoint':
+        n_eq, n_param = self.EQS_zero.shape
+        adjoint = self.mode == 'adjoint' or \
+                  (self.mode == 'auto' and n_eq < n_param)
+        
+        if self.sparse:
+            self._solve_sparse(adjoint)
+        elif adjoint:
             total_derivs = linalg.solve(self.LHS.T, self.EQS.T)
             self.gradient = self.EQS_zero + dot(total_derivs.T, self.RHS)
         else:
             total_derivs = linalg.solve(self.LHS, self.RHS)
             self.gradient = self.EQS_zero + dot(self.EQS, total_derivs)
+            
+    def _solve_sparse(self, adjoint):
+        """Solve the sparse linear system. The LHS is factored (or iterated
+        on) once for every column of the smaller of RHS and EQS.T."""
+        
+        if self.LHS.shape[0] == 0:
+            self.gradient = self.EQS_zero.copy()
+            return
+        
+        if adjoint:
+            total_derivs = self._sparse_solve(self.LHS.T.tocsc(),
+                                              self.EQS.T.toarray())
+            self.gradient = self.EQS_zero + \
+                            self.RHS.T.tocsr().dot(total_derivs).T
+        else:
+            total_derivs = self._sparse_solve(self.LHS.tocsc(),
+                                              self.RHS.toarray())
+            self.gradient = self.EQS_zero + \
+                            self.EQS.tocsr().dot(total_derivs)
+            
+    def _sparse_solve(self, A, B):
+        """Returns the solution of A*X = B for sparse A and dense B."""
+        
+        if self.sparse_solver == 'splu':
+            return splu(A).solve(B)
+        
+        X = zeros(B.shape, 'd')
+        for j in range(B.shape[1]):
+            X[:, j], info = gmres(A, B[:, j], tol=self.sparse_tol)
+            if info != 0:
+                msg = "gmres did not converge (info = %d)." % info
+                self.raise_exception(msg, RuntimeError)
+                
+        return X
         
@@ -6,7 +6,7 @@ from ordereddict import OrderedDict
 
 # pylint: disable-msg=E0611,F0401
 
-from openmdao.lib.datatypes.api import Float
+from openmdao.lib.datatypes.api import Float, Enum
 from openmdao.lib.differentiators.fd_helper import FDhelper
 from openmdao.main.api import Driver, Assembly, Container
 from openmdao.main.container import find_name
@@ -16,6 +16,34 @@ from openmdao.main.mp_support import has_interface
 from openmdao.main.numpy_fallback import array
 from openmdao.units import convert_units
 
+
+def _d_conn(expr_txt, target, ascope):
+    """ Evaluates the derivative of a source-target variable connection.
+    This includes the derivative of the expression as well as the
+    derivative of the unit conversion factor."""
+    
+    expr = ascope._exprmapper.get_expr(expr_txt)
+    source = expr.refs().pop()
+        
+    # Need derivative of the expression
+    expr_deriv = expr.evaluate_gradient(scope=ascope,
+                                        wrt=source)
+    
+    # We also need the derivative of the unit
+    # conversion factor if there is one
+    metadata = expr.get_metadata('units')
+    source_unit = [x[1] for x in metadata if x[0] == source]
+    if source_unit and source_unit[0]:
+        dest_expr = ascope._exprmapper.get_expr(target)
+        metadata = dest_expr.get_metadata('units')
+        target_unit = [x[1] for x in metadata if x[0] == target]
+
+        expr_deriv[source] = expr_deriv[source] * \
+            convert_units(1.0, source_unit[0], target_unit[0])
+        
+    return source, expr_deriv
+
+
 class ChainRule(Container):
     """ Differentiates a driver's workflow using the Chain Rule with Numerical
     Derivatives (CRND) method."""
@@ -27,6 +55,11 @@ class ChainRule(Container):
     default_stepsize = Float(1.0e-6, iotype='in', desc='Default finite ' + \
                              'difference step size.')
     
+    mode = Enum('auto', ['direct', 'adjoint', 'auto'], iotype='in',
+                desc='Choose forward or adjoint mode. auto uses adjoint ' + \
+                'mode when there are fewer objectives and constraints ' + \
+                'than parameters.')
+    
     def __init__(self):
 
         super(ChainRule, self).__init__()
@@ -418,6 +451,11 @@ class ChainRule(Container):
             for name in self.param_names:
                 self.gradient[name] = {}
         
+        if self.mode == 'adjoint' or (self.mode == 'auto' and \
+           len(self.function_names) < len(self.param_names)):
+            self._calc_gradient_adjoint()
+            return
+        
         # Determine gradient of model outputs wrt each parameter
         for wrt in self.param_names:
                     
@@ -431,52 +469,46 @@ class ChainRule(Container):
             # Find derivatives for all component outputs in the workflow
             self._chain_workflow(derivs, self._parent, wrt)
 
-            # Calculate derivative of the objectives.
-            for obj_name, expr in self._parent.get_objectives().iteritems():
-            
-                obj_grad = expr.evaluate_gradient(scope=self._parent.parent,
-                                                  wrt=derivs.keys())
-                obj_deriv = 0.0
-                for input_name, val in obj_grad.iteritems():
-                    obj_deriv += val*derivs[input_name]
-                    
-                self.gradient[wrt][obj_name] = obj_deriv
-                
-            # Calculate derivatives of the constraints.
-            for con_name, constraint in \
-                self._parent.get_constraints().iteritems():
-                
-                lhs, rhs, comparator, _ = \
-                    constraint.evaluate_gradient(scope=self._parent.parent,
-                                                 wrt=derivs.keys())
+            # Calculate derivatives of the objectives and constraints.
+            for name, grad in \
+                self._function_gradients(derivs.keys()).iteritems():
                 
-                con_deriv = 0.0
-                con_vals = {}
-                if '>' in comparator:
-                    for input_name, val in lhs.iteritems():
-                        con_vals[input_name] = -val
-                        
-                    for input_name, val in rhs.iteritems():
-                        if input_name in con_vals:
-                            con_vals[input_name] += val
-                        else:
-                            con_vals[input_name] = val
-                            
-                else:
-                    for input_name, val in lhs.iteritems():
-                        con_vals[input_name] = val
-                        
-                    for input_name, val in rhs.iteritems():
-                        if input_name in con_vals:
-                            con_vals[input_name] -= val
-                        else:
-                            con_vals[input_name] = val
-
-                for input_name, val in con_vals.iteritems():
-                    con_deriv += val*derivs[input_name]
+                func_deriv = 0.0
+                for input_name, val in grad.iteritems():
+                    func_deriv += val*derivs[input_name]
                     
-                self.gradient[wrt][con_name] = con_deriv
+                self.gradient[wrt][name] = func_deriv
 
+    def _function_gradients(self, wrt):
+        """Returns a dictionary containing the gradient of each objective
+        and constraint with respect to the variables in wrt. Constraints are
+        differentiated in the form lhs-rhs for '<' and '=', and rhs-lhs for
+        '>'."""
+        
+        grads = {}
+        ascope = self._parent.parent
+        
+        for obj_name, expr in self._parent.get_objectives().iteritems():
+            grads[obj_name] = expr.evaluate_gradient(scope=ascope, wrt=wrt)
+            
+        for con_name, constraint in self._parent.get_constraints().iteritems():
+            
+            lhs, rhs, comparator, _ = \
+                constraint.evaluate_gradient(scope=ascope, wrt=wrt)
+            
+            sign = -1.0 if '>' in comparator else 1.0
+            
+            con_vals = {}
+            for input_name, val in lhs.iteritems():
+                con_vals[input_name] = sign*val
+                
+            for input_name, val in rhs.iteritems():
+                con_vals[input_name] = con_vals.get(input_name, 0.0) - sign*val
+                
+            grads[con_name] = con_vals
+            
+        return grads
+        
     def _chain_workflow(self, derivs, scope, param):
         """Process a workflow calculating all intermediate derivatives
         using the chain rule. This can be called recursively to handle
@@ -560,7 +592,7 @@ class ChainRule(Container):
                         incoming_derivs[full_name] = derivs[full_name]
                         
                     # Do nothing for inputs connected to the other params
-                    elif full_name in self.param_names:
+                    elif self._is_param(full_name):
                         pass
                     
                     # Inputs who are connected to something with a derivative
@@ -718,6 +750,188 @@ class ChainRule(Container):
                 upscope_derivs[target] = value
 
 
+    def _calc_gradient_adjoint(self):
+        """Calculates the gradient in adjoint (reverse) mode. The workflow is
+        linearized once, and then the sensitivity of each objective and
+        constraint is propagated backwards through it, so the cost scales
+        with the number of outputs instead of the number of parameters."""
+        
+        edges = []
+        self._linearize_workflow(edges, self._parent)
+        
+        wrt = set(self.param_names).union(self.grouped_param_names)
+        for target, source, _ in edges:
+            wrt.add(target)
+            wrt.add(source)
+        
+        for name, grad in self._function_gradients(list(wrt)).iteritems():
+            
+            # Edges were stored in execution order, so in reverse order the
+            # sensitivity of each target is complete before we pass it on.
+            sens = dict(grad)
+            for target, source, val in reversed(edges):
+                if target in sens:
+                    sens[source] = sens.get(source, 0.0) + sens[target]*val
+                    
+            for param in self.param_names:
+                self.gradient[param][name] = sens.get(param, 0.0)
+                
+            for grouped, base in self.grouped_param_names.iteritems():
+                self.gradient[base][name] += sens.get(grouped, 0.0)
+        
+    def _is_param(self, name):
+        """Returns True if name is a parameter or part of a parameter
+        group."""
+        
+        return name in self.param_names or name in self.grouped_param_names
+        
+    def _linearize_workflow(self, edges, scope, head=''):
+        """Appends a (target, source, derivative) tuple to edges for every
+        connection and every component input-output pair in the workflow,
+        in execution order. Names are relative to the driver's assembly,
+        with head prepended for nested assemblies. This can be called
+        recursively to handle nested assemblies."""
+        
+        # Figure out what outputs we need
+        scope_name = scope.get_pathname()
+        if scope_name not in self.edge_dicts:
+            self._find_edges(scope, scope)
+
+        # Loop through each comp in the workflow
+        for node_names in self.dworkflow[scope_name]:
+    
+            # If it's a list, then it's a set of components to finite
+            # difference together.
+            if not isinstance(node_names, list):
+                node = scope.parent.get(node_names)
+                fdblock = False
+                node_names = [node_names]
+            else:
+                fdblock = True
+    
+            # Finite difference block
+            if fdblock:
+                
+                fd = self.fdhelpers[scope_name][str(node_names)]
+                
+                input_dict = {}
+                for item in fd.list_wrt():
+                    input_dict[item] = scope.parent.get(item)
+                    
+                output_dict = {}
+                for item in fd.list_outs():
+                    output_dict[item] = scope.parent.get(item)
+                        
+                local_derivs = fd.run(input_dict, output_dict)
+            
+            # We don't handle nested drivers.
+            elif isinstance(node, Driver):
+                raise NotImplementedError('Nested drivers')
+            
+            # Recurse into assemblies.
+            elif isinstance(node, Assembly):
+                
+                if not isinstance(node.driver, Run_Once):
+                    raise NotImplementedError('Nested drivers')
+                
+                self._linearize_assy(edges, node, head)
+                continue
+                                     
+            # This component can determine its derivatives.
+            elif hasattr(node, 'calculate_first_derivatives'):
+                
+                node.calc_derivatives(first=True)
+                
+                local_derivs = node.derivatives.first_derivatives
+                
+            for node_name in node_names:
+            
+                node = scope.parent.get(node_name)
+                ascope = node.parent
+                
+                local_inputs = self.edge_dicts[scope_name][node_name][0]
+                local_outputs = self.edge_dicts[scope_name][node_name][1]
+                
+                # Connections into this component. Parameters are where
+                # the propagation stops.
+                for input_name in local_inputs:
+                    
+                    full_name = '.'.join([node_name, input_name])
+                    if self._is_param(head + full_name):
+                        continue
+                
+                    sources = ascope._depgraph.connections_to(full_name)
+                    expr_txt = sources[0][0]
+                    target = sources[0][1]
+                    
+                    # Variables on an assembly boundary
+                    if expr_txt[0:4] == '@bin':
+                        expr_txt = expr_txt.replace('@bin.', '')
+                        
+                    source, expr_deriv = _d_conn(expr_txt, target, ascope)
+                    edges.append((head + full_name, head + source,
+                                  expr_deriv[source]))
+                    
+                # Derivatives of each output wrt each input
+                for output_name in local_outputs:
+                    
+                    full_output_name = '.'.join([node_name, output_name])
+                    
+                    if fdblock:
+                        local_out = full_output_name
+                    else:
+                        local_out = output_name
+                    
+                    for input_name in local_inputs:
+                        
+                        full_input_name = '.'.join([node_name, input_name])
+                        if fdblock:
+                            local_in = full_input_name
+                        else:
+                            local_in = input_name
+                        
+                        edges.append((head + full_output_name,
+                                      head + full_input_name,
+                                      local_derivs[local_out][local_in]))
+                            
+    def _linearize_assy(self, edges, scope, head):
+        """Linearizes a nested assembly, including the connections on its
+        boundary."""
+        
+        inner = '%s%s.' % (head, scope.name)
+        
+        # Connections into the assembly boundary
+        for item in scope._depgraph.var_edges('@xin'):
+            src_expr = item[0].replace('@xin.','')
+            dest = item[1].split('.')[1]
+            
+            src, expr_deriv = _d_conn(src_expr, dest, scope)
+            upscope_src = src.replace('parent.','')
+            
+            if not self._is_param(inner + dest):
+                edges.append((inner + dest, head + upscope_src,
+                              expr_deriv[src]))
+        
+        self._linearize_workflow(edges, scope.driver, inner)
+        
+        # Connections out of the assembly boundary. Connections that bypass
+        # the boundary need nothing, since inner names are already upscoped.
+        for item in scope._depgraph.var_in_edges('@bout'):
+            src = item[0]
+            dest = item[1]
+            
+            if dest.count('.') < 2:
+                
+                dest = dest.replace('@bout.','')
+                
+                expr_txt = scope._depgraph.get_source(dest)
+                expr = scope._exprmapper.get_expr(expr_txt)
+                expr_deriv = expr.evaluate_gradient(scope=scope,
+                                                    wrt=src)
+                
+                edges.append((inner + dest, inner + src, expr_deriv[src]))
+
+
     def calc_hessian(self, reuse_first=False):
         """Returns the Hessian matrix for all outputs in the Driver's
         workflow.
@@ -3,16 +3,20 @@ Derivatives (FDAD) method.
 
 A variety of difference types are available for both first and second order."""
 
+import copy
 import logging
 from ordereddict import OrderedDict
 from itertools import product
 
-from openmdao.main.numpy_fallback import array
+from openmdao.main.numpy_fallback import array, ndarray
 
-from openmdao.lib.datatypes.api import Enum, Float
-from openmdao.main.api import Container
+from openmdao.lib.datatypes.api import Bool, Enum, Float
+from openmdao.main.api import Container, Case
 from openmdao.main.interfaces import implements, IDifferentiator
 from openmdao.main.container import find_name
+from openmdao.main.hasparameters import ParameterGroup
+from openmdao.lib.casehandlers.api import ListCaseRecorder
+from openmdao.lib.drivers.caseiterdriver import CaseIterDriverBase
 
 
 def diff_1st_central(fp, fm, eps):
@@ -36,6 +40,29 @@ def diff_2nd_xy(fpp, fpm, fmp, fmm, eps1, eps2):
     return (fpp - fpm - fmp + fmm)/(4.0*eps1*eps2)
 
 
+class _StepCaseDriver(CaseIterDriverBase):
+    """ Evaluates a list of finite difference step cases concurrently, on
+    replicas of the model obtained from the
+    :class:`ResourceAllocationManager`. """
+    
+    def __init__(self):
+        super(_StepCaseDriver, self).__init__()
+        self.sequential = False
+        self.cases = []
+        
+    def get_case_iterator(self):
+        """Returns a new iterator over the step cases."""
+        return iter(self.cases)
+
+
+def _changed(old, new):
+    """ Returns True if input value `new` differs from `old`. """
+    try:
+        return bool(old != new)
+    except ValueError:  # Multi-element array.
+        return bool((old != new).any())
+
+
 class FiniteDifference(Container):
     """ Differentiates a driver's workflow using the Finite Difference with
     Analytical Derivatives (FDAD) method. A variety of difference types are
@@ -50,6 +77,18 @@ class FiniteDifference(Container):
     default_stepsize = Float(1.0e-6, iotype='in', desc='Default finite ' + \
                              'difference step size.')
     
+    sequential = Bool(True, iotype='in', desc='If True, evaluate the ' + \
+                      'finite difference steps sequentially. Otherwise ' + \
+                      'they are evaluated concurrently on replicas of the ' + \
+                      'model, in which components are always executed ' + \
+                      'rather than using their analytic derivatives.')
+    
+    server_idle_timeout = Float(60., low=0., iotype='in', units='s',
+                                desc='When not sequential, servers (with the'
+                                     ' model loaded) are kept for reuse by'
+                                     ' following calculations, and released'
+                                     ' after being idle this long.')
+    
     def __init__(self):
         
         super(FiniteDifference, self).__init__()
@@ -69,11 +108,43 @@ class FiniteDifference(Container):
         self.hessian_offdiag_case = OrderedDict()
         self.hessian = {}
         
+        # Concurrent evaluation. The step driver and its replica of the
+        # model are kept until the configuration changes.
+        self._step_driver = None
+        self._step_config = None
+        self._step_values = {}  # Input values saved in the replica.
+        self._step_changed = set()  # Inputs which differ from the replica.
+        
+    def __getstate__(self):
+        """Return dict representing this container's state."""
+        state = super(FiniteDifference, self).__getstate__()
+        state['_step_driver'] = None
+        state['_step_config'] = None
+        state['_step_values'] = {}
+        state['_step_changed'] = set()
+        return state
+    
+    def config_changed(self):
+        """Called by our driver when its configuration changes, so the
+        replica used for concurrent evaluation gets rebuilt."""
+        self._step_config = None
+        
+    def pre_delete(self):
+        """Remove the replica used for concurrent evaluation."""
+        super(FiniteDifference, self).pre_delete()
+        if self._step_driver is not None:
+            self._step_driver._cleanup()
+            self._step_driver = None
+            self._step_config = None
+        
     def setup(self):
         """Sets some dimensions."""
 
         self.param_names = self._parent.get_parameters().keys()
-        self.objective_names = self._parent.get_objectives().keys()
+        try:
+            self.objective_names = self._parent.get_objectives().keys()
+        except AttributeError:
+            self.objective_names = []
         
         try:
             self.ineqconst_names = self._parent.get_ineq_constraints().keys()
@@ -197,14 +268,14 @@ class FiniteDifference(Container):
             self.gradient_case[param] = pcase
             
         # Run all "cases".
-        # TODO - Integrate OpenMDAO's concurrent processing capability once it
-        # is formalized. This operation is inherently paralellizable.
+        pcases = []
         for key, case in self.gradient_case.iteritems():
             for ipcase, pcase in enumerate(case):
                 if deltas[ipcase]:
-                    pcase['data'] = self._run_point(pcase['param'])
+                    pcases.append(pcase)
                 else:
                     pcase['data'] = base_data
+        self._run_cases(pcases)
                 
         
         # Calculate gradients
@@ -313,8 +384,7 @@ class FiniteDifference(Container):
             self.hessian_offdiag_case[param1] = offdiag
             
         # Run all "cases".
-        # TODO - Integrate OpenMDAO's concurrent processing capability once it
-        # is formalized. This operation is inherently paralellizable.
+        pcases = []
         
         # We don't need to re-run on-diag cases if the gradients were
         # calculated with Central Difference.
@@ -328,15 +398,14 @@ class FiniteDifference(Container):
                     pcase['data'] = gradient_ipcase['data'] 
         else:
             for case in self.hessian_ondiag_case.values():
-                for pcase in case:
-                    data = self._run_point(pcase['param'])
-                    pcase['data'] = data
+                pcases.extend(case)
 
         # Off-diag cases must always be run.
         for cases in self.hessian_offdiag_case.values():
             for case in cases.values():
-                for pcase in case:
-                    pcase['data'] = self._run_point(pcase['param'])
+                pcases.extend(case)
+                
+        self._run_cases(pcases)
 
                     
         # Calculate Hessians - On Diagonal
@@ -376,6 +445,127 @@ class FiniteDifference(Container):
                         self.hessian[key1][key2][name]
                     
     
+    def _run_cases(self, pcases):
+        """Runs the model at the 'param' point of each of the given cases and
+        stores the results as its 'data'. The points are evaluated
+        concurrently unless `sequential` is True."""
+        
+        if self.sequential or not pcases:
+            for pcase in pcases:
+                pcase['data'] = self._run_point(pcase['param'])
+            return
+        
+        driver = self._parent
+        scope = driver.parent
+        objectives = OrderedDict()
+        if self.objective_names:
+            objectives.update(driver.get_objectives())
+        constraints = OrderedDict()
+        if self.ineqconst_names:
+            constraints.update(driver.get_ineq_constraints())
+        if self.eqconst_names:
+            constraints.update(driver.get_eq_constraints())
+            
+        outputs = [item.text for item in objectives.values()]
+        for item in constraints.values():
+            outputs.extend([item.lhs.text, item.rhs.text])
+        outputs = list(set(outputs))
+        
+        targets = []
+        for param in driver.get_parameters().values():
+            if isinstance(param, ParameterGroup):
+                targets.extend([prm.target for prm in param._params])
+            else:
+                targets.append(param.target)
+        config = (tuple(driver.workflow.get_names()), tuple(targets),
+                  tuple(outputs))
+        values = self._get_step_values(scope, driver.iteration_set(),
+                                       set(targets))
+
+        step_driver = self._step_driver
+        replicate = step_driver is None or config != self._step_config
+        if replicate:
+            if step_driver is not None:
+                step_driver._cleanup()
+            # The step driver is not added to the model, so it doesn't end
+            # up in the replica. Cases set all parameters, so the replica
+            # doesn't need to be reloaded between them.
+            step_driver = _StepCaseDriver()
+            step_driver.name = '%s_fd' % driver.name
+            step_driver.parent = scope
+            step_driver.reload_model = False
+            step_driver.workflow.add(driver.workflow.get_names())
+            self._step_driver = step_driver
+            self._step_config = config
+            self._step_values = values
+            self._step_changed = set()
+        else:
+            # Send inputs which have changed since the replica was saved.
+            # Servers keep their model between calls, so once sent an input
+            # is always sent.
+            for path, val in values.items():
+                if path not in self._step_values or \
+                   _changed(self._step_values[path], val):
+                    self._step_changed.add(path)
+        changed = dict([(path, values[path]) for path in self._step_changed
+                                             if path in values])
+        
+        cases = []
+        for pcase in pcases:
+            case = Case(outputs=outputs, parent_uuid=driver._case_id)
+            for val, param in zip(pcase['param'].values(),
+                                  driver.get_parameters().values()):
+                if isinstance(param, ParameterGroup):
+                    params = param._params
+                else:
+                    params = [param]
+                for prm in params:
+                    case.add_input(prm.target, prm._transform(val))
+            for path, val in changed.items():
+                case.add_input(path, val)
+            cases.append(case)
+            
+        step_driver.server_idle_timeout = self.server_idle_timeout
+        step_driver._case_id = driver._case_id
+        step_driver.cases = cases
+        step_driver.recorders = [ListCaseRecorder()]
+        step_driver.setup(replicate=replicate)
+        step_driver.resume(remove_egg=False)
+            
+        for pcase, case in zip(pcases, cases):
+            if case.msg:
+                self.raise_exception('finite difference step case %s failed: %s'
+                                     % (case.uuid, case.msg), RuntimeError)
+            data = {}
+            for key, item in objectives.iteritems():
+                data[key] = case[item.text]
+            for key, item in constraints.iteritems():
+                lhs = (case[item.lhs.text] + item.adder)*item.scaler
+                rhs = (case[item.rhs.text] + item.adder)*item.scaler
+                if '>' in item.comparator:
+                    data[key] = rhs-lhs
+                else:
+                    data[key] = lhs-rhs
+            pcase['data'] = data
+    
+    def _get_step_values(self, scope, comps, targets):
+        """Returns copies of the values of inputs which may differ from
+        those in the replica, excluding parameter `targets`."""
+        values = {}
+        for name in scope.list_inputs():
+            values[name] = getattr(scope, name)
+        for comp in comps:
+            for name in comp.list_inputs(connected=False):
+                path = '%s.%s' % (comp.name, name)
+                if path not in targets:
+                    values[path] = comp.get(name)
+        for path, val in values.items():
+            if isinstance(val, (int, long, float, basestring, ndarray)):
+                values[path] = copy.copy(val)
+            else:
+                del values[path]
+        return values
+    
     def _run_point(self, data_param):
         """Runs the model at a single point and captures the results. Note that 
         some differences require the baseline point."""
@@ -390,8 +580,9 @@ class FiniteDifference(Container):
         data = {}
 
         # Get Objectives
-        for key, item in self._parent.get_objectives().iteritems():
-            data[key] = item.evaluate(self._parent.parent)
+        if self.objective_names:
+            for key, item in self._parent.get_objectives().iteritems():
+                data[key] = item.evaluate(self._parent.parent)
 
         # Get Inequality Constraints
         if self.ineqconst_names:
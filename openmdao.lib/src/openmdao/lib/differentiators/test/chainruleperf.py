@@ -0,0 +1,170 @@
+"""
+Compare direct and adjoint mode of the ChainRule differentiator on the
+scalable problem of openmdao.lib.optproblems.scalable, which has many more
+design variables than objectives and constraints.
+
+The disciplines here evaluate the same equations as
+openmdao.lib.optproblems.scalable.Discipline, but with scalar variables and
+analytic derivatives, since the chain rule differentiates scalar variables.
+The coupling loop is opened (each discipline feeds the next) because
+ChainRule doesn't support nested solvers.
+"""
+
+import sys
+import time
+
+from openmdao.lib.datatypes.api import Float
+from openmdao.lib.differentiators.chain_rule import ChainRule
+from openmdao.main.api import ComponentWithDerivatives, Assembly, set_as_top
+from openmdao.main.driver_uses_derivatives import DriverUsesDerivatives
+from openmdao.main.hasconstraints import HasConstraints
+from openmdao.main.hasobjective import HasObjectives
+from openmdao.main.hasparameters import HasParameters
+from openmdao.util.decorators import add_delegate
+
+
+class ScalarDiscipline(ComponentWithDerivatives):
+    """ Evaluates y_out = -1/c_y_out*(C_z*z + C_x*x - C_y*y_in), with C_z
+    and C_x all ones and C_y the identity, as in the scalable Discipline.
+    """
+
+    def __init__(self, prob_size, c_y_out):
+        super(ScalarDiscipline, self).__init__()
+
+        self.prob_size = prob_size
+        self.c_y_out = c_y_out
+
+        for i in range(prob_size):
+            self.add_trait('z%d' % i, Float(0.0, iotype='in'))
+            self.add_trait('x%d' % i, Float(0.0, iotype='in'))
+            self.add_trait('y_in%d' % i, Float(0.0, iotype='in'))
+            self.add_trait('y_out%d' % i, Float(0.0, iotype='out'))
+
+        for i in range(prob_size):
+            for j in range(prob_size):
+                self.derivatives.declare_first_derivative('y_out%d' % i,
+                                                          'z%d' % j)
+                self.derivatives.declare_first_derivative('y_out%d' % i,
+                                                          'x%d' % j)
+            self.derivatives.declare_first_derivative('y_out%d' % i,
+                                                      'y_in%d' % i)
+
+    def execute(self):
+        """ Evaluates the discipline. """
+
+        zsum = sum([getattr(self, 'z%d' % j) for j in range(self.prob_size)])
+        xsum = sum([getattr(self, 'x%d' % j) for j in range(self.prob_size)])
+
+        for i in range(self.prob_size):
+            y_in = getattr(self, 'y_in%d' % i)
+            setattr(self, 'y_out%d' % i, -(zsum + xsum - y_in)/self.c_y_out)
+
+    def calculate_first_derivatives(self):
+        """ Analytical first derivatives. """
+
+        for i in range(self.prob_size):
+            for j in range(self.prob_size):
+                self.derivatives.set_first_derivative('y_out%d' % i,
+                                                      'z%d' % j,
+                                                      -1.0/self.c_y_out)
+                self.derivatives.set_first_derivative('y_out%d' % i,
+                                                      'x%d' % j,
+                                                      -1.0/self.c_y_out)
+            self.derivatives.set_first_derivative('y_out%d' % i,
+                                                  'y_in%d' % i,
+                                                  1.0/self.c_y_out)
+
+
+@add_delegate(HasParameters, HasObjectives, HasConstraints)
+class Driv(DriverUsesDerivatives):
+    """ Driver that just runs the workflow. """
+
+    def execute(self):
+        """ Runs the workflow once. """
+        self.run_iteration()
+
+
+def scalable(n_disciplines, prob_size):
+    """ Returns the scalable problem with the given number of disciplines
+    and variables per discipline.
+    """
+
+    top = set_as_top(Assembly())
+    top.add('driver', Driv())
+    top.driver.differentiator = ChainRule()
+
+    names = []
+    for i in range(n_disciplines):
+        name = 'd%d' % i
+        top.add(name, ScalarDiscipline(prob_size, float(n_disciplines)))
+        names.append(name)
+
+        for j in range(prob_size):
+            top.driver.add_parameter('%s.x%d' % (name, j), low=-10, high=10)
+            top.set('%s.x%d' % (name, j), -1.0)
+
+        if i > 0:
+            for j in range(prob_size):
+                top.connect('%s.y_out%d' % (names[i-1], j),
+                            '%s.y_in%d' % (name, j))
+
+    top.driver.workflow.add(names)
+
+    for j in range(prob_size):
+        params = ['%s.z%d' % (name, j) for name in names]
+        top.driver.add_parameter(params, low=-10, high=10)
+        for param in params:
+            top.set(param, -1.0)
+
+    parts = ['d0.z%d**2' % j for j in range(prob_size)]
+    for name in names:
+        parts += ['%s.y_out%d**2' % (name, j) for j in range(prob_size)]
+    top.driver.add_objective('+'.join(parts))
+
+    # Only the last discipline is constrained, so that there are just a
+    # handful of outputs.
+    for j in range(prob_size):
+        top.driver.add_constraint('1-%s.y_out%d <= 0' % (names[-1], j))
+
+    return top
+
+
+def run_test(n_disciplines, prob_size):
+    """ Time both modes and check that they give the same gradient. """
+
+    top = scalable(n_disciplines, prob_size)
+    top.run()
+    diff = top.driver.differentiator
+    n_param = len(top.driver.get_parameters())
+    n_func = len(top.driver.get_objectives()) + \
+             len(top.driver.get_constraints())
+
+    grads = {}
+    times = {}
+    for mode in ['direct', 'adjoint']:
+        diff.mode = mode
+        start = time.time()
+        diff.calc_gradient()
+        times[mode] = time.time() - start
+        grads[mode] = dict([(name, diff.get_gradient(name))
+                            for name in diff.function_names])
+
+    for name in diff.function_names:
+        err = abs(grads['direct'][name] - grads['adjoint'][name]).max()
+        assert err < 1e-8, '%s: direct and adjoint differ by %g' % (name, err)
+
+    print '%d parameters, %d functions' % (n_param, n_func)
+    print '    direct %g sec, adjoint %g sec, speedup %g' \
+          % (times['direct'], times['adjoint'],
+             times['direct'] / times['adjoint'])
+    sys.stdout.flush()
+
+
+def main():
+    """ Run timing for 40 to 420 parameters. """
+    for n_disciplines, prob_size in [(3, 10), (10, 10), (20, 20)]:
+        run_test(n_disciplines, prob_size)
+
+
+if __name__ == '__main__':
+    main()
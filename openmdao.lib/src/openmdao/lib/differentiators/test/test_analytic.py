@@ -190,7 +190,36 @@ class AnalyticTestCase(unittest.TestCase):
         self.assertEqual(len(grad), 2)
         assert_rel_error(self, grad[0], 7.0, .001)
         assert_rel_error(self, grad[1], 16.0, .001)
-        
+
+    def test_simple_sparse(self):
+
+        self.model.comp.x = 1.0
+        self.model.comp.u = 1.0
+        self.model.run()
+
+        self.model.driver.differentiator.sparse = True
+        for mode in ['direct', 'adjoint', 'auto']:
+            for solver in ['splu', 'gmres']:
+                self.model.driver.differentiator.mode = mode
+                self.model.driver.differentiator.sparse_solver = solver
+                self.model.driver.differentiator.calc_gradient()
+
+                grad = self.model.driver.differentiator.get_gradient('comp.y')
+                assert_rel_error(self, grad[0], 6.0, .001)
+                assert_rel_error(self, grad[1], 13.0, .001)
+
+                grad = self.model.driver.differentiator.get_gradient('comp.v')
+                assert_rel_error(self, grad[0], 3.0, .001)
+                assert_rel_error(self, grad[1], 2.0, .001)
+
+                grad = self.model.driver.differentiator.get_gradient('Con1')
+                assert_rel_error(self, grad[0], 7.0, .001)
+                assert_rel_error(self, grad[1], 15.0, .001)
+
+                grad = self.model.driver.differentiator.get_gradient('ConE')
+                assert_rel_error(self, grad[0], 7.0, .001)
+                assert_rel_error(self, grad[1], 16.0, .001)
+
     def test_large_dataflow(self):
         
         self.top = set_as_top(Assembly())
@@ -802,7 +831,15 @@ class AnalyticTestCase(unittest.TestCase):
         
         grad = self.top.driver.differentiator.get_gradient(obj)
         assert_rel_error(self, grad[0], 0.08660, .001)
-        
+
+        # Sparse storage, and auto picks adjoint for 1 objective, 2 params
+        self.top.driver.differentiator.sparse = True
+        self.top.driver.differentiator.mode = 'auto'
+        self.top.driver.differentiator.calc_gradient()
+
+        grad = self.top.driver.differentiator.get_gradient(obj)
+        assert_rel_error(self, grad[0], 0.08660, .001)
+
     def test_medium_coupled(self):
         
         self.top = set_as_top(Assembly())
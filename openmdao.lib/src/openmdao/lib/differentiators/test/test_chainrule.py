@@ -189,6 +189,53 @@ class ChainRuleTestCase(unittest.TestCase):
         assert_rel_error(self, grad[0], 7.0, .001)
         assert_rel_error(self, grad[1], 16.0, .001)
         
+    def test_rhs_constraints(self):
+        # Variables appearing only on the rhs of a constraint
+        
+        self.model.driver.add_constraint('comp.x < comp.y', name="Con2")
+        self.model.driver.add_constraint('2.0*comp.u = comp.y', name="ConE2")
+        self.model.driver.add_constraint('comp.x > comp.y', name="Con3")
+        self.model.comp.x = 1.0
+        self.model.comp.u = 1.0
+        self.model.run()
+        self.model.driver.differentiator.calc_gradient()
+        
+        grad = self.model.driver.differentiator.get_gradient('Con2')
+        assert_rel_error(self, grad[0], -5.0, .001)
+        assert_rel_error(self, grad[1], -13.0, .001)
+        
+        grad = self.model.driver.differentiator.get_gradient('ConE2')
+        assert_rel_error(self, grad[0], -6.0, .001)
+        assert_rel_error(self, grad[1], -11.0, .001)
+        
+        grad = self.model.driver.differentiator.get_gradient('Con3')
+        assert_rel_error(self, grad[0], 5.0, .001)
+        assert_rel_error(self, grad[1], 13.0, .001)
+        
+    def test_simple_adjoint(self):
+        
+        self.model.comp.x = 1.0
+        self.model.comp.u = 1.0
+        self.model.run()
+        self.model.driver.differentiator.mode = 'adjoint'
+        self.model.driver.differentiator.calc_gradient()
+        
+        grad = self.model.driver.differentiator.get_gradient('comp.y')
+        assert_rel_error(self, grad[0], 6.0, .001)
+        assert_rel_error(self, grad[1], 13.0, .001)
+        
+        grad = self.model.driver.differentiator.get_gradient('comp.v')
+        assert_rel_error(self, grad[0], 3.0, .001)
+        assert_rel_error(self, grad[1], 2.0, .001)
+        
+        grad = self.model.driver.differentiator.get_gradient('Con1')
+        assert_rel_error(self, grad[0], 7.0, .001)
+        assert_rel_error(self, grad[1], 15.0, .001)
+        
+        grad = self.model.driver.differentiator.get_gradient('ConE')
+        assert_rel_error(self, grad[0], 7.0, .001)
+        assert_rel_error(self, grad[1], 16.0, .001)
+        
     def test_large_dataflow(self):
         
         self.top = set_as_top(Assembly())
@@ -334,6 +381,15 @@ class ChainRuleTestCase(unittest.TestCase):
         
         grad = self.top.driver.differentiator.get_gradient('comp5.y1-nest1.comp3.y1>0')
         assert_rel_error(self, grad[0], -313.0+10.5, .001)
+        
+        self.top.driver.differentiator.mode = 'adjoint'
+        self.top.driver.differentiator.calc_gradient()
+        
+        grad = self.top.driver.differentiator.get_gradient(obj)
+        assert_rel_error(self, grad[0], 313.0, .001)
+        
+        grad = self.top.driver.differentiator.get_gradient('comp5.y1-nest1.comp3.y1>0')
+        assert_rel_error(self, grad[0], -313.0+10.5, .001)
     
     def test_find_edges(self):
         # Verifies that we don't chain derivatives for inputs that are
@@ -477,6 +533,16 @@ class ChainRuleTestCase(unittest.TestCase):
         grad = self.top.driver.differentiator.get_gradient(con)
         assert_rel_error(self, grad[0], -48.0, .001)
         
+        self.top.driver.differentiator.mode = 'adjoint'
+        self.top.driver.differentiator.calc_gradient()
+        
+        grad = self.top.driver.differentiator.get_gradient(obj)
+        assert_rel_error(self, grad[0], 8.0, .001)
+        grad = self.top.driver.differentiator.get_gradient(con)
+        assert_rel_error(self, grad[0], -48.0, .001)
+        
+        self.top.driver.differentiator.mode = 'auto'
+        
         # Testing conversion at this boundary (ft instead of inch)
         self.top.nest1.add('nestx', Float(iotype='in', units='ft', desc='Legit connection'))
         self.top.nest1.add('nesty', Float(iotype='out', units='inch', desc='Legit connection'))
@@ -517,6 +583,12 @@ class ChainRuleTestCase(unittest.TestCase):
         grad = self.top.driver.differentiator.get_gradient(obj)
         assert_rel_error(self, grad[0], 4.0, .001)
         
+        self.top.driver.differentiator.mode = 'adjoint'
+        self.top.driver.differentiator.calc_gradient()
+        
+        grad = self.top.driver.differentiator.get_gradient(obj)
+        assert_rel_error(self, grad[0], 4.0, .001)
+        
     #def test_reset_state(self):
         
         #raise SkipTest("Test not needed yet.")
@@ -23,13 +23,15 @@ class Comp(Component):
     # pylint: disable-msg=E1101
     x = Float(0.0, iotype='in')
     u = Float(0.0, iotype='in')
+    w = Float(0.0, iotype='in')
     y = Float(0.0, iotype='out')
     v = Float(0.0, iotype='out')
 
     def execute(self):
         """ Executes it """
         
-        self.y = (self.x)**2 + 3.0*self.u**3 + 4*self.u*self.x
+        self.y = (self.x)**2 + 3.0*self.u**3 + 4*self.u*self.x + \
+                 self.w*self.x
         self.v = (self.x)**3 * (self.u)**2
 
         
@@ -183,6 +185,77 @@ class FiniteDifferenceTestCase(unittest.TestCase):
         #assert_rel_error(self, hess[0][1], 4.0, .001)
         #assert_rel_error(self, hess[1][0], 4.0, .001)
         
+    def test_concurrent(self):
+        
+        self.model.comp.x = 1.0
+        self.model.comp.u = 1.0
+        self.model.run()
+        self.model.driver.differentiator.sequential = False
+        self.model.driver.differentiator.calc_gradient()
+        
+        grad = self.model.driver.differentiator.get_gradient('comp.y')
+        assert_rel_error(self, grad[0], 6.0, .001)
+        assert_rel_error(self, grad[1], 13.0, .001)
+        
+        grad = self.model.driver.differentiator.get_gradient('Con1')
+        assert_rel_error(self, grad[0], 7.0, .001)
+        assert_rel_error(self, grad[1], 15.0, .001)
+        
+        grad = self.model.driver.differentiator.get_gradient('ConE')
+        assert_rel_error(self, grad[0], 7.0, .001)
+        assert_rel_error(self, grad[1], 16.0, .001)
+        
+        # Steps were run on replicas, so the local model is untouched.
+        self.assertEqual(self.model.comp.u, 1.0)
+        
+        self.model.driver.differentiator.default_stepsize = .001
+        self.model.driver.differentiator.calc_hessian(reuse_first=True)
+        assert_rel_error(self, self.model.driver.differentiator.get_2nd_derivative('comp.y',wrt=('comp.x', 'comp.u')),
+                               4.0, .001)
+        assert_rel_error(self, self.model.driver.differentiator.get_2nd_derivative('ConE',wrt=('comp.x', 'comp.x')),
+                               2.0, .001)        
+        
+    def test_concurrent_reuse(self):
+        
+        fd = self.model.driver.differentiator
+        fd.sequential = False
+        try:
+            self.model.comp.x = 1.0
+            self.model.comp.u = 1.0
+            self.model.run()
+            fd.calc_gradient()
+            step_driver = fd._step_driver
+            egg_file = step_driver._egg_file
+            grad = fd.get_gradient('comp.y')
+            assert_rel_error(self, grad[0], 6.0, .001)
+            
+            # Replica is reused, changed inputs are sent with the cases.
+            self.model.comp.w = 1.0
+            fd.calc_gradient()
+            self.assertTrue(fd._step_driver is step_driver)
+            self.assertEqual(step_driver._egg_file, egg_file)
+            grad = fd.get_gradient('comp.y')
+            assert_rel_error(self, grad[0], 7.0, .001)
+            assert_rel_error(self, grad[1], 13.0, .001)
+            
+            # Changing back must be sent too.
+            self.model.comp.w = 0.0
+            fd.calc_gradient()
+            self.assertTrue(fd._step_driver is step_driver)
+            self.assertEqual(step_driver._egg_file, egg_file)
+            grad = fd.get_gradient('comp.y')
+            assert_rel_error(self, grad[0], 6.0, .001)
+            
+            # Configuration change causes a new replica.
+            self.model.add('comp2', Comp())
+            fd.calc_gradient()
+            self.assertFalse(fd._step_driver is step_driver)
+            grad = fd.get_gradient('comp.y')
+            assert_rel_error(self, grad[0], 6.0, .001)
+        finally:
+            self.model.pre_delete()
+        self.assertEqual(fd._step_driver, None)
+        
     def test_reset_state(self):
         
         self.model.driver.form = 'central'
@@ -22,8 +22,8 @@ from random import randint, shuffle
 
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import array, size, sum, floor, zeros
-    from numpy.linalg import norm
+    from numpy import array, size, sum, floor, zeros, ones, empty, \
+                      absolute, sqrt, isfinite, triu_indices
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 
@@ -76,6 +76,32 @@ def is_latin_hypercube(lh):
     return True
 
 
+def _row_distances(doe, rows, p):
+    """Returns the p-norm distances between the points of `doe` indexed by
+    `rows` and all points of `doe` as a len(rows) by n array.
+    """
+    diff = doe[rows][:, None, :] - doe[None, :, :]
+    if p == 1:
+        return absolute(diff).sum(axis=-1)
+    elif p == 2:
+        return sqrt((diff*diff).sum(axis=-1))
+    return (absolute(diff)**p).sum(axis=-1)**(1.0/p)
+
+
+def _distance_matrix(doe, p, chunk_size=1000000):
+    """Returns the n by n matrix of p-norm distances between the points of
+    `doe`. Rows are computed in chunks of about `chunk_size` differences
+    to limit memory use.
+    """
+    n,k = doe.shape
+    dist = empty((n, n))
+    step = max(1, chunk_size // (n*k))
+    for start in range(0, n, step):
+        rows = range(start, min(start+step, n))
+        dist[start:start+len(rows)] = _row_distances(doe, rows, p)
+    return dist
+
+
 @stub_if_missing_deps('numpy')
 class LHC_indivudal(object):
     
@@ -84,6 +110,9 @@ class LHC_indivudal(object):
         self.p = p
         self.doe = doe
         self.phi = None # Morris-Mitchell sampling criterion
+        self._phiq = None  # sum of distance**-q over all pairs of points
+        self._dist = None  # matrix of distances between points
+        self._base = None  # (parent distances, changed rows, row distances)
     
     @property
     def shape(self):
@@ -94,26 +123,51 @@ class LHC_indivudal(object):
         """Returns the Morris-Mitchell sampling criterion for this Latin hypercube."""
 
         if self.phi is None:
-            n,m = self.doe.shape
-            distdict = {}
-            
-            #calculate the norm between each pair of points in the DOE
-            # TODO: This norm takes up the majority of the computation time. It
-            # should be converted to C or ShedSkin.
-            arr = self.doe
-            for i in range(n):
-                for j in range(i+1, n):
-                    nrm = norm(arr[i]-arr[j], ord=self.p)
-                    distdict[nrm] = distdict.get(nrm, 0) + 1
-    
-            distinct_d = array(distdict.keys())
-            
-            #mutltiplicity array with a count of how many pairs of points have a given distance
-            J = array(distdict.values())
-            
-            self.phi = sum(J*(distinct_d**(-self.q)))**(1.0/self.q)
+            if self._phiq is None:
+                dist = self._distances()
+                n = dist.shape[0]
+                self._phiq = sum(dist[triu_indices(n, 1)]**(-self.q))
+            self.phi = self._phiq**(1.0/self.q)
         
         return self.phi
+
+    def _distances(self):
+        """Returns the matrix of distances between the points of the DOE."""
+        if self._dist is None:
+            if self._base is None:
+                self._dist = _distance_matrix(self.doe, self.p)
+            else:
+                dist, rows, rowdist = self._base
+                self._dist = dist.copy()
+                self._dist[rows, :] = rowdist
+                self._dist[:, rows] = rowdist.T
+                self._base = None
+        return self._dist
+
+    def _update_from(self, parent, rows):
+        """Derives distances and criterion from those of `parent`, whose
+        DOE differs from ours only in `rows`. Only the distances involving
+        those points are computed, which is O(n) per point. The full
+        distance matrix is only built if this individual is perturbed.
+        """
+        dist = parent._distances()
+        parent.mmphi()
+        rows = array(rows)
+        rowdist = _row_distances(self.doe, rows, self.p)
+        self._base = (dist, rows, rowdist)
+
+        # pairs involving the changed points, each pair counted once
+        mask = ones(rowdist.shape, dtype=bool)
+        for i in range(len(rows)):
+            mask[i, rows[:i+1]] = False
+        old = sum(dist[rows][mask]**(-self.q))
+        new = sum(rowdist[mask]**(-self.q))
+
+        # Removing a dominant part of the sum would lose precision, so in
+        # that case the sum is recomputed in mmphi().
+        if isfinite(parent._phiq) and isfinite(new) and \
+           old <= 0.5*parent._phiq:
+            self._phiq = parent._phiq - old + new
     
     def perturb(self, mutation_count):
         """ Interchanges pairs of randomly chosen elements within randomly chosen
@@ -122,6 +176,7 @@ class LHC_indivudal(object):
         """
         new_doe = self.doe.copy()
         n,k = self.doe.shape
+        rows = set()
         for count in range(mutation_count): 
             col = randint(0, k-1)
             
@@ -133,8 +188,11 @@ class LHC_indivudal(object):
            
             new_doe[el1, col] = self.doe[el2, col]
             new_doe[el2, col] = self.doe[el1, col] 
+            rows.update((el1, el2))
                
-        return LHC_indivudal(new_doe, self.q, self.p)
+        child = LHC_indivudal(new_doe, self.q, self.p)
+        child._update_from(self, sorted(rows))
+        return child
     
     def __iter__(self):
         return self._get_rows()
@@ -0,0 +1,86 @@
+"""
+Compare the optimization of Latin hypercubes by _mmlhs using the original
+pairwise-loop Morris-Mitchell criterion with the vectorized, incremental
+one in LHC_indivudal. For a fixed seed both must produce identical results.
+"""
+
+import random
+import time
+from random import randint
+
+from numpy import array, sum
+from numpy.linalg import norm
+
+from openmdao.lib.doegenerators.optlh import LHC_indivudal, _mmlhs, \
+                                             rand_latin_hypercube
+
+
+class LoopIndividual(LHC_indivudal):
+    """ Original implementation of the criterion, for reference. """
+
+    def mmphi(self):
+        if self.phi is None:
+            n,m = self.doe.shape
+            distdict = {}
+            arr = self.doe
+            for i in range(n):
+                for j in range(i+1, n):
+                    nrm = norm(arr[i]-arr[j], ord=self.p)
+                    distdict[nrm] = distdict.get(nrm, 0) + 1
+            distinct_d = array(distdict.keys())
+            J = array(distdict.values())
+            self.phi = sum(J*(distinct_d**(-self.q)))**(1.0/self.q)
+        return self.phi
+
+    def perturb(self, mutation_count):
+        new_doe = self.doe.copy()
+        n,k = self.doe.shape
+        for count in range(mutation_count):
+            col = randint(0, k-1)
+            el1 = randint(0, n-1)
+            el2 = randint(0, n-1)
+            while el1==el2:
+                el2 = randint(0, n-1)
+            new_doe[el1, col] = self.doe[el2, col]
+            new_doe[el2, col] = self.doe[el1, col]
+        return LoopIndividual(new_doe, self.q, self.p)
+
+
+def run_test(n, k, qs, p, population, generations, seed=10):
+    """ Optimize an `n` by `k` hypercube for each of `qs` with both
+    implementations and check that the results are identical.
+    """
+    random.seed(seed)
+    doe = rand_latin_hypercube(n, k)
+    times = [0., 0.]
+    for q in qs:
+        results = []
+        for i, cls in enumerate((LoopIndividual, LHC_indivudal)):
+            random.seed(seed+q)
+            start = time.time()
+            best = _mmlhs(cls(doe, q, p), population, generations)
+            phi = best.mmphi()
+            times[i] += time.time() - start
+            results.append((best.doe, phi))
+        (loop_doe, loop_phi), (doe_opt, phi) = results
+        assert (loop_doe == doe_opt).all(), \
+               '%dx%d, q=%d: optimized DOEs differ' % (n, k, q)
+        assert abs(phi - loop_phi) <= 1e-10 * loop_phi, \
+               '%dx%d, q=%d: phi %r vs. %r' % (n, k, q, phi, loop_phi)
+    print '%dx%d, %d-norm, population %d, generations %d:' \
+          % (n, k, p, population, generations)
+    print '    loop %g sec, vectorized %g sec, speedup %g' \
+          % (times[0], times[1], times[0] / times[1])
+    return times
+
+
+def main():
+    """ Run timing on an 80x2 and a 500x10 hypercube. """
+    qs = [1, 2, 5, 10, 20, 50, 100]
+    for p in (1, 2):
+        run_test(80, 2, qs, p, population=20, generations=20)
+    run_test(500, 10, [2, 20], 1, population=10, generations=2)
+
+
+if __name__ == '__main__':
+    main()
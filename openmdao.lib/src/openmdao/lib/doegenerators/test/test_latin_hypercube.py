@@ -23,6 +23,16 @@ class TestCase(unittest.TestCase):
         opt_phi = lh_opt.mmphi()
         self.assertTrue(is_latin_hypercube(lh_opt))
         self.assertTrue(opt_phi < phi1)
+
+    def test_mmphi_perturb(self):
+        # criterion of perturbed individuals is updated incrementally
+        for q in (1, 2, 100):
+            for p in (1, 2):
+                lh = LHC_indivudal(rand_latin_hypercube(30,3), q, p)
+                for i in range(20):
+                    lh = lh.perturb(i%3+1)
+                    expected = LHC_indivudal(lh.doe, q, p).mmphi()
+                    self.assertAlmostEqual(lh.mmphi()/expected, 1., places=10)
         
     def test_OptLatinHypercube(self):
         olh = OptLatinHypercube()
@@ -15,6 +15,7 @@ from openmdao.lib.drivers.caseiterdriver import CaseIteratorDriver
 from openmdao.lib.drivers.genetic import Genetic
 from openmdao.lib.drivers.iterate import FixedPointIterator, IterateUntil
 from openmdao.lib.drivers.broydensolver import BroydenSolver
+from openmdao.lib.drivers.newtonkrylov import NewtonKrylovSolver
 from openmdao.lib.drivers.doedriver import DOEdriver, NeighborhoodDOEdriver
 from openmdao.lib.drivers.sensitivity import SensitivityDriver
 from openmdao.lib.drivers.distributioncasedriver import DistributionCaseDriver
@@ -3,23 +3,28 @@
 
 """
 
+import collections
+import cStringIO
 import logging
 import os.path
 import Queue
 import sys
 import thread
 import threading
+import time
 import traceback
 
-from openmdao.main.datatypes.api import Bool, Dict, Enum, Int, Slot
+from openmdao.main.datatypes.api import Bool, Dict, Enum, Float, Int, Slot
 
-from openmdao.main.api import Driver
+from openmdao.main.api import Component, Driver
 from openmdao.main.exceptions import RunStopped, TracedError, traceback_str
 from openmdao.main.expreval import ExprEvaluator
 from openmdao.main.interfaces import ICaseIterator, ICaseRecorder, ICaseFilter
+from openmdao.main.mp_support import is_instance
 from openmdao.main.rbac import get_credentials, set_credentials
 from openmdao.main.resource import ResourceAllocationManager as RAM
 from openmdao.main.resource import LocalAllocator
+from openmdao.main.serverpool import SERVER_POOL, model_digest
 from openmdao.util.filexfer import filexfer
 
 from openmdao.util.decorators import add_delegate
@@ -65,6 +70,26 @@ class CaseIterDriverBase(Driver):
                                         ' requirements will be included in the'
                                         ' generated egg.')
 
+    queue_depth = Int(0, low=0, iotype='in',
+                      desc='If > 0, concurrent evaluation is pipelined:'
+                           ' up to this many requests are queued for each'
+                           ' server, each evaluating `batch_size` cases'
+                           ' with a single remote call.')
+
+    batch_size = Int(1, low=1, iotype='in',
+                     desc='Number of cases per request when pipelined.')
+
+    local_replication = Bool(True, iotype='in',
+                             desc='If True and only local servers are'
+                                  ' available, replicate the model by sending'
+                                  ' its pickled state rather than an egg.')
+
+    server_idle_timeout = Float(0., low=0., iotype='in', units='s',
+                                desc='If > 0, servers are kept after'
+                                     ' execution (with the model loaded) for'
+                                     ' reuse by later executions, and'
+                                     ' released after being idle this long.')
+
     def __init__(self, *args, **kwargs):
         super(CaseIterDriverBase, self).__init__(*args, **kwargs)
         self._iter = None  # Set to None when iterator is empty.
@@ -73,12 +98,16 @@ class CaseIterDriverBase(Driver):
         self._abort_exc = None  # Set if error_policy == ABORT.
 
         self._egg_file = None
+        self._egg_digest = None
         self._egg_required_distributions = None
         self._egg_orphan_modules = None
 
         self._reply_q = None  # Replies from server threads.
         self._server_lock = None  # Lock for server data.
 
+        # Tokens for servers kept in SERVER_POOL, keyed by server name.
+        self._pooled = {}
+
         # Various per-server data keyed by server name.
         self._servers = {}
         self._top_levels = {}
@@ -89,11 +118,21 @@ class CaseIterDriverBase(Driver):
         self._server_cases = {}
         self._exceptions = {}
         self._load_failures = {}
+        self._warm_models = {}
  
         self._todo = []   # Cases grabbed during server startup.
         self._rerun = []  # Cases that failed and should be retried.
         self._generation = 0  # Used to keep worker names unique.
 
+        self._pending = {}  # Requests in flight when pipelined.
+        self._server_stats = {}
+
+    def __getstate__(self):
+        """Return dict representing this container's state."""
+        state = super(CaseIterDriverBase, self).__getstate__()
+        state['_pooled'] = {}  # Server proxies can't be pickled.
+        return state
+
     def execute(self):
         """
         Runs all cases and records results in `recorder`.
@@ -126,6 +165,9 @@ class CaseIterDriverBase(Driver):
                         self.step()
                     except StopIteration:
                         break
+            elif self.queue_depth:
+                self._logger.info('Start pipelined concurrent evaluation.')
+                self._start_pipelined()
             else:
                 self._logger.info('Start concurrent evaluation.')
                 self._start()
@@ -172,7 +214,8 @@ class CaseIterDriverBase(Driver):
 
         replicate: bool
              If True, then replicate the model and save to an egg file
-             first (for concurrent evaluation).
+             (or pickle file, see `local_replication`) first
+             (for concurrent evaluation).
         """
         self._cleanup(remove_egg=replicate)
 
@@ -186,23 +229,39 @@ class CaseIterDriverBase(Driver):
                 # If only local host will be used, we can skip determining
                 # distributions required by the egg.
                 allocators = RAM.list_allocators()
-                need_reqs = False
-                if not self.ignore_egg_requirements:
-                    for allocator in allocators:
-                        if not isinstance(allocator, LocalAllocator):
-                            need_reqs = True
-                            break
+                local_only = True
+                for allocator in allocators:
+                    if not isinstance(allocator, LocalAllocator):
+                        local_only = False
+                        break
+                need_reqs = not (local_only or self.ignore_egg_requirements)
+                use_pickle = local_only and self.local_replication and \
+                             self._can_pickle()
 
+                # The replica's driver just executes our workflow once.
+                # It's swapped in quietly, since this isn't a configuration
+                # change (add() would notify the whole model).
                 driver = self.parent.driver
-                self.parent.add('driver', Driver()) # this driver will execute the workflow once
-                self.parent.driver.workflow = self.workflow
+                replica_driver = Driver()
+                replica_driver.parent = self.parent
+                replica_driver.name = 'driver'
+                replica_driver.cpath_updated()
+                replica_driver.workflow = self.workflow
+                self.parent.trait_setq(driver=replica_driver)
                 try:
-                    #egg_info = self.model.save_to_egg(self.model.name, version)
-                    # FIXME: what name should we give to the egg?
-                    egg_info = self.parent.save_to_egg(self.name, version,
+                    if use_pickle:
+                        egg_info = self._save_pickle(version)
+                    else:
+                        #egg_info = self.model.save_to_egg(self.model.name, version)
+                        # FIXME: what name should we give to the egg?
+                        egg_info = self.parent.save_to_egg(self.name, version,
                                                     need_requirements=need_reqs)
+                    # Idle servers holding a model with this digest can be
+                    # reused as-is.
+                    self._egg_digest = model_digest(self.parent)
                 finally:
-                    self.parent.driver = driver
+                    self.parent.trait_setq(driver=driver)
+                    self.workflow._parent = self
 
                 self._egg_file = egg_info[0]
                 self._egg_required_distributions = egg_info[1]
@@ -211,20 +270,82 @@ class CaseIterDriverBase(Driver):
         self._iter = self.get_case_iterator()
         self._seqno = 0
         
+    def _can_pickle(self):
+        """
+        Returns True if the model can be replicated on local servers by just
+        pickling its state. Local servers are forked from this process on
+        POSIX systems, so they already have the model's classes, including
+        any defined in ``__main__``. Models referring to files need the egg.
+        """
+        if sys.platform == 'win32':
+            return False
+        components = [self.parent]
+        components.extend([obj for name, obj in self.parent.items(recurse=True)
+                                               if is_instance(obj, Component)])
+        for comp in components:
+            if comp is not self.parent and os.path.isabs(comp.directory):
+                return False
+            if [meta for meta in comp.external_files if meta.path]:
+                return False
+            if [fvar for name, fvar, trait in comp.get_file_vars()
+                     if fvar.path]:
+                return False
+        return True
+
+    def _save_pickle(self, version):
+        """
+        Save model state to a pickle file, avoiding egg creation.
+        Returns ``(filename, required_distributions, orphan_modules)``,
+        similar to :meth:`save_to_egg`.
+        """
+        filename = '%s-%s.pickle' % (self.name, version)
+        stream = cStringIO.StringIO()
+        self.parent.save(stream)
+        data = stream.getvalue()
+        with open(filename, 'wb') as out:
+            out.write(data)
+        self._logger.debug('Saved %d bytes to %s', len(data), filename)
+        return (filename, set(), set())
+
     def get_case_iterator(self):
         """Returns a new iterator over the Case set."""
         raise NotImplementedError('get_case_iterator')
 
-    def _start(self):
-        """ Start evaluating cases concurrently. """
-        # Need credentials in case we're using a PublicKey server.
-        credentials = get_credentials()
-
-        # Determine maximum number of servers available.
+    def get_server_stats(self):
+        """
+        Return a dictionary of statistics for each server used during the
+        last concurrent evaluation, keyed by server name. Each entry is a
+        dictionary with the number of `cases` evaluated, the number of
+        `requests` processed, the time the server was `busy` processing
+        requests, the `elapsed` time it was in use, `utilization` (busy
+        divided by elapsed), and the maximum `queue_depth` observed.
+        """
+        stats = {}
+        for name, entry in self._server_stats.items():
+            entry = entry.copy()
+            if entry['elapsed'] > 0:
+                entry['utilization'] = entry['busy'] / entry['elapsed']
+            else:
+                entry['utilization'] = 0.
+            stats[name] = entry
+        return stats
+
+    def _log_server_stats(self):
+        """ Log per-server statistics. """
+        for name, entry in sorted(self.get_server_stats().items()):
+            self._logger.info('%s: %d cases, %d requests, utilization %.2f,'
+                              ' max queue depth %d', name, entry['cases'],
+                              entry['requests'], entry['utilization'],
+                              entry['queue_depth'])
+
+    def _get_resources(self):
+        """ Return resource description and maximum number of servers. """
         resources = {
             'required_distributions':self._egg_required_distributions,
             'orphan_modules':self._egg_orphan_modules,
-            'python_version':sys.version[:3]}
+            'python_version':sys.version[:3],
+            # Share servers fairly with other concurrent drivers.
+            'share_group':self.get_pathname()}
         if self.extra_resources:
             resources.update(self.extra_resources)
         max_servers = RAM.max_servers(resources)
@@ -232,11 +353,44 @@ class CaseIterDriverBase(Driver):
         if max_servers <= 0:
             msg = 'No servers supporting required resources %s' % resources
             self.raise_exception(msg, RuntimeError)
+        return resources, max_servers
+
+    def _start_worker(self, name, resources, credentials):
+        """ Start server worker thread. Returns True if started. """
+        self._logger.debug('starting worker for %r', name)
+        self._servers[name] = None
+        self._in_use[name] = True
+        self._server_cases[name] = None
+        self._server_states[name] = _EMPTY
+        self._load_failures[name] = 0
+        self._server_stats[name] = dict(cases=0, requests=0, busy=0.,
+                                        elapsed=0., queue_depth=0)
+        server_thread = threading.Thread(target=self._service_loop,
+                                         args=(name, resources,
+                                               credentials, self._reply_q))
+        server_thread.daemon = True
+        try:
+            server_thread.start()
+        except thread.error:
+            self._logger.warning('worker thread startup failed for %r',
+                                 name)
+            self._in_use[name] = False
+            return False
+        return True
+
+    def _start(self):
+        """ Start evaluating cases concurrently. """
+        # Need credentials in case we're using a PublicKey server.
+        credentials = get_credentials()
+
+        # Determine maximum number of servers available.
+        resources, max_servers = self._get_resources()
 
         # Kick off initial wave of cases.
         self._server_lock = threading.Lock()
         self._reply_q = Queue.Queue()
         self._generation += 1
+        self._server_stats = {}
         n_servers = 0
         while n_servers < max_servers:
             if not self._more_to_go():
@@ -257,22 +411,7 @@ class CaseIterDriverBase(Driver):
             # Start server worker thread.
             n_servers += 1
             name = '%s_%d_%d' % (self.name, self._generation, n_servers)
-            self._logger.debug('starting worker for %r', name)
-            self._servers[name] = None
-            self._in_use[name] = True
-            self._server_cases[name] = None
-            self._server_states[name] = _EMPTY
-            self._load_failures[name] = 0
-            server_thread = threading.Thread(target=self._service_loop,
-                                             args=(name, resources,
-                                                   credentials, self._reply_q))
-            server_thread.daemon = True
-            try:
-                server_thread.start()
-            except thread.error:
-                self._logger.warning('worker thread startup failed for %r',
-                                     name)
-                self._in_use[name] = False
+            if not self._start_worker(name, resources, credentials):
                 break
 
             if sys.platform != 'win32':
@@ -341,7 +480,10 @@ class CaseIterDriverBase(Driver):
             else:
                 self._in_use[name] = self._server_ready(name)
 
-        # Shut-down (started) servers.
+        self._shutdown_servers()
+
+    def _shutdown_servers(self):
+        """ Shut-down (started) servers. """
         self._logger.debug('Shut-down (started) servers')
         for queue in self._queues.values():
             queue.put(None)
@@ -357,6 +499,199 @@ class CaseIterDriverBase(Driver):
         # Hard to force worker to hang, which is handled here.
         for name in self._queues.keys():  #pragma no cover
             self._logger.warning('Timeout waiting for %r to shut-down.', name)
+        self._log_server_stats()
+
+    def _start_pipelined(self):
+        """
+        Start evaluating cases concurrently, keeping up to `queue_depth`
+        requests of `batch_size` cases queued for each server.
+        """
+        # Need credentials in case we're using a PublicKey server.
+        credentials = get_credentials()
+
+        # Determine maximum number of servers available.
+        resources, max_servers = self._get_resources()
+
+        self._server_lock = threading.Lock()
+        self._reply_q = Queue.Queue()
+        self._generation += 1
+        self._server_stats = {}
+        self._pending = {}
+        started = set()
+
+        # Start servers, limited by the number of requests available.
+        n_servers = 0
+        while n_servers < max_servers:
+            batch = self._next_batch()
+            if not batch:
+                break
+            for case, seqno, rerun in batch:
+                if rerun:
+                    self._rerun.append((case, seqno))
+                else:
+                    self._todo.append((case, seqno))
+
+            n_servers += 1
+            name = '%s_%d_%d' % (self.name, self._generation, n_servers)
+            self._pending[name] = collections.deque()
+            if not self._start_worker(name, resources, credentials):
+                break
+
+        # Continue until no servers are busy.
+        while self._busy():
+            if self._more_to_go():
+                timeout = None
+            else:
+                # Don't wait indefinitely for a server we don't need.
+                timeout = 60
+            try:
+                name, result, exc = self._reply_q.get(timeout=timeout)
+            # Hard to force worker to hang, which is handled here.
+            except Queue.Empty:  #pragma no cover
+                for name, in_use in self._in_use.items():
+                    if in_use and name not in started:
+                        self._logger.error('Timeout waiting with nothing'
+                                           ' left to do: %r: no startup'
+                                           ' reply', name)
+                        self._in_use[name] = False
+                continue
+
+            if name not in started:
+                started.add(name)
+                # Difficult to force startup failure.
+                if self._servers[name] is None:  #pragma nocover
+                    self._logger.debug('server startup failed for %r', name)
+                    self._in_use[name] = False
+                    continue
+            else:
+                batch = self._pending[name].popleft()
+                self._batch_done(name, batch, result, exc)
+
+            if self._load_failures[name] < 3:
+                self._fill_pipeline(name)
+            self._in_use[name] = len(self._pending[name]) > 0
+
+        self._shutdown_servers()
+
+    def _next_batch(self):
+        """
+        Return a list of up to `batch_size` ``(case, seqno, rerun)`` to
+        be evaluated next.
+        """
+        batch = []
+        while len(batch) < self.batch_size and self._more_to_go():
+            if self._todo:
+                case, seqno = self._todo.pop(0)
+                batch.append((case, seqno, False))
+            elif self._rerun:
+                case, seqno = self._rerun.pop(0)
+                batch.append((case, seqno, True))
+            else:
+                try:
+                    case = self._iter.next()
+                except StopIteration:
+                    self._iter = None
+                    self._seqno = 0
+                    break
+                else:
+                    self._seqno += 1
+                    batch.append((case, self._seqno, False))
+        return batch
+
+    def _fill_pipeline(self, server):
+        """ Queue requests for `server` until its pipeline is full. """
+        pending = self._pending[server]
+        while len(pending) < self.queue_depth:
+            batch = self._next_batch()
+            if not batch:
+                break
+            for case, seqno, rerun in batch:
+                self._prepare_case(case, rerun)
+            pending.append(batch)
+            self._queues[server].put((self._remote_run_batch,
+                                      (server, batch)))
+
+    def _remote_run_batch(self, request):
+        """
+        Run a batch of cases in remote server. All cases in the batch are
+        evaluated by a single remote call, unless `reload_model` is set, in
+        which case each case needs its own load and call.
+        """
+        server, batch = request
+        if self.reload_model:
+            groups = [[item] for item in batch]
+        else:
+            groups = [batch]
+
+        itername = self.get_itername()
+        events = self.get_events()
+        results = []
+        for group in groups:
+            if self.reload_model or self._top_levels.get(server) is None:
+                self._exceptions[server] = None
+                self._remote_load_model(server)
+                exc = self._exceptions[server]
+                if exc is not None:
+                    results.extend([('load', None, str(exc), exc)] * len(group))
+                    continue
+            cases = [(case, seqno) for case, seqno, rerun in group]
+            results.extend(self._top_levels[server].run_cases(cases, itername,
+                                                              events))
+        return results
+
+    def _batch_done(self, server, batch, results, exc):
+        """ Process the `results` of evaluating `batch` on `server`. """
+        load_failed = False
+        for i, (case, seqno, rerun) in enumerate(batch):
+            if results is None:
+                # Request failed, so there's nothing to show for the cases.
+                self._logger.debug('    exception while executing: %r', exc)
+                phase, outputs, msg, error = 'execute', None, str(exc), exc
+            else:
+                phase, outputs, msg, info = results[i]
+                if phase == 'load':
+                    error = info  # Local exception from _remote_load_model().
+                else:
+                    error = TracedError(RuntimeError(msg), info or '')
+
+            if phase == 'load':
+                self._logger.debug('    exception while loading: %r', msg)
+                load_failed = True
+                if self.error_policy == 'ABORT':
+                    if self._abort_exc is None:
+                        self._abort_exc = error
+                    self._stop = True
+                # The case never ran, so try it again.
+                if rerun:
+                    self._rerun.append((case, seqno))
+                else:
+                    self._todo.append((case, seqno))
+                continue
+
+            self._server_stats[server]['cases'] += 1
+            if outputs:
+                for name, value in outputs.items():
+                    case[name] = value
+            if phase is None:
+                case.msg = None
+            elif phase == 'execute':
+                self._logger.debug('    exception while executing: %r', msg)
+                case.msg = msg
+            else:
+                self._logger.debug('    %s', msg)
+                case.msg = '%s: %s' % (self.get_pathname(), msg)
+
+            if case.msg is not None and self.error_policy == 'ABORT':
+                if self._abort_exc is None:
+                    self._abort_exc = error
+                self._stop = True
+
+            self._record_case(case, seqno)
+
+        if load_failed:
+            self._load_failures[server] += 1
+            if self._load_failures[server] >= 3:
+                self._logger.debug('    too many load failures')
 
     def _busy(self):
         """ Return True while at least one server is in use. """
@@ -380,13 +715,23 @@ class CaseIterDriverBase(Driver):
         self._server_cases = {}
         self._exceptions = {}
         self._load_failures = {}
+        self._warm_models = {}
 
         self._todo = []
         self._rerun = []
 
-        if self._egg_file and os.path.exists(self._egg_file):
+        if remove_egg and self._egg_file and os.path.exists(self._egg_file):
             os.remove(self._egg_file)
             self._egg_file = None
+            self._egg_digest = None
+
+    def release_servers(self):
+        """
+        Release servers this driver kept for reuse (see
+        `server_idle_timeout`) which haven't been reused since.
+        """
+        SERVER_POOL.release(self._pooled.values())
+        self._pooled = {}
 
     def _server_ready(self, server, stepping=False):
         """
@@ -456,6 +801,8 @@ class CaseIterDriverBase(Driver):
                 self._stop = True
 
             # Record the data.
+            if server is not None:
+                self._server_stats[server]['cases'] += 1
             self._record_case(case, seqno)
 
             # Set up for next case.
@@ -538,8 +885,8 @@ class CaseIterDriverBase(Driver):
                 
         return in_use
 
-    def _run_case(self, case, seqno, server, rerun=False):
-        """ Setup and start a case. Returns True if started. """
+    def _prepare_case(self, case, rerun=False):
+        """ Setup `case` to be run. """
         if not rerun:
             if not case.max_retries:
                 case.max_retries = self.max_retries
@@ -561,6 +908,9 @@ class CaseIterDriverBase(Driver):
                 val = ExprEvaluator(var, scope=self.parent).evaluate()
                 case.add_output(var, val)
 
+    def _run_case(self, case, seqno, server, rerun=False):
+        """ Setup and start a case. Returns True if started. """
+        self._prepare_case(case, rerun)
         try:
             for event in self.get_events(): 
                 try: 
@@ -601,15 +951,14 @@ class CaseIterDriverBase(Driver):
         """ Each server has an associated thread executing this. """
         set_credentials(credentials)
 
-        server, server_info = RAM.allocate(resource_desc)
+        server, server_info, top_level = \
+            SERVER_POOL.get(resource_desc, self._egg_digest)
         # Just being defensive, this should never happen.
         if server is None:  #pragma no cover
             self._logger.error('Server allocation for %r failed :-(', name)
             reply_q.put((name, False, None))
             return
         else:
-            # Clear egg re-use indicator.
-            server_info['egg_file'] = None
             self._logger.debug('%r using %r', name, server_info['name'])
             if self._logger.level == logging.NOTSET:
                 # By default avoid lots of protocol messages.
@@ -618,12 +967,22 @@ class CaseIterDriverBase(Driver):
                 server.set_log_level(self._logger.level)
 
         request_q = Queue.Queue()
+        start = time.time()
+        keep = False
 
         try:
+            stats = self._server_stats.get(name)
+            if reply_q is not self._reply_q or stats is None:
+                # Cleaned up (or restarted) while waiting for a server.
+                self._logger.debug('%r no longer needed', name)
+                return
+
             with self._server_lock:
                 self._servers[name] = server
                 self._server_info[name] = server_info
                 self._queues[name] = request_q
+                if top_level is not None:
+                    self._warm_models[name] = top_level
 
             reply_q.put((name, True, None))  # ACK startup.
 
@@ -631,6 +990,9 @@ class CaseIterDriverBase(Driver):
                 request = request_q.get()
                 if request is None:
                     break
+                stats['queue_depth'] = max(stats['queue_depth'],
+                                           request_q.qsize() + 1)
+                req_start = time.time()
                 try:
                     result = request[0](request[1])
                 except Exception as req_exc:
@@ -639,15 +1001,27 @@ class CaseIterDriverBase(Driver):
                     result = None
                 else:
                     req_exc = None
+                stats['requests'] += 1
+                stats['busy'] += time.time() - req_start
+                stats['elapsed'] = time.time() - start
                 reply_q.put((name, result, req_exc))
+            keep = self.server_idle_timeout > 0 and \
+                   not self._load_failures.get(name)
         except Exception as exc:  # pragma no cover
             # This can easily happen if we take a long time to allocate and
             # we get 'cleaned-up' before we get started.
             if self._server_lock is not None:
                 self._logger.error('%r: %r', name, exc)
         finally:
-            self._logger.debug('%r releasing server', name)
-            RAM.release(server)
+            if keep:
+                self._logger.debug('%r keeping server', name)
+                self._pooled[name] = \
+                    SERVER_POOL.put(server, server_info, resource_desc,
+                                    self.server_idle_timeout,
+                                    self._top_levels.get(name))
+            else:
+                self._logger.debug('%r releasing server', name)
+                RAM.release(server)
             reply_q.put((name, True, None))  # ACK shutdown.
 
     def _load_model(self, server):
@@ -657,9 +1031,17 @@ class CaseIterDriverBase(Driver):
             self._queues[server].put((self._remote_load_model, server))
 
     def _remote_load_model(self, server):
-        """ Load model into remote server. """
-        egg_file = self._server_info[server].get('egg_file', None)
-        if egg_file is None or egg_file is not self._egg_file:
+        """
+        Load model into remote server. A model left loaded by a previous
+        execution is used as-is unless `reload_model` is set.
+        """
+        server_info = self._server_info[server]
+        top_level = self._warm_models.pop(server, None)
+        if top_level is not None and not self.reload_model:
+            self._top_levels[server] = top_level
+            return
+
+        if server_info.get('egg_digest') != self._egg_digest:
             # Only transfer if changed.
             try:
                 filexfer(None, self._egg_file,
@@ -672,13 +1054,15 @@ class CaseIterDriverBase(Driver):
                 self._exceptions[server] = TracedError(exc, traceback.format_exc())
                 return
             else:
-                self._server_info[server]['egg_file'] = self._egg_file
+                server_info['egg_file'] = self._egg_file
+                server_info['egg_digest'] = self._egg_digest
+        egg_file = server_info['egg_file']
         try:
-            tlo = self._servers[server].load_model(self._egg_file)
+            tlo = self._servers[server].load_model(egg_file)
         # Difficult to force load error.
         except Exception as exc:  #pragma nocover
             self._logger.error('server.load_model of %r failed: %r',
-                               self._egg_file, exc)
+                               egg_file, exc)
             self._top_levels[server] = None
             self._exceptions[server] = TracedError(exc, traceback.format_exc())
         else:
@@ -18,17 +18,34 @@ from pyevolve import GSimpleGA, Selectors, Initializators, Mutators, Consts
 # pylint: disable-msg=E0611,F0401
 from openmdao.main.datatypes.api import Python, Enum, Float, Int, Bool, Slot
 
-from openmdao.main.api import Driver 
-from openmdao.main.hasparameters import HasParameters
+from openmdao.main.api import Driver, Case
+from openmdao.main.hasparameters import HasParameters, ParameterGroup
 from openmdao.main.hasobjective import HasObjective
 from openmdao.main.hasevents import HasEvents
 from openmdao.main.interfaces import IHasParameters, IHasObjective, \
                                      implements, IOptimizer
 from openmdao.util.decorators import add_delegate
 from openmdao.util.typegroups import real_types, int_types, iterable_types
+from openmdao.lib.casehandlers.api import ListCaseRecorder
+from openmdao.lib.drivers.caseiterdriver import CaseIterDriverBase
 
 array_test = re.compile("(\[[0-9]+\])+$")
 
+
+class _PopulationCaseDriver(CaseIterDriverBase):
+    """ Evaluates the individuals of a generation concurrently, on replicas
+    of the model obtained from the :class:`ResourceAllocationManager`. """
+    
+    def __init__(self):
+        super(_PopulationCaseDriver, self).__init__()
+        self.sequential = False
+        self.cases = []
+        
+    def get_case_iterator(self):
+        """Returns a new iterator over the individual cases."""
+        return iter(self.cases)
+
+
 @add_delegate(HasParameters, HasObjective, HasEvents)
 class Genetic(Driver):
     """Genetic algorithm for the OpenMDAO framework, based on the Pyevolve
@@ -82,6 +99,23 @@ class Genetic(Driver):
                     "for repeatable results; otherwise leave as None for truly "
                     "random seeding.")
     
+    sequential = Bool(True, iotype="in",
+                      desc="If False, the individuals of each generation are "
+                           "evaluated concurrently, on replicas of the model.")
+    
+    server_idle_timeout = Float(60., low=0., iotype='in', units='s',
+                                desc='When not sequential, servers (with the'
+                                     ' model loaded) are kept for reuse by'
+                                     ' following generations, and released'
+                                     ' after being idle this long or at the'
+                                     ' end of the run.')
+    
+    def __init__(self, *args, **kwargs):
+        super(Genetic, self).__init__(*args, **kwargs)
+        self._fitness = {}  # Objective value keyed by chromosome.
+        self._case_driver = None  # Evaluates batches when not sequential.
+        self._pending = []  # Individuals created since the last batch.
+    
     def _make_alleles(self): 
         """ Returns a GAllelle.Galleles instance with alleles corresponding to 
         the parameters specified by the user"""
@@ -127,8 +161,14 @@ class Genetic(Driver):
         genome.setParams(allele=alleles)
         genome.evaluator.set(self._run_model)
         
-        genome.mutator.set(Mutators.G1DListMutatorAllele)
-        genome.initializator.set(Initializators.G1DListInitializatorAllele)
+        if self.sequential:
+            genome.mutator.set(Mutators.G1DListMutatorAllele)
+            genome.initializator.set(Initializators.G1DListInitializatorAllele)
+        else:
+            # Individuals are collected as they're created, so that the
+            # first evaluation of a generation can evaluate all of them.
+            genome.mutator.set(self._mutate)
+            genome.initializator.set(self._initialize)
         #TODO: fix tournament size settings        
         #genome.setParams(tournamentPool=self.tournament_size)
         
@@ -154,21 +194,135 @@ class Genetic(Driver):
         ga.selector.set(self._selection_mapping[self.selection_method])
         
         #GO
-        ga.evolve(freq_stats=0)
+        self._fitness = {}
+        if self.sequential:
+            ga.evolve(freq_stats=0)
+        else:
+            self._evolve_concurrent(ga)
 
         self.best_individual = ga.bestIndividual()
         
         #run it once to get the model into the optimal state
-        self._run_model(self.best_individual) 
-        
-        # TODO - We really need to be able to record the best candidate from each
-        # generation, but that will only be possible if we let OpenMDAO drive
-        # the optimization. For now, just print out the final best individual state.
+        self.set_parameters([val for val in self.best_individual])
+        self.run_iteration()
         self.record_case()
         
+    def _evolve_concurrent(self, ga):
+        """Evolves `ga`, evaluating each generation as a batch on replicas
+        of the model."""
+        
+        # The case driver is not added to the model, so it doesn't end up in
+        # the egg used to replicate the model. The egg is reused for every
+        # generation, and servers are kept (with the model loaded) until the
+        # end of the run. Cases set all parameters, so the model doesn't
+        # need to be reloaded.
+        case_driver = _PopulationCaseDriver()
+        case_driver.name = '%s_pop' % self.name
+        case_driver.parent = self.parent
+        case_driver.workflow.add(self.workflow.get_names())
+        case_driver._case_id = self._case_id
+        case_driver.reload_model = False
+        case_driver.server_idle_timeout = self.server_idle_timeout
+        for event in self.get_events():
+            case_driver.add_event(event)
+            
+        self._case_driver = case_driver
+        self._pending = []
+        try:
+            ga.evolve(freq_stats=0)
+        finally:
+            self._case_driver = None
+            self._pending = []
+            case_driver.release_servers()
+            case_driver._cleanup()
+            
+    def _initialize(self, genome, **args):
+        """Initializes `genome` and adds it to the pending batch."""
+        Initializators.G1DListInitializatorAllele(genome, **args)
+        self._pending.append(genome)
+        
+    def _mutate(self, genome, **args):
+        """Mutates `genome` and adds it to the pending batch."""
+        nmuts = Mutators.G1DListMutatorAllele(genome, **args)
+        self._pending.append(genome)
+        return nmuts
+            
+    def _evaluate_batch(self, case_driver, individuals):
+        """Evaluates the individuals whose fitness isn't cached yet
+        concurrently using `case_driver`."""
+        
+        objective = self.get_objectives().values()[0].text
+        printvars = []
+        for printvar in self.printvars:
+            if '*' in printvar:
+                printvars.extend(self._get_all_varpaths(printvar))
+            else:
+                printvars.append(printvar)
+        params = self.get_parameters()
+        
+        chromosomes = []
+        cases = []
+        for individual in individuals:
+            chromosome = tuple(individual)
+            if chromosome in self._fitness:
+                continue
+            self._fitness[chromosome] = None
+            case = Case(outputs=[objective]+printvars,
+                        parent_uuid=self._case_id)
+            for val, param in zip(chromosome, params.values()):
+                if isinstance(param, ParameterGroup):
+                    prms = param._params
+                else:
+                    prms = [param]
+                for prm in prms:
+                    case.add_input(prm.target, prm._transform(val))
+            chromosomes.append(chromosome)
+            cases.append(case)
+        if not cases:
+            return
+            
+        case_driver.cases = cases
+        case_driver.recorders = [ListCaseRecorder()]
+        case_driver.setup(replicate=False)
+        case_driver.resume(remove_egg=False)
+        
+        for chromosome, case in zip(chromosomes, cases):
+            if case.msg:
+                self.raise_exception('evaluation of %s failed: %s'
+                                     % (list(chromosome), case.msg),
+                                     RuntimeError)
+            fitness = case[objective]
+            self._fitness[chromosome] = fitness
+            
+            if self.recorders:
+                inputs = []
+                for name, val in zip(params.keys(), chromosome):
+                    if isinstance(name, tuple):
+                        name = name[0]
+                    inputs.append((name, val))
+                outputs = [('Objective', fitness)]
+                outputs.extend([(var, case[var]) for var in printvars])
+                for recorder in self.recorders:
+                    recorder.record(Case(inputs, outputs,
+                                         parent_uuid=self._case_id))
+        
     def _run_model(self, chromosome):
-        self.set_parameters([val for val in chromosome])
-        self.run_iteration()
-        return self.eval_objective()
+        """Returns the objective value for `chromosome`. Each distinct
+        chromosome is only evaluated (and recorded) once."""
+        if self._case_driver is not None and \
+           tuple(chromosome) not in self._fitness:
+            individuals = self._pending + [chromosome]
+            self._pending = []
+            self._evaluate_batch(self._case_driver, individuals)
+            
+        chromosome = tuple(chromosome)
+        fitness = self._fitness.get(chromosome)
+        if fitness is None:
+            self.set_parameters(list(chromosome))
+            self.run_iteration()
+            fitness = self.eval_objective()
+            self._fitness[chromosome] = fitness
+            self.record_case()
+        return fitness
     
     
@@ -7,8 +7,8 @@ are used as termination criteria.
 import logging
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import zeros
-    from numpy.linalg import norm
+    from numpy import zeros, dot
+    from numpy.linalg import norm, lstsq
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 
@@ -43,6 +43,15 @@ class FixedPointIterator(Driver):
                        desc = 'For multivariable iteration, type of norm '
                                    'to use to test convergence.')
 
+    accelerator = Enum('None', ['None', 'Aitken', 'Anderson'], iotype='in',
+                       desc='Acceleration of the iteration. Aitken scales '
+                            'each step by a dynamic relaxation factor. '
+                            'Anderson mixes the last window iterations.')
+
+    window = Int(5, iotype='in', low=1, desc='Number of previous '
+                 'iterations used for Anderson mixing. Also the number of '
+                 'residuals kept in history besides the current one.')
+
 
     def __init__(self):
         super(FixedPointIterator, self).__init__()
@@ -54,7 +63,12 @@ class FixedPointIterator(Driver):
         """Perform the iteration."""
         
         nvar = len(self.get_parameters().values())
-        history = zeros([self.max_iteration, nvar])
+        
+        # Ring buffers with the inputs and residuals of the last window+1
+        # iterations. Iteration k is stored in row k % size.
+        size = self.window + 1
+        x_hist = zeros([size, nvar])
+        r_hist = zeros([size, nvar])
         delta = zeros(nvar)
         
         # Get and save the intial value of the input parameters
@@ -69,13 +83,16 @@ class FixedPointIterator(Driver):
         for i, val in enumerate(self.get_eq_constraints().values()):
             
             term = val.evaluate(self.parent)
-            history[0, i] = term[0] - term[1]
+            delta[i] = term[0] - term[1]
+        x_hist[0] = val0
+        r_hist[0] = delta
 
         if self.norm_order == 'Infinity':
             order = float('inf')
         else:
             order = 2
 
+        omega = 1.0
         unconverged = True
         while unconverged:
 
@@ -84,14 +101,20 @@ class FixedPointIterator(Driver):
 
             # check max iteration
             if self.current_iteration >= self.max_iteration-1:
-                self.history = history[:self.current_iteration+1, :]
+                self.history = self._ordered(r_hist)
                 
                 self._logger.warning('Max iterations exceeded without ' + \
                                      'convergence.')
                 return
                 
             # Pass output to input
-            val0 += history[self.current_iteration, :]
+            if self.accelerator == 'Aitken':
+                omega = self._aitken(r_hist, omega)
+                val0 += omega*delta
+            elif self.accelerator == 'Anderson':
+                val0 = self._anderson(x_hist, r_hist)
+            else:
+                val0 += delta
             self.set_parameters(val0)
 
             # run the workflow
@@ -106,14 +129,50 @@ class FixedPointIterator(Driver):
             
                 term = val.evaluate(self.parent)
                 delta[i] = term[0] - term[1]
-            history[self.current_iteration] = delta
+            x_hist[self.current_iteration % size] = val0
+            r_hist[self.current_iteration % size] = delta
             
             if norm(delta, order) < self.tolerance:
                 break
             # relative tolerance -- problematic around 0
             #if abs( (val1-val0)/val0 ) < self.tolerance:
             #    break
-        self.history = history[:self.current_iteration+1, :]
+        self.history = self._ordered(r_hist)
+        
+    def _ordered(self, buf):
+        """Returns the rows of ring buffer `buf` for the last iterations,
+        oldest first."""
+        size = len(buf)
+        first = max(0, self.current_iteration-size+1)
+        return buf[[k % size for k in range(first, self.current_iteration+1)]]
+        
+    def _aitken(self, r_hist, omega):
+        """Returns the Aitken relaxation factor for the current step, given
+        the factor of the previous step."""
+        if self.current_iteration == 0:
+            return 1.0
+        size = len(r_hist)
+        res = r_hist[self.current_iteration % size]
+        res_old = r_hist[(self.current_iteration-1) % size]
+        dres = res - res_old
+        denom = dot(dres, dres)
+        if denom == 0.0:
+            return omega
+        return -omega*dot(res_old, dres)/denom
+        
+    def _anderson(self, x_hist, r_hist):
+        """Returns the next input from Anderson mixing of the last window
+        iterations."""
+        x = self._ordered(x_hist)
+        res = self._ordered(r_hist)
+        if len(res) == 1:
+            return x[-1] + res[-1]
+        
+        # differences between consecutive iterations, one per column
+        dx = (x[1:] - x[:-1]).T
+        dres = (res[1:] - res[:-1]).T
+        gamma = lstsq(dres, res[-1])[0]
+        return x[-1] + res[-1] - dot(dx + dres, gamma)
         
     def check_config(self):
         """Make sure the problem is set up right."""
@@ -0,0 +1,294 @@
+"""
+    ``newtonkrylov.py`` -- Matrix-free Newton-Krylov solver for large coupled
+    systems, using GMRES from ``scipy.sparse.linalg``.
+
+"""
+
+# pylint: disable-msg=C0103
+
+#public symbols
+__all__ = ['NewtonKrylovSolver']
+
+import logging
+
+try:
+    import numpy
+    from scipy.sparse.linalg import gmres, LinearOperator
+except ImportError as err:
+    logging.warn("In %s: %r" % (__file__, err))
+else:
+    npnorm = numpy.linalg.norm
+    def norm(a, ord=None):
+        return npnorm(numpy.asarray_chkfinite(a), ord=ord)
+
+# pylint: disable-msg=E0611,F0401
+from openmdao.lib.datatypes.api import Float, Int, Enum
+
+from openmdao.main.driver_uses_derivatives import DriverUsesDerivatives
+from openmdao.main.exceptions import RunStopped
+from openmdao.main.hasparameters import HasParameters
+from openmdao.main.hasconstraints import HasEqConstraints
+from openmdao.util.decorators import add_delegate, stub_if_missing_deps
+from openmdao.main.interfaces import IHasParameters, IHasEqConstraints, \
+                                     ISolver, implements
+
+
+@stub_if_missing_deps('numpy', 'scipy')
+@add_delegate(HasParameters, HasEqConstraints)
+class NewtonKrylovSolver(DriverUsesDerivatives):
+    """ :term:`MIMO` Newton-Krylov solver that never forms a dense Jacobian,
+    so that memory scales linearly with the number of coupling variables.
+    Like the BroydenSolver, it finds x for which F(x)=0, where the x are the
+    parameters and F(x) are the residuals of the equality constraints.
+
+    - ``newton-krylov``: Each Newton step is solved inexactly with GMRES.
+      The Jacobian-vector products GMRES needs are either finite
+      differences along the Krylov direction, which cost one workflow run
+      each (``jacobian = 'fd'``), or products with the gradients of the
+      socketed differentiator, computed once per Newton step
+      (``jacobian = 'differentiator'``). Note that the differentiator
+      returns dense gradients.
+    - ``limited-broyden``: Broyden's second method, with the inverse
+      Jacobian stored as at most `memory` rank-one updates of
+      ``-alpha*I``. It needs one workflow run per iteration.
+    """
+
+    implements(IHasParameters, IHasEqConstraints, ISolver)
+
+    # pylint: disable-msg=E1101
+    algorithm = Enum('newton-krylov', ['newton-krylov', 'limited-broyden'],
+                     iotype='in', desc='Algorithm to use. Choose from '
+                     'newton-krylov and limited-broyden.')
+
+    jacobian = Enum('fd', ['fd', 'differentiator'], iotype='in',
+                    desc='Source of the Jacobian-vector products for '
+                    'newton-krylov: finite differences along each Krylov '
+                    'direction, or the socketed differentiator.')
+
+    itmax = Int(10, iotype='in', desc='Maximum number of iterations before '
+                'termination.')
+
+    tol = Float(0.00001, iotype='in',
+                desc='Convergence tolerance. If the norm of the independent '
+                'vector is lower than this, then terminate successfully.')
+
+    eta = Float(0.01, iotype='in', low=0.0, high=1.0,
+                desc='Relative tolerance of the GMRES solution of each '
+                'Newton step (newton-krylov only).')
+
+    restart = Int(20, iotype='in', low=1,
+                  desc='Number of GMRES iterations between restarts '
+                  '(newton-krylov only).')
+
+    gmres_maxiter = Int(50, iotype='in', low=1,
+                        desc='Maximum number of GMRES restart cycles per '
+                        'Newton step (newton-krylov only).')
+
+    fd_step = Float(1.0e-6, iotype='in',
+                    desc='Relative finite difference step for the '
+                    'Jacobian-vector products.')
+
+    alpha = Float(0.4, iotype='in',
+                  desc='Mixing Coefficient (limited-broyden only).')
+
+    memory = Int(10, iotype='in', low=1,
+                 desc='Maximum number of rank-one updates kept '
+                 '(limited-broyden only).')
+
+    def __init__(self):
+
+        super(NewtonKrylovSolver, self).__init__()
+
+        self.xin = numpy.zeros(0,'d')
+        self.F = numpy.zeros(0,'d')
+
+
+    def check_config(self):
+        """Make sure the problem is set up right."""
+
+        # only check component derivatives if they are used
+        self.uses_gradients = self.jacobian == 'differentiator' and \
+                              self.algorithm == 'newton-krylov'
+
+        super(NewtonKrylovSolver, self).check_config()
+
+        if self.uses_gradients and not self.differentiator:
+            msg = 'A differentiator must be socketed for this driver.'
+            self.raise_exception(msg, RuntimeError)
+
+        if len(self.get_eq_constraints()) != len(self.get_parameters()):
+            msg = "The number of input parameters must equal the number of" + \
+                  " output constraint equations in NewtonKrylovSolver."
+            self.raise_exception(msg, RuntimeError)
+
+    def execute(self):
+        """Solver execution."""
+        # get the initial values of the independents
+        independents = self.get_parameters().values()
+        self.xin = numpy.zeros(len(independents),'d')
+        for i, val in enumerate(independents):
+            self.xin[i] = val.evaluate(self.parent)
+        # perform an initial run for self-consistency
+        self.pre_iteration()
+        self.run_iteration()
+        self.post_iteration()
+
+        # get initial dependents
+        self.F = self._get_residuals()
+
+        # pick solver algorithm
+        if self.algorithm == 'newton-krylov':
+            self.execute_newton_krylov()
+        elif self.algorithm == 'limited-broyden':
+            self.execute_limited_broyden()
+
+    def _get_residuals(self):
+        """Returns the residuals of the equality constraints."""
+        dependents = self.get_eq_constraints().values()
+        F = numpy.zeros(len(dependents),'d')
+        for i, val in enumerate(dependents):
+            term = val.evaluate(self.parent)
+            F[i] = term[0] - term[1]
+        return F
+
+    def _run_model(self, x):
+        """Runs the workflow with independents `x` and returns the
+        residuals."""
+        self.set_parameters(x)
+        self.pre_iteration()
+        self.run_iteration()
+        self.post_iteration()
+        return self._get_residuals()
+
+    def _calc_jacobian(self):
+        """Returns the Jacobian of the residuals from the differentiator."""
+        self.ffd_order = 1
+        self.differentiator.calc_gradient()
+        self.ffd_order = 0
+        return numpy.array([self.differentiator.get_gradient(name)
+                            for name in self.get_eq_constraints().keys()])
+
+    def execute_newton_krylov(self):
+        """Inexact Newton iteration. Each step J*dx = -F is solved with
+        GMRES to a relative tolerance of `eta`.
+
+        Only the current independents and residuals and the GMRES Krylov
+        basis are stored, so memory is O(restart*n) with finite
+        differences.
+        """
+
+        xm = self.xin.copy()
+        Fxm = self.F.copy()
+        n = len(xm)
+
+        for it in range(self.itmax):
+
+            if self._stop:
+                self.raise_exception('Stop requested', RunStopped)
+
+            fnorm = norm(Fxm)
+            if fnorm < self.tol:
+                return
+
+            if self.jacobian == 'fd':
+                def matvec(v, xm=xm, Fxm=Fxm):
+                    """Directional finite difference of the residuals."""
+                    v = numpy.asarray(v).flatten()
+                    vnorm = norm(v)
+                    if vnorm == 0:
+                        return numpy.zeros(n,'d')
+                    eps = self.fd_step*(1.0 + norm(xm))/vnorm
+                    return (self._run_model(xm + eps*v) - Fxm)/eps
+            else:
+                jac = self._calc_jacobian()
+                def matvec(v, jac=jac):
+                    """Product with the differentiator's Jacobian."""
+                    return numpy.dot(jac, numpy.asarray(v).flatten())
+
+            # Solve for the step scaled by the residual norm. Some versions
+            # of gmres treat tol as an absolute tolerance, which would accept
+            # a zero step once the residuals are small.
+            J = LinearOperator((n, n), matvec=matvec, dtype='d')
+            deltaxm, info = gmres(J, -Fxm/fnorm, tol=self.eta,
+                                  restart=self.restart,
+                                  maxiter=self.gmres_maxiter)
+            if info < 0:
+                self.raise_exception('GMRES failed with illegal input or '
+                                     'breakdown (info = %d).' % info,
+                                     RuntimeError)
+            if info > 0:
+                self._logger.debug('GMRES did not reach a relative '
+                                   'tolerance of %g in %d iterations.'
+                                   % (self.eta, info))
+
+            xm = xm + deltaxm*fnorm
+
+            # update the new independents in the model and run it
+            Fxm = self._run_model(xm)
+            self.xin = xm
+            self.F = Fxm
+
+            self.record_case()
+
+            # successful termination if independents are below tolerance
+            if norm(Fxm) < self.tol:
+                return
+
+        self._logger.warning('Max iterations exceeded without convergence.')
+
+    def execute_limited_broyden(self):
+        """Broyden's second method, as in BroydenSolver.execute_broyden3,
+        but with at most `memory` rank-one updates of the inverse Jacobian.
+        When more are made, the oldest update is dropped, so memory is
+        O(memory*n).
+        """
+
+        zy = []
+
+        def Gmul(f):
+            """G=-alpha*1+z*y.T+z*y.T ..."""
+            s = -self.alpha*f
+            for z, y in zy:
+                s = s + z*numpy.dot(y, f)
+            return s
+
+        xm = self.xin.copy()
+        Fxm = self.F.copy()
+
+        for it in range(self.itmax):
+
+            if self._stop:
+                self.raise_exception('Stop requested', RunStopped)
+
+            deltaxm = Gmul(-Fxm)
+            xm = xm + deltaxm
+
+            # update the new independents in the model and run it
+            Fxm1 = self._run_model(xm)
+            self.xin = xm
+            self.F = Fxm1
+
+            self.record_case()
+
+            # successful termination if independents are below tolerance
+            if norm(Fxm1) < self.tol:
+                return
+
+            deltaFxm = Fxm1 - Fxm
+
+            if norm(deltaFxm) == 0:
+                msg = "Broyden iteration has stopped converging. Change in " + \
+                      "input has produced no change in output. This could " + \
+                      "indicate a problem with your component connections. " + \
+                      "It could also mean that this solver method is " + \
+                      "inadequate for your problem."
+                raise RuntimeError(msg)
+
+            Fxm = Fxm1
+            zy.append((deltaxm - Gmul(deltaFxm), deltaFxm/norm(deltaFxm)**2))
+            if len(zy) > self.memory:
+                del zy[0]
+
+        self._logger.warning('Max iterations exceeded without convergence.')
+
+# end newtonkrylov.py
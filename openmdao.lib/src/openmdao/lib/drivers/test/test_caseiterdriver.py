@@ -19,8 +19,10 @@ from openmdao.main.interfaces import ICaseIterator
 from openmdao.main.eggchecker import check_save_load
 from openmdao.main.exceptions import RunStopped
 from openmdao.main.resource import ResourceAllocationManager, ClusterAllocator
+from openmdao.main.serverpool import SERVER_POOL
 
 from openmdao.lib.datatypes.api import Float, Bool, Array, Int, Slot, Str
+from openmdao.lib.drivers import caseiterdriver
 from openmdao.lib.drivers.caseiterdriver import CaseIteratorDriver
 from openmdao.lib.drivers.simplecid import SimpleCaseIterDriver
 from openmdao.lib.casehandlers.api import ListCaseRecorder, ListCaseIterator, \
@@ -254,6 +256,104 @@ class TestCase(unittest.TestCase):
         self.run_cases(sequential=False, forced_errors=True, retry=False)
         self.run_cases(sequential=False, forced_errors=True, retry=True)
 
+    def test_pipelined(self):
+        logging.debug('')
+        logging.debug('test_pipelined')
+        init_cluster(encrypted=True, allow_shell=True)
+        self.model.driver.queue_depth = 2
+        self.model.driver.batch_size = 2
+        self.model.driver.reload_model = False
+        self.run_cases(sequential=False)
+
+        stats = self.model.driver.get_server_stats()
+        self.assertTrue(stats)
+        self.assertEqual(sum([entry['cases'] for entry in stats.values()]),
+                         len(self.cases))
+        for entry in stats.values():
+            self.assertTrue(entry['queue_depth'] <= 2)
+            self.assertTrue(0. <= entry['utilization'] <= 1.)
+
+    def test_pipelined_errors(self):
+        logging.debug('')
+        logging.debug('test_pipelined_errors')
+        init_cluster(encrypted=True, allow_shell=True)
+        self.model.driver.queue_depth = 2
+        self.model.driver.batch_size = 2
+        self.generate_cases(force_errors=True)
+        self.run_cases(sequential=False, forced_errors=True, retry=False)
+        self.run_cases(sequential=False, forced_errors=True, retry=True)
+
+    def test_warm_servers(self):
+        logging.debug('')
+        logging.debug('test_warm_servers')
+        init_cluster(encrypted=True, allow_shell=True)
+        self.model.driver.reload_model = False
+        self.model.driver.server_idle_timeout = 60
+
+        ram = ResourceAllocationManager._get_instance()
+        transfers = []  # Destination server for each model transfer.
+        orig_filexfer = caseiterdriver.filexfer
+        def filexfer(*args, **kwargs):
+            transfers.append(id(args[2]))
+            return orig_filexfer(*args, **kwargs)
+        caseiterdriver.filexfer = filexfer
+        try:
+            # First execution changes validity state saved with the model.
+            self.run_cases(sequential=False)
+            n_servers = len(SERVER_POOL)
+            allocations = ram._allocations
+            del transfers[:]
+            self.run_cases(sequential=False)
+            self.assertEqual(ram._allocations, allocations)
+            loaded = set(transfers)
+            self.assertTrue(0 < len(loaded) <= n_servers)
+            self.assertEqual(len(loaded), len(transfers))
+
+            # Same model: servers are reused, loaded models aren't resent.
+            del transfers[:]
+            self.run_cases(sequential=False)
+            self.assertEqual(ram._allocations, allocations)
+            self.assertEqual(len(SERVER_POOL), n_servers)
+            self.assertFalse(loaded.intersection(transfers))
+
+            # Changed model: servers are reused, the model is transferred.
+            del transfers[:]
+            self.model.driven.sum_y = 42.
+            self.run_cases(sequential=False)
+            self.assertEqual(ram._allocations, allocations)
+            self.assertTrue(transfers)
+        finally:
+            caseiterdriver.filexfer = orig_filexfer
+            SERVER_POOL.clear()
+        self.assertEqual(len(SERVER_POOL), 0)
+
+    def test_local_replication(self):
+        logging.debug('')
+        logging.debug('test_local_replication')
+        init_cluster(encrypted=True, allow_shell=True)
+
+        sent = []  # Model files transferred.
+        orig_filexfer = caseiterdriver.filexfer
+        def filexfer(*args, **kwargs):
+            sent.append(args[1])
+            return orig_filexfer(*args, **kwargs)
+        caseiterdriver.filexfer = filexfer
+        try:
+            # Only local allocators, so model state is just pickled.
+            self.run_cases(sequential=False)
+            self.assertTrue(sent)
+            for filename in sent:
+                self.assertTrue(filename.endswith('.pickle'))
+
+            del sent[:]
+            self.model.driver.local_replication = False
+            self.run_cases(sequential=False)
+            self.assertTrue(sent)
+            for filename in sent:
+                self.assertTrue(filename.endswith('.egg'))
+        finally:
+            caseiterdriver.filexfer = orig_filexfer
+
     def test_unencrypted(self):
         logging.debug('')
         logging.debug('test_unencrypted')
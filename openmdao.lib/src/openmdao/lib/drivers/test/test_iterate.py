@@ -8,6 +8,7 @@ import unittest
 from openmdao.main.api import Assembly, Component, set_as_top
 from openmdao.lib.datatypes.api import Float
 from openmdao.lib.drivers.iterate import FixedPointIterator, IterateUntil
+from openmdao.lib.casehandlers.api import ListCaseRecorder
 from openmdao.util.testutil import assert_rel_error
 
 
@@ -71,6 +72,17 @@ class Multi(Component):
         self.out1 = self.in1/10.0
         self.out2 = self.in2/10.0
 
+class Coupled(Component): 
+    """Slowly converging linear coupling"""
+    in1 = Float(0.0, iotype="in")
+    in2 = Float(0.0, iotype="in")
+    out1 = Float(0, iotype="out")
+    out2 = Float(0, iotype="out")
+    
+    def execute(self):
+        self.out1 = 0.6*self.in1 + 0.3*self.in2 + 1.0
+        self.out2 = 0.3*self.in1 + 0.6*self.in2 + 2.0
+
 class FixedPointIteratorTestCase(unittest.TestCase):
     """test FixedPointIterator component"""
 
@@ -109,6 +121,44 @@ class FixedPointIteratorTestCase(unittest.TestCase):
         assert_rel_error(self, self.top.simple.out1, .001, .0002)
         self.assertEqual(self.top.driver.current_iteration, 2)
             
+    def _run_coupled(self, accelerator):
+        self.top.add("driver", FixedPointIterator())
+        self.top.add("simple", Coupled())
+        self.top.driver.workflow.add('simple')
+        
+        self.top.driver.add_constraint('simple.out1 = simple.in1')
+        self.top.driver.add_constraint('simple.out2 = simple.in2')
+        self.top.driver.add_parameter('simple.in1', -9e99, 9e99)
+        self.top.driver.add_parameter('simple.in2', -9e99, 9e99)
+        self.top.driver.tolerance = 1e-8
+        self.top.driver.max_iteration = 500
+        self.top.driver.window = 3
+        self.top.driver.accelerator = accelerator
+        self.top.driver.recorders = [ListCaseRecorder()]
+        self.top.run()
+        
+        # solution of x = A*x + b
+        assert_rel_error(self, self.top.simple.in1, 1.0/0.07, 1e-6)
+        assert_rel_error(self, self.top.simple.in2, 1.1/0.07, 1e-6)
+        
+        # residuals of the last window+1 iterations are kept, and all
+        # iterations are recorded
+        self.assertEqual(self.top.driver.history.shape, (4, 2))
+        self.assertEqual(self.top.driver.history[-1, 0],
+                         self.top.simple.out1 - self.top.simple.in1)
+        cases = self.top.driver.recorders[0].cases
+        self.assertEqual(len(cases), self.top.driver.current_iteration)
+        return self.top.driver.current_iteration
+        
+    def test_accelerator(self):
+        plain = self._run_coupled('None')
+        self.top = set_as_top(Assembly())
+        aitken = self._run_coupled('Aitken')
+        self.top = set_as_top(Assembly())
+        anderson = self._run_coupled('Anderson')
+        self.assertTrue(aitken < plain)
+        self.assertTrue(anderson < aitken)
+        
     def test_maxiteration(self):
         self.top.add("driver", FixedPointIterator())
         self.top.add("simple", Simple1())
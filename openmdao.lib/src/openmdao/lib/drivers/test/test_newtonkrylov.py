@@ -0,0 +1,210 @@
+"""
+Test the Newton-Krylov solver component.
+"""
+
+import unittest
+import numpy
+
+
+from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.lib.drivers.api import NewtonKrylovSolver
+from openmdao.lib.differentiators.finite_difference import FiniteDifference
+from openmdao.lib.casehandlers.api import ListCaseRecorder
+from openmdao.main.datatypes.float import Float
+from openmdao.util.testutil import assert_rel_error
+
+# pylint: disable-msg=E1101,E1103
+# "Instance of <class> has no <attr> member"
+
+class SellarDiscipline1(Component):
+    """Component containing Discipline 1"""
+
+    # pylint: disable-msg=E1101
+    z1 = Float(0.0, iotype='in', desc='Global Design Variable')
+    z2 = Float(0.0, iotype='in', desc='Global Design Variable')
+    x1 = Float(0.0, iotype='in', desc='Local Design Variable')
+    y2 = Float(0.0, iotype='in', desc='Disciplinary Coupling')
+
+    y1 = Float(iotype='out', desc='Output of this Discipline')
+
+
+    def execute(self):
+        """Evaluates the equation
+        y1 = z1**2 + z2 + x1 - 0.2*y2"""
+
+        self.y1 = self.z1**2 + self.z2 + self.x1 - 0.2*self.y2
+
+
+class SellarDiscipline2(Component):
+    """Component containing Discipline 2"""
+
+    # pylint: disable-msg=E1101
+    z1 = Float(0.0, iotype='in', desc='Global Design Variable')
+    z2 = Float(0.0, iotype='in', desc='Global Design Variable')
+    y1 = Float(0.0, iotype='in', desc='Disciplinary Coupling')
+
+    y2 = Float(iotype='out', desc='Output of this Discipline')
+
+
+    def execute(self):
+        """Evaluates the equation
+        y2 = y1**(.5) + z1 + z2"""
+
+        self.y2 = abs(self.y1)**(.5) + self.z1 + self.z2
+
+
+class SellarNewtonKrylov(Assembly):
+    """Solution of the sellar analytical problem using MDF."""
+
+    def configure(self):
+
+        self.add('driver', NewtonKrylovSolver())
+
+        self.add('dis1', SellarDiscipline1())
+        self.add('dis2', SellarDiscipline2())
+        self.driver.workflow.add(['dis1', 'dis2'])
+
+        self.connect('dis1.y1','dis2.y1')
+
+        # solver connections
+        self.driver.add_parameter('dis1.y2', low=-9.e99, high=9.e99)
+        self.driver.add_constraint('dis2.y2 = dis1.y2')
+        self.driver.itmax = 20
+        self.driver.tol = .000000001
+
+
+class MIMOEquation(Component):
+    """Equation with 5 inputs and 5 outputs"""
+
+    # pylint: disable-msg=E1101
+    x1 = Float(1.0, iotype='in', desc='Global Design Variable')
+    x2 = Float(1.0, iotype='in', desc='Global Design Variable')
+    x3 = Float(1.0, iotype='in', desc='Global Design Variable')
+    x4 = Float(1.0, iotype='in', desc='Global Design Variable')
+    x5 = Float(1.0, iotype='in', desc='Global Design Variable')
+
+    f1 = Float(iotype='out', desc='Output of this Discipline')
+    f2 = Float(iotype='out', desc='Output of this Discipline')
+    f3 = Float(iotype='out', desc='Output of this Discipline')
+    f4 = Float(iotype='out', desc='Output of this Discipline')
+    f5 = Float(iotype='out', desc='Output of this Discipline')
+
+
+    def execute(self):
+        """Should converge to x=[0,0,0,0,0]"""
+
+        xx = numpy.array([self.x1, self.x2, self.x3, self.x4, self.x5])
+
+        d = numpy.array([3,2,1.5,1,0.5])
+        c = 0.01
+
+        ff = -d*xx - c*xx**3
+
+        self.f1 = ff[0]
+        self.f2 = ff[1]
+        self.f3 = ff[2]
+        self.f4 = ff[3]
+        self.f5 = ff[4]
+
+
+class MIMONewtonKrylov(Assembly):
+    """Solution of the MIMO problem."""
+
+    def configure(self):
+
+        self.add('driver', NewtonKrylovSolver())
+
+        self.add('dis1', MIMOEquation())
+        self.driver.workflow.add(['dis1'])
+
+        for i in range(1, 6):
+            self.driver.add_parameter('dis1.x%d' % i, low=-9.e99, high=9.e99)
+            self.driver.add_constraint('dis1.f%d = 0.0' % i)
+        self.driver.itmax = 40
+        self.driver.alpha = .8
+        self.driver.tol = .000001
+
+
+class TestCase(unittest.TestCase):
+    """ Test the Newton-Krylov solver. """
+
+    def _check_sellar(self, prob):
+        assert_rel_error(self, prob.dis1.y1, 0.819002, 0.0001)
+        assert_rel_error(self, prob.dis2.y1, 0.819002, 0.0001)
+        assert_rel_error(self, prob.dis1.y2, 0.904988, 0.0001)
+        assert_rel_error(self, prob.dis2.y2, 0.904988, 0.0001)
+
+    def _check_mimo(self, prob):
+        for i in range(1, 6):
+            assert_rel_error(self, 1.0 - getattr(prob.dis1, 'x%d' % i),
+                             1.0, 0.0001)
+
+    def _sellar(self):
+        prob = set_as_top(SellarNewtonKrylov())
+        prob.dis1.x1 = 1.0
+        return prob
+
+    def test_newton_krylov_fd(self):
+        prob = self._sellar()
+        prob.driver.recorders = [ListCaseRecorder()]
+        prob.run()
+        self._check_sellar(prob)
+        # Newton converges in a few iterations
+        self.assertTrue(len(prob.driver.recorders[0].cases) < 6)
+
+    def test_newton_krylov_differentiator(self):
+        prob = self._sellar()
+        prob.driver.jacobian = 'differentiator'
+        prob.driver.differentiator = FiniteDifference()
+        prob.run()
+        self._check_sellar(prob)
+
+    def test_limited_broyden(self):
+        prob = self._sellar()
+        prob.driver.algorithm = 'limited-broyden'
+        prob.driver.memory = 2
+        prob.run()
+        self._check_sellar(prob)
+
+    def test_MIMO_newton_krylov(self):
+        prob = set_as_top(MIMONewtonKrylov())
+        prob.run()
+        self._check_mimo(prob)
+
+    def test_MIMO_limited_broyden(self):
+        prob = set_as_top(MIMONewtonKrylov())
+        prob.driver.algorithm = 'limited-broyden'
+        prob.run()
+        self._check_mimo(prob)
+
+    def test_check_config(self):
+        prob = set_as_top(MIMONewtonKrylov())
+        prob.driver.remove_constraint('dis1.f5 = 0.0')
+
+        try:
+            prob.run()
+        except RuntimeError, err:
+            msg = "driver: The number of input parameters must equal the " + \
+                  "number of output constraint equations in NewtonKrylovSolver."
+            self.assertEqual(str(err), msg)
+        else:
+            self.fail('RuntimeError expected')
+
+        prob.driver.add_constraint('dis1.f5 = 0.0')
+        prob.driver.jacobian = 'differentiator'
+
+        try:
+            prob.run()
+        except RuntimeError, err:
+            msg = "driver: A differentiator must be socketed for this driver."
+            self.assertEqual(str(err), msg)
+        else:
+            self.fail('RuntimeError expected')
+
+
+if __name__ == '__main__':
+    import nose
+    import sys
+    sys.argv.append('--cover-package=openmdao')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()
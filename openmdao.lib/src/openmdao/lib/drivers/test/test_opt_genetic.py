@@ -13,6 +13,8 @@ from openmdao.lib.datatypes.api import Float, Array, Enum, Int, Str
 from pyevolve import Selectors
 
 from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.main.serverpool import SERVER_POOL
+from openmdao.lib.casehandlers.api import ListCaseRecorder
 from openmdao.lib.drivers.genetic import Genetic
 from openmdao.main.eggchecker import check_save_load
 
@@ -120,6 +122,50 @@ class TestCase(unittest.TestCase):
         self.assertEqual(y, 0)
         self.assertEqual(z, 0)
 
+    def _run_recorded(self, sequential):
+        self.top.add('comp', SphereFunction())
+        self.top.driver.workflow.add('comp')
+        self.top.driver.add_objective("comp.total")
+
+        self.top.driver.add_parameter('comp.x')
+        self.top.driver.add_parameter('comp.y')
+        self.top.driver.add_parameter('comp.z')
+
+        self.top.driver.generations = 5
+        self.top.driver.population_size = 10
+        self.top.driver.elitism = True
+        self.top.driver.sequential = sequential
+        self.top.driver.recorders = [ListCaseRecorder()]
+
+        self.top.run()
+
+        cases = self.top.driver.recorders[0].get_iterator()
+        # Every distinct individual is evaluated and recorded just once,
+        # followed by the final best individual.
+        chromosomes = [(case['comp.x'], case['comp.y'], case['comp.z'])
+                       for case in cases]
+        self.assertEqual(len(set(chromosomes[:-1])), len(chromosomes)-1)
+        self.assertTrue(len(chromosomes)-1 < 6*10)
+        best = tuple(self.top.driver.best_individual)
+        self.assertEqual(chromosomes[-1], best)
+        self.assertTrue(best in chromosomes[:-1])
+        for case in cases:
+            x, y, z = case['comp.x'], case['comp.y'], case['comp.z']
+            self.assertAlmostEqual(case['Objective'], x**2+y**2+z**2)
+        return best, chromosomes
+
+    def test_record_individuals(self):
+        self._run_recorded(sequential=True)
+
+    def test_concurrent(self):
+        best, chromosomes = self._run_recorded(sequential=False)
+        # Servers are kept between generations and released at the end.
+        self.assertEqual(len(SERVER_POOL), 0)
+        self.setUp()
+        seq_best, seq_chromosomes = self._run_recorded(sequential=True)
+        self.assertEqual(best, seq_best)
+        self.assertEqual(sorted(chromosomes), sorted(seq_chromosomes))
+
     def test_optimizeSpherearray_nolowhigh(self):
         self.top.add('comp', SphereFunctionArray())
         self.top.driver.workflow.add('comp')
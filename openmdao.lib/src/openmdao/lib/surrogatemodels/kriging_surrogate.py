@@ -1,14 +1,16 @@
 """ Surrogate model based on Kriging. """
 
-from math import log, e, sqrt
+from math import log, e
 import logging
 
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import array, zeros, dot, ones, arange, eye, abs, vstack, exp, diag
-    from numpy.linalg import det, linalg, lstsq
-    from scipy.linalg import cho_factor, cho_solve
-    from scipy.optimize import fmin
+    from numpy import array, zeros, dot, ones, eye, abs, vstack, exp, \
+                      diag, sqrt, triu_indices, outer, concatenate, triu, tril
+    from numpy import log as vlog
+    from numpy.linalg import det, linalg, lstsq, pinv
+    from scipy.linalg import cho_factor, cho_solve, cholesky, solve_triangular
+    from scipy.optimize import fmin_tnc
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 
@@ -32,12 +34,30 @@ class KrigingSurrogate(Container):
         self.n = None #number of training points
         self.thetas = None
         self.nugget = 0 #nugget smoothing parameter from [Sasena, 2002]
+        self.theta_bounds = (-6., 3.) #bounds on log10(thetas) during training
+        self.refit_interval = 10 #update() refits thetas once this many points
+                                 #have been added since the last fit, None to
+                                 #never refit
         
         self.R = None
         self.R_fact = None
         self.mu = None
         self.sig2 = None
         self.log_likelihood = None
+        
+        # solutions of R*x = (Y-mu) and R*x = 1, cached at train time so
+        # that predictions only need to solve for the correlation vectors
+        self.R_solve_ymu = None
+        self.R_solve_one = None
+        
+        # squared distances between each pair of training points (one row 
+        # per pair, one column per independent), computed once per training 
+        # set and only rescaled by thetas during the hyperparameter fit
+        self._pairs = None
+        self._sq_dists = None
+        
+        # number of training points when thetas were last fit
+        self._n_fit = 0
                     
     def get_uncertain_value(self,value): 
         """Returns a NormalDistribution centered around the value, with a 
@@ -48,56 +68,45 @@ class KrigingSurrogate(Container):
         """Calculates a predicted value of the response based on the current
         trained model for the supplied list of inputs.
         """
+        f, RMSE = self.predict_batch([new_x])
+        return NormalDistribution(f[0], RMSE[0])
+        
+    def predict_batch(self, X_new):
+        """Calculates the predicted mean and root mean square error of the 
+        response at every point in X_new in a single vectorized call.
+        
+        X_new: 2D array-like
+            One row of independent values per point to be predicted.
+            
+        Returns a tuple of arrays (mu, RMSE), each with one entry per row 
+        of X_new.
+        """
         if self.m == None: #untrained surrogate
             raise RuntimeError("KrigingSurrogate has not been trained, so no "
                                "prediction can be made")
-        r = zeros(self.n)
-        X, Y = self.X, self.Y
         thetas = 10.**self.thetas
-        XX = array(X)
-        new_x = array(new_x)
-        for i in range(self.n):
-            r[i] = sum(thetas*(XX[i]-new_x)**2.)
-        r = exp(-r)
-            
-        one = ones(self.n)
+        XX = array(self.X, dtype=float)
+        X_new = array(X_new, dtype=float).reshape(-1, self.m)
+        
+        # correlation of every new point (rows) with every training point 
+        # (columns)
+        r = exp(-(thetas*(X_new[:, None, :]-XX[None, :, :])**2.).sum(axis=2))
+        
         if self.R_fact is not None: 
             #---CHOLESKY DECOMPOSTION ---
-            #f = self.mu+dot(r,cho_solve(self.R_fact,Y-dot(one,self.mu)))
-            #term1 = dot(r,cho_solve(self.R_fact,r))
-            #term2 = (1.0-dot(one,cho_solve(self.R_fact,r)))**2./dot(one,cho_solve(self.R_fact,one))
-            
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            R_fact = (self.R_fact[0].T,not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-            
-            f = self.mu + dot(r, cho[0])
-            term1 = dot(r, cho[1])
-            term2 = (1.0 - dot(one, cho[1]))**2./dot(one, cho[2])
-            
+            R_solve_r = cho_solve(self.R_fact, r.T).T
         else: 
             #-----LSTSQ-------
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            lsq = lstsq(self.R.T, rhs)[0].T
+            R_solve_r = lstsq(self.R.T, r.T)[0].T
             
-            f = self.mu + dot(r, lsq[0])
-            term1 = dot(r, lsq[1])
-            term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-            """
-      #-----LSTSQ-------
-      rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-      lsq = lstsq(self.R.T, rhs)[0].T
-      
-      f = self.mu + dot(r, lsq[0])
-      term1 = dot(r, lsq[1])
-      term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-      """
+        f = self.mu + dot(r, self.R_solve_ymu)
+        term1 = (r*R_solve_r).sum(axis=1)
+        term2 = (1.0 - dot(r, self.R_solve_one))**2./self.R_solve_one.sum()
+        
         MSE = self.sig2*(1.0-term1+term2)
         RMSE = sqrt(abs(MSE))
         
-        dist = NormalDistribution(f, RMSE)
-        return dist
-        
+        return f, RMSE
 
     def train(self,X,Y):
         """Train the surrogate model with the given set of inputs and outputs."""
@@ -113,38 +122,139 @@ class KrigingSurrogate(Container):
         self.Y = Y
         self.m = len(X[0])
         self.n = len(X)
+        
+        XX = array(X, dtype=float)
+        self._pairs = triu_indices(self.n, 1)
+        self._sq_dists = (XX[self._pairs[0]]-XX[self._pairs[1]])**2.
                 
         thetas = zeros(self.m)
         def _calcll(thetas):
             self.thetas = thetas
-            self._calculate_log_likelihood()
-            return -self.log_likelihood
+            grad = self._calculate_log_likelihood(gradient=True)
+            return -self.log_likelihood, -grad
         #if self.thetas == None:
-        self.thetas = fmin(_calcll, thetas, disp=False, ftol = 0.0001)
+        self.thetas = fmin_tnc(_calcll, thetas, bounds=[self.theta_bounds]*self.m,
+                               disp=0)[0]
+        self._n_fit = self.n
         self._calculate_log_likelihood()
+        self._calculate_predictor_solves()
+        
+    def _calculate_predictor_solves(self):
+        """Caches R^-1*(Y-mu) and R^-1*1, which are independent of the point 
+        being predicted."""
+        one = ones(self.n)
+        rhs = vstack([(array(self.Y)-dot(one, self.mu)), one]).T
+        if self.R_fact is not None: 
+            sol = cho_solve(self.R_fact, rhs).T
+        else: 
+            sol = lstsq(self.R.T, rhs)[0].T
+        self.R_solve_ymu = sol[0]
+        self.R_solve_one = sol[1]
+        
+    def update(self, X, Y):
+        """Adds new training points to the surrogate model without refitting 
+        thetas. The Cholesky factor of R is extended with the rows for the 
+        new points instead of being recomputed. Once refit_interval points 
+        have been added since thetas were last fit, the model is retrained 
+        on all the points instead, so thetas don't go stale.
+        
+        X: 2D array-like
+            One row of independent values per new training point.
+        Y: 1D array-like
+            Output value for each new training point.
+        """
+        if self.m == None: #untrained surrogate
+            self.train(X, Y)
+            return
+        
+        X_old = array(self.X, dtype=float)
+        X_new = array(X, dtype=float).reshape(-1, self.m)
+        n_old = self.n
+        
+        X_all = vstack([X_old, X_new])
+        Y_all = concatenate([array(self.Y, dtype=float), array(Y, dtype=float)])
+        if self.refit_interval and \
+           len(X_all)-self._n_fit >= self.refit_interval:
+            self.train(X_all, Y_all)
+            return
+        
+        self.X = X_all
+        self.Y = Y_all
+        self.n = len(self.X)
+        self._pairs = triu_indices(self.n, 1)
+        self._sq_dists = (self.X[self._pairs[0]]-self.X[self._pairs[1]])**2.
+        
+        # correlations of the new points with the old ones (B) and with 
+        # each other (C)
+        thetas = 10.**self.thetas
+        B = (1-self.nugget)*exp(-dot((X_old[:, None, :]-X_new[None, :, :])**2.,
+                                     thetas))
+        C = (1-self.nugget)*exp(-dot((X_new[:, None, :]-X_new[None, :, :])**2.,
+                                     thetas))
+        C[range(len(X_new)), range(len(X_new))] = 1.
+        R = zeros((self.n, self.n))
+        R[:n_old, :n_old] = self.R
+        R[:n_old, n_old:] = B
+        R[n_old:, :n_old] = B.T
+        R[n_old:, n_old:] = C
+        self.R = R
+        
+        if self.R_fact is not None: 
+            try:
+                # [R B; B^T C] = U^T*U with U = [U11 S; 0 U22]
+                U11, lower = self.R_fact
+                U11 = tril(U11).T if lower else triu(U11)
+                S = solve_triangular(U11, B, trans='T')
+                U22 = cholesky(C-dot(S.T, S))
+                U = zeros((self.n, self.n))
+                U[:n_old, :n_old] = U11
+                U[:n_old, n_old:] = S
+                U[n_old:, n_old:] = U22
+                self.R_fact = (U, False)
+                self._calculate_cholesky_likelihood()
+            except (linalg.LinAlgError,ValueError):
+                self._calculate_log_likelihood()
+        else: 
+            self._calculate_log_likelihood()
+        self._calculate_predictor_solves()
+        
+    def _calculate_cholesky_likelihood(self):
+        """Calculates mu, sig2 and the log likelihood from the Cholesky 
+        factor of R. Returns R^-1*(Y-mu)."""
+        Y = array(self.Y)
+        one = ones(self.n)
+        rhs = vstack([Y, one]).T
+        cho = cho_solve(self.R_fact, rhs).T
         
-    def _calculate_log_likelihood(self):
+        self.mu = dot(one,cho[0])/dot(one,cho[1])
+        R_solve_ymu = cho_solve(self.R_fact,(Y-dot(one,self.mu)))
+        self.sig2 = dot(Y-dot(one,self.mu),R_solve_ymu)/self.n
+        log_det = 2.*vlog(diag(self.R_fact[0])).sum()
+        self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log_det
+        return R_solve_ymu
+        
+    def _calculate_log_likelihood(self, gradient=False):
+        """Calculates the concentrated log likelihood of the current thetas.
+        If gradient is True, the gradient of the log likelihood with respect
+        to the (log10) thetas is also calculated and returned.
+        """
         #if self.m == None:
         #    Give error message
-        R = zeros((self.n, self.n))
-        X,Y = array(self.X), array(self.Y)
+        Y = array(self.Y)
         thetas = 10.**self.thetas
-        for i in range(self.n):
-            for j in arange(i+1,self.n):
-                R[i,j] = (1-self.nugget)*e**(-sum(thetas*(X[i]-X[j])**2.)) #weighted distance formula
+        
+        #weighted distance formula
+        R_pairs = (1-self.nugget)*exp(-dot(self._sq_dists, thetas))
+        R = zeros((self.n, self.n))
+        R[self._pairs] = R_pairs
         R = R + R.T + eye(self.n)
         self.R = R
         one = ones(self.n)
         try:
             self.R_fact = cho_factor(R)
-            rhs = vstack([Y, one]).T
-            R_fact = (self.R_fact[0].T,not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-            
-            self.mu = dot(one,cho[0])/dot(one,cho[1])
-            self.sig2 = dot(Y-dot(one,self.mu),cho_solve(self.R_fact,(Y-dot(one,self.mu))))/self.n
-            #self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))-sum(thetas)
-            self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))
+            R_solve_ymu = self._calculate_cholesky_likelihood()
+            if gradient:
+                R_inv = cho_solve(self.R_fact, eye(self.n))
         except (linalg.LinAlgError,ValueError):
             #------LSTSQ---------
             self.R_fact = None #reset this to none, so we know not to use cholesky
@@ -152,9 +262,20 @@ class KrigingSurrogate(Container):
             rhs = vstack([Y, one]).T
             lsq = lstsq(self.R.T,rhs)[0].T
             self.mu = dot(one,lsq[0])/dot(one,lsq[1])
-            self.sig2 = dot(Y-dot(one,self.mu),lstsq(self.R,Y-dot(one,self.mu))[0])/self.n
+            R_solve_ymu = lstsq(self.R,Y-dot(one,self.mu))[0]
+            self.sig2 = dot(Y-dot(one,self.mu),R_solve_ymu)/self.n
             self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))
             #print self.log_likelihood
+            if gradient:
+                R_inv = pinv(self.R)
+                
+        if gradient:
+            # dlnL/dR = 1/2*(a*a^T/sig2 - R^-1), with a = R^-1*(Y-mu). Only
+            # the off-diagonal terms of R depend on thetas, and R is
+            # symmetric, so each pair contributes twice.
+            dlnL_dR = outer(R_solve_ymu, R_solve_ymu)/self.sig2 - R_inv
+            dlnL_dR = dlnL_dR[self._pairs]*R_pairs
+            return -log(10.)*thetas*dot(dlnL_dR, self._sq_dists)
 
 
 class FloatKrigingSurrogate(KrigingSurrogate):
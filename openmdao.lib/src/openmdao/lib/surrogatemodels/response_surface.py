@@ -1,6 +1,6 @@
 """Surrogate Model based on second order response surface equations."""
 
-from numpy import matrix, linalg, power, multiply, concatenate, ones
+from numpy import matrix, linalg, power, multiply, concatenate, ones, eye
 
 from openmdao.main.api import Container
 from openmdao.main.interfaces import implements,ISurrogate
@@ -17,6 +17,13 @@ class ResponseSurface(Container):
         self.n = None #number of independents
         self.betas = None #vector of response surface equation coefficients
         
+        # training data expanded into response surface terms, and the 
+        # inverse of its normal matrix, kept for recursive least squares
+        # updates
+        self._X = None
+        self._Y = None
+        self._P = None
+        
         if X is not None and Y is not None: 
             self.train(X,Y)
             
@@ -33,29 +40,58 @@ class ResponseSurface(Container):
         self.m = X.shape[0]
         self.n = X.shape[1]
         
-        # Modify X to include constant, squared terms and cross terms
-        X = concatenate((matrix(ones((self.m,1))),X),1) 
+        self._X = self._terms(X)
+        self._Y = Y
+        self._least_squares()
+        
+    def update(self,X,Y): 
+        """ Add new training points to the response surface, updating the 
+        coefficients with recursive least squares instead of refitting all 
+        of the training data. """ 
+        
+        if self.betas is None: 
+            self.train(X,Y)
+            return
+        
+        A = self._terms(matrix(X))
+        Y = matrix(Y).T
+        
+        self.m += A.shape[0]
+        self._X = concatenate((self._X,A))
+        self._Y = concatenate((self._Y,Y))
+        
+        if self._P is None: # not enough points yet for a unique solution
+            self._least_squares()
+        else: 
+            PA = self._P*A.T
+            K = PA*linalg.inv(eye(A.shape[0])+A*PA)
+            self.betas = self.betas+K*(Y-A*self.betas)
+            self._P = self._P-K*PA.T
+        
+    def _least_squares(self):
+        """ Determine response surface equation coefficients (betas) using 
+        least squares on all of the training data. """
+        X = self._X
+        self.betas, rs, r, s = linalg.lstsq(X,self._Y)
+        if r == X.shape[1]: 
+            self._P = linalg.inv(X.T*X)
+        else: 
+            self._P = None
+        
+    def _terms(self,X): 
+        """ Modify X to include constant, squared terms and cross terms. """
+        X = concatenate((matrix(ones((X.shape[0],1))),X),1) 
         for i in range(1,self.n+1):
             X = concatenate((X,power(X[:,i],2)),1)
         for i in range(1,self.n):
             for j in range(i+1,self.n+1):
                 X = concatenate((X,multiply(X[:,i],X[:,j])),1)
-        
-        # Determine response surface equation coefficients (betas) using least squares
-        self.betas, rs, r, s = linalg.lstsq(X,Y)
+        return X
         
     def predict(self,new_x): 
         """Calculates a predicted value of the response based on the current response surface model for the supplied list of inputs. """ 
         
-        new_x = matrix(new_x)
-        
-        # Modify new_x to include constant, squared terms and cross terms
-        new_x = concatenate((matrix(ones((1,1))),new_x),1) 
-        for i in range(1,self.n+1):
-            new_x = concatenate((new_x,power(new_x[:,i],2)),1)
-        for i in range(1,self.n):
-            for j in range(i+1,self.n+1):
-                new_x = concatenate((new_x,multiply(new_x[:,i],new_x[:,j])),1)
+        new_x = self._terms(matrix(new_x))
         
         # Predict new_y using new_x and betas
         new_y = new_x*self.betas
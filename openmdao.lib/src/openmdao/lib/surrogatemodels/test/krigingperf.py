@@ -0,0 +1,37 @@
+"""
+Measure KrigingSurrogate training time for various numbers of training points.
+"""
+
+import time
+
+from numpy import sin, cos
+from numpy.random import RandomState
+
+from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate
+
+
+def run_test(npoints, ndims=2, seed=11):
+    """ Train on `npoints` random points in `ndims` dimensions. """
+    rand = RandomState(seed)
+    X = rand.uniform(-1., 1., (npoints, ndims))
+    Y = sin(3.*X[:, 0]) + cos(2.*X[:, 1:]).sum(axis=1)
+
+    krig = KrigingSurrogate()
+    start = time.time()
+    krig.train(X, Y)
+    et = time.time() - start
+    print '%d points, %d dims: train time %g sec, log likelihood %g' \
+          % (npoints, ndims, et, krig.log_likelihood)
+    return et
+
+
+def main():
+    """ Train on 100, 500 and 2000 points and report wall time. """
+    results = []
+    for npoints in (100, 500, 2000):
+        results.append((npoints, run_test(npoints)))
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -30,7 +30,7 @@ class KrigingSurrogateTests(unittest.TestCase):
         krig1 = KrigingSurrogate()
         krig1.train(x,y)
 
-        self.assertAlmostEqual(1.18375,krig1.thetas,places=7)
+        self.assertAlmostEqual(1.183723,krig1.thetas,places=5)
         
     def test_1d_kriging_predictor(self):
         x = array([[0.05], [.25], [0.61], [0.95]])
@@ -76,6 +76,120 @@ class KrigingSurrogateTests(unittest.TestCase):
         self.assertAlmostEqual(14.513550,pred.sigma,places=2)
         self.assertAlmostEqual(18.759264,pred.mu,places=2)
         
+    def test_log_likelihood_gradient(self):
+        x = array([[-2.,0.],[-0.5,1.5],[1.,3.],[8.5,4.5],[-3.5,6.],[4.,7.5]])
+        y = array([1.2, 0.3, -0.5, 2.1, 0.9, -1.3])
+        krig1 = KrigingSurrogate()
+        krig1.train(x,y)
+        
+        krig1.thetas = array([-1.,-2.])
+        grad = krig1._calculate_log_likelihood(gradient=True)
+        ll = krig1.log_likelihood
+        for i in range(2): 
+            thetas = array([-1.,-2.])
+            thetas[i] += 1.e-6
+            krig1.thetas = thetas
+            krig1._calculate_log_likelihood()
+            self.assertAlmostEqual((krig1.log_likelihood-ll)/1.e-6, grad[i],
+                                   places=4)
+        
+    def test_predict_batch(self):
+        def bran(x):
+            y = (x[1]-(5.1/(4.*pi**2.))*x[0]**2.+5.*x[0]/pi-6.)**2.+10.*(1.-1./(8.*pi))*cos(x[0])+10.
+            return y
+
+        x = array([[-2.,0.],[-0.5,1.5],[1.,3.],[8.5,4.5],[-3.5,6.],[4.,7.5],[-5.,9.],[5.5,10.5],
+                   [10.,12.],[7.,13.5],[2.5,15.]])
+        y = array([bran(case) for case in x])
+
+        krig1 = KrigingSurrogate()
+        krig1.train(x,y)
+        
+        new_x = array([[-2.,0.],[5.,5.],[1.,1.],[9.,14.]])
+        mu, rmse = krig1.predict_batch(new_x)
+        self.assertEqual(mu.shape, (4,))
+        self.assertEqual(rmse.shape, (4,))
+        for i, point in enumerate(new_x): 
+            pred = krig1.predict(point)
+            self.assertAlmostEqual(pred.mu, mu[i], places=10)
+            self.assertAlmostEqual(pred.sigma, rmse[i], places=10)
+            
+        self.assertAlmostEqual(14.513550,rmse[1],places=2)
+        self.assertAlmostEqual(18.759264,mu[1],places=2)
+        
+    def test_predict_batch_lstsq(self):
+        x = [[case] for case in linspace(0.,1.,40)]
+        y = sin(x).flatten()
+        krig1 = KrigingSurrogate()
+        krig1.train(x,y)
+        
+        mu, rmse = krig1.predict_batch([[0.5], [0.25]])
+        self.assertAlmostEqual(0.479425538688,mu[0],places=7)
+        self.assertAlmostEqual(0.247403959255,mu[1],places=7)
+        
+    def test_update(self):
+        def bran(x):
+            y = (x[1]-(5.1/(4.*pi**2.))*x[0]**2.+5.*x[0]/pi-6.)**2.+10.*(1.-1./(8.*pi))*cos(x[0])+10.
+            return y
+
+        x = array([[-2.,0.],[-0.5,1.5],[1.,3.],[8.5,4.5],[-3.5,6.],[4.,7.5],[-5.,9.],[5.5,10.5],
+                   [10.,12.],[7.,13.5],[2.5,15.]])
+        y = array([bran(case) for case in x])
+
+        krig1 = KrigingSurrogate()
+        krig1.train(x[:7],y[:7])
+        thetas = krig1.thetas
+        krig1.update(x[7:8],y[7:8])
+        krig1.update(x[8:],y[8:])
+        self.assertEqual(krig1.n, 11)
+        self.assertTrue(all(krig1.thetas == thetas))
+        
+        # same thetas, full factorization
+        krig2 = KrigingSurrogate()
+        krig2.train(x,y)
+        krig2.thetas = thetas
+        krig2._calculate_log_likelihood()
+        krig2._calculate_predictor_solves()
+        
+        self.assertAlmostEqual(krig1.log_likelihood, krig2.log_likelihood, places=8)
+        for point in ([5.,5.], [-2.,0.], [9.,14.]):
+            pred1 = krig1.predict(point)
+            pred2 = krig2.predict(point)
+            self.assertAlmostEqual(pred1.mu, pred2.mu, places=8)
+            self.assertAlmostEqual(pred1.sigma, pred2.sigma, places=8)
+        
+    def test_update_refit(self):
+        x = array([[0.05], [.25], [0.61], [0.95], [0.4], [0.8]])
+        y = sin(10.*x[:, 0])
+        
+        krig1 = KrigingSurrogate()
+        krig1.refit_interval = 2
+        krig1.train(x[:3],y[:3])
+        thetas = krig1.thetas
+        krig1.update(x[3:4],y[3:4])
+        self.assertTrue(all(krig1.thetas == thetas))
+        
+        # second added point reaches the interval, so thetas are refit
+        krig1.update(x[4:5],y[4:5])
+        krig2 = KrigingSurrogate()
+        krig2.train(x[:5],y[:5])
+        self.assertEqual(krig1.n, 5)
+        self.assertTrue(all(krig1.thetas == krig2.thetas))
+        
+        # and the count starts again from the refit
+        thetas = krig1.thetas
+        krig1.update(x[5:],y[5:])
+        self.assertTrue(all(krig1.thetas == thetas))
+        
+        # never refit
+        krig1 = KrigingSurrogate()
+        krig1.refit_interval = None
+        krig1.train(x[:3],y[:3])
+        thetas = krig1.thetas
+        krig1.update(x[3:],y[3:])
+        self.assertEqual(krig1.n, 6)
+        self.assertTrue(all(krig1.thetas == thetas))
+        
     def test_get_uncertain_value(self): 
         x = array([[0.05], [.25], [0.61], [0.95]])
         y = array([0.738513784857542,-0.210367746201974,-0.489015457891476,12.3033138316612])
@@ -94,6 +208,13 @@ class KrigingSurrogateTests(unittest.TestCase):
             self.assertEqual(str(err),"KrigingSurrogate has not been trained, so no prediction can be made")
         else: 
             self.fail("RuntimeError Expected")
+            
+        try: 
+            krig1.predict_batch([[0.,1.]])
+        except RuntimeError,err:
+            self.assertEqual(str(err),"KrigingSurrogate has not been trained, so no prediction can be made")
+        else: 
+            self.fail("RuntimeError Expected")
         
     
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ from numpy import array,round,linspace,sin,cos,pi
 import numpy as np
 
 from openmdao.lib.surrogatemodels.logistic_regression import LogisticRegression
+from openmdao.lib.surrogatemodels.response_surface import ResponseSurface
 
 
 class LogisticRegressionTest(unittest.TestCase):
@@ -42,4 +43,31 @@ class LogisticRegressionTest(unittest.TestCase):
     def test_uncertain_value(self): 
         lr = LogisticRegression()
         
-        self.assertEqual(lr.get_uncertain_value(1.0),1.0)
\ No newline at end of file
+        self.assertEqual(lr.get_uncertain_value(1.0),1.0)
+
+
+class ResponseSurfaceTest(unittest.TestCase):
+    
+    def setUp(self):
+        np.random.seed(10)
+        self.X_train = np.random.random((20, 2))
+        self.Y_train = 1. + 2.*self.X_train[:, 0] - self.X_train[:, 1]**2 + \
+                       0.01*np.random.random(20)
+        
+    def test_update(self): 
+        rs1 = ResponseSurface(self.X_train[:4], self.Y_train[:4])
+        for i in range(4, 20, 4): 
+            rs1.update(self.X_train[i:i+4], self.Y_train[i:i+4])
+            
+        rs2 = ResponseSurface(self.X_train, self.Y_train)
+        
+        self.assertEqual(rs1.m, 20)
+        for beta1, beta2 in zip(rs1.betas.flat, rs2.betas.flat): 
+            self.assertAlmostEqual(beta1, beta2, places=8)
+        self.assertAlmostEqual(rs1.predict([0.3, 0.4]), rs2.predict([0.3, 0.4]), places=8)
+        
+    def test_update_untrained(self): 
+        rs = ResponseSurface()
+        rs.update(self.X_train, self.Y_train)
+        
+        self.assertAlmostEqual(rs.predict([0.5, 0.5]), 1.75, places=1)
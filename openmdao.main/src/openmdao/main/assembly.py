@@ -7,6 +7,7 @@ __all__ = ['Assembly', 'set_as_top']
 import cStringIO
 import threading
 import re
+import traceback
 
 from zope.interface import implementedBy
 
@@ -19,19 +20,23 @@ from openmdao.main.mp_support import has_interface
 from openmdao.main.container import _copydict
 from openmdao.main.component import Component, Container
 from openmdao.main.variable import Variable
-from openmdao.main.datatypes.api import Slot
+from openmdao.main.datatypes.api import Slot, Float, Array
 from openmdao.main.driver import Driver, Run_Once
 from openmdao.main.hasparameters import HasParameters, ParameterGroup
 from openmdao.main.hasconstraints import HasConstraints, HasEqConstraints, HasIneqConstraints
 from openmdao.main.hasobjective import HasObjective, HasObjectives
 from openmdao.main.rbac import rbac
 from openmdao.main.mp_support import is_instance
+from openmdao.main.exceptions import traceback_str
 from openmdao.main.expreval import ConnectedExprEvaluator
 from openmdao.main.printexpr import eliminate_expr_ws
 from openmdao.util.nameutil import partition_names_by_comp
+from openmdao.units import get_conversion_tuple
 
 _iodict = {'out': 'output', 'in': 'input'}
 
+_simple_var = re.compile(r'^[a-zA-Z_]\w*\.[a-zA-Z_]\w*$')
+
 
 __has_top__ = False
 __toplock__ = threading.RLock()
@@ -85,6 +90,90 @@ class PassthroughProperty(Variable):
         self._vals[obj][name] = self._trait.validate(obj, name, value)
 
 
+class _Transfer(object):
+    """Moves the value of a Float or Array output of one local Component
+    to a connected input of another without going through the expressions
+    of the connection. Unit conversion factors are looked up once, and
+    Arrays whose source has 'copy' metadata are copied into the existing
+    destination array when it owns its data and its shape and dtype match.
+    """
+
+    def __init__(self, srccomp, srcvar, destcomp, destvar, conversion=None,
+                 copy=None):
+        self.srccomp = srccomp
+        self.srcvar = srcvar
+        self.destcomp = destcomp
+        self.destvar = destvar
+        self.conversion = conversion
+        self.copy = copy
+
+    def __call__(self, scope):
+        """Transfer the data between the children of scope."""
+        dest = getattr(scope, self.destcomp)
+        val = getattr(getattr(scope, self.srccomp), self.srcvar)
+        if self.conversion is not None:
+            factor, offset = self.conversion
+            val = (val + offset) * factor
+        elif self.copy:
+            old = getattr(dest, self.destvar)
+            # A view or an array shared with the source must not be
+            # written through.
+            if old is not val and \
+               getattr(old, 'shape', None) == val.shape and \
+               getattr(old, 'dtype', None) == val.dtype and \
+               old.flags.owndata:
+                old[...] = val
+                dest._call_execute = True
+                dest._input_updated(self.destvar)
+                return
+            val = _copydict[self.copy](val)
+
+        # bypass input source checking, just like Container.set does
+        chk = dest._input_check
+        dest._input_check = dest._input_nocheck
+        try:
+            setattr(dest, self.destvar, val)
+        finally:
+            dest._input_check = chk
+
+
+def _make_transfer(scope, srcexpr, destexpr):
+    """Return a _Transfer for the connection from srcexpr to destexpr if its
+    data can be moved directly between two local Components, or None if
+    the connection has to be evaluated through its expressions.
+    """
+    if not (_simple_var.match(srcexpr.text) and
+            _simple_var.match(destexpr.text)):
+        return None
+
+    srccomp, srcvar = srcexpr.text.split('.')
+    destcomp, destvar = destexpr.text.split('.')
+    src = getattr(scope, srccomp, None)
+    dest = getattr(scope, destcomp, None)
+    # proxies to remote Components are not instances of Component
+    if not (isinstance(src, Component) and isinstance(dest, Component)):
+        return None
+
+    srctrait = src.get_trait(srcvar)
+    desttrait = dest.get_trait(destvar)
+    if srctrait is None or desttrait is None or desttrait.iotype != 'in':
+        return None
+    srctype = srctrait.trait_type
+    desttype = desttrait.trait_type
+    if type(desttype) not in (Float, Array) or type(srctype) is not type(desttype):
+        return None
+
+    conversion = None
+    if srctype.units and desttype.units and srctype.units != desttype.units:
+        try:
+            conversion = get_conversion_tuple(srctype.units, desttype.units)
+        except Exception:
+            return None  # let the normal path report the problem
+
+    return _Transfer(srccomp, srcvar, destcomp, destvar, conversion,
+                     srctype.copy if type(desttype) is Array else None)
+
+
 class ExprMapper(object):
     """A mapping between source expressions and destination expressions"""
     def __init__(self, scope):
@@ -262,17 +351,28 @@ class Assembly(Component):
                     desc="The top level Driver that manages execution of "
                     "this Assembly.")
 
+    # If True, update_inputs moves data using transfer plans that are built
+    # once per configuration. Otherwise every connection is evaluated
+    # through its source and destination expressions.
+    plan_transfers = True
+
     def __init__(self, directory=''):
 
         super(Assembly, self).__init__(directory=directory)
 
         self._exprmapper = ExprMapper(self)
+        self._transfer_plans = {}
+        self._changing_connections = None
 
         # default Driver executes its workflow once
         self.add('driver', Run_Once())
 
         set_as_top(self, first_only=True)  # we're the top Assembly only if we're the first instantiated
 
+    def __setstate__(self, state):
+        super(Assembly, self).__setstate__(state)
+        self._transfer_plans = {}
+
     @rbac(('owner', 'user'))
     def set_itername(self, itername, seqno=0):
         """
@@ -292,13 +392,80 @@ class Assembly(Component):
         if seqno:
             self.driver.workflow.set_initial_count(seqno)
 
+    @rbac(('owner', 'user'))
+    def run_cases(self, cases, itername='', events=()):
+        """
+        Evaluate several cases in a single call. This is used by
+        :class:`CaseIterDriverBase` to avoid a remote call for every input
+        and output of every case.
+
+        Returns a list of ``(phase, outputs, msg, traceback)``, one per case.
+        `phase` is None if the case ran successfully, otherwise one of
+        'inputs', 'execute', or 'outputs' to indicate where the error `msg`
+        occurred. `outputs` is a dictionary of the case output values.
+
+        cases: list
+            List of ``(case, seqno)``.
+
+        itername: string
+            Iteration coordinates, set along with `seqno` before each case
+            is run.
+
+        events: list[string]
+            Event variables to be set before each case is run.
+        """
+        results = []
+        for case, seqno in cases:
+            self.set_itername(itername, seqno)
+            try:
+                for event in events:
+                    try:
+                        self.set(event, True)
+                    except Exception as exc:
+                        msg = 'Exception setting %r: %s' % (event, exc)
+                        raise RuntimeError(msg)
+                try:
+                    case.apply_inputs(self)
+                except Exception as exc:
+                    msg = 'Exception setting case inputs: %s' % exc
+                    raise RuntimeError(msg)
+            except Exception as exc:
+                results.append(('inputs', None, str(exc),
+                                traceback.format_exc()))
+                continue
+
+            try:
+                self.run(case_id=case.uuid)
+            except Exception as exc:
+                results.append(('execute', None, str(exc),
+                                traceback.format_exc()))
+                continue
+
+            try:
+                case.update_outputs(self)
+            except Exception as exc:
+                results.append(('outputs', dict(case.items(iotype='out')),
+                                'Exception getting case outputs: %s' % exc,
+                                traceback_str(exc)))
+            else:
+                results.append((None, dict(case.items(iotype='out')),
+                                None, None))
+        return results
+
     def add(self, name, obj):
         """Call the base class *add*.  Then,
         if obj is a Component, add it to the component graph.
 
         Returns the added object.
         """
-        obj = super(Assembly, self).add(name, obj)
+        # a new child isn't connected to anything yet, so our workflows
+        # don't have to be updated
+        if not self.contains(name):
+            self._changing_connections = []
+        try:
+            obj = super(Assembly, self).add(name, obj)
+        finally:
+            self._changing_connections = None
         if is_instance(obj, Component):
             self._depgraph.add(obj.name)
         return obj
@@ -317,11 +484,22 @@ class Assembly(Component):
         component name.
         """
         wflows = []
-        for obj in self.__dict__.values():
-            if is_instance(obj, Driver) and name in obj.workflow:
+        for obj in self._list_drivers():
+            if name in obj.workflow:
                 wflows.append((obj.workflow, obj.workflow.index(name)))
         return wflows
 
+    def _list_drivers(self):
+        """Returns a list of the Drivers which are children of this
+        Assembly.
+        """
+        drivers = []
+        for name in self.list_containers():
+            obj = getattr(self, name)
+            if is_instance(obj, Driver) and obj.parent is self:
+                drivers.append(obj)
+        return drivers
+
     def _cleanup_autopassthroughs(self, name):
         """Clean up any autopassthrough connections involving the given name.
         Returns a list containing a tuple for each removed connection.
@@ -383,8 +561,8 @@ class Assembly(Component):
         # Save existing driver references.
         refs = {}
         if has_interface(tobj, IComponent):
-            for obj in self.__dict__.values():
-                if obj is not tobj and is_instance(obj, Driver):
+            for obj in self._list_drivers():
+                if obj is not tobj:
                     refs[obj] = obj.get_references(target_name)
 
         if has_interface(newobj, IComponent):  # remove any existing connections to replacement object
@@ -416,8 +594,8 @@ class Assembly(Component):
 
         # Restore driver references.
         if refs:
-            for obj in self.__dict__.values():
-                if obj is not newobj and is_instance(obj, Driver):
+            for obj in self._list_drivers():
+                if obj is not newobj:
                     obj.restore_references(refs[obj], target_name)
 
         # Workflows need a reference to their new parent driver
@@ -432,8 +610,8 @@ class Assembly(Component):
         self._exprmapper.remove(name)
         if has_interface(cont, IComponent):
             self._depgraph.remove(name)
-            for obj in self.__dict__.values():
-                if obj is not cont and is_instance(obj, Driver):
+            for obj in self._list_drivers():
+                if obj is not cont:
                     obj.workflow.remove(name)
                     obj.remove_references(name)
 
@@ -584,26 +762,31 @@ class Assembly(Component):
                            "driver '%s'." % comp.name
                     self.raise_exception(msg, RuntimeError)
 
-        super(Assembly, self).connect(src, dest)
-
+        # let our workflows know that only this connection is changing
+        self._changing_connections = [(src, dest)]
         try:
-            self._exprmapper.connect(srcexpr, destexpr, self)
-        except Exception as err:
-            super(Assembly, self).disconnect(src, dest)
-            self.raise_exception("Can't connect '%s' to '%s': %s" % (src, dest, str(err)),
-                                 RuntimeError)
+            super(Assembly, self).connect(src, dest)
 
-        if not srcexpr.refs_parent():
-            if not destexpr.refs_parent():
-                # if it's an internal connection, could change dependencies, so we have
-                # to call config_changed to notify our driver
-                self.config_changed(update_parent=False)
+            try:
+                self._exprmapper.connect(srcexpr, destexpr, self)
+            except Exception as err:
+                super(Assembly, self).disconnect(src, dest)
+                self.raise_exception("Can't connect '%s' to '%s': %s" % (src, dest, str(err)),
+                                     RuntimeError)
+
+            if not srcexpr.refs_parent():
+                if not destexpr.refs_parent():
+                    # if it's an internal connection, could change dependencies, so we have
+                    # to call config_changed to notify our driver
+                    self.config_changed(update_parent=False)
 
-                destcompname, destcomp, destvarname = self._split_varpath(dest)
+                    destcompname, destcomp, destvarname = self._split_varpath(dest)
 
-                outs = destcomp.invalidate_deps(varnames=set([destvarname]), force=True)
-                if (outs is None) or outs:
-                    bouts = self.child_invalidated(destcompname, outs, force=True)
+                    outs = destcomp.invalidate_deps(varnames=set([destvarname]), force=True)
+                    if (outs is None) or outs:
+                        bouts = self.child_invalidated(destcompname, outs, force=True)
+        finally:
+            self._changing_connections = None
 
     @rbac(('owner', 'user'))
     def disconnect(self, varpath, varpath2=None):
@@ -627,8 +810,12 @@ class Assembly(Component):
         else:
             to_remove = [(varpath, varpath2)]
 
-        for u, v in to_remove:
-            super(Assembly, self).disconnect(u, v)
+        self._changing_connections = to_remove
+        try:
+            for u, v in to_remove:
+                super(Assembly, self).disconnect(u, v)
+        finally:
+            self._changing_connections = None
 
         self._exprmapper.disconnect(varpath, varpath2)
 
@@ -638,10 +825,11 @@ class Assembly(Component):
         or removed, etc.
         """
         super(Assembly, self).config_changed(update_parent)
-        # driver must tell workflow that config has changed because
+        self._transfer_plans = {}
+        # drivers must tell workflows that config has changed because
         # dependencies may have changed
-        if self.driver is not None:
-            self.driver.config_changed(update_parent=False)
+        for obj in self._list_drivers():
+            obj.config_changed(update_parent=False)
 
     def execute(self):
         """Runs driver and updates our boundary variables."""
@@ -681,17 +869,10 @@ class Assembly(Component):
         """
         return self._exprmapper.list_connections(show_passthrough)
 
-    @rbac(('owner', 'user'))
-    def update_inputs(self, compname, exprs):
-        """Transfer input data to input expressions on the specified component.
-        The exprs iterator is assumed to contain expression strings that reference
-        component variables relative to the component, e.g., 'abc[3][1]' rather
-        than 'comp1.abc[3][1]'.
+    def _find_connections(self, compname, exprs):
+        """Return a list of (srcexpr, destexpr) tuples for the connections
+        feeding the given expressions of the specified component.
         """
-        parent = self.parent
-        expr_info = []
-        invalids = []
-
         if compname is not None:
             pred = self._exprmapper._exprgraph.pred
             if exprs:
@@ -703,12 +884,61 @@ class Assembly(Component):
             else:
                 exprs = [expr for expr in self._exprmapper.find_referring_exprs(compname)
                              if expr in pred]
+        connections = []
         for expr in exprs:
             srctxt = self._exprmapper.get_source(expr)
             if srctxt:
-                srcexpr = self._exprmapper.get_expr(srctxt)
-                invalids.extend(srcexpr.invalid_refs())
-                expr_info.append((srcexpr, self._exprmapper.get_expr(expr)))
+                connections.append((self._exprmapper.get_expr(srctxt),
+                                    self._exprmapper.get_expr(expr)))
+        return connections
+
+    def _get_transfer_plan(self, compname, exprs):
+        """Return a list of (srcexpr, destexpr, transfer) tuples for the
+        connections feeding the given expressions of the specified component.
+        transfer is None for connections that must be evaluated through
+        their expressions. Plans are kept until our configuration changes.
+        """
+        plan = []
+        for name in (exprs or [None]):
+            key = (compname, name)
+            try:
+                plan.extend(self._transfer_plans[key])
+            except KeyError:
+                conns = self._find_connections(compname,
+                                               None if name is None else [name])
+                entries = [(src, dest, _make_transfer(self, src, dest))
+                               for src, dest in conns]
+                self._transfer_plans[key] = entries
+                plan.extend(entries)
+        return plan
+
+    @rbac(('owner', 'user'))
+    def update_inputs(self, compname, exprs):
+        """Transfer input data to input expressions on the specified component.
+        The exprs iterator is assumed to contain expression strings that reference
+        component variables relative to the component, e.g., 'abc[3][1]' rather
+        than 'comp1.abc[3][1]'.
+        """
+        if self.plan_transfers:
+            plan = self._get_transfer_plan(compname, exprs)
+        else:
+            plan = [(src, dest, None)
+                        for src, dest in self._find_connections(compname, exprs)]
+
+        # check the validity of all of the source variables at once
+        srcnames = []
+        seen = set()
+        for srcexpr, destexpr, transfer in plan:
+            for name in srcexpr.get_referenced_varpaths(copy=False):
+                if name not in seen:
+                    seen.add(name)
+                    srcnames.append(name)
+        if srcnames:
+            invalids = [name for name, valid in zip(srcnames,
+                                                    self.get_valid(srcnames))
+                                 if valid is False]
+        else:
+            invalids = []
 
         # if source exprs reference invalid vars, request an update
         if invalids:
@@ -720,9 +950,12 @@ class Assembly(Component):
                     getattr(self, cname).update_outputs(vnames)
                     #self.set_valid(vnames, True)
 
-        for srcexpr, destexpr in expr_info:
+        for srcexpr, destexpr, transfer in plan:
             try:
-                destexpr.set(srcexpr.evaluate(), src=srcexpr.text)
+                if transfer is None:
+                    destexpr.set(srcexpr.evaluate(), src=srcexpr.text)
+                else:
+                    transfer(self)
             except Exception as err:
                 self.raise_exception("cannot set '%s' from '%s': %s" %
                                      (destexpr.text, srcexpr.text, str(err)), type(err))
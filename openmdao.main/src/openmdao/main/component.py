@@ -18,7 +18,7 @@ from enthought.traits.trait_base import not_event
 from enthought.traits.api import Property
 
 from openmdao.main.container import Container
-from openmdao.main.expreval import ConnectedExprEvaluator
+from openmdao.main.expreval import ConnectedExprEvaluator, invalidate_accessors
 from openmdao.main.interfaces import implements, obj_has_interface, \
                                      IAssembly, IComponent, IDriver, \
                                      IHasCouplingVars, IHasObjectives, \
@@ -248,6 +248,15 @@ class Component(Container):
 
         result = super(Component, self).__deepcopy__(memo)
 
+        # Cached name lists are copied in arbitrary order while children
+        # call config_changed() on the partial copy, so don't trust them.
+        result._input_names = None
+        result._output_names = None
+        result._container_names = None
+        result._expr_sources = None
+        result._connected_inputs = None
+        result._connected_outputs = None
+
         for name, trait in result.class_traits().items():
             if trait.iotype == 'in':
                 result._set_input_callback(name)
@@ -582,6 +591,9 @@ class Component(Container):
         """
         self.config_changed()
         super(Component, self).add(name, obj)
+        # config_changed() may have listed our children before this one
+        # was in place.
+        self._container_names = None
         if is_instance(obj, Container) and not is_instance(obj, Component):
             self._depgraph.add(name)
         return obj
@@ -715,6 +727,7 @@ class Component(Container):
         self._expr_sources = None
         self._call_check_config = True
         self._call_execute = True
+        invalidate_accessors()
 
     def list_inputs(self, valid=None, connected=None):
         """Return a list of names of input values.
@@ -793,7 +806,8 @@ class Component(Container):
     def list_containers(self):
         """Return a list of names of child Containers."""
         if self._container_names is None:
-            visited = set([id(self), id(self.parent)])
+            # _parent may not be set yet if we're a partial deepcopy.
+            visited = set([id(self), id(getattr(self, '_parent', None))])
             names = []
             for n, v in self.__dict__.items():
                 if is_instance(v, Container) and id(v) not in visited:
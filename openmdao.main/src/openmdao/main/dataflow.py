@@ -5,16 +5,30 @@ from networkx.algorithms.components import strongly_connected_components
 from openmdao.main.seqentialflow import SequentialWorkflow
 from openmdao.main.interfaces import IDriver
 from openmdao.main.mp_support import has_interface
+from openmdao.main.depgraph import _cvt_names_to_graph
 
 __all__ = ['Dataflow']
 
 class Dataflow(SequentialWorkflow):
     """
-    A Dataflow consists of a collection of Components which are executed in 
+    A Dataflow consists of a collection of Components which are executed in
     data flow order.
+
+    The graph of dependencies between our components and their topological
+    sort are cached. Adding or removing components through this workflow,
+    and connecting or disconnecting components in our scope, only updates
+    the affected part of the cache. Any other configuration change causes
+    the cache to be rebuilt.
     """
+
+    # Set to False to rebuild the cached graph on every configuration change.
+    incremental = True
+
     def __init__(self, parent=None, scope=None, members=None):
         """ Create an empty flow. """
+        self._updating = False
+        self._base_graph = None
+        self._outer_flows = set()
         super(Dataflow, self).__init__(parent, scope, members)
         self.config_changed()
 
@@ -27,23 +41,74 @@ class Dataflow(SequentialWorkflow):
 
     def add(self, compnames, index=None, check=False):
         """ Add new component(s) to the workflow by name. """
-        super(Dataflow, self).add(compnames, index, check)
-        self.config_changed()
+        nnames = len(self._names)
+        self._updating = True
+        try:
+            super(Dataflow, self).add(compnames, index, check)
+        finally:
+            self._updating = False
+            self._iterset_changed()
+            if index is None and self._base_graph is not None and \
+               self.incremental:
+                for name in self._names[nnames:]:
+                    if not self._add_node(name):
+                        self._clear_cache()
+                        break
+            else:
+                self._clear_cache()
 
     def remove(self, compname):
         """Remove a component from this Workflow by name."""
         super(Dataflow, self).remove(compname)
-        self.config_changed()
+        self._iterset_changed()
+        if self._base_graph is not None and self.incremental and \
+           compname not in self._names:
+            self._remove_node(compname)
+        else:
+            self._clear_cache()
+
+    def clear(self):
+        """Remove all components from this workflow."""
+        super(Dataflow, self).clear()
+        self._iterset_changed()
+        self._clear_cache()
 
     def config_changed(self):
         """Notifies the Workflow that its configuration (dependencies, etc.)
         has changed.
         """
+        if self._updating:
+            return
+
+        # Connections being made or removed in our scope (or new children
+        # being added to it) only need the affected edges to be updated.
+        if self._base_graph is not None and self.incremental:
+            conns = getattr(self._scope, '_changing_connections', None)
+            if conns is not None:
+                self._pending_conns.update(conns)
+                return
+
+        self._clear_cache()
+
+    def _iterset_changed(self):
+        """Our Driver's iteration set may have changed, so discard the
+        cache of any workflow that collapsed it onto the Driver."""
+        flows = self._outer_flows
+        self._outer_flows = set()
+        for flow in flows:
+            flow._clear_cache()
+
+    def _clear_cache(self):
+        """Discard the cached graphs and topological sort."""
+        self._base_graph = None
         self._collapsed_graph = None
         self._topsort = None
         self._duplicates = None
+        self._pending_conns = set()
 
     def _get_topsort(self):
+        if self._pending_conns:
+            self._update_connections()
         if self._topsort is None:
             graph = self._get_collapsed_graph()
             try:
@@ -59,83 +124,295 @@ class Dataflow(SequentialWorkflow):
                 self._insert_duplicates()
         return self._topsort
 
-    def _get_collapsed_graph(self):
-        """Get a dependency graph with only our workflow components
-        in it, with additional edges added to it from sub-workflows
-        of any Driver components in our workflow, and from any ExprEvaluators
-        in any components in our workflow.
+    def _get_base_graph(self):
+        """Get a dependency graph containing our workflow components and the
+        components in the iteration sets of any Driver components in our
+        workflow, with edges from the Assembly's dependency graph, from any
+        ExprEvaluators in any components in our workflow, and from the
+        sub-workflows of any Driver components collapsed onto their Driver.
+
+        Only edges between these components are kept. Components that are
+        connected to anything else, including the boundary variables of our
+        scope, are collected in self._external.
         """
-        if self._collapsed_graph:
-            return self._collapsed_graph
-        
-        to_add = []
+        if self._pending_conns:
+            self._update_connections()
+        if self._base_graph is not None:
+            return self._base_graph
+
         scope = self.scope
-        graph = scope._depgraph.copy_graph()
-        
+        depgraph = scope._depgraph._graph
         contents = self.get_components()
-        
+
+        itersets = {}
+        drivers = []
+        for comp in contents:
+            if has_interface(comp, IDriver):
+                iterset = comp.iteration_set()
+                itersets[comp.name] = [c.name for c in iterset]
+                drivers.append(comp)
+                drivers.extend([c for c in iterset
+                                if has_interface(c, IDriver)])
+
+        # make sure we hear about changes to any of these iteration sets
+        for drv in drivers:
+            if isinstance(drv.workflow, Dataflow):
+                drv.workflow._outer_flows.add(self)
+
+        members = set()
+        for iterset in itersets.values():
+            members.update(iterset)
+        nodes = members.union(self._names)
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(nodes)
+        external = set()
+
+        for name in nodes:
+            if name not in depgraph:
+                continue
+            for v in depgraph.successors(name):
+                if v in nodes:
+                    graph.add_edge(name, v)
+                else:
+                    external.add(name)
+            for u in depgraph.predecessors(name):
+                if u not in nodes:
+                    external.add(name)
+
         # add any dependencies due to ExprEvaluators
+        expr_edges = set()
         for comp in contents:
-            graph.add_edges_from([tup for tup in comp.get_expr_depends()])
-            
-        collapsed_graph = nx.DiGraph(graph)  # this way avoids a deep copy of edge/node data
+            expr_edges.update(comp.get_expr_depends())
+        for u, v in expr_edges:
+            if u in nodes and v in nodes:
+                graph.add_edge(u, v)
+            elif u in nodes:
+                external.add(u)
+            elif v in nodes:
+                external.add(v)
 
         # find all of the incoming and outgoing edges to/from all of the
         # components in each driver's iteration set so we can add edges to/from
         # the driver in our collapsed graph
-        cnames = set(self._names)
-        removes = set()
-        itersets = {}
-        for comp in contents:
-            cname = comp.name
-            if has_interface(comp, IDriver):
-                iterset = [c.name for c in comp.iteration_set()]
-                itersets[cname] = iterset
-                removes.update(iterset)
-                for u,v in graph.edges_iter(nbunch=iterset): # outgoing edges
-                    if v != cname and v not in iterset:
-                        collapsed_graph.add_edge(cname, v)
-                for u,v in graph.in_edges_iter(nbunch=iterset): # incoming edges
-                    if u != cname and u not in iterset:
-                        collapsed_graph.add_edge(u, cname)
+        to_add = []
+        for drv, iterset in itersets.items():
+            for u, v in graph.edges_iter(nbunch=iterset): # outgoing edges
+                if v != drv and v not in iterset:
+                    to_add.append((drv, v))
+            for u, v in graph.in_edges_iter(nbunch=iterset): # incoming edges
+                if u != drv and u not in iterset:
+                    to_add.append((u, drv))
+            if external.intersection(iterset):
+                external.add(drv)
+        graph.add_edges_from(to_add)
 
         # connect all of the edges from each driver's iterset members to itself
         to_add = []
-        for drv,iterset in itersets.items():
+        for drv, iterset in itersets.items():
             for cname in iterset:
-                for u,v in collapsed_graph.edges_iter(cname):
+                for u, v in graph.edges_iter(cname):
                     if v != drv:
                         to_add.append((drv, v))
-                for u,v in collapsed_graph.in_edges_iter(cname):
+                for u, v in graph.in_edges_iter(cname):
                     if u != drv:
                         to_add.append((u, drv))
-        collapsed_graph.add_edges_from(to_add)
-        
+        graph.add_edges_from(to_add)
+
+        self._base_graph = graph
+        self._members = members
+        self._drivers = set(itersets)
+        self._external = external
+        self._expr_edges = expr_edges
+        return graph
+
+    def _get_collapsed_graph(self):
+        """Get a dependency graph with only our workflow components
+        in it, with additional edges added to it from sub-workflows
+        of any Driver components in our workflow, and from any ExprEvaluators
+        in any components in our workflow.
+        """
+        graph = self._get_base_graph()
+        if self._collapsed_graph is not None:
+            return self._collapsed_graph
+
+        members = self._members
+        collapsed_graph = graph.subgraph(set(self._names)-members)
+
         # now add some fake dependencies for degree 0 nodes in an attempt to
         # mimic a SequentialWorkflow in cases where nodes aren't connected.
-        # Edges are added from each degree 0 node to all nodes after it in
-        # sequence order.
+        # Connections outside of our graph, including those to boundary
+        # variables, count toward a node's degree.
+        # Each degree 0 node must come before all nodes after it in sequence
+        # order, or after all nodes before it if it's last. Rather than
+        # adding edges to all of those nodes, the degree 0 nodes are chained
+        # together, and each node gets an edge from the last degree 0 node
+        # before it.
         self._duplicates = set()
-        last = len(self._names)-1
+        names = self._names
+        last = len(names)-1
         if last > 0:
+            counts = {}
+            for cname in names:
+                counts[cname] = counts.get(cname, 0) + 1
             to_add = []
-            for i,cname in enumerate(self._names):
-                if collapsed_graph.degree(cname) == 0:
-                    if self._names.count(cname) > 1:
+            prev = None
+            for i, cname in enumerate(names):
+                if cname in members:
+                    continue
+                if prev is not None:
+                    to_add.append((prev, cname))
+                if graph.degree(cname) == 0 and cname not in self._external:
+                    if counts[cname] > 1:
                         # Don't introduce circular dependencies.
                         self._duplicates.add(cname)
+                    elif i < last:
+                        prev = cname
                     else:
-                        if i < last:
-                            for n in self._names[i+1:]:
-                                to_add.append((cname, n))
-                        else:
-                            for n in self._names[0:i]:
+                        for n in names[0:i]:
+                            if n not in members:
                                 to_add.append((n, cname))
             collapsed_graph.add_edges_from(to_add)
-        
-        self._collapsed_graph = collapsed_graph.subgraph(cnames-removes)
+
+        self._collapsed_graph = collapsed_graph
         return self._collapsed_graph
 
+    def _add_node(self, name):
+        """Update the cache for a component that was appended to the
+        workflow. If it doesn't feed any component already in the workflow,
+        it is appended to the topological sort. Returns False if the cache
+        must be rebuilt instead.
+        """
+        graph = self._get_base_graph()
+        if name in graph:
+            return False
+
+        scope = self.scope
+        comp = getattr(scope, name, None)
+        if comp is None or has_interface(comp, IDriver):
+            return False
+
+        depgraph = scope._depgraph._graph
+        edges = []
+        if name in depgraph:
+            edges.extend([(u, name) for u in depgraph.predecessors(name)])
+            edges.extend([(name, v) for v in depgraph.successors(name)])
+        self._expr_edges.update(comp.get_expr_depends())
+        edges.extend([(u, v) for u, v in self._expr_edges
+                      if u == name or v == name])
+
+        to_add = []
+        for u, v in edges:
+            other = v if u == name else u
+            if other in self._members:
+                return False
+            if other in graph:
+                to_add.append((u, v))
+
+        graph.add_node(name)
+        graph.add_edges_from(to_add)
+        self._collapsed_graph = None
+
+        # Neighbors may have been external only because of this component.
+        self._update_external(name, depgraph)
+        for u, v in to_add:
+            self._update_external(v if u == name else u, depgraph)
+
+        if self._topsort is not None:
+            for u, v in to_add:
+                if u == name or u in self._duplicates:
+                    self._topsort = None
+                    break
+            else:
+                self._topsort.append(name)
+        return True
+
+    def _remove_node(self, name):
+        """Update the cache for a component that was removed from the
+        workflow."""
+        graph = self._get_base_graph()
+        if name not in graph:
+            return
+        if name in self._members or name in self._drivers:
+            self._clear_cache()
+            return
+
+        # The component is still in our scope, so its neighbors remain
+        # connected.
+        self._external.update(graph.predecessors(name))
+        self._external.update(graph.successors(name))
+        self._external.discard(name)
+        graph.remove_node(name)
+        self._collapsed_graph = None
+        self._topsort = None
+
+    def _update_connections(self):
+        """Update the cache for connections that were made or removed in our
+        scope since it was built."""
+        pending = self._pending_conns
+        self._pending_conns = set()
+        graph = self._base_graph
+        if graph is None:
+            return
+
+        depgraph = self.scope._depgraph._graph
+        for src, dest in pending:
+            u, _, v, _ = _cvt_names_to_graph(src, dest)
+            if u in self._members or v in self._members or \
+               u in self._drivers or v in self._drivers:
+                self._clear_cache()
+                return
+
+            for name in (u, v):
+                if name in graph:
+                    self._update_external(name, depgraph)
+
+            if u not in graph or v not in graph:
+                continue
+
+            connected = depgraph.has_edge(u, v) or (u, v) in self._expr_edges
+            if connected == graph.has_edge(u, v):
+                continue
+
+            self._collapsed_graph = None
+            if not connected:
+                # Components may have become unconnected.
+                graph.remove_edge(u, v)
+                self._topsort = None
+            else:
+                graph.add_edge(u, v)
+                topsort = self._topsort
+                if topsort is not None:
+                    if u in self._duplicates or v in self._duplicates or \
+                       topsort.index(u) > topsort.index(v):
+                        self._topsort = None
+
+    def _update_external(self, name, depgraph):
+        """Update whether the given workflow component is connected to
+        anything outside of our graph."""
+        graph = self._base_graph
+        external = False
+        if name in depgraph:
+            for other in depgraph.predecessors(name)+depgraph.successors(name):
+                if other not in graph:
+                    external = True
+                    break
+        if not external:
+            for u, v in self._expr_edges:
+                if (u == name and v not in graph) or \
+                   (v == name and u not in graph):
+                    external = True
+                    break
+
+        if external != (name in self._external):
+            if external:
+                self._external.add(name)
+            else:
+                self._external.remove(name)
+                # It may have become unconnected.
+                self._topsort = None
+            self._collapsed_graph = None
+
     def _insert_duplicates(self):
         """We have some duplicate unconnected components. Adjust order
         to include duplicates in 'sequential' order.
@@ -159,4 +436,3 @@ class Dataflow(SequentialWorkflow):
                         start = index + 1
                     max_index = max(index, max_index)
                 topsort.insert(max_index+1, cname)
-
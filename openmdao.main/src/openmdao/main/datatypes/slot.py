@@ -19,6 +19,7 @@ from inspect import isclass
 from enthought.traits.api import Instance, Interface
 import zope.interface
 
+from openmdao.main.expreval import invalidate_accessors
 from openmdao.main.variable import Variable, gui_excludes
 from openmdao.main.mp_support import has_interface
 from openmdao.main.interfaces import IContainer
@@ -97,9 +98,13 @@ class Slot(Variable):
         '''Containers must know their place within the hierarchy, so set their
         parent here.  This keeps side effects out of validate()'''
 
-        if self._is_container and value is not None:
+        if self._is_container and value is None:
+            # expressions must stop referring to the old contents
+            invalidate_accessors()
+        elif self._is_container:
             if value.parent is not obj:
                 value.parent = obj
+                invalidate_accessors()
             # VariableTrees also need to know their iotype
             if hasattr(value, '_iotype'):
                 value._iotype = self.iotype
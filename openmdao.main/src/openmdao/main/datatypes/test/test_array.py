@@ -66,6 +66,15 @@ class ArrayTestCase(unittest.TestCase):
         self.assertAlmostEqual(2., self.hobj.arr2[1])
         self.assertAlmostEqual(4., self.hobj.arr2[2])
         
+    def test_unit_conversion_offset(self):
+        self.hobj.add('arr6', Array(array([0., 100.]), iotype='out', units='degC'))
+        self.hobj.add('arr7', Array(iotype='in', units='degF'))
+        self.hobj.arr7 = self.hobj.get_wrapped_attr('arr6')
+        self.assertAlmostEqual(32., self.hobj.arr7[0])
+        self.assertAlmostEqual(212., self.hobj.arr7[1])
+        # source is left alone
+        self.assertEqual(100., self.hobj.arr6[1])
+        
     def test_bogus_units(self):
         try:
             uf = Array([0.], iotype='in', units='bogus')
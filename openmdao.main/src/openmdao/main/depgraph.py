@@ -5,7 +5,6 @@ import sys
 
 # pylint: disable-msg=E0611,F0401
 import networkx as nx
-from networkx.algorithms.dag import is_directed_acyclic_graph
 from networkx.algorithms.components import strongly_connected_components
 
 from openmdao.main.expreval import ExprEvaluator
@@ -63,6 +62,20 @@ def _cvt_names_to_graph(srcpath, destpath):
 #fake nodes for boundary and passthrough connections
 _fakes = ['@xin', '@xout', '@bin', '@bout']
 
+def _is_reachable(graph, start, end):
+    """Return True if there is a path from start to end in graph."""
+    visited = set()
+    tmpset = set([start])
+    while tmpset:
+        node = tmpset.pop()
+        if node == end:
+            return True
+        if node in visited:
+            continue
+        visited.add(node)
+        tmpset.update(graph.successors(node))
+    return False
+
 # to use as a quick check for exprs to avoid overhead of constructing an
 # ExprEvaluator
 _exprset = set('+-/*[]()&| %<>!')
@@ -326,8 +339,14 @@ class DependencyGraph(object):
             except KeyError:
                 link = _Link(srccompname, destcompname)
                 graph.add_edge(srccompname, destcompname, link=link)
+                new_edge = True
+            else:
+                new_edge = False
             
-            if is_directed_acyclic_graph(graph):
+            # A new edge can only create a cycle through itself, so just
+            # check whether destcompname already leads back to srccompname.
+            if not (new_edge and _is_reachable(graph, destcompname, 
+                                               srccompname)):
                 link.connect(srcvarname, destvarname)
             else:   # cycle found
                 # do a little extra work here to give more info to the user
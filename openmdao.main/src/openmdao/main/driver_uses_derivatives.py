@@ -33,6 +33,18 @@ class DriverUsesDerivatives(Driver):
         if self.differentiator is not None:
             self.differentiator._parent = self
         
+    def config_changed(self, update_parent=True):
+        """Call this whenever the configuration of this Component changes,
+        for example, children are added or removed or dependencies may have
+        changed. The differentiator is notified too, since it may have
+        cached information about the model.
+        """
+        super(DriverUsesDerivatives, self).config_changed(update_parent)
+        differentiator = self.differentiator
+        if differentiator is not None and \
+           hasattr(differentiator, 'config_changed'):
+            differentiator.config_changed()
+        
     def _list_driver_connections(self):
         """Return a list of inputs and a list of outputs that are referenced by
         any existing driver Expreval."""
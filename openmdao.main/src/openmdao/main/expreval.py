@@ -12,7 +12,7 @@ import __builtin__
 
 from openmdao.main.printexpr import _get_attr_node, _get_long_name, transform_expression, ExprPrinter
 from openmdao.util.nameutil import partition_names_by_comp
-from openmdao.main.index import INDEX, ATTR, CALL, SLICE
+from openmdao.main.index import INDEX, ATTR, CALL, SLICE, get_indexed_value
 
 from openmdao.main.sym import SymGrad, SymbolicDerivativeError
 
@@ -50,6 +50,19 @@ else:
 
 _Missing = object()
 
+# incremented whenever the structure of any model changes. ExprEvaluators
+# compare this against the value it had when they resolved their variable
+# accessors to know when those accessors have to be thrown away.
+_config_generation = 0
+
+def invalidate_accessors():
+    """Mark the variable accessors cached by all ExprEvaluators as stale.
+    This is called by Component.config_changed, so it normally doesn't need
+    to be called directly.
+    """
+    global _config_generation
+    _config_generation += 1
+
 class ExprTransformer(ast.NodeTransformer):
     """Transforms dotted name references, e.g., abc.d.g in an expression AST
     into scope.get('abc.d.g') and turns assignments into the appropriate
@@ -362,6 +375,71 @@ class ExprExaminer(ast.NodeVisitor):
         super(ExprExaminer, self).generic_visit(node)
     
 
+class _AccessorScope(object):
+    """Stands in for the scoping object of an ExprEvaluator during
+    evaluation. The part of each referenced variable path that runs through
+    local Components is resolved only once, leaving just the final getattr
+    (and index lookup, if any) to be done on each call. Anything other than
+    *get* and *get_wrapped_attr* is passed through to the real scope.
+    """
+    
+    def __init__(self, scope):
+        self._scope = weakref.ref(scope)
+        self.generation = _config_generation
+        self._accessors = {}
+        
+    def __getattr__(self, name):
+        return getattr(self._scope(), name)
+    
+    def _resolve(self, path):
+        """Return a tuple of the form (owner_ref, restofpath, simple) where 
+        owner is the deepest local Component found along the given path and
+        simple is True if restofpath refers directly to an attribute of owner.
+        """
+        from openmdao.main.container import Container
+        from openmdao.main.component import Component
+        
+        obj = self._scope()
+        parts = path.split('.')
+        i = 0
+        if isinstance(obj, Component):
+            while i < len(parts)-1:
+                child = getattr(obj, parts[i], _Missing)
+                if not isinstance(child, Component):
+                    break
+                obj = child
+                i += 1
+        restofpath = '.'.join(parts[i:])
+        simple = isinstance(obj, Container) and '.' not in restofpath \
+                 and '[' not in restofpath
+        return (weakref.ref(obj), restofpath, simple)
+    
+    def _lookup(self, path):
+        try:
+            ref, name, simple = self._accessors[path]
+            owner = ref()
+        except KeyError:
+            owner = None
+        if owner is None:
+            ref, name, simple = self._accessors[path] = self._resolve(path)
+            owner = ref()
+        return owner, name, simple
+        
+    def get(self, path, index=None):
+        owner, name, simple = self._lookup(path)
+        if simple:
+            obj = getattr(owner, name, _Missing)
+            if obj is not _Missing:
+                if index:
+                    return get_indexed_value(obj, '', index)
+                return obj
+        return owner.get(name, index)
+    
+    def get_wrapped_attr(self, path, index=None):
+        owner, name, simple = self._lookup(path)
+        return owner.get_wrapped_attr(name, index)
+    
+
 class ExprEvaluator(object):
     """A class that translates an expression string into a new string
     containing any necessary framework access functions, e.g., set, get. The
@@ -372,10 +450,17 @@ class ExprEvaluator(object):
     function invocation are also translated in a similar way.  For a description
     of the format of the 'index' arg of set/get that is generated by ExprEvaluator,
     see the doc string for the ``openmdao.main.index.process_index_entry`` function.
+    
+    Variable references are resolved through accessors that are cached until
+    the configuration of the model changes. Setting *cache_accessors* to
+    False makes every evaluation resolve its variables from the scope.
     """
     
+    cache_accessors = True
+    
     def __init__(self, text, scope=None, getter='get'):
         self._scope = None
+        self._accessors = None
         self.scope = scope
         self.text = text
         self.getter = getter
@@ -389,7 +474,7 @@ class ExprEvaluator(object):
     @text.setter
     def text(self, value):
         self._code = self._assignment_code = None
-        self._examiner = self.cached_grad_eq = None
+        self._examiner = self.cached_grad_eq = self._accessors = None
         self._text = value
 
     @property
@@ -406,7 +491,7 @@ class ExprEvaluator(object):
     def scope(self, value):
         if value is not self.scope:
             self._code = self._assignment_code = None
-            self._examiner = self.cached_grad_eq = None
+            self._examiner = self.cached_grad_eq = self._accessors = None
             if value is not None:
                 self._scope = weakref.ref(value)
             else:
@@ -439,6 +524,7 @@ class ExprEvaluator(object):
         # remove weakref to scope because it won't pickle
         state['_scope'] = self.scope
         state['_code'] = None  # <type 'code'> won't pickle either.
+        state['_accessors'] = None  # full of weakrefs
         if state.get('_assignment_code'):
             state['_assignment_code'] = None # more unpicklable <type 'code'>
         return state
@@ -514,6 +600,17 @@ class ExprEvaluator(object):
             return scope
         return self.scope
 
+    def _get_accessor_scope(self, scope):
+        """Return the object to use in place of *scope* when evaluating
+        our expression.
+        """
+        if scope is None or not self.cache_accessors:
+            return scope
+        if self._accessors is None or \
+           self._accessors.generation != _config_generation:
+            self._accessors = _AccessorScope(scope)
+        return self._accessors
+
     def evaluate(self, scope=None):
         """Return the value of the scoped string, evaluated 
         using the eval() function.
@@ -523,6 +620,7 @@ class ExprEvaluator(object):
         try:
             if self._code is None:
                 self._parse()
+            scope = self._get_accessor_scope(scope)
             return eval(self._code, _expr_dict, locals())
         except Exception, err:
             raise type(err)("can't evaluate expression "+
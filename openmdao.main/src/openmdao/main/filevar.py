@@ -4,8 +4,10 @@ Support for files, either as :class:`File` or external files.
 import copy
 import os.path
 import pprint
+import zlib
 
 from openmdao.main.rbac import rbac, rbac_decorate
+from openmdao.util.filexfer import COMPRESSION_LEVEL
 
 __all__ = ('FileMetadata', 'FileRef', '_get_valid_owner')
 
@@ -125,6 +127,14 @@ class RemoteFile(object):
         """ Read up to `size` bytes. """
         return self.fileobj.read(size)
     
+    @rbac('owner')
+    def read_compressed(self, size=-1):
+        """ Read up to `size` bytes, returned :mod:`zlib` compressed. """
+        data = self.fileobj.read(size)
+        if data:
+            data = zlib.compress(data, COMPRESSION_LEVEL)
+        return data
+
     @rbac('owner')
     def readline(self, size=-1):
         """ Read one line. """
@@ -135,11 +145,33 @@ class RemoteFile(object):
         """ Read until EOF. """
         return self.fileobj.readlines(sizehint)
 
+    @rbac('owner')
+    def seek(self, offset, whence=0):
+        """ Set the current file position. """
+        return self.fileobj.seek(offset, whence)
+
+    @rbac('owner')
+    def tell(self):
+        """ Return the current file position. """
+        return self.fileobj.tell()
+
+    @rbac('owner')
+    def truncate(self, size=None):
+        """ Truncate (or extend) the file to `size` bytes. """
+        if size is None:
+            return self.fileobj.truncate()
+        return self.fileobj.truncate(size)
+
     @rbac('owner')
     def write(self, data):
         """ Write `data` to the file. """
         return self.fileobj.write(data)
 
+    @rbac('owner')
+    def write_compressed(self, data):
+        """ Write :mod:`zlib` compressed `data` to the file. """
+        return self.fileobj.write(zlib.decompress(data))
+
 rbac_decorate(RemoteFile.__enter__, 'owner', proxy_types=(RemoteFile,))
 rbac_decorate(RemoteFile.__iter__,  'owner', proxy_types=(RemoteFile,))
 
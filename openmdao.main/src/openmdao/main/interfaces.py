@@ -544,6 +544,18 @@ class ISurrogate(Interface):
             Training case output history for this surrogate's output,
             which corresponds to the training case input history given by X.
         """
+        
+    def update(X, Y): 
+        """Optional. Adds new training points to a surrogate model that has 
+        already been trained, without retraining on the full data set. 
+        MetaModel calls this instead of train() when the only change to the 
+        training data is that new cases were appended.
+        
+        X: iterator of lists
+            Input values of the new training cases.
+        y: iterator
+            Output values of the new training cases.
+        """
     
 class IHasParameters(Interface):
     
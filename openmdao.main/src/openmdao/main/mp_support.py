@@ -14,6 +14,10 @@ is used between the Proxy and Server:
 3. Subsequent communication is encrypted with the session key (which presumably
    is quicker than public/private key encryption).
 
+Requests and replies are sent via :func:`send_message`, which sends large numpy
+arrays as raw data frames following the pickled message rather than pickling
+them.
+
 If `authkey` is not 'PublicKey', then the above session protocol is not used,
 and channel data is in the clear.
 
@@ -60,9 +64,9 @@ if sys.platform == 'win32':  #pragma no cover
 from enthought.traits.trait_handlers import TraitDictObject
 
 from openmdao.main.interfaces import obj_has_interface
-from openmdao.main.mp_util import decrypt, encrypt, is_legal_connection, \
-                                  keytype, make_typeid, public_methods, \
-                                  SPECIALS
+from openmdao.main.mp_util import is_legal_connection, keytype, \
+                                  make_typeid, public_methods, \
+                                  receive_message, send_message, SPECIALS
 from openmdao.main.rbac import AccessController, RoleError, check_role, \
                                need_proxy, Credentials, \
                                get_credentials, set_credentials
@@ -356,8 +360,6 @@ class OpenMDAO_Server(Server):
         """
         self._logger.log(LOG_DEBUG2, 'starting server thread to service %r, %s',
                          threading.current_thread().name, keytype(self._authkey))
-        recv = conn.recv
-        send = conn.send
         id_to_obj = self.id_to_obj
         id_to_controller = self._id_to_controller
 
@@ -372,9 +374,10 @@ class OpenMDAO_Server(Server):
             try:
                 ident = methodname = args = kwds = credentials = None
                 obj = exposed = gettypeid = None
-                data = recv()
                 try:
-                    request = decrypt(data, session_key)
+                    request = receive_message(conn, session_key)
+                except EOFError:
+                    raise
                 except Exception as exc:
                     trace = traceback.format_exc()
                     msg = "Can't decrypt/unpack request. This could be the" \
@@ -397,6 +400,18 @@ class OpenMDAO_Server(Server):
                     self._logger.error('%r' % exc)
                     raise
 
+                if ident is None:
+                    # Reference count changes sent by a _ConnectionPool.
+                    self._logger.log(LOG_DEBUG2, '%s %s', methodname, args)
+                    if methodname not in ('incref', 'decref'):
+                        raise RuntimeError('Unexpected request %r'
+                                           % methodname)
+                    refcount = getattr(self, methodname)
+                    for ref in args:
+                        refcount(conn, ref)
+                    send_message(conn, ('#RETURN', None), session_key)
+                    continue
+
                 try:
                     obj, exposed, gettypeid = id_to_obj[ident]
                 # Hard to cause this to happen.
@@ -493,9 +508,10 @@ class OpenMDAO_Server(Server):
 
             try:
                 try:
-                    send(encrypt(msg, session_key))
+                    send_message(conn, msg, session_key)
                 except Exception:
-                    send(encrypt(('#UNSERIALIZABLE', repr(msg)), session_key))
+                    send_message(conn, ('#UNSERIALIZABLE', repr(msg)),
+                                 session_key)
             # Just being defensive, this should never happen.
             except Exception as exc: #pragma no cover
                 self._logger.error('exception in thread serving %r',
@@ -515,8 +531,8 @@ class OpenMDAO_Server(Server):
             raise
 
         client_version = client_data[0]
-        if client_version != 1:  #pragma no cover
-            msg = 'Expected client protocol version 1, got %r' % client_version
+        if client_version != 2:  #pragma no cover
+            msg = 'Expected client protocol version 2, got %r' % client_version
             self._logger.error(msg)
             raise RuntimeError(msg)
 
@@ -533,7 +549,7 @@ class OpenMDAO_Server(Server):
             self._logger.error("Can't recreate client key: %r", exc)
             raise
 
-        server_version = 1
+        server_version = 2
         try:
             session_key = hashlib.sha1(str(id(conn))).hexdigest()
             data = client_key.encrypt(session_key, '')
@@ -1079,6 +1095,7 @@ class OpenMDAO_Manager(BaseManager):
         # Just being defensive here.
         except KeyError:  #pragma no cover
             pass
+        _discard_pools(address)
 
 
 class ObjectManager(object):
@@ -1180,41 +1197,40 @@ class OpenMDAO_Proxy(BaseProxy):
         else:
             del kwds['pubkey']
 
-        super(OpenMDAO_Proxy, self).__init__(*args, **kwds)
-
-        if self._manager is None:
+        # Needed by _incref(), which may be called by BaseProxy.__init__().
+        manager = kwds.get('manager', args[2] if len(args) > 2 else None)
+        if manager is None:
             self._pubkey = pubkey
         else:
-            self._pubkey = self._manager._pubkey
+            self._pubkey = manager._pubkey
+
+        super(OpenMDAO_Proxy, self).__init__(*args, **kwds)
+
+    @property
+    def _pool(self):
+        """ :class:`_ConnectionPool` for our server. """
+        return _get_pool(self._token.address, self._authkey, self._pubkey,
+                         self._Client)
 
     def _callmethod(self, methodname, args=None, kwds=None):
         """
         Try to call a method of the referrent and return a copy of the result.
-        This version optionally encrypts the channel and sends the current
-        thread's credentials with method arguments.
+        This version optionally encrypts the channel, sends the current
+        thread's credentials with method arguments, and sends large numpy
+        arrays out-of-band. Connections are obtained from a
+        :class:`_ConnectionPool` shared by all threads.
         """
         args = args or ()
         kwds = kwds or {}
 
+        pool = self._pool
         try:
-            conn = self._tls.connection
-        except AttributeError:
-            curr_thread = threading.current_thread()
-            util.debug('thread %r does not own a connection', curr_thread.name)
-            try:
-                self._connect()
-            except Exception as exc:
-                msg = "Can't connect to server at %r for %r: %r" \
-                      % (self._token.address, methodname, exc)
-                logging.error(msg)
-                raise RuntimeError(msg)
-            conn = self._tls.connection
-            if self._authkey == 'PublicKey':
-                self._init_session(conn)
-            else:
-                self._tls.session_key = ''
-
-        session_key = self._tls.session_key
+            conn, session_key = pool.get()
+        except Exception as exc:
+            msg = "Can't connect to server at %r for %r: %r" \
+                  % (self._token.address, methodname, exc)
+            logging.error(msg)
+            raise RuntimeError(msg)
 
 # FIXME: Bizarre problem evidenced by test_extcode.py (Python 2.6.1)
 # For some reason pickling the env_vars dictionary causes:
@@ -1229,16 +1245,26 @@ class OpenMDAO_Proxy(BaseProxy):
             else:
                 new_args.append(arg)
 
+        # The connection is only reused if the request/reply completes.
+        reusable = False
         try:
-            conn.send(encrypt((self._id, methodname, new_args, kwds,
-                               get_credentials().encode()), session_key))
-        except IOError as exc:
-            msg = "Can't send to server at %r for %r: %r" \
-                  % (self._token.address, methodname, exc)
-            logging.error(msg)
-            raise RuntimeError(msg)
+            pool.flush(conn, session_key)
+            try:
+                send_message(conn, (self._id, methodname, new_args, kwds,
+                                    get_credentials().encode()), session_key)
+            except IOError as exc:
+                msg = "Can't send to server at %r for %r: %r" \
+                      % (self._token.address, methodname, exc)
+                logging.error(msg)
+                raise RuntimeError(msg)
 
-        kind, result = decrypt(conn.recv(), session_key)
+            kind, result = receive_message(conn, session_key)
+            reusable = True
+        finally:
+            if reusable:
+                pool.put(conn, session_key)
+            else:
+                pool.discard(conn)
 
         if kind == '#RETURN':
             return result
@@ -1265,99 +1291,62 @@ class OpenMDAO_Proxy(BaseProxy):
             else:
                 manager = self._manager
 
+            # The server has already counted the proxy's reference, so rather
+            # than incref followed by decref, just start tracking it.
             proxy = proxytype(token, self._serializer, manager=manager,
                               authkey=self._authkey, exposed=exposed,
-                              pubkey=pubkey)
-
-            conn = _get_connection(self._Client, token.address, self._authkey)
-            dispatch(conn, None, 'decref', (token.id,))
+                              incref=False, pubkey=pubkey)
+            proxy._track()
             return proxy
 
         raise convert_to_error(kind, result)
 
-    def _init_session(self, conn):
-        """ Send client public key, receive session key. """
-        key_pair = get_key_pair(Credentials.user_host)
-        public_key = key_pair.publickey()
-        text = encode_public_key(public_key)
-
-        server_key = self._pubkey
-        encrypted = pk_encrypt(text, server_key)
-        client_version = 1
-        conn.send((client_version, server_key.n, server_key.e, encrypted))
-
-        server_data = conn.recv()
-        server_version = server_data[0]
-        # Just being defensive, this should never happen.
-        if server_version != 1:  #pragma no cover
-            msg = 'Expecting server protocol version 1, got %r' % server_version
-            logging.error(msg)
-            if server_version == '#TRACEBACK':
-                try:
-                    logging.error(''.join(server_data[1]))
-                except Exception:
-                    pass
-            raise RuntimeError(msg)
-        
-        self._tls.session_key = key_pair.decrypt(server_data[1])
-
     def _incref(self):
         """
         Tell server to increment its reference count.
-        This version avoids a hang in _Client if the server no longer exists.
+        This version uses our :class:`_ConnectionPool`, which avoids a hang
+        in _Client if the server no longer exists.
         """
-        # Hard to cause this to happen.
-        if not OpenMDAO_Proxy.manager_is_alive(self._token.address):  #pragma no cover
-            raise RuntimeError('Cannot connect to manager at %r' 
-                               % (self._token.address,))
-
-        conn = _get_connection(self._Client, self._token.address, self._authkey)
-        dispatch(conn, None, 'incref', (self._id,))
+        self._pool.incref(self._id)
         # Enable this with care. While testing CaseIteratorDriver it can cause a
         # deadlock in logging (called via BaseProxy._after_fork()).
         #util.debug('INCREF %r', self._token.id)
+        self._track()
 
+    def _track(self):
+        """ Record our reference and arrange for decref when reaped. """
         self._idset.add(self._id)
 
         state = self._manager and self._manager._state
 
         self._close = util.Finalize(
             self, OpenMDAO_Proxy._decref,
-            args=(self._token, self._authkey, state,
-                  self._tls, self._idset, self._Client),
+            args=(self._token, state, self._pool, self._idset),
             exitpriority=10
             )
 
     @staticmethod
-    def _decref(token, authkey, state, tls, idset, _Client):
+    def _decref(token, state, pool, idset):
         """
         Tell server to decrement its reference count.
-        This version avoids a hang in _Client if the server no longer exists.
+        This version queues the decrement to be sent with others, which
+        happens on the next call to the server, after a short delay, or
+        when the last proxy for the server is reaped.
         """
         idset.discard(token.id)
 
         # check whether manager is still alive
         if state is None or state.value == State.STARTED:
-            # Avoid a hang in _Client() if the server isn't there anymore.
-            if OpenMDAO_Proxy.manager_is_alive(token.address):
-                # tell manager this process no longer cares about referent
-                try:
-                    util.debug('DECREF %r', token.id)
-                    conn = _get_connection(_Client, token.address, authkey)
-                    dispatch(conn, None, 'decref', (token.id,))
-                # Hard to cause this to happen.
-                except Exception as exc:  #pragma no cover
-                    util.debug('... decref failed %s', exc)
+            util.debug('DECREF %r', token.id)
+            pool.decref(token.id)
         else:
             util.debug('DECREF %r -- manager already shutdown', token.id)
 
-        # check whether we can close this thread's connection because
+        # check whether we can close the pool's connections because
         # the process owns no more references to objects for this manager
-        if not idset and hasattr(tls, 'connection'):
-            util.debug('thread %r has no more %r proxies so closing conn',
-                       threading.current_thread().name, token.typeid)
-            tls.connection.close()
-            del tls.connection
+        if not idset:
+            util.debug('no more %r proxies so closing pool', token.typeid)
+            pool.close()
 
     @staticmethod
     def manager_is_alive(address):
@@ -1536,6 +1525,311 @@ def _auto_proxy(token, serializer, manager=None, authkey=None,
     return proxy
 
 
+# Connection pools for OpenMDAO_Proxy, keyed by (address, authkey).
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+def _reset_pools(unused):
+    """
+    Forget pools inherited by a child process. Their connections belong to
+    the parent, and another parent thread may have held the lock at fork time.
+    """
+    global _POOLS_LOCK
+    _POOLS_LOCK = threading.Lock()
+    _POOLS.clear()
+
+util.register_after_fork(_reset_pools, _reset_pools)
+
+# Maximum number of idle connections kept by a _ConnectionPool.
+_MAX_IDLE = 8
+
+# Queued decrements are sent after this many seconds if no request has
+# carried them sooner.
+_FLUSH_DELAY = 5.
+
+# Queued decrements are sent immediately once there are this many.
+_MAX_PENDING = 100
+
+
+def connection_stats(address=None):
+    """
+    Returns a dictionary of proxy connection statistics for this process.
+
+    address: tuple or string
+        If specified, only report on connections to this server address.
+        Otherwise values are summed over all servers.
+
+    Statistics reported:
+
+    - 'connections': number of connections opened.
+    - 'handshakes': number of session key negotiations.
+    - 'open': number of connections currently open.
+    - 'idle': number of open connections not currently in use.
+    - 'refcount_msgs': number of reference count messages sent.
+    - 'decrefs': number of reference count decrements sent.
+    """
+    stats = dict(connections=0, handshakes=0, open=0, idle=0,
+                 refcount_msgs=0, decrefs=0)
+    with _POOLS_LOCK:
+        pools = _POOLS.values()
+    for pool in pools:
+        if address is None or pool.address == address:
+            with pool.lock:
+                for name, value in pool.stats.items():
+                    stats[name] += value
+                stats['idle'] += len(pool.idle)
+    return stats
+
+
+def _get_pool(address, authkey, pubkey, _client):
+    """ Return the :class:`_ConnectionPool` for `address`. """
+    key = (address, authkey)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        # Connections inherited from our parent aren't ours to use.
+        if pool is None or pool.pid != os.getpid():
+            pool = _ConnectionPool(address, authkey, pubkey, _client)
+            _POOLS[key] = pool
+    return pool
+
+def _discard_pools(address):
+    """ Discard pools for a server at `address` which has been shut down. """
+    with _POOLS_LOCK:
+        for key in _POOLS.keys():
+            if key[0] == address:
+                pool = _POOLS.pop(key)
+                if pool.pid == os.getpid():
+                    pool.close(flush=False)
+
+
+class _ConnectionPool(object):
+    """
+    Connections to the server at `address`, shared by all proxies and threads
+    of this process. A connection is used for one request at a time and then
+    returned to the pool for reuse, so the session key handshake is only
+    performed when a new connection is needed. Reference count decrements
+    are queued and sent together.
+
+    Requests from different threads are not multiplexed on one connection;
+    each concurrent request uses a connection of its own.
+
+    address: tuple or string
+        A :mod:`multiprocessing` address specifying an Internet address or
+        a pipe.
+
+    authkey: string
+        Authorization key.
+
+    pubkey: public key
+        Server's public key, used if `authkey` is 'PublicKey'.
+
+    _client: callable
+        Used to create new connections.
+    """
+
+    def __init__(self, address, authkey, pubkey, _client):
+        self.address = address
+        self.pid = os.getpid()
+        self.lock = threading.RLock()  # Decref may be called during GC.
+        self.idle = []
+        self.stats = dict(connections=0, handshakes=0, open=0,
+                          refcount_msgs=0, decrefs=0)
+        self._authkey = authkey
+        self._pubkey = pubkey
+        self._client = _client
+        self._pending = []
+        self._timer = None
+
+    def get(self):
+        """ Return ``(conn, session_key)``, connecting if necessary. """
+        with self.lock:
+            if self.idle:
+                return self.idle.pop()
+
+        # Avoid a hang in _Client() if the server isn't there anymore.
+        if not OpenMDAO_Proxy.manager_is_alive(self.address):
+            raise RuntimeError('Cannot connect to manager at %r'
+                               % (self.address,))
+
+        conn = _get_connection(self._client, self.address, self._authkey)
+        with self.lock:
+            self.stats['connections'] += 1
+            self.stats['open'] += 1
+        try:
+            name = current_process().name
+            if threading.current_thread().name != 'MainThread':
+                name += '|' + threading.current_thread().name
+            dispatch(conn, None, 'accept_connection', (name,))
+            if self._authkey == 'PublicKey':
+                session_key = _init_session(conn, self._pubkey)
+                with self.lock:
+                    self.stats['handshakes'] += 1
+            else:
+                session_key = ''
+        except Exception:
+            self.discard(conn)
+            raise
+        return (conn, session_key)
+
+    def put(self, conn, session_key):
+        """ Return `conn` to the pool after successful use. """
+        with self.lock:
+            if len(self.idle) < _MAX_IDLE:
+                self.idle.append((conn, session_key))
+                return
+        self.discard(conn)
+
+    def discard(self, conn):
+        """ Close `conn` rather than returning it to the pool. """
+        try:
+            conn.close()
+        # Just being defensive.
+        except Exception:  #pragma no cover
+            pass
+        with self.lock:
+            self.stats['open'] -= 1
+
+    def incref(self, ident):
+        """ Increment the reference count for `ident`. """
+        self._refcount('incref', [ident])
+
+    def decref(self, ident):
+        """
+        Queue a decrement of the reference count for `ident`. Queued
+        decrements are sent ahead of the next request, or after
+        `_FLUSH_DELAY` seconds, or as soon as `_MAX_PENDING` are queued.
+        """
+        with self.lock:
+            self._pending.append(ident)
+            if len(self._pending) < _MAX_PENDING:
+                if self._timer is None:
+                    self._timer = threading.Timer(_FLUSH_DELAY,
+                                                  self._flush_pending)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self._flush_pending()
+
+    def flush(self, conn, session_key):
+        """ Send any queued decrements using `conn`. """
+        with self.lock:
+            if not self._pending:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            idents = self._pending
+            self._pending = []
+        try:
+            self._send_refcount(conn, session_key, 'decref', idents)
+        except (EOFError, IOError):
+            raise
+        # Don't fail the request this is being sent ahead of.
+        except Exception as exc:  #pragma no cover
+            logging.warning('decref of %s at %r failed: %s',
+                            idents, self.address, exc)
+
+    def close(self, flush=True):
+        """ Optionally send queued decrements, then close idle connections. """
+        if flush:
+            self._flush_pending()
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            idle = self.idle
+            self.idle = []
+        for conn, session_key in idle:
+            self.discard(conn)
+
+    def _flush_pending(self):
+        """ Send queued decrements without waiting for a request. """
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            idents = self._pending
+            self._pending = []
+        if idents and self.pid == os.getpid():
+            try:
+                self._refcount('decref', idents)
+            # Hard to cause this to happen.
+            except Exception as exc:  #pragma no cover
+                util.debug('... decref failed %s', exc)
+
+    def _refcount(self, funcname, idents):
+        """
+        Send reference count change `funcname` ('incref' or 'decref') for
+        `idents`. If there's an idle connection it's used, otherwise rather
+        than negotiate a new session each change is sent the way
+        :class:`BaseProxy` does, via a new unencrypted connection.
+        """
+        with self.lock:
+            idle = self.idle.pop() if self.idle else None
+
+        if idle is None:
+            # Avoid a hang in _Client() if the server isn't there anymore.
+            if not OpenMDAO_Proxy.manager_is_alive(self.address):
+                raise RuntimeError('Cannot connect to manager at %r'
+                                   % (self.address,))
+            for ident in idents:
+                conn = _get_connection(self._client, self.address,
+                                       self._authkey)
+                try:
+                    dispatch(conn, None, funcname, (ident,))
+                finally:
+                    conn.close()
+        else:
+            conn, session_key = idle
+            reusable = False
+            try:
+                self._send_refcount(conn, session_key, funcname, idents)
+                reusable = True
+            finally:
+                if reusable:
+                    self.put(conn, session_key)
+                else:
+                    self.discard(conn)
+
+    def _send_refcount(self, conn, session_key, funcname, idents):
+        """ Send reference count change `funcname` for `idents` on `conn`. """
+        send_message(conn, (None, funcname, idents, {},
+                            get_credentials().encode()), session_key)
+        kind, result = receive_message(conn, session_key)
+        with self.lock:
+            self.stats['refcount_msgs'] += 1
+            if funcname == 'decref':
+                self.stats['decrefs'] += len(idents)
+        if kind != '#RETURN':
+            raise convert_to_error(kind, result)
+
+
+def _init_session(conn, server_key):
+    """ Send client public key, return session key. """
+    key_pair = get_key_pair(Credentials.user_host)
+    public_key = key_pair.publickey()
+    text = encode_public_key(public_key)
+
+    encrypted = pk_encrypt(text, server_key)
+    client_version = 2
+    conn.send((client_version, server_key.n, server_key.e, encrypted))
+
+    server_data = conn.recv()
+    server_version = server_data[0]
+    # Just being defensive, this should never happen.
+    if server_version != 2:  #pragma no cover
+        msg = 'Expecting server protocol version 2, got %r' % server_version
+        logging.error(msg)
+        if server_version == '#TRACEBACK':
+            try:
+                logging.error(''.join(server_data[1]))
+            except Exception:
+                pass
+        raise RuntimeError(msg)
+
+    return key_pair.decrypt(server_data[1])
+
+
 def _get_connection(_client, address, authkey):
     """
     Get client connection to `address` using `authkey`.
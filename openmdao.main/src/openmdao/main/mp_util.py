@@ -12,11 +12,19 @@ import logging
 import os.path
 import re
 import socket
+import struct
 import sys
 import time
 
+from cStringIO import StringIO
+
 from Crypto.Cipher import AES
 
+try:
+    from numpy import ascontiguousarray, empty, frombuffer, ndarray, uint8
+except ImportError:
+    ndarray = None
+
 from multiprocessing import current_process, connection
 from multiprocessing.managers import BaseProxy
 
@@ -29,6 +37,14 @@ from openmdao.util.shellproc import ShellProc, STDOUT
 # Names of attribute access methods requiring special handling.
 SPECIALS = ('__getattribute__', '__getattr__', '__setattr__', '__delattr__')
 
+# Numpy arrays of at least this many bytes are sent out-of-band by
+# :func:`send_message` rather than being pickled.
+OOB_THRESHOLD = 1 << 16
+
+# Maximum size of an out-of-band data frame.
+# Must be a multiple of the AES block size.
+FRAME_SIZE = 1 << 24
+
 
 def keytype(authkey):
     """
@@ -199,59 +215,155 @@ def _cleanup_tunnel(tunnel_proc, stdin, stdout, logname, pid):
             logging.warning("Can't remove tunnel logfile: %s", exc)
 
 
-def encrypt(obj, session_key):
+def send_message(conn, obj, session_key):
     """
-    If `session_key` is specified, returns ``(length, data)`` of encrypted,
-    pickled, `obj`. Otherwise `obj` is returned.
+    Send `obj` on `conn`, encrypted if `session_key` is specified.
+
+    conn: :class:`Connection`
+        Connection to send on.
 
     obj: object
-        Object to be pickled and encrypted.
+        Object to be sent.
 
     session_key: string
         Key used for encryption. Should be at least 16 bytes long.
+
+    Large contiguous numpy arrays in `obj` are not pickled. The pickled header
+    just records their type and shape, and their data follows in raw frames
+    sent directly from the arrays' memory. If there is no `session_key` and
+    no large array, the message is compatible with :meth:`Connection.recv`.
+    If sending array data fails, `conn` is closed.
     """
+    arrays = []
+    ids = {}
+
+    def persistent_id(obj):
+        """ Return reference for out-of-band array, else None. """
+        if type(obj) is not ndarray or obj.nbytes < OOB_THRESHOLD or \
+           obj.dtype.hasobject or obj.dtype.fields is not None:
+            return None
+        try:
+            return (ids[id(obj)],)
+        except KeyError:
+            pass
+        if obj.flags.c_contiguous:
+            order = 'C'
+            data = obj
+        elif obj.flags.f_contiguous:
+            order = 'F'
+            data = obj
+        else:
+            order = 'C'
+            data = ascontiguousarray(obj)
+        ids[id(obj)] = len(arrays)
+        arrays.append(data.reshape(-1, order=order).view(uint8))
+        return (len(arrays)-1, obj.dtype.str, obj.shape, order)
+
+    out = StringIO()
+    pickler = cPickle.Pickler(out, cPickle.HIGHEST_PROTOCOL)
+    # Only called for objects which aren't of builtin types.
+    pickler.inst_persistent_id = persistent_id
+    pickler.dump(obj)
+    text = out.getvalue()
+
     if session_key:
-        # Just being defensive, this should never happen.
-        if len(session_key) < 16:  #pragma no cover
-            session_key += '!'*16
-        session_key = session_key[:16]
-        encryptor = AES.new(session_key, AES.MODE_CBC, '?'*AES.block_size)
-        text = cPickle.dumps(obj, cPickle.HIGHEST_PROTOCOL)
         length = len(text)
-        pad = length % AES.block_size
+        pad = (length + 8) % AES.block_size
         if pad:
             pad = AES.block_size - pad
-            text += '-'*pad
-        data = encryptor.encrypt(text)
-        return (length, data)
+        text = struct.pack('!Q', length) + text + '-'*pad
+        conn.send_bytes(_cipher(session_key).encrypt(text))
     else:
-        return obj
+        conn.send_bytes(text)
 
-def decrypt(msg, session_key):
+    try:
+        for data in arrays:
+            _send_frames(conn, data, session_key)
+    except Exception:
+        # The receiver can't resynchronize with a partial message.
+        conn.close()
+        raise
+
+def receive_message(conn, session_key):
     """
-    If `session_key` is specified, returns object from encrypted pickled data
-    contained in `msg`. Otherwise `msg` is returned.
+    Return object received from `conn`, decrypted if `session_key`
+    is specified.
 
-    msg: string
-        Encrypted text of pickled object.
+    conn: :class:`Connection`
+        Connection to receive from.
 
     session_key: string
         Key used for encryption. Should be at least 16 bytes long.
+
+    Receives messages sent by :func:`send_message`. Out-of-band array data
+    is received directly into newly allocated arrays. If that fails, `conn`
+    is closed, since the rest of the message can't be skipped.
     """
+    text = conn.recv_bytes()
     if session_key:
+        text = _cipher(session_key).decrypt(text)
+        length = struct.unpack('!Q', text[:8])[0]
+        text = text[8:length+8]
+
+    arrays = []
+
+    def persistent_load(pid):
+        """ Return out-of-band array referred to by `pid`. """
+        if len(pid) == 1:
+            return arrays[pid[0]]
+        index, dtype, shape, order = pid
         # Just being defensive, this should never happen.
-        if len(msg) != 2:  #pragma no cover
-            raise RuntimeError('_decrypt: msg not encrypted?')
-        # Just being defensive, this should never happen.
-        if len(session_key) < 16:  #pragma no cover
-            session_key += '!'*16
-        session_key = session_key[:16]
-        decryptor = AES.new(session_key, AES.MODE_CBC, '?'*AES.block_size)
-        length, data = msg
-        text = decryptor.decrypt(data)
-        return cPickle.loads(text[:length])
-    else:
-        return msg
+        if index != len(arrays):  #pragma no cover
+            raise RuntimeError('Out-of-band array %d out of sequence' % index)
+        try:
+            arr = empty(shape, dtype, order=order)
+            _recv_frames(conn, arr.reshape(-1, order=order).view(uint8),
+                         session_key)
+        except Exception:
+            # Unread frames would be taken as the next message.
+            conn.close()
+            raise
+        arrays.append(arr)
+        return arr
+
+    unpickler = cPickle.Unpickler(StringIO(text))
+    unpickler.persistent_load = persistent_load
+    return unpickler.load()
+
+def _cipher(session_key):
+    """ Return new AES cipher for `session_key`. """
+    # Just being defensive, this should never happen.
+    if len(session_key) < 16:  #pragma no cover
+        session_key += '!'*16
+    session_key = session_key[:16]
+    return AES.new(session_key, AES.MODE_CBC, '?'*AES.block_size)
+
+def _send_frames(conn, data, session_key):
+    """ Send `data` (a flat :class:`uint8` array) in frames. """
+    cipher = _cipher(session_key) if session_key else None
+    nbytes = len(data)
+    for offset in range(0, nbytes, FRAME_SIZE):
+        size = min(FRAME_SIZE, nbytes - offset)
+        if cipher is None:
+            conn.send_bytes(data, offset, size)
+        else:
+            chunk = buffer(data, offset, size)
+            pad = size % AES.block_size
+            if pad:
+                chunk = str(chunk) + '-'*(AES.block_size - pad)
+            conn.send_bytes(cipher.encrypt(chunk))
+
+def _recv_frames(conn, data, session_key):
+    """ Receive frames into `data` (a flat :class:`uint8` array). """
+    cipher = _cipher(session_key) if session_key else None
+    nbytes = len(data)
+    for offset in range(0, nbytes, FRAME_SIZE):
+        if cipher is None:
+            conn.recv_bytes_into(data, offset)
+        else:
+            size = min(FRAME_SIZE, nbytes - offset)
+            text = cipher.decrypt(conn.recv_bytes())
+            data[offset:offset+size] = frombuffer(text, uint8, size)
 
 
 def public_methods(obj):
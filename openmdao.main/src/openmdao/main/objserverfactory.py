@@ -14,10 +14,11 @@ import signal
 import socket
 import sys
 import time
+import zipfile
 
 from multiprocessing import current_process
 
-from openmdao.main.component import SimulationRoot
+from openmdao.main.component import Component, SimulationRoot
 from openmdao.main.container import Container
 from openmdao.main.factory import Factory
 from openmdao.main.factorymanager import create, get_available_types, \
@@ -30,7 +31,8 @@ from openmdao.main.rbac import get_credentials, set_credentials, \
                                rbac, RoleError
 from openmdao.main.releaseinfo import __version__
 
-from openmdao.util.filexfer import pack_zipfile, unpack_zipfile
+from openmdao.util.filexfer import FileCache, get_digests, install_files, \
+                                   pack_zipfile, unpack_zipfile
 from openmdao.util.log import install_remote_handler, remove_remote_handlers, \
                               logging_port, LOG_DEBUG2
 from openmdao.util.publickey import make_private, read_authorized_keys, \
@@ -322,6 +324,10 @@ class ObjServer(object):
     All remote file accesses must be within the tree rooted in the current
     directory at startup.
 
+    Files sent via :func:`filexfer.send_files` are kept in a :class:`FileCache`
+    shared by servers on the same host, so unchanged files need not be sent
+    again.
+
     name: string
         Name of server, used in log messages, etc.
 
@@ -358,6 +364,7 @@ class ObjServer(object):
 
         SimulationRoot.chroot(self._root_dir)
         self.tlo = None
+        self._file_cache = FileCache()
 
         # Ensure Traits Array support is initialized. The code contains
         # globals for numpy symbols that are initialized within
@@ -494,7 +501,10 @@ class ObjServer(object):
         `allow_shell` attribute is True.
 
         egg_filename: string
-            Filename of egg to be loaded.
+            Filename of egg to be loaded. If this isn't an egg, then it
+            is assumed to contain model state written by
+            :meth:`Container.save`, which only works if the model's classes
+            can be imported by this server.
         """
         self._logger.debug('load_model %r', egg_filename)
         if not self._allow_shell:
@@ -504,7 +514,12 @@ class ObjServer(object):
         self._check_path(egg_filename, 'load_model')
         if self.tlo:
             self.tlo.pre_delete()
-        self.tlo = Container.load_from_eggfile(egg_filename, log=self._logger)
+        if os.path.exists(egg_filename) and \
+           not zipfile.is_zipfile(egg_filename):
+            self.tlo = Component.load(egg_filename)
+        else:
+            self.tlo = Container.load_from_eggfile(egg_filename,
+                                                   log=self._logger)
         return self.tlo
 
     @rbac('owner')
@@ -540,6 +555,74 @@ class ObjServer(object):
         self._check_path(filename, 'unpack_zipfile')
         return unpack_zipfile(filename, self._logger, textfiles)
 
+    @rbac('owner')
+    def cache_lookup(self, digests):
+        """
+        Returns those of `digests` not in this host's file cache.
+        Used by :func:`filexfer.send_files`.
+
+        digests: list
+            SHA-1 hex digests of file contents.
+        """
+        self._logger.debug('cache_lookup %d digests', len(digests))
+        return self._file_cache.missing(digests)
+
+    @rbac('owner')
+    def cache_insert(self, filename, digest):
+        """
+        Move `filename` into the file cache if `filename` is legal
+        and its contents match `digest`.
+
+        filename: string
+            Name of file to move.
+
+        digest: string
+            SHA-1 hex digest of the file contents.
+        """
+        self._logger.debug('cache_insert %r %s', filename, digest)
+        self._check_path(filename, 'cache_insert')
+        self._file_cache.insert(filename, digest)
+
+    @rbac('owner')
+    def cache_install(self, files, textfiles=None, linesep=None):
+        """
+        Copy `files` from the file cache if their paths are legal.
+        Returns ``(nfiles, nbytes, missing)``, where `missing` lists the
+        ``(path, digest)`` entries not found in the cache.
+
+        files: list
+            List of ``(path, digest)``, where `path` is '/' separated.
+
+        textfiles: list
+            List of :mod:`fnmatch` style patterns specifying which files are
+            text files possibly needing newline translation. If not supplied,
+            the first 4KB of each is scanned for a zero byte. If not found then
+            the file is assumed to be a text file.
+
+        linesep: string
+            Line separator of the system the files came from. Text files are
+            translated if this differs from the local line separator.
+        """
+        self._logger.debug('cache_install %d files', len(files))
+        for path, digest in files:
+            self._check_path(path, 'cache_install')
+        return install_files(self._file_cache, files, textfiles, linesep,
+                             self._logger)
+
+    @rbac('owner')
+    def get_digests(self, patterns):
+        """
+        Returns ``[(path, size, digest), ...]`` for files matching `patterns`
+        if the patterns are legal. Used by :func:`filexfer.retrieve_files`.
+
+        patterns: list
+            List of :mod:`glob`-style patterns.
+        """
+        self._logger.debug('get_digests %s', patterns)
+        for pattern in patterns:
+            self._check_path(pattern, 'get_digests')
+        return get_digests(patterns)
+
     @rbac('owner')
     def chmod(self, path, mode):
         """
@@ -82,6 +82,12 @@ RESOURCE_LIMITS = set((
     'wallclock_time',
 ))
 
+# Keys used by AllocationScheduler, not passed to allocators.
+SCHEDULING_KEYS = set((
+    'share_group',
+    'share_weight',
+))
+
 # DRMAA derived constants.
 HOME_DIRECTORY = '$drmaa_hd_ph$'
 WORKING_DIRECTORY = '$drmaa_wd_ph$'
@@ -100,6 +106,13 @@ class ResourceAllocationManager(object):
     The manager is initialized with a :class:`LocalAllocator` for the local
     host, using `authkey` of 'PublicKey', and allowing 'shell' access.
 
+    Requests are ordered and placed by an :class:`AllocationScheduler`.
+    Requests made by different drivers share servers fairly if they specify
+    different ``share_group`` values (optionally weighted by
+    ``share_weight``). Servers kept idle for reuse (see
+    :class:`ServerPool`) still count against their allocator's capacity,
+    so when a request is blocked by them the pool is asked to release one.
+
     By default ``~/.openmdao/resources.cfg`` will be used for additional
     configuration information. To avoid this, call :meth:`configure` before
     any other allocation routines, or set the ``OPENMDAO_RAMFILE`` environment
@@ -108,7 +121,9 @@ class ResourceAllocationManager(object):
     """
 
     _lock = threading.Lock()
+    _ready = threading.Condition(_lock)  # Notified when servers are released.
     _RAM = None  # Singleton.
+    _reclaimer = None  # Called to release idle servers.
 
     def __init__(self, config_filename=None):
         self._logger = logging.getLogger('RAM')
@@ -116,6 +131,7 @@ class ResourceAllocationManager(object):
         self._allocations = 0
         self._allocators = []
         self._deployed_servers = {}
+        self._scheduler = AllocationScheduler()
         self._allocators.append(LocalAllocator('LocalHost',
                                                authkey='PublicKey',
                                                allow_shell=True))
@@ -289,6 +305,7 @@ class ResourceAllocationManager(object):
             Description of required resources.
         """
         ResourceAllocationManager.validate_resources(resource_desc)
+        resource_desc = _allocation_desc(resource_desc)
         ram = ResourceAllocationManager._get_instance()
         with ResourceAllocationManager._lock:
             return ram._max_servers(resource_desc)
@@ -312,7 +329,9 @@ class ResourceAllocationManager(object):
     def allocate(resource_desc):
         """
         Determine best resource for `resource_desc` and deploy.
-        In the case of a tie, the first allocator in the allocators list wins.
+        In the case of a tie, the scheduler's preference is used, then
+        the first allocator in the allocators list wins.
+        If no allocator currently has room, waits until one does.
         Returns ``(proxy-object, server-dict)``.
 
         resource_desc: dict
@@ -325,42 +344,90 @@ class ResourceAllocationManager(object):
 
     def _allocate(self, resource_desc):
         """ Do the allocation. """
-        deployment_retries = 0
-        best_estimate = -1
-        while best_estimate == -1:
-            best_estimate, best_criteria, best_allocator = \
-                self._get_estimates(resource_desc)
-            if best_estimate >= 0:
-                self._allocations += 1
-                name = 'Sim-%d' % self._allocations
-                self._logger.debug('deploying on %r', best_allocator._name)
-                server = best_allocator.deploy(name, resource_desc,
-                                               best_criteria)
-                if server is not None:
-                    server_info = {
-                        'name': name,
-                        'pid':  server.pid,
-                        'host': server.host
-                    }
-                    self._logger.info('allocated %r pid %d on %s',
-                                      name, server_info['pid'],
-                                      server_info['host'])
-                    self._deployed_servers[id(server)] = \
-                        (best_allocator, server, server_info)
-                    return (server, server_info)
-                # Difficult to generate deployable request that won't deploy...
-                else:  #pragma no cover
-                    deployment_retries += 1
-                    if deployment_retries > 10:
-                        self._logger.error('deployment failed too many times.')
-                        return (None, None)
-                    self._logger.warning('deployment failed, retrying.')
-                    best_estimate = -1
-            elif best_estimate != -1:
-                return (None, None)
+        request = self._scheduler.submit(resource_desc)
+        try:
+            while True:
+                result = self._try_allocate(request)
+                if result is not None:
+                    return result
+                # Wait for a release, but poll for load changes.
+                ResourceAllocationManager._ready.wait(1)
+        finally:
+            self._scheduler.withdraw(request)
+            ResourceAllocationManager._ready.notify_all()
+
+    def _try_allocate(self, request):
+        """
+        Try to deploy a server for `request`.
+        Returns ``(proxy-object, server-dict)``, ``(None, None)`` if no
+        allocator supports the request, or None if the request must wait.
+        """
+        if not self._scheduler.may_start(request):
+            return None
+
+        resource_desc = request.resource_desc
+        best_estimate, best_criteria, best_allocator = \
+            self._get_estimates(resource_desc, request=request)
+        if best_estimate >= 0:
+            self._allocations += 1
+            name = 'Sim-%d' % self._allocations
+            self._logger.debug('deploying on %r', best_allocator._name)
+            server = best_allocator.deploy(name, resource_desc, best_criteria)
+            if server is not None:
+                server_info = {
+                    'name': name,
+                    'pid':  server.pid,
+                    'host': server.host
+                }
+                self._logger.info('allocated %r pid %d on %s',
+                                  name, server_info['pid'],
+                                  server_info['host'])
+                self._deployed_servers[id(server)] = \
+                    (best_allocator, server, server_info)
+                self._scheduler.started(request, best_allocator, server,
+                                        best_criteria)
+                return (server, server_info)
             # Difficult to generate deployable request that won't deploy...
             else:  #pragma no cover
-                time.sleep(1)  # Wait a bit between retries.
+                request.failures += 1
+                if request.failures > 10:
+                    self._logger.error('deployment failed too many times.')
+                    return (None, None)
+                self._logger.warning('deployment failed, retrying.')
+                return None
+        elif best_estimate != -1:
+            return (None, None)
+        else:
+            if self._scheduler.blocked(request):
+                # Let requests behind this one consider backfilling.
+                ResourceAllocationManager._ready.notify_all()
+            self._reclaim_idle()
+            return None
+
+    def _reclaim_idle(self):
+        """ Ask for idle servers on full allocators to be released. """
+        reclaimer = ResourceAllocationManager._reclaimer
+        if reclaimer is None:
+            return
+        servers = [self._deployed_servers[key][1]
+                   for key in self._scheduler.idle_blocking()]
+        if servers:
+            self._logger.debug('reclaiming from %d idle servers',
+                               len(servers))
+            reclaimer(servers)
+
+    @staticmethod
+    def set_reclaimer(reclaimer):
+        """
+        Set the function called with a list of idle servers when a request
+        is blocked by allocators whose capacity they use. The function should
+        arrange for at least one of them to be released, without calling
+        back into the manager before returning. Used by :class:`ServerPool`.
+
+        reclaimer: callable
+            Function taking a list of servers, or None.
+        """
+        ResourceAllocationManager._reclaimer = reclaimer
 
     @staticmethod
     def get_hostnames(resource_desc):
@@ -374,6 +441,7 @@ class ResourceAllocationManager(object):
             Description of required resources.
         """
         ResourceAllocationManager.validate_resources(resource_desc)
+        resource_desc = _allocation_desc(resource_desc)
         ram = ResourceAllocationManager._get_instance()
         with ResourceAllocationManager._lock:
             return ram._get_hostnames(resource_desc)
@@ -393,14 +461,29 @@ class ResourceAllocationManager(object):
             else:  #pragma no cover
                 time.sleep(1)  # Wait a bit between retries.
 
-    def _get_estimates(self, resource_desc, need_hostnames=False):
-        """ Return best (estimate, criteria, allocator). """
+    def _get_estimates(self, resource_desc, need_hostnames=False,
+                       request=None):
+        """
+        Return best (estimate, criteria, allocator).
+        If `request` is specified, allocators the scheduler considers full
+        are treated as having no resource at this time, and ties are decided
+        by the scheduler's preference.
+        """
         best_estimate = -2
         best_criteria = None
         best_allocator = None
+        if request is not None:
+            self._scheduler.begin_pass()
 
         for allocator in self._allocators:
             estimate, criteria = allocator.time_estimate(resource_desc)
+            if estimate >= 0 and request is not None:
+                info = self._scheduler.check_allocator(allocator, request,
+                                                       criteria)
+                if info:
+                    self._logger.debug('%r full: %s', allocator.name, info)
+                    estimate, criteria = -1, info
+
             if estimate == -2:
                 key = criteria.keys()[0]
                 info = criteria[key]
@@ -412,7 +495,10 @@ class ResourceAllocationManager(object):
 
             if (best_estimate == -2 and estimate >= -1) or \
                (best_estimate == 0  and estimate >  0) or \
-               (best_estimate >  0  and estimate < best_estimate):
+               (best_estimate >  0  and estimate < best_estimate) or \
+               (best_estimate >= 0  and estimate == best_estimate and
+                request is not None and
+                self._scheduler.prefer(allocator, best_allocator, request)):
                 # All current allocators support 'hostnames'.
                 if estimate >= 0 and need_hostnames \
                    and not 'hostnames' in criteria:  #pragma no cover
@@ -447,9 +533,12 @@ class ResourceAllocationManager(object):
                 self._logger.error('server %r not found', server)
                 return
             del self._deployed_servers[id(server)]
+            duration = self._scheduler.finished(server)
+            ResourceAllocationManager._ready.notify_all()
 
-        self._logger.info('release %r pid %d on %s', server_info['name'],
-                          server_info['pid'], server_info['host'])
+        self._logger.info('release %r pid %d on %s after %.1f sec',
+                          server_info['name'], server_info['pid'],
+                          server_info['host'], duration)
         try:
             allocator.release(server)
         # Just being defensive.
@@ -457,6 +546,36 @@ class ResourceAllocationManager(object):
             self._logger.error("Can't release %r: %r", server_info['name'], exc)
         server._close.cancel()
 
+    @staticmethod
+    def mark_idle(server):
+        """
+        Note that `server` is being kept for reuse rather than released,
+        so its idle time isn't taken as part of the job's duration.
+
+        server: :class:`OpenMDAO_Proxy`
+            Server being kept.
+        """
+        ram = ResourceAllocationManager._get_instance()
+        with ResourceAllocationManager._lock:
+            if id(server) in ram._deployed_servers:
+                ram._scheduler.idle(server)
+
+    @staticmethod
+    def mark_busy(server, resource_desc):
+        """
+        Note that idle `server` is being reused for `resource_desc`.
+
+        server: :class:`OpenMDAO_Proxy`
+            Server being reused.
+
+        resource_desc: dict
+            Description of required resources.
+        """
+        ram = ResourceAllocationManager._get_instance()
+        with ResourceAllocationManager._lock:
+            if id(server) in ram._deployed_servers:
+                ram._scheduler.busy(server, resource_desc)
+
     @staticmethod
     def add_remotes(server, prefix=''):
         """
@@ -636,6 +755,404 @@ class ResourceAllocationManager(object):
                 raise ValueError('max_cpus %d < min_cpus %d'
                                  % (max_cpus, min_cpus))
 
+class AllocationScheduler(object):
+    """
+    Scheduling policy used by :class:`ResourceAllocationManager`.
+
+    The scheduler keeps track of the servers in flight on each allocator,
+    the memory (``min_phys_memory``) they requested on each host, and how
+    long servers were used (deployment or reuse to release or return to an
+    idle pool). Pending requests are
+    ordered by weighted fair share: the request whose ``share_group`` has
+    the fewest servers in flight per unit of ``share_weight`` goes first,
+    with ties going to the earliest request. If the first request can't be
+    satisfied, a later request may be 'backfilled' if it is expected to
+    complete before the earliest expected release of a server in flight.
+    A request's expected duration is its ``wallclock_time`` resource limit
+    if specified, otherwise the average observed duration for its group.
+
+    All methods must be called with the manager's lock held.
+
+    clock: callable
+        Returns the current time in seconds.
+        Simulations may provide their own.
+
+    history: int
+        Number of recent durations averaged for estimates.
+    """
+
+    def __init__(self, clock=time.time, history=20):
+        self.clock = clock
+        self.history = history
+        self._seqno = 0
+        self._pending = []          # Requests in arrival order.
+        self._jobs = {}             # id(server) -> _Job
+        self._in_flight = {}        # allocator name -> count.
+        self._group_in_flight = {}  # share group -> count.
+        self._memory = {}           # hostname -> KB requested.
+        self._durations = {}        # (allocator name, group) -> durations.
+        self._capacity = {}         # allocator name -> max_servers this pass.
+        self._full = set()          # allocator names full this pass.
+
+    def submit(self, resource_desc):
+        """
+        Returns a new pending request for `resource_desc`.
+
+        resource_desc: dict
+            Description of required resources, including any
+            scheduling keys.
+        """
+        self._seqno += 1
+        request = _Request(self._seqno, resource_desc)
+        self._pending.append(request)
+        return request
+
+    def withdraw(self, request):
+        """
+        Remove `request` from the pending requests.
+
+        request: :class:`_Request`
+            Request returned by :meth:`submit`.
+        """
+        self._pending.remove(request)
+
+    def may_start(self, request):
+        """
+        Returns True if `request` should try to deploy now, either because
+        it is first in fair share order, or because all requests ahead of
+        it are blocked and it can be backfilled.
+
+        request: :class:`_Request`
+            Request returned by :meth:`submit`.
+        """
+        order = sorted(self._pending, key=self._share_key)
+        ahead = order[:order.index(request)]
+        if not ahead:
+            return True
+        for other in ahead:
+            if not other.blocked:
+                return False
+
+        duration = request.duration
+        if duration is None:
+            duration = self.average_duration(group=request.group)
+            if duration is None:
+                return False
+        shadow = self.shadow_time()
+        if shadow is None:
+            return False
+        return self.clock() + duration <= shadow
+
+    def begin_pass(self):
+        """
+        Start a pass over the allocators for a request. Each allocator's
+        :meth:`max_servers` is queried at most once per pass.
+        """
+        self._capacity = {}
+        self._full = set()
+
+    def blocked(self, request):
+        """
+        Record that `request` could not be satisfied by any allocator.
+        Returns True if it wasn't already blocked.
+
+        request: :class:`_Request`
+            Request returned by :meth:`submit`.
+        """
+        if request.blocked:
+            return False
+        request.blocked = True
+        return True
+
+    def check_allocator(self, allocator, request, criteria):
+        """
+        Returns None if `allocator` has room for `request`, otherwise
+        a dictionary describing why not.
+
+        allocator: :class:`ResourceAllocator`
+            Allocator being considered.
+
+        request: :class:`_Request`
+            Request returned by :meth:`submit`.
+
+        criteria: dict
+            The dictionary returned by the allocator's :meth:`time_estimate`.
+        """
+        capacity = self._get_capacity(allocator, request)
+        in_flight = self._in_flight.get(allocator.name, 0)
+        if capacity > 0 and in_flight >= capacity:
+            self._full.add(allocator.name)
+            return {'in_flight': 'have %d, max_servers %d'
+                                 % (in_flight, capacity)}
+
+        total_memory = criteria.get('total_memory', 0)
+        if request.memory and total_memory:
+            host = self._host(allocator, criteria)
+            in_use = self._memory.get(host, 0)
+            if in_use + request.memory > total_memory:
+                self._full.add(allocator.name)
+                return {'min_phys_memory': 'want %s, available %s on %s'
+                                           % (request.memory,
+                                              total_memory - in_use, host)}
+        return None
+
+    def idle_blocking(self):
+        """
+        Returns keys (server ids) of idle servers on allocators found full
+        during the current pass.
+        """
+        return [key for key, job in self._jobs.items()
+                    if job.idle and job.allocator in self._full]
+
+    def prefer(self, allocator, other, request):
+        """
+        Returns True if `allocator` should be used rather than `other`
+        when their estimates are equal. Allocators with shorter observed
+        durations for the request's group are preferred (allocators without
+        history are tried first), then those with a smaller fraction of
+        their capacity in flight.
+
+        allocator: :class:`ResourceAllocator`
+            Allocator being considered.
+
+        other: :class:`ResourceAllocator`
+            Current best allocator.
+
+        request: :class:`_Request`
+            Request returned by :meth:`submit`.
+        """
+        return self._preference(allocator, request) \
+             < self._preference(other, request)
+
+    def started(self, request, allocator, server, criteria):
+        """
+        Record that `server` was deployed by `allocator` for `request`.
+
+        request: :class:`_Request`
+            Request returned by :meth:`submit`.
+
+        allocator: :class:`ResourceAllocator`
+            Allocator which deployed `server`.
+
+        server: proxy
+            The deployed server.
+
+        criteria: dict
+            The dictionary returned by the allocator's :meth:`time_estimate`.
+        """
+        host = self._host(allocator, criteria)
+        self._jobs[id(server)] = _Job(request, allocator.name, host,
+                                      self.clock())
+        self._in_flight[allocator.name] = \
+            self._in_flight.get(allocator.name, 0) + 1
+        self._group_in_flight[request.group] = \
+            self._group_in_flight.get(request.group, 0) + 1
+        if request.memory:
+            self._memory[host] = self._memory.get(host, 0) + request.memory
+
+    def finished(self, server):
+        """
+        Record that `server` has been released. Returns the time it was held.
+        Pending requests are no longer considered blocked.
+
+        server: proxy
+            The released server.
+        """
+        job = self._jobs.pop(id(server))
+        self._in_flight[job.allocator] -= 1
+        self._group_in_flight[job.group] -= 1
+        if job.memory:
+            self._memory[job.host] -= job.memory
+        if not job.idle:
+            self._record(job)
+
+        for request in self._pending:
+            request.blocked = False
+        return self.clock() - job.deployed
+
+    def idle(self, server):
+        """
+        Record that `server` is being kept for reuse rather than released.
+        The time it was used is recorded now, so time spent idle isn't
+        included in observed durations.
+
+        server: proxy
+            The idle server.
+        """
+        job = self._jobs[id(server)]
+        if not job.idle:
+            job.idle = True
+            self._record(job)
+
+    def busy(self, server, resource_desc):
+        """
+        Record that idle `server` is being reused for `resource_desc`.
+
+        server: proxy
+            The reused server.
+
+        resource_desc: dict
+            Description of required resources, including any
+            scheduling keys.
+        """
+        job = self._jobs[id(server)]
+        request = _Request(0, resource_desc)
+        self._group_in_flight[job.group] -= 1
+        self._group_in_flight[request.group] = \
+            self._group_in_flight.get(request.group, 0) + 1
+        job.group = request.group
+        job.duration = request.duration
+        job.start = self.clock()
+        job.idle = False
+
+    def shadow_time(self):
+        """
+        Returns the earliest time a server in flight is expected to be
+        released, or None if no estimate is available.
+        """
+        shadow = None
+        for job in self._jobs.values():
+            if job.idle:
+                continue  # Released when needed or after its timeout.
+            duration = job.duration
+            if duration is None:
+                duration = self.average_duration(job.allocator, job.group)
+                if duration is None:
+                    continue
+            end = job.start + duration
+            if shadow is None or end < shadow:
+                shadow = end
+        return shadow
+
+    def average_duration(self, allocator=None, group=None):
+        """
+        Returns the average observed duration, or None if nothing has been
+        observed. If the allocator and group combination has no history, the
+        average for the group across all allocators is returned.
+
+        allocator: string
+            Allocator name. If None, consider all allocators.
+
+        group: string
+            Share group. If None, consider all groups.
+        """
+        average = self._average(self._durations_for(allocator, group))
+        if average is None and allocator is not None:
+            average = self._average(self._durations_for(group=group))
+        return average
+
+    def in_flight(self, allocator=None, group=None):
+        """
+        Returns the number of servers in flight.
+
+        allocator: string
+            Allocator name. If None, consider all allocators.
+
+        group: string
+            Share group. If None, consider all groups.
+        """
+        if group is None:
+            if allocator is None:
+                return len(self._jobs)
+            return self._in_flight.get(allocator, 0)
+        count = 0
+        for job in self._jobs.values():
+            if allocator is None or job.allocator == allocator:
+                if job.group == group:
+                    count += 1
+        return count
+
+    def _share_key(self, request):
+        """ Returns fair share ordering key for `request`. """
+        in_flight = self._group_in_flight.get(request.group, 0)
+        return (float(in_flight) / request.weight, request.seqno)
+
+    def _get_capacity(self, allocator, request):
+        """ Returns `max_servers` for `allocator` during this pass. """
+        try:
+            return self._capacity[allocator.name]
+        except KeyError:
+            count, criteria = allocator.max_servers(request.resource_desc)
+            self._capacity[allocator.name] = count
+            return count
+
+    def _record(self, job):
+        """ Record the duration of `job`. """
+        key = (job.allocator, job.group)
+        durations = self._durations.setdefault(key, [])
+        durations.append(self.clock() - job.start)
+        del durations[:-self.history]
+
+    def _preference(self, allocator, request):
+        """ Returns sort key for choosing between equivalent allocators. """
+        durations = self._durations.get((allocator.name, request.group), [])
+        average = self._average(durations) or 0.
+        capacity = self._get_capacity(allocator, request)
+        in_flight = self._in_flight.get(allocator.name, 0)
+        return (average, float(in_flight) / max(capacity, 1))
+
+    def _durations_for(self, allocator=None, group=None):
+        """ Returns list of durations matching `allocator` and `group`. """
+        durations = []
+        for key, values in self._durations.items():
+            if (allocator is None or key[0] == allocator) and \
+               (group is None or key[1] == group):
+                durations.extend(values)
+        return durations
+
+    @staticmethod
+    def _average(durations):
+        """ Returns average of `durations`, or None if empty. """
+        if durations:
+            return sum(durations) / len(durations)
+        return None
+
+    @staticmethod
+    def _host(allocator, criteria):
+        """ Returns the host an allocation is expected to use. """
+        hostnames = criteria.get('hostnames')
+        if hostnames:
+            return hostnames[0]
+        return allocator.name
+
+
+class _Request(object):
+    """ A pending request for a server. """
+
+    def __init__(self, seqno, resource_desc):
+        self.seqno = seqno
+        self.group = resource_desc.get('share_group', '')
+        self.weight = resource_desc.get('share_weight', 1)
+        self.memory = resource_desc.get('min_phys_memory', 0)
+        limits = resource_desc.get('resource_limits', {})
+        self.duration = limits.get('wallclock_time')
+        self.resource_desc = _allocation_desc(resource_desc)
+        self.blocked = False
+        self.failures = 0
+
+
+class _Job(object):
+    """ A deployed server. """
+
+    def __init__(self, request, allocator, host, start):
+        self.group = request.group
+        self.memory = request.memory
+        self.duration = request.duration
+        self.allocator = allocator
+        self.host = host
+        self.start = start
+        self.deployed = start
+        self.idle = False
+
+
+def _allocation_desc(resource_desc):
+    """ Returns `resource_desc` without scheduling keys. """
+    if SCHEDULING_KEYS.isdisjoint(resource_desc):
+        return resource_desc
+    return dict([(key, value) for key, value in resource_desc.items()
+                              if key not in SCHEDULING_KEYS])
+
+
 def _true(value):
     """ Just returns True -- these registered keys need more work. """
     return True
@@ -721,6 +1238,9 @@ _VALIDATORS = {'allocator': _allocator,
                'max_cpus': _positive,
                'min_phys_memory': _positive,
 
+               'share_group': _no_whitespace,
+               'share_weight': _positive,
+
                'remote_command': _no_whitespace,
                'args': _stringlist,
                'submit_as_hold': _bool,
@@ -1031,6 +1551,11 @@ class LocalAllocator(FactoryAllocator):
         If True, :meth:`execute_command` and :meth:`load_model` are allowed
         in created servers. Use with caution!
 
+    total_memory: int
+        If >0, then that is taken as the physical memory available (KB).
+        Otherwise the number is taken from :meth:`os.sysconf` if possible.
+        Used to check ``min_phys_memory`` requests.
+
     Resource configuration file entry equivalent to the default
     `LocalHost` allocator::
 
@@ -1044,7 +1569,7 @@ class LocalAllocator(FactoryAllocator):
     """
 
     def __init__(self, name='LocalAllocator', total_cpus=0, max_load=1.0,
-                 authkey=None, allow_shell=False):
+                 authkey=None, allow_shell=False, total_memory=0):
         super(LocalAllocator, self).__init__(name, authkey, allow_shell)
         if total_cpus > 0:
             self.total_cpus = total_cpus
@@ -1054,6 +1579,15 @@ class LocalAllocator(FactoryAllocator):
             # Just being defensive (according to docs this could happen).
             except NotImplementedError:  # pragma no cover
                 self.total_cpus = 1
+        if total_memory > 0:
+            self.total_memory = total_memory
+        else:
+            try:
+                self.total_memory = os.sysconf('SC_PHYS_PAGES') \
+                                  * os.sysconf('SC_PAGE_SIZE') / 1024
+            # Not available on Windows.
+            except (AttributeError, ValueError, OSError):  #pragma no cover
+                self.total_memory = 0  # Unknown.
         if max_load > 0.:
             self.max_load = max_load
         else:
@@ -1078,7 +1612,8 @@ class LocalAllocator(FactoryAllocator):
             Configuration data is located under the section matching
             this allocator's `name`.
 
-        Allows modifying factory options, `total_cpus`, and `max_load`.
+        Allows modifying factory options, `total_cpus`, `max_load`,
+        and `total_memory`.
         """
         super(LocalAllocator, self).configure(cfg)
 
@@ -1100,11 +1635,21 @@ class LocalAllocator(FactoryAllocator):
                 raise ValueError('%s: max_load must be > 0, got %g'
                                  % (self.name, value))
 
+        if cfg.has_option(self.name, 'total_memory'):
+            value = cfg.getint(self.name, 'total_memory')
+            self._logger.debug('    total_memory: %s', value)
+            if value > 0:
+                self.total_memory = value
+            else:
+                raise ValueError('%s: total_memory must be > 0, got %d'
+                                 % (self.name, value))
+
     @rbac('*')
     def max_servers(self, resource_desc):
         """
         Returns `total_cpus` * `max_load` if `resource_desc` is supported,
-        otherwise zero.
+        otherwise zero. If ``min_phys_memory`` is requested, the result is
+        also limited by `total_memory`.
 
         resource_desc: dict
             Description of required resources.
@@ -1118,10 +1663,13 @@ class LocalAllocator(FactoryAllocator):
             if req_cpus > avail_cpus:
                 return (0, {'min_cpus': 'want %s, available %s'
                                         % (req_cpus, avail_cpus)})
-            else:
-                return (avail_cpus / req_cpus, {})
+            count = avail_cpus / req_cpus
         else:
-            return (avail_cpus, {})
+            count = avail_cpus
+        if 'min_phys_memory' in resource_desc and self.total_memory:
+            count = min(count,
+                        self.total_memory / resource_desc['min_phys_memory'])
+        return (count, {})
 
     @rbac('*')
     def time_estimate(self, resource_desc):
@@ -1151,8 +1699,9 @@ class LocalAllocator(FactoryAllocator):
         # Not available on Windows.
         except AttributeError:  #pragma no cover
             criteria = {
-                'hostnames'  : [socket.gethostname()],
-                'total_cpus' : self.total_cpus,
+                'hostnames'    : [socket.gethostname()],
+                'total_cpus'   : self.total_cpus,
+                'total_memory' : self.total_memory,
             }
             return (0, criteria)
 
@@ -1160,10 +1709,11 @@ class LocalAllocator(FactoryAllocator):
                            loadavgs[0], loadavgs[1], loadavgs[2],
                            self.max_load * self.total_cpus)
         criteria = {
-            'hostnames'  : [socket.gethostname()],
-            'loadavgs'   : loadavgs,
-            'total_cpus' : self.total_cpus,
-            'max_load'   : self.max_load
+            'hostnames'    : [socket.gethostname()],
+            'loadavgs'     : loadavgs,
+            'total_cpus'   : self.total_cpus,
+            'total_memory' : self.total_memory,
+            'max_load'     : self.max_load
         }
         if (loadavgs[0] / self.total_cpus) < self.max_load:
             return (0, criteria)
@@ -1197,6 +1747,10 @@ class LocalAllocator(FactoryAllocator):
                 if value > self.total_cpus:
                     return (-2, {key: 'want %s, have %s'
                                       % (value, self.total_cpus)})
+            elif key == 'min_phys_memory':
+                if self.total_memory and value > self.total_memory:
+                    return (-2, {key: 'want %s, have %s'
+                                      % (value, self.total_memory)})
         return (0, {})
 
 register(LocalAllocator, mp_distributing.Cluster)
@@ -0,0 +1,295 @@
+"""
+.. _`serverpool.py`:
+
+Pool of allocated servers kept 'warm' for reuse, along with any model
+loaded into them.
+"""
+
+import hashlib
+import logging
+import pickle
+import threading
+import time
+
+from multiprocessing import util
+
+from openmdao.main.rbac import get_credentials, set_credentials
+from openmdao.main.resource import ResourceAllocationManager as RAM, \
+                                   _allocation_desc
+
+
+# Component state which changes with each execution but doesn't change
+# what a loaded model computes.
+_VOLATILE = ('exec_count', 'derivative_exec_count', 'itername',
+             '_exec_state')
+
+
+def model_digest(model):
+    """
+    Returns a SHA-1 digest of the pickled state of `model`, excluding
+    execution counters, iteration coordinates, and execution state. Models
+    which differ only by having been executed again have identical digests.
+
+    model: :class:`Component`
+        Model to be digested.
+    """
+    sha = hashlib.sha1()
+    parent = model.parent
+    model.parent = None  # Just like save(), ignore stuff above `model`.
+    try:
+        _DigestPickler(_DigestStream(sha), -1).dump(model)
+    finally:
+        model.parent = parent
+    return sha.hexdigest()
+
+
+class _DigestPickler(pickle.Pickler):
+    """ Pickler which omits volatile component state. """
+
+    def save_reduce(self, func, args, state=None, listitems=None,
+                    dictitems=None, obj=None):
+        if isinstance(state, dict) and 'exec_count' in state:
+            state = dict([(key, value) for key, value in state.items()
+                                       if key not in _VOLATILE])
+        pickle.Pickler.save_reduce(self, func, args, state, listitems,
+                                   dictitems, obj)
+
+
+class _DigestStream(object):
+    """ File-like object which just updates `sha`. """
+
+    def __init__(self, sha):
+        self.sha = sha
+
+    def write(self, data):
+        self.sha.update(data)
+
+
+class ServerPool(object):
+    """
+    Keeps servers obtained from the :class:`ResourceAllocationManager`
+    after their user is done with them, so a later user with the same
+    resource description can avoid server startup, and possibly model
+    transfer and loading. Servers are released to the manager after being
+    idle for their timeout.
+
+    Idle servers still count against their allocator's capacity, so idle
+    servers for other resource descriptions are released before allocating
+    a new server, and the least recently used is released when they block
+    another request to the :class:`ResourceAllocationManager`.
+    """
+
+    def __init__(self):
+        self._logger = logging.getLogger('ServerPool')
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._idle = []  # _Entry, least recently used first.
+        self._reaper = None
+
+    def get(self, resource_desc, digest=None):
+        """
+        Returns ``(server, server_info, top_level)`` for `resource_desc`.
+        An idle server is used if possible, preferring one whose loaded
+        model has `digest`. `top_level` is the loaded model if its digest
+        matches, otherwise None. If no idle server is available, one is
+        allocated and ``server_info['egg_digest']`` will be None.
+
+        resource_desc: dict
+            Description of required resources.
+
+        digest: string
+            Digest of model to be used, from :func:`model_digest`.
+        """
+        key = _resources_key(resource_desc)
+        while True:
+            with self._lock:
+                entry = None
+                for candidate in reversed(self._idle):
+                    if candidate.key == key:
+                        if candidate.digest == digest:
+                            entry = candidate
+                            break
+                        elif entry is None:
+                            entry = candidate
+                if entry is None:
+                    stale = [other for other in self._idle if other.key != key]
+                    self._idle = [other for other in self._idle
+                                        if other.key == key]
+                else:
+                    self._idle.remove(entry)
+                    stale = []
+
+            if entry is None:
+                for other in stale:
+                    self._release(other)
+                server, server_info = RAM.allocate(resource_desc)
+                if server_info is not None:
+                    server_info['egg_digest'] = None
+                return (server, server_info, None)
+
+            # Servers can die while idle.
+            try:
+                entry.server.echo()
+            except Exception as exc:
+                self._logger.warning('idle server %r failed: %r',
+                                     entry.server_info['name'], exc)
+                self._release(entry)
+                continue
+
+            self._logger.debug('reusing %r', entry.server_info['name'])
+            RAM.mark_busy(entry.server, resource_desc)
+            if entry.digest == digest:
+                return (entry.server, entry.server_info, entry.top_level)
+            return (entry.server, entry.server_info, None)
+
+    def put(self, server, server_info, resource_desc, timeout,
+            top_level=None):
+        """
+        Keep `server` for reuse, releasing it after `timeout` idle seconds.
+        Returns a token which may be passed to :meth:`release`.
+
+        server: proxy
+            Server obtained from :meth:`get`.
+
+        server_info: dict
+            Server information obtained from :meth:`get`. If the key
+            ``egg_digest`` is set, it should be the digest of the model
+            loaded as `top_level`.
+
+        resource_desc: dict
+            Description of resources used to obtain `server`.
+
+        timeout: float
+            Idle time (seconds) before `server` is released.
+
+        top_level: proxy
+            Model loaded in `server`, if any.
+        """
+        entry = _Entry(server, server_info, _resources_key(resource_desc),
+                       timeout, top_level, get_credentials())
+        RAM.mark_idle(server)
+        with self._lock:
+            self._idle.append(entry)
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap,
+                                                name='ServerPool-reaper')
+                self._reaper.daemon = True
+                self._reaper.start()
+            else:
+                self._wakeup.notify()
+        return entry
+
+    def release(self, tokens):
+        """
+        Release those servers kept by :meth:`put` calls returning `tokens`
+        which are still idle. Servers since reused (and possibly kept again
+        by someone else) are not affected.
+
+        tokens: list
+            Values returned by :meth:`put`.
+        """
+        tokens = set([id(token) for token in tokens])
+        with self._lock:
+            idle = [entry for entry in self._idle if id(entry) in tokens]
+            self._idle = [entry for entry in self._idle
+                                if id(entry) not in tokens]
+        for entry in idle:
+            self._release(entry)
+
+    def reclaim(self, servers):
+        """
+        Have the least recently used of `servers` which is idle here released
+        by the reaper thread. Called by the :class:`ResourceAllocationManager`
+        with its lock held.
+
+        servers: list
+            Idle servers blocking a request.
+        """
+        keys = set([id(server) for server in servers])
+        with self._lock:
+            for entry in self._idle:
+                if id(entry.server) in keys:
+                    entry.expires = 0
+                    self._wakeup.notify()
+                    return
+
+    def clear(self):
+        """ Release all idle servers. """
+        with self._lock:
+            idle = self._idle
+            self._idle = []
+        for entry in idle:
+            self._release(entry)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._idle)
+
+    def _reap(self):
+        """ Release servers which have been idle for their timeout. """
+        while True:
+            with self._lock:
+                if not self._idle:
+                    self._reaper = None
+                    return
+                now = time.time()
+                expired = [entry for entry in self._idle
+                                 if entry.expires <= now]
+                if not expired:
+                    delay = min([entry.expires for entry in self._idle]) - now
+                    self._wakeup.wait(delay)
+                    continue
+                self._idle = [entry for entry in self._idle
+                                    if entry.expires > now]
+            for entry in expired:
+                self._logger.debug('releasing idle %r',
+                                   entry.server_info['name'])
+                self._release(entry)
+
+    def _release(self, entry):
+        """ Release `entry` using the credentials it was kept with. """
+        credentials = get_credentials()
+        set_credentials(entry.credentials)
+        try:
+            RAM.release(entry.server)
+        except Exception as exc:
+            self._logger.error("Can't release %r: %r",
+                               entry.server_info['name'], exc)
+        finally:
+            set_credentials(credentials)
+
+    def _reset(self):
+        """ Forget servers inherited by a child process. """
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._idle = []
+        self._reaper = None
+
+
+class _Entry(object):
+    """ An idle server. """
+
+    def __init__(self, server, server_info, key, timeout, top_level,
+                 credentials):
+        self.server = server
+        self.server_info = server_info
+        self.key = key
+        self.digest = server_info.get('egg_digest')
+        self.top_level = top_level if self.digest else None
+        self.expires = time.time() + timeout
+        self.credentials = credentials
+
+
+def _resources_key(resource_desc):
+    """
+    Returns hashable key for `resource_desc`. Scheduling keys don't affect
+    which servers are suitable, so they're ignored.
+    """
+    return repr(sorted(_allocation_desc(resource_desc).items()))
+
+
+# Process-wide pool.
+SERVER_POOL = ServerPool()
+
+util.register_after_fork(SERVER_POOL, ServerPool._reset)
+RAM.set_reclaimer(SERVER_POOL.reclaim)
@@ -0,0 +1,141 @@
+"""
+Measure round-trip thruput of numpy arrays, comparing the out-of-band
+transport of :func:`send_message` with pickling the whole message, both
+over a local pipe and (out-of-band only) through an echo server.
+
+Usage: python arrayperf.py [max_megabytes]
+"""
+
+import glob
+import os.path
+import shutil
+import sys
+import threading
+import time
+
+from multiprocessing import Pipe
+
+import numpy
+
+from openmdao.main import mp_util
+from openmdao.main.mp_util import read_server_config, receive_message, \
+                                  send_message
+from openmdao.main.objserverfactory import connect, start_server
+from openmdao.util.fileutil import onerror
+
+
+SIZES = (1, 4, 16, 64, 256, 500)  # Megabytes.
+
+SESSION_KEY = 'abcdefghijklmnopqrstuvwxyz'
+
+REPS = 3  # Best time of REPS is reported.
+
+
+def echo(conn, session_key, send, receive):
+    """ Echo one message on `conn`. """
+    send(conn, receive(conn, session_key), session_key)
+
+
+def pipe_roundtrip(arr, session_key, send, receive):
+    """ Return best time to send `arr` over a pipe and receive it back. """
+    return min([_pipe_roundtrip(arr, session_key, send, receive)
+                for i in range(REPS)])
+
+def _pipe_roundtrip(arr, session_key, send, receive):
+    """ Return time to send `arr` over a pipe and receive it back. """
+    ours, theirs = Pipe()
+    echoer = threading.Thread(target=echo,
+                              args=(theirs, session_key, send, receive))
+    echoer.daemon = True
+    echoer.start()
+    start = time.time()
+    send(ours, (arr,), session_key)
+    result = receive(ours, session_key)[0]
+    et = time.time() - start
+    echoer.join()
+    ours.close()
+    theirs.close()
+    assert result.shape == arr.shape and result[-1] == arr[-1]
+    return et
+
+
+def run_pipe_tests(sizes):
+    """ Compare transports over a local pipe. """
+    for session_key in ('', SESSION_KEY):
+        print
+        print 'Pipe, %s' % ('encrypted' if session_key else 'unencrypted')
+        for size in sizes:
+            arr = numpy.arange(size * (1 << 17), dtype=float)  # size MB.
+            # Pickle the whole message, as was done before out-of-band arrays.
+            threshold = mp_util.OOB_THRESHOLD
+            mp_util.OOB_THRESHOLD = sys.maxint
+            try:
+                pickled = pipe_roundtrip(arr, session_key,
+                                         send_message, receive_message)
+            finally:
+                mp_util.OOB_THRESHOLD = threshold
+            oob = pipe_roundtrip(arr, session_key,
+                                 send_message, receive_message)
+            print '%4d MB: pickled %g MB/sec, out-of-band %g MB/sec,' \
+                  ' speedup %g' % (size, size/pickled, size/oob, pickled/oob)
+            sys.stdout.flush()
+            del arr
+
+
+def run_server_tests(sizes):
+    """ Time echoing arrays through a server. """
+    count = 0
+    for authkey in ('PublicKey', 'UnEncrypted'):
+        # Start factory in unique directory.
+        count += 1
+        name = 'Array_%d' % count
+        if os.path.exists(name):
+            shutil.rmtree(name, onerror=onerror)
+        os.mkdir(name)
+        os.chdir(name)
+        try:
+            server_proc, server_cfg = start_server(authkey=authkey)
+            cfg = read_server_config(server_cfg)
+        finally:
+            os.chdir('..')
+
+        print
+        print 'Server, %s' % authkey
+        factory = connect(cfg['address'], cfg['port'], authkey=authkey,
+                          pubkey=cfg['key'])
+        try:
+            factory.echo(0)  # 'prime' the connection.
+            for size in sizes:
+                arr = numpy.arange(size * (1 << 17), dtype=float)
+                times = []
+                for i in range(REPS):
+                    start = time.time()
+                    result = factory.echo(arr)[0]
+                    times.append(time.time() - start)
+                    assert result.shape == arr.shape and \
+                           result[-1] == arr[-1]
+                    del result
+                print '%4d MB: %g MB/sec' % (size, size/min(times))
+                sys.stdout.flush()
+                del arr
+        finally:
+            factory.cleanup()
+            server_proc.terminate(timeout=10)
+
+    for path in glob.glob('Array_*'):
+        shutil.rmtree(path, onerror=onerror)
+
+
+def main():
+    """ Run array thruput tests, optionally limiting the array size. """
+    if len(sys.argv) > 1:
+        max_size = int(sys.argv[1])
+        sizes = [size for size in SIZES if size <= max_size]
+    else:
+        sizes = SIZES
+    run_pipe_tests(sizes)
+    run_server_tests(sizes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Compare the configuration time of large Assemblies with and without
+incremental updates of the Dataflow's cached graph, both when the
+workflow order is only needed at the end and when it's requested after
+every change, as the GUI does.
+"""
+
+import sys
+import time
+
+from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.main.dataflow import Dataflow
+from openmdao.main.datatypes.api import Float
+
+
+class Simple(Component):
+    """ Component with two inputs and two outputs. """
+
+    a = Float(0., iotype='in')
+    b = Float(0., iotype='in')
+    c = Float(0., iotype='out')
+    d = Float(0., iotype='out')
+
+    def execute(self):
+        self.c = self.a + self.b
+        self.d = self.a - self.b
+
+
+def build(ncomps, chain=10, query=False):
+    """ Build an Assembly of `ncomps` components, added to the workflow one
+    at a time. Every other group of `chain` components is connected into a
+    chain, the others are left unconnected. If `query` is True, the
+    workflow order is requested after each addition and connection.
+    Returns the Assembly.
+    """
+    top = set_as_top(Assembly())
+    workflow = top.driver.workflow
+    for i in range(ncomps):
+        name = 'c%d' % i
+        top.add(name, Simple())
+        workflow.add(name)
+        if query:
+            list(workflow)
+        if (i / chain) % 2 == 0 and i % chain:
+            top.connect('c%d.c' % (i-1), '%s.a' % name)
+            if query:
+                list(workflow)
+    list(workflow)
+    return top
+
+
+def run_test(ncomps, query):
+    """ Time building with and without incremental updates and check that
+    the resulting orders respect the connections.
+    """
+    times = []
+    for incremental in (False, True):
+        Dataflow.incremental = incremental
+        try:
+            start = time.time()
+            top = build(ncomps, query=query)
+            times.append(time.time() - start)
+        finally:
+            Dataflow.incremental = True
+        order = [comp.name for comp in top.driver.workflow]
+        for src, dest in top.list_connections():
+            assert order.index(src.split('.')[0]) < \
+                   order.index(dest.split('.')[0]), 'bad order'
+        print '%d components, query %s, incremental %s: %g sec' \
+              % (ncomps, query, incremental, times[-1])
+        sys.stdout.flush()
+
+    print '%d components, query %s: speedup %g' \
+          % (ncomps, query, times[0] / times[1])
+    return times
+
+
+def main():
+    """ Run configuration timing for 500 to 2000 components. """
+    for ncomps in (500, 1000, 2000):
+        for query in (False, True):
+            run_test(ncomps, query)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Compare the cost of ExprEvaluator.evaluate with and without cached
+variable accessors on a Sellar-sized model and on a model with 1000
+connections.
+"""
+
+import time
+
+from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.main.datatypes.api import Float
+from openmdao.main.expreval import ExprEvaluator
+
+
+class Discipline1(Component):
+    """ Sellar discipline 1. """
+
+    z1 = Float(0., iotype='in')
+    z2 = Float(0., iotype='in')
+    x1 = Float(0., iotype='in')
+    y2 = Float(0., iotype='in')
+    y1 = Float(0., iotype='out')
+
+    def execute(self):
+        self.y1 = self.z1**2 + self.z2 + self.x1 - 0.2*self.y2
+
+
+class Discipline2(Component):
+    """ Sellar discipline 2. """
+
+    z1 = Float(0., iotype='in')
+    z2 = Float(0., iotype='in')
+    y1 = Float(0., iotype='in')
+    y2 = Float(0., iotype='out')
+
+    def execute(self):
+        self.y2 = abs(self.y1)**.5 + self.z1 + self.z2
+
+
+class Wide(Component):
+    """ Component with `n` inputs and `n` outputs. """
+
+    def __init__(self, n):
+        super(Wide, self).__init__()
+        for i in range(n):
+            self.add('x%d' % i, Float(float(i), iotype='in'))
+            self.add('y%d' % i, Float(float(i), iotype='out'))
+
+
+def sellar_exprs():
+    """ Return the expressions a Sellar optimization evaluates on each
+    iteration: objective, constraint sides and parameter targets.
+    """
+    top = set_as_top(Assembly())
+    top.add('dis1', Discipline1())
+    top.add('dis2', Discipline2())
+    top.connect('dis1.y1', 'dis2.y1')
+    texts = ['(dis1.x1)**2 + dis1.z2 + dis1.y1 + math.exp(-dis2.y2)',
+             '3.16', 'dis1.y1', 'dis2.y2', '24.0',
+             'dis1.z1', 'dis2.z1', 'dis1.z2', 'dis2.z2', 'dis1.x1', 'dis1.y2']
+    return top, [ExprEvaluator(text, top) for text in texts]
+
+
+def connection_exprs(ncomps=11, width=100):
+    """ Return the source expressions of a chain of `ncomps` components,
+    each connected to the next by `width` connections.
+    """
+    top = set_as_top(Assembly())
+    for i in range(ncomps):
+        top.add('c%d' % i, Wide(width))
+    for i in range(ncomps-1):
+        for j in range(width):
+            top.connect('c%d.y%d' % (i, j), 'c%d.x%d' % (i+1, j))
+    exprs = [top._exprmapper.get_expr(src)
+             for src, dest in top.list_connections(show_passthrough=False)]
+    return top, exprs
+
+
+def run_test(name, exprs, reps):
+    """ Time `reps` evaluations of each of `exprs`, with and without
+    cached accessors.
+    """
+    results = []
+    for cached in (False, True):
+        ExprEvaluator.cache_accessors = cached
+        try:
+            for expr in exprs:  # Resolve accessors outside of timing.
+                expr.evaluate()
+            start = time.time()
+            for i in range(reps):
+                for expr in exprs:
+                    expr.evaluate()
+            et = time.time() - start
+        finally:
+            ExprEvaluator.cache_accessors = True
+        results.append(et)
+        print '%s: %d exprs, %d reps, cached %s: %g sec, %g usec/eval' \
+              % (name, len(exprs), reps, cached, et,
+                 1e6 * et / (reps * len(exprs)))
+    print '%s: speedup %g' % (name, results[0] / results[1])
+    return results
+
+
+def main():
+    """ Run evaluation timing on both models. """
+    top, exprs = sellar_exprs()
+    run_test('Sellar', exprs, 10000)
+    top, exprs = connection_exprs()
+    run_test('1000 connections', exprs, 100)
+
+
+if __name__ == '__main__':
+    main()
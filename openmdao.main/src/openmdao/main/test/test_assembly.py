@@ -5,6 +5,9 @@ import os
 import shutil
 import unittest
 import logging
+from copy import deepcopy
+
+import numpy
 
 from openmdao.main.api import Assembly, Component, Driver, SequentialWorkflow, \
                               set_as_top, SimulationRoot
@@ -207,6 +210,35 @@ class Dummy(Component):
         pass
 
 
+class Source(Component):
+    """ Float and Array outputs for transfer tests. """
+
+    x = Float(2., iotype='in')
+    ft = Float(iotype='out', units='ft')
+    degC = Float(iotype='out', units='degC')
+    arr = Array([1., 2., 3.], iotype='out')
+    arr_copy = Array([1., 2., 3.], iotype='out', copy='deep')
+
+    def execute(self):
+        self.ft = self.x
+        self.degC = self.x * 10.
+        self.arr = self.arr * self.x
+        self.arr_copy = self.arr_copy * self.x
+
+
+class Sink(Component):
+    """ Float and Array inputs for transfer tests. """
+
+    inch = Float(iotype='in', units='inch')
+    degF = Float(iotype='in', units='degF')
+    arr = Array([0., 0., 0.], iotype='in')
+    arr_copy = Array([0., 0., 0.], iotype='in')
+    arr2 = Array([0., 0.], iotype='in')
+
+    def execute(self):
+        pass
+
+
 class AssemblyTestCase(unittest.TestCase):
 
     def setUp(self):
@@ -257,6 +289,66 @@ class AssemblyTestCase(unittest.TestCase):
         self.assertEqual(top.comp1.exec_count, 1)
         self.assertEqual(top.comp2.exec_count, 2)
 
+    def _transfer_model(self):
+        top = set_as_top(Assembly())
+        top.add('src', Source())
+        top.add('sink', Sink())
+        top.driver.workflow.add(['src', 'sink'])
+        top.connect('src.ft', 'sink.inch')
+        top.connect('src.degC', 'sink.degF')
+        top.connect('src.arr', 'sink.arr')
+        top.connect('src.arr_copy', 'sink.arr_copy')
+        top.connect('src.arr[1:]', 'sink.arr2')
+        return top
+
+    def test_transfer_plan(self):
+        results = []
+        for plan in (True, False):
+            top = self._transfer_model()
+            top.plan_transfers = plan
+            top.run()
+            arr_copy = top.sink.arr_copy
+            top.src.x = 3.
+            top.run()
+            self.assertAlmostEqual(top.sink.inch, 36., 10)
+            self.assertAlmostEqual(top.sink.degF, 86., 10)
+            self.assertEqual(list(top.sink.arr), [6., 12., 18.])
+            self.assertEqual(list(top.sink.arr_copy), [6., 12., 18.])
+            self.assertEqual(list(top.sink.arr2), [12., 18.])
+            self.assertTrue(top.sink.arr is top.src.arr)
+            self.assertFalse(top.sink.arr_copy is top.src.arr_copy)
+            if plan:
+                # copied into the existing array
+                self.assertTrue(top.sink.arr_copy is arr_copy)
+            self.assertEqual(top.sink.exec_count, 2)
+            results.append(top.sink.degF)
+        self.assertEqual(results[0], results[1])
+
+    def test_transfer_plan_view(self):
+        # destination doesn't own its array, so it must not be written through
+        top = set_as_top(Assembly())
+        top.add('src', Source())
+        top.add('sink', Sink())
+        top.driver.workflow.add(['src', 'sink'])
+        base = numpy.zeros(6)
+        top.sink.arr_copy = base[:3]
+        top.connect('src.arr_copy', 'sink.arr_copy')
+        top.run()
+        self.assertEqual(list(top.sink.arr_copy), [2., 4., 6.])
+        self.assertEqual(list(base), [0.] * 6)
+
+    def test_transfer_plan_reconnect(self):
+        top = self._transfer_model()
+        top.run()
+        self.assertAlmostEqual(top.sink.inch, 24., 10)
+        self.assertEqual(list(top.sink.arr2), [4., 6.])
+        top.disconnect('sink.arr2')
+        top.connect('src.arr_copy[:2]', 'sink.arr2')
+        top.src.x = 4.
+        top.run()
+        self.assertAlmostEqual(top.sink.inch, 48., 10)
+        self.assertEqual(list(top.sink.arr2), [8., 16.])
+
     def test_data_passing(self):
         comp1 = self.asm.comp1
         comp2 = self.asm.comp2
@@ -920,6 +1012,30 @@ subassy.comp3: ReRun.2-3.2-2.2-1"""
         self.assertEqual([c.name for c in asm.sub.driver.workflow],
                          ['newcomp2', 'newcomp3'])
 
+    def test_child_drivers(self):
+        top = set_as_top(Assembly())
+        top.add('sub', Assembly())
+        top.add('comp1', Simple())
+        top.add('driver2', Driver())
+        self.assertTrue('driver2' in top.list_containers())
+        self.assertEqual(set(d.name for d in top._list_drivers()),
+                         set(['driver', 'driver2']))
+        # A Driver we only hold a reference to isn't ours to notify.
+        top.foreign = top.sub.driver
+        top.config_changed()
+        self.assertTrue('foreign' in top.list_containers())
+        self.assertEqual(set(d.name for d in top._list_drivers()),
+                         set(['driver', 'driver2']))
+
+        del top.foreign
+        top.config_changed()
+
+        top.driver.workflow.add(['comp1'])
+        copy = deepcopy(top)
+        self.assertEqual(set(copy.list_containers()),
+                         set(['driver', 'driver2', 'sub', 'comp1']))
+        self.assertEqual([c.name for c in copy.driver.workflow], ['comp1'])
+
 
 if __name__ == "__main__":
     unittest.main()
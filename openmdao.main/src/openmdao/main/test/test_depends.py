@@ -335,7 +335,88 @@ class DependsTestCase(unittest.TestCase):
         top.driver2.add_objective("c1.c")
         top.run()
         self.assertEqual(exec_order, ['driver2','c1','driver1','c2','c3'])
-        
+
+    def test_incremental_config(self):
+        # verify that the order is right when the workflow is queried after
+        # every configuration change, so the cached graph gets updated
+        # rather than rebuilt
+        top = set_as_top(Assembly())
+        wflow = top.driver.workflow
+        def order():
+            return [comp.name for comp in wflow]
+
+        for name in ['c1','c2','c3','c4']:
+            top.add(name, Simple())
+            wflow.add(name)
+            order()
+        self.assertEqual(order(), ['c1','c2','c3','c4'])
+        top.connect('c4.c', 'c3.a')
+        self.assertEqual(order(), ['c1','c2','c4','c3'])
+        top.disconnect('c4.c', 'c3.a')
+        self.assertEqual(order(), ['c1','c2','c3','c4'])
+        wflow.remove('c2')
+        self.assertEqual(order(), ['c1','c3','c4'])
+
+        top.add('driver1', DumbDriver())
+        top.add('c5', Simple())
+        wflow.add('driver1')
+        self.assertEqual(order(), ['c1','c3','c4','driver1'])
+        top.driver1.workflow.add('c5')
+        top.connect('c5.c', 'c1.a')
+        self.assertEqual(order(), ['c3','c4','driver1','c1'])
+
+    def test_incremental_external(self):
+        # a component removed while connected to something outside of the
+        # workflow mustn't stay marked as connected when it's added back
+        orders = []
+        for incremental in (True, False):
+            top = set_as_top(Assembly())
+            wflow = top.driver.workflow
+            wflow.incremental = incremental
+            def order():
+                return [comp.name for comp in wflow]
+
+            for name in ['c1','c3','c7','c8','c9']:
+                top.add(name, Simple())
+            top.connect('c1.c', 'c3.b')
+            wflow.add('c3')
+            self.assertEqual(order(), ['c3'])
+            wflow.remove('c3')
+            top.disconnect('c1.c', 'c3.b')
+            for name in ['c7','c8','c3','c1','c9']:
+                wflow.add(name)
+                order()
+            top.connect('c8.c', 'c7.b')
+            orders.append(order())
+        self.assertEqual(orders[0], orders[1])
+        self.assertTrue(orders[0].index('c3') < orders[0].index('c1'))
+        self.assertTrue(orders[0].index('c3') < orders[0].index('c9'))
+
+    def test_boundary_connected(self):
+        # a component connected only to boundary variables isn't treated as
+        # unconnected, so it gets no sequential ordering edges
+        for incremental in (True, False):
+            top = set_as_top(Assembly())
+            top.add('x', Float(1., iotype='in'))
+            top.add('y', Float(iotype='out'))
+            wflow = top.driver.workflow
+            wflow.incremental = incremental
+            for name in ['c1','c2','c3']:
+                top.add(name, Simple())
+                wflow.add(name)
+            top.connect('x', 'c1.a')
+            top.connect('c3.c', 'y')
+            [comp.name for comp in wflow]
+            graph = wflow._get_collapsed_graph()
+            self.assertEqual(sorted(graph.edges()), [('c2', 'c3')])
+
+            # and becomes unconnected again when disconnected
+            top.disconnect('x', 'c1.a')
+            [comp.name for comp in wflow]
+            graph = wflow._get_collapsed_graph()
+            self.assertEqual(sorted(graph.edges()),
+                             [('c1', 'c2'), ('c2', 'c3')])
+
 
     def test_set_already_connected(self):
         try:
@@ -528,6 +528,39 @@ class ExprEvalTestCase(unittest.TestCase):
         assert_rel_error(self, grad['comp1.b2d[0][1]'], 12.0, 0.00001)
         assert_rel_error(self, grad['comp1.b2d[1][1]'], 4.0, 0.00001)
 
+    def test_cached_accessors(self):
+        ex = ExprEvaluator('comp.x+comp.cont.f+a.a1d[2]', self.top)
+        self.top.comp.cont = A()
+        self.top.comp.cont.f = 2.
+        self.assertEqual(ex.evaluate(), 3.14+2.+3.)
+
+        # values are never cached, only the objects that own them
+        self.top.comp.x = 1.
+        self.top.a.a1d[2] = 5.
+        self.assertEqual(ex.evaluate(), 1.+2.+5.)
+
+        # filling a Slot invalidates the accessors
+        self.top.comp.cont = A()
+        self.top.comp.cont.f = 20.
+        self.assertEqual(ex.evaluate(), 1.+20.+5.)
+
+        # as does replacing a Component
+        self.top.add('a', A())
+        self.top.a.a1d = [7., 8., 9.]
+        self.assertEqual(ex.evaluate(), 1.+20.+9.)
+
+        ExprEvaluator.cache_accessors = False
+        try:
+            self.assertEqual(ex.evaluate(), 1.+20.+9.)
+        finally:
+            ExprEvaluator.cache_accessors = True
+
+    def test_cached_accessors_parent(self):
+        ex = ExprEvaluator('parent.comp.x*2.', self.top.a)
+        self.assertEqual(ex.evaluate(), 6.28)
+        self.top.comp.x = 2.
+        self.assertEqual(ex.evaluate(), 4.)
+
     def test_scope_transform(self):
         exp = ExprEvaluator('myvar+abs(comp.x)*a.a1d[2]', self.top)
         self.assertEqual(new_text(exp), "scope.get('myvar')+abs(scope.get('comp.x'))*scope.get('a.a1d',[(0,2)])")
@@ -0,0 +1,153 @@
+"""
+Test mp_support.py
+"""
+
+import gc
+import logging
+import sys
+import threading
+import time
+import unittest
+import nose
+
+from multiprocessing.managers import Token
+
+from openmdao.main import mp_support
+from openmdao.main.mp_support import ObjectManager, connection_stats, \
+                                     _auto_proxy
+from openmdao.main.rbac import rbac
+
+
+class Echo(object):
+    """ Simple object to be served. """
+
+    @rbac('*')
+    def echo(self, *args):
+        return args
+
+
+class TestCase(unittest.TestCase):
+    """ Test mp_support.py """
+
+    def test_pool(self):
+        logging.debug('')
+        logging.debug('test_pool')
+
+        manager = ObjectManager(Echo(), authkey='PublicKey', name='Echo')
+        proxy = manager.proxy
+        address = proxy._token.address
+        server = manager._server
+
+        self.assertEqual(proxy.echo('hello'), ('hello',))
+        stats = connection_stats(address)
+        self.assertEqual(stats['connections'], 1)
+        self.assertEqual(stats['handshakes'], 1)
+        self.assertEqual(stats['open'], 1)
+        self.assertEqual(stats['idle'], 1)
+
+        # Threads taking turns share the same connection and session.
+        for i in range(5):
+            thread = threading.Thread(target=proxy.echo, args=(i,))
+            thread.start()
+            thread.join()
+        self.assertEqual(connection_stats(address), stats)
+
+        # Concurrent threads need their own connections, which are kept.
+        event = threading.Event()
+        def wait():
+            proxy.echo(event.wait(10))
+        threads = [threading.Thread(target=wait) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        event.set()
+        for thread in threads:
+            thread.join()
+        stats = connection_stats(address)
+        self.assertTrue(stats['connections'] <= 4)
+        self.assertEqual(stats['handshakes'], stats['connections'])
+        self.assertEqual(stats['open'], stats['idle'])
+
+        # Proxies to new objects. Increments use an idle connection.
+        typeid = proxy._token.typeid
+        server.registry[typeid] = (None, None, None, None)
+        tokens = []
+        for i in range(3):
+            ident, exposed = server.create(None, typeid, Echo())
+            tokens.append(Token(typeid, address, ident))
+        proxies = [_auto_proxy(token, 'pickle', authkey='PublicKey',
+                               exposed=exposed, pubkey=proxy._pubkey)
+                   for token in tokens]
+        for token in tokens:
+            server.decref(None, token.id)  # Now just referenced by proxies.
+        new_stats = connection_stats(address)
+        self.assertEqual(new_stats['connections'], stats['connections'])
+        self.assertEqual(new_stats['refcount_msgs'], 3)
+
+        # Decrements are sent together with the next request.
+        del proxies
+        gc.collect()
+        for token in tokens:
+            self.assertTrue(token.id in server.id_to_obj)
+        proxy.echo('hello')
+        for token in tokens:
+            self.assertFalse(token.id in server.id_to_obj)
+        new_stats = connection_stats(address)
+        self.assertEqual(new_stats['refcount_msgs'], 4)
+        self.assertEqual(new_stats['decrefs'], 3)
+
+    def test_flush(self):
+        logging.debug('')
+        logging.debug('test_flush')
+
+        manager = ObjectManager(Echo(), authkey='PublicKey', name='Echo')
+        proxy = manager.proxy
+        address = proxy._token.address
+        server = manager._server
+        proxy.echo('hello')
+
+        typeid = proxy._token.typeid
+        server.registry[typeid] = (None, None, None, None)
+
+        def make_proxies(count):
+            tokens = []
+            for i in range(count):
+                ident, exposed = server.create(None, typeid, Echo())
+                tokens.append(Token(typeid, address, ident))
+            proxies = [_auto_proxy(token, 'pickle', authkey='PublicKey',
+                                   exposed=exposed, pubkey=proxy._pubkey)
+                       for token in tokens]
+            for token in tokens:
+                server.decref(None, token.id)
+            return tokens, proxies
+
+        saved = (mp_support._FLUSH_DELAY, mp_support._MAX_PENDING)
+        try:
+            # Decrements are sent after a delay without another request.
+            mp_support._FLUSH_DELAY = 0.1
+            tokens, proxies = make_proxies(2)
+            del proxies
+            gc.collect()
+            for i in range(50):
+                time.sleep(0.1)
+                if not [token for token in tokens
+                        if token.id in server.id_to_obj]:
+                    break
+            for token in tokens:
+                self.assertFalse(token.id in server.id_to_obj)
+
+            # Or as soon as enough are queued.
+            mp_support._FLUSH_DELAY = 60.
+            mp_support._MAX_PENDING = 3
+            tokens, proxies = make_proxies(3)
+            del proxies
+            gc.collect()
+            for token in tokens:
+                self.assertFalse(token.id in server.id_to_obj)
+        finally:
+            mp_support._FLUSH_DELAY, mp_support._MAX_PENDING = saved
+
+
+if __name__ == '__main__':
+    sys.argv.append('--cover-package=openmdao.main')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()
@@ -6,11 +6,18 @@ import logging
 import os.path
 import socket
 import sys
+import threading
 import unittest
 import nose
 
+from multiprocessing import Pipe
+
+import numpy
+
+from openmdao.main import mp_util
 from openmdao.main.mp_util import read_server_config, read_allowed_hosts, \
-                                  is_legal_connection
+                                  is_legal_connection, receive_message, \
+                                  send_message
 
 from openmdao.util.publickey import make_private, HAVE_PYWIN32
 from openmdao.util.testutil import assert_raises
@@ -125,6 +132,79 @@ class TestCase(unittest.TestCase):
             finally:
                 os.remove('hosts.allow')
 
+    def test_messages(self):
+        logging.debug('')
+        logging.debug('test_messages')
+
+        big = numpy.arange(20000.)
+        fortran = numpy.asfortranarray(big.reshape((200, 100)))
+        strided = big[::2]
+        small = numpy.ones(3)
+        obj = {'big': big, 'again': big, 'fortran': fortran,
+               'strided': strided, 'small': small, 'other': [1, 'two', 3.]}
+
+        sender, receiver = Pipe()
+        saved = mp_util.FRAME_SIZE
+        mp_util.FRAME_SIZE = 4096  # Force multiple frames.
+        try:
+            for session_key in ('', 'x'*20):
+                thread = threading.Thread(target=send_message,
+                                          args=(sender, obj, session_key))
+                thread.start()
+                result = receive_message(receiver, session_key)
+                thread.join()
+
+                self.assertEqual(sorted(result.keys()), sorted(obj.keys()))
+                for name in ('big', 'fortran', 'strided', 'small'):
+                    self.assertEqual(result[name].shape, obj[name].shape)
+                    self.assertTrue((result[name] == obj[name]).all())
+                self.assertTrue(result['again'] is result['big'])
+                self.assertTrue(result['fortran'].flags.f_contiguous)
+                self.assertEqual(result['other'], obj['other'])
+        finally:
+            mp_util.FRAME_SIZE = saved
+
+        # Without arrays or encryption, compatible with recv().
+        send_message(sender, ('hello', 42), '')
+        self.assertEqual(receiver.recv(), ('hello', 42))
+        sender.send(('hello', 42))
+        self.assertEqual(receive_message(receiver, ''), ('hello', 42))
+
+    def test_partial_message(self):
+        logging.debug('')
+        logging.debug('test_partial_message')
+
+        class FailingConnection(object):
+            """ Sends `count` frames before failing. """
+            def __init__(self, conn, count):
+                self.conn = conn
+                self.count = count
+                self.closed = False
+            def send_bytes(self, *args):
+                if not self.count:
+                    raise IOError('connection lost')
+                self.count -= 1
+                self.conn.send_bytes(*args)
+            def close(self):
+                self.closed = True
+
+        obj = {'big': numpy.arange(20000.)}
+        sender, receiver = Pipe()
+        saved = mp_util.FRAME_SIZE
+        mp_util.FRAME_SIZE = 4096  # Force multiple frames.
+        try:
+            # Header and first frame get through, then the sender fails.
+            failing = FailingConnection(sender, 2)
+            self.assertRaises(IOError, send_message, failing, obj, '')
+            self.assertTrue(failing.closed)
+            sender.close()
+
+            # The receiver can't skip the rest of the message.
+            self.assertRaises(EOFError, receive_message, receiver, '')
+            self.assertTrue(receiver.closed)
+        finally:
+            mp_util.FRAME_SIZE = saved
+
 
 if __name__ == '__main__':
     sys.argv.append('--cover-package=openmdao.main')
@@ -18,6 +18,8 @@ from openmdao.main.objserverfactory import ObjServerFactory, ObjServer, \
                                            start_server, stop_server, \
                                            connect_to_server, _PROXIES
 from openmdao.main.resource import ResourceAllocationManager as RAM
+from openmdao.util import filexfer
+from openmdao.util.filexfer import file_digest, retrieve_files, send_files
 from openmdao.util.testutil import assert_raises
 from openmdao.util.fileutil import onerror
 
@@ -275,6 +277,108 @@ class TestCase(unittest.TestCase):
             SimulationRoot.chroot('..')
             shutil.rmtree(testdir, onerror=onerror)
 
+    def test_transfer(self):
+        logging.debug('')
+        logging.debug('test_transfer')
+
+        testdir = 'test_transfer'
+        if os.path.exists(testdir):
+            shutil.rmtree(testdir, onerror=onerror)
+        os.mkdir(testdir)
+        os.chdir(testdir)
+
+        # Count actual transfers.
+        transfers = []
+        orig_filexfer = filexfer.filexfer
+        def counting_filexfer(*args, **kwargs):
+            transfers.append(args[1])
+            return orig_filexfer(*args, **kwargs)
+
+        # Have the 'big' file sent in sections.
+        orig_size = filexfer.PARALLEL_SIZE
+        filexfer.PARALLEL_SIZE = 1 << 18
+
+        # Keep the server's file cache within the test directory.
+        orig_cache = os.environ.get('OPENMDAO_FILE_CACHE')
+        os.environ['OPENMDAO_FILE_CACHE'] = os.path.abspath('cache')
+
+        factory = None
+        digests = []
+        try:
+            filexfer.filexfer = counting_filexfer
+            factory = ObjServerFactory()
+            server = factory.create('')
+
+            with open('text', 'w') as out:
+                out.write('Hello world!\n' * 100)
+            with open('big', 'wb') as out:
+                out.write(os.urandom(1000) * 1000)
+            digests = [file_digest('text'), file_digest('big')]
+
+            # First send transfers both files.
+            nfiles, nbytes = send_files(server, ['text', 'big'], ['text'])
+            self.assertEqual((nfiles, nbytes), (2, 1001300))
+            self.assertEqual(len(transfers), 2)
+            self.assertEqual(server.cache_lookup(digests), [])
+
+            # Unchanged files aren't transferred again.
+            del transfers[:]
+            send_files(server, ['*'], ['text'])
+            self.assertEqual(transfers, [])
+
+            # Only the changed file is transferred.
+            with open('text', 'a') as out:
+                out.write('Goodbye world!\n')
+            digests.append(file_digest('text'))
+            send_files(server, ['text', 'big'], ['text'])
+            self.assertEqual(transfers, ['text'])
+
+            # Results identical to local files aren't transferred.
+            del transfers[:]
+            nfiles, nbytes = retrieve_files(server, ['text', 'big'], ['text'])
+            self.assertEqual((nfiles, nbytes), (2, 1001315))
+            self.assertEqual(transfers, [])
+
+            os.remove('text')
+            with open('big', 'wb') as out:
+                out.write('not so big')
+            retrieve_files(server, ['text', 'big'], ['text'])
+            self.assertEqual(sorted(transfers), ['big', 'text'])
+            self.assertEqual(file_digest('text'), digests[2])
+            self.assertEqual(file_digest('big'), digests[1])
+
+            # Bad paths.
+            assert_raises(self, "server.get_digests(['../*'])",
+                          globals(), locals(), RuntimeError,
+                          "Can't get_digests '../*', not within root ")
+            assert_raises(self, "server.cache_install([('../x', digests[0])])",
+                          globals(), locals(), RuntimeError,
+                          "Can't cache_install '../x', not within root ")
+
+            # Bad digests.
+            bad = '../' * 10 + 'etc/passwd'
+            assert_raises(self, "server.cache_lookup([bad])",
+                          globals(), locals(), ValueError,
+                          "invalid digest %r" % bad)
+            assert_raises(self, "server.cache_install([('x', bad)])",
+                          globals(), locals(), ValueError,
+                          "invalid digest %r" % bad)
+        finally:
+            filexfer.filexfer = orig_filexfer
+            filexfer.PARALLEL_SIZE = orig_size
+            if orig_cache is None:
+                del os.environ['OPENMDAO_FILE_CACHE']
+            else:
+                os.environ['OPENMDAO_FILE_CACHE'] = orig_cache
+            if factory is not None:
+                factory.cleanup()
+            SimulationRoot.chroot('..')
+            if sys.platform == 'win32':
+                time.sleep(2)  # Wait for process shutdown.
+            keep_dirs = int(os.environ.get('OPENMDAO_KEEPDIRS', '0'))
+            if not keep_dirs:
+                shutil.rmtree(testdir, onerror=onerror)
+
 
 if __name__ == '__main__':
     sys.argv.append('--cover-package=openmdao.main')
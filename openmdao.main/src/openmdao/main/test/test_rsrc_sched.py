@@ -0,0 +1,359 @@
+"""
+Test allocation scheduling using simulated allocators.
+"""
+
+import logging
+import nose
+import sys
+import threading
+import time
+import unittest
+
+from openmdao.main.resource import ResourceAllocationManager as RAM
+from openmdao.main.resource import ResourceAllocator, LocalAllocator
+
+
+class FakeTimer(object):
+    """ Stands in for a proxy's close timer. """
+
+    def cancel(self):
+        pass
+
+
+class FakeServer(object):
+    """ Stands in for a server proxy. """
+
+    def __init__(self, name, pid, host):
+        self.name = name
+        self.pid = pid
+        self.host = host
+        self._close = FakeTimer()
+
+
+class FakeAllocator(ResourceAllocator):
+    """
+    Simulated allocator. Like :class:`LocalAllocator`, its estimate doesn't
+    reflect servers just deployed, so the scheduler must enforce `slots`.
+    Servers deployed here run jobs `slowdown` times longer.
+    """
+
+    def __init__(self, name, slots, slowdown=1., total_memory=0):
+        super(FakeAllocator, self).__init__(name)
+        self.slots = slots
+        self.slowdown = slowdown
+        self.total_memory = total_memory
+        self.deployed = 0
+        self.released = 0
+        self.queries = 0
+
+    def max_servers(self, resource_desc):
+        self.queries += 1
+        return (self.slots, {})
+
+    def time_estimate(self, resource_desc):
+        retcode, info = self.check_compatibility(resource_desc)
+        if retcode != 0:
+            return (retcode, info)
+        criteria = {
+            'hostnames': [self.name.lower()],
+            'total_memory': self.total_memory,
+        }
+        return (0, criteria)
+
+    def deploy(self, name, resource_desc, criteria):
+        self.deployed += 1
+        return FakeServer(name, self.deployed, criteria['hostnames'][0])
+
+    def release(self, server):
+        self.released += 1
+
+
+class Simulator(object):
+    """
+    Discrete event simulation of jobs requesting servers from a manager.
+    Each job holds its server for its duration times the allocator's
+    `slowdown`.
+    """
+
+    def __init__(self, allocators):
+        self.now = 0.
+        self.ram = RAM()
+        self.ram._allocators = list(allocators)
+        self.ram._scheduler.clock = lambda: self.now
+        self.pending = []  # (request, name, duration)
+        self.running = []  # (end, name, server)
+        self.started = {}  # name -> (start, allocator name)
+        self.finished = {}  # name -> end
+
+    def submit(self, name, duration, **resource_desc):
+        """ Submit job `name`, which runs for `duration`. """
+        RAM.validate_resources(resource_desc)
+        request = self.ram._scheduler.submit(resource_desc)
+        self.pending.append((request, name, duration))
+
+    def run(self):
+        """ Run until all jobs have finished. """
+        while self.pending or self.running:
+            self._start_jobs()
+            if not self.running:
+                raise RuntimeError('pending jobs can never start')
+            self.running.sort()
+            end, name, server = self.running.pop(0)
+            self.now = end
+            self.ram._release(server)
+            self.finished[name] = end
+
+    def _start_jobs(self):
+        """ Start jobs until no pending job can start. """
+        started = True
+        while started:
+            started = False
+            for entry in self.pending:
+                request, name, duration = entry
+                with RAM._lock:
+                    result = self.ram._try_allocate(request)
+                if result is None:
+                    continue
+                server, server_info = result
+                if server is None:
+                    raise RuntimeError('%s not supported' % name)
+                self.pending.remove(entry)
+                with RAM._lock:
+                    self.ram._scheduler.withdraw(request)
+                allocator = self.ram._deployed_servers[id(server)][0]
+                end = self.now + duration * allocator.slowdown
+                self.running.append((end, name, server))
+                self.started[name] = (self.now, allocator.name)
+                started = True
+                break
+
+    def concurrency(self, prefix=''):
+        """ Returns maximum number of concurrent jobs starting with `prefix`. """
+        events = []
+        for name, (start, allocator) in self.started.items():
+            if name.startswith(prefix):
+                events.append((start, 1))
+                events.append((self.finished[name], -1))
+        count = peak = 0
+        for when, delta in sorted(events):
+            count += delta
+            peak = max(peak, count)
+        return peak
+
+
+class TestCase(unittest.TestCase):
+    """ Test allocation scheduling. """
+
+    def test_capacity(self):
+        logging.debug('')
+        logging.debug('test_capacity')
+
+        sim = Simulator([FakeAllocator('Sim', 2)])
+        for i in range(5):
+            sim.submit('job%d' % i, 10)
+        sim.run()
+        self.assertEqual(sim.concurrency(), 2)
+        self.assertEqual(sim.now, 30)
+        self.assertEqual(sim.ram._scheduler.in_flight(), 0)
+        self.assertEqual(sim.ram._scheduler.average_duration('Sim'), 10)
+
+    def test_fair_share(self):
+        logging.debug('')
+        logging.debug('test_fair_share')
+
+        # Two groups, the first submitted all its jobs first.
+        sim = Simulator([FakeAllocator('Sim', 4)])
+        for i in range(12):
+            sim.submit('a%d' % i, 10, share_group='a')
+        for i in range(12):
+            sim.submit('b%d' % i, 10, share_group='b')
+        sim.run()
+        for group in ('a', 'b'):
+            starts = [start for name, (start, alloc) in sim.started.items()
+                            if name.startswith(group)]
+            self.assertEqual(starts.count(0), 2)
+            self.assertEqual(max(starts), 50)
+        self.assertEqual(sim.now, 60)
+
+        # Weighted.
+        sim = Simulator([FakeAllocator('Sim', 4)])
+        for i in range(12):
+            sim.submit('a%d' % i, 10, share_group='a')
+        for i in range(12):
+            sim.submit('b%d' % i, 10, share_group='b', share_weight=3)
+        sim.run()
+        self.assertEqual(sim.concurrency('b'), 3)
+        self.assertEqual(max(sim.finished[name] for name in sim.finished
+                                                if name.startswith('b')), 40)
+        # Until 'b' is done, 'a' gets a quarter.
+        starts = sorted(start for name, (start, alloc) in sim.started.items()
+                              if name.startswith('a'))
+        self.assertEqual(starts[:5], [0, 10, 20, 30, 40])
+
+    def test_memory(self):
+        logging.debug('')
+        logging.debug('test_memory')
+
+        sim = Simulator([FakeAllocator('Sim', 4, total_memory=1000)])
+        for i in range(4):
+            sim.submit('big%d' % i, 10, min_phys_memory=400)
+        sim.run()
+        self.assertEqual(sim.concurrency(), 2)
+        self.assertEqual(sim.now, 20)
+
+    def test_backfill(self):
+        logging.debug('')
+        logging.debug('test_backfill')
+
+        sim = Simulator([FakeAllocator('Sim', 2, total_memory=1000)])
+        sim.submit('long', 100, min_phys_memory=600,
+                   resource_limits={'wallclock_time': 100})
+        sim.submit('head', 10, min_phys_memory=800)
+        for i in range(4):
+            sim.submit('short%d' % i, 20, min_phys_memory=100,
+                       resource_limits={'wallclock_time': 20})
+        sim.submit('medium', 50, min_phys_memory=100,
+                   resource_limits={'wallclock_time': 50})
+        sim.run()
+
+        # Short jobs run while 'head' waits for memory.
+        for i in range(4):
+            self.assertEqual(sim.started['short%d' % i][0], i * 20)
+        # But not if they would delay 'head'.
+        self.assertEqual(sim.started['head'][0], 100)
+        self.assertEqual(sim.started['medium'][0], 100)
+
+        # Without an expected duration there's no backfill.
+        sim = Simulator([FakeAllocator('Sim', 2, total_memory=1000)])
+        sim.submit('long', 100, min_phys_memory=600)
+        sim.submit('head', 10, min_phys_memory=800)
+        sim.submit('short', 20, min_phys_memory=100,
+                   resource_limits={'wallclock_time': 20})
+        sim.run()
+        self.assertEqual(sim.started['head'][0], 100)
+        self.assertEqual(sim.started['short'][0], 100)
+
+        # But observed durations are used.
+        sim = Simulator([FakeAllocator('Sim', 2, total_memory=1000)])
+        sim.submit('warmup', 100)
+        sim.run()
+        sim.submit('long', 100, min_phys_memory=600)
+        sim.submit('head', 10, min_phys_memory=800)
+        sim.submit('short', 20, min_phys_memory=100,
+                   resource_limits={'wallclock_time': 20})
+        sim.run()
+        self.assertEqual(sim.started['head'][0], 200)
+        self.assertEqual(sim.started['short'][0], 100)
+
+    def test_throughput(self):
+        logging.debug('')
+        logging.debug('test_throughput')
+
+        slow = FakeAllocator('Slow', 2, slowdown=3)
+        fast = FakeAllocator('Fast', 2)
+        sim = Simulator([slow, fast])
+        sim.submit('first', 10)
+        sim.submit('second', 10)
+        sim.run()
+        self.assertEqual(sim.started['first'][1], 'Slow')
+        self.assertEqual(sim.started['second'][1], 'Fast')
+
+        # History now favors 'Fast'.
+        for i in range(3):
+            sim.submit('job%d' % i, 10)
+            sim.run()
+            self.assertEqual(sim.started['job%d' % i][1], 'Fast')
+        self.assertEqual(slow.released, 1)
+        self.assertEqual(fast.released, 4)
+
+    def test_capacity_queries(self):
+        logging.debug('')
+        logging.debug('test_capacity_queries')
+
+        # Capacity is checked and used for preference, but only queried
+        # once per allocator per pass.
+        allocators = [FakeAllocator('Sim%d' % i, 2) for i in range(3)]
+        sim = Simulator(allocators)
+        sim.submit('job', 10)
+        sim.run()
+        self.assertEqual([alloc.queries for alloc in allocators], [1, 1, 1])
+
+    def test_idle(self):
+        logging.debug('')
+        logging.debug('test_idle')
+
+        sim = Simulator([FakeAllocator('Sim', 1)])
+        orig_ram = RAM._RAM
+        RAM._RAM = sim.ram
+        try:
+            with RAM._lock:
+                request = sim.ram._scheduler.submit({'share_group': 'a'})
+                server, server_info = sim.ram._try_allocate(request)
+                sim.ram._scheduler.withdraw(request)
+
+            # Time spent idle in a pool isn't part of a job's duration.
+            sim.now = 10.
+            RAM.mark_idle(server)
+            sim.now = 100.
+            RAM.mark_busy(server, {'share_group': 'b'})
+            self.assertEqual(sim.ram._scheduler.in_flight(group='b'), 1)
+            sim.now = 120.
+            RAM.mark_idle(server)
+            sim.now = 200.
+            RAM.release(server)
+            scheduler = sim.ram._scheduler
+            self.assertEqual(scheduler.average_duration(group='a'), 10)
+            self.assertEqual(scheduler.average_duration(group='b'), 20)
+            self.assertEqual(scheduler.in_flight(), 0)
+        finally:
+            RAM._RAM = orig_ram
+
+    def test_wait(self):
+        logging.debug('')
+        logging.debug('test_wait')
+
+        orig_ram = RAM._RAM
+        RAM._RAM = RAM()
+        RAM._RAM._allocators = [FakeAllocator('Sim', 1)]
+        try:
+            server, server_info = RAM.allocate({'share_group': 'test'})
+            self.assertEqual(server_info['host'], 'sim')
+
+            results = []
+            def allocate():
+                results.append(RAM.allocate({'share_group': 'test'}))
+            waiter = threading.Thread(target=allocate)
+            waiter.daemon = True
+            waiter.start()
+            time.sleep(0.5)
+            self.assertEqual(results, [])
+
+            # Release wakes the waiter (much sooner than the 1 sec poll).
+            start = time.time()
+            RAM.release(server)
+            waiter.join(5)
+            self.assertTrue(time.time() - start < 0.5)
+            server, server_info = results[0]
+            self.assertEqual(server.pid, 2)
+            RAM.release(server)
+        finally:
+            RAM._RAM = orig_ram
+
+    def test_local_memory(self):
+        logging.debug('')
+        logging.debug('test_local_memory')
+
+        local = LocalAllocator('LocalMemory', total_cpus=4, max_load=1.,
+                               total_memory=1000)
+        self.assertEqual(local.max_servers({'min_phys_memory': 300}), (3, {}))
+        self.assertEqual(local.max_servers({}), (4, {}))
+        self.assertEqual(local.time_estimate({'min_phys_memory': 2000}),
+                         (-2, {'min_phys_memory': 'want 2000, have 1000'}))
+        estimate, criteria = local.time_estimate({'min_phys_memory': 1000})
+        self.assertEqual(criteria['total_memory'], 1000)
+
+
+if __name__ == '__main__':
+    sys.argv.append('--cover-package=openmdao.main')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()
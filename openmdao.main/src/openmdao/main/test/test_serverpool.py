@@ -0,0 +1,224 @@
+"""
+Test pool of warm servers.
+"""
+
+import logging
+import nose
+import sys
+import threading
+import time
+import unittest
+
+from openmdao.main.api import Assembly, set_as_top
+from openmdao.main.resource import ResourceAllocationManager as RAM
+from openmdao.main.resource import ResourceAllocator
+from openmdao.main.serverpool import ServerPool, model_digest
+from openmdao.test.execcomp import ExecComp
+
+
+class FakeTimer(object):
+    """ Stands in for a proxy's close timer. """
+
+    def cancel(self):
+        pass
+
+
+class FakeServer(object):
+    """ Stands in for a server proxy. """
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.host = 'fake'
+        self.alive = True
+        self._close = FakeTimer()
+
+    def echo(self, *args):
+        if not self.alive:
+            raise RuntimeError('server died')
+        return args
+
+
+class FakeAllocator(ResourceAllocator):
+    """ Deploys fake servers. """
+
+    def __init__(self, name):
+        super(FakeAllocator, self).__init__(name)
+        self.deployed = 0
+        self.released = []
+        self.slots = 10
+
+    def max_servers(self, resource_desc):
+        return (self.slots, {})
+
+    def time_estimate(self, resource_desc):
+        return self.check_compatibility(resource_desc)[0], {}
+
+    def deploy(self, name, resource_desc, criteria):
+        self.deployed += 1
+        return FakeServer(self.deployed)
+
+    def release(self, server):
+        self.released.append(server.pid)
+
+
+class TestCase(unittest.TestCase):
+    """ Test pool of warm servers. """
+
+    def setUp(self):
+        self.orig_ram = RAM._RAM
+        RAM._RAM = RAM()
+        self.allocator = FakeAllocator('Fake')
+        RAM._RAM._allocators = [self.allocator]
+        self.pool = ServerPool()
+
+    def tearDown(self):
+        self.pool.clear()
+        RAM._RAM = self.orig_ram
+
+    def test_reuse(self):
+        logging.debug('')
+        logging.debug('test_reuse')
+
+        desc = {'python_version': sys.version[:3]}
+        server, info, top = self.pool.get(desc, 'abc')
+        self.assertEqual((server.pid, info['egg_digest'], top), (1, None, None))
+        other, other_info, top = self.pool.get(desc, 'def')
+        self.assertEqual(other.pid, 2)
+        info['egg_digest'] = 'abc'
+        self.pool.put(server, info, desc, 60, 'model-abc')
+        other_info['egg_digest'] = 'def'
+        self.pool.put(other, other_info, desc, 60, 'model-def')
+        self.assertEqual(len(self.pool), 2)
+
+        # Matching model preferred.
+        server, info, top = self.pool.get(desc, 'abc')
+        self.assertEqual((server.pid, top), (1, 'model-abc'))
+        # Otherwise any server with the same resources.
+        # Scheduling keys don't affect suitability.
+        share_desc = {'python_version': sys.version[:3],
+                      'share_group': 'other', 'share_weight': 2}
+        server2, info2, top = self.pool.get(share_desc, 'xyz')
+        self.assertEqual((server2.pid, top), (2, None))
+        self.assertEqual(info2['egg_digest'], 'def')
+        self.assertEqual(self.allocator.deployed, 2)
+
+        # Idle servers for other resources are released when allocating.
+        self.pool.put(server, info, desc, 60, 'model-abc')
+        self.pool.put(server2, info2, desc, 60)
+        other_desc = {'python_version': sys.version[:3], 'min_cpus': 1}
+        server3, info3, top = self.pool.get(other_desc, 'abc')
+        self.assertEqual((server3.pid, top), (3, None))
+        self.assertEqual(sorted(self.allocator.released), [1, 2])
+        self.assertEqual(len(self.pool), 0)
+
+        # Dead idle servers are released and skipped.
+        self.pool.put(server3, info3, other_desc, 60)
+        server3.alive = False
+        server4, info4, top = self.pool.get(other_desc)
+        self.assertEqual(server4.pid, 4)
+        self.assertEqual(sorted(self.allocator.released), [1, 2, 3])
+        RAM.release(server4)
+
+    def test_timeout(self):
+        logging.debug('')
+        logging.debug('test_timeout')
+
+        desc = {}
+        servers = []
+        for i in range(2):
+            server, info, top = self.pool.get(desc)
+            servers.append((server, info))
+        self.pool.put(servers[0][0], servers[0][1], desc, 0.5)
+        self.pool.put(servers[1][0], servers[1][1], desc, 60)
+
+        for retry in range(50):
+            if self.allocator.released:
+                break
+            time.sleep(0.1)
+        self.assertEqual(self.allocator.released, [1])
+        self.assertEqual(len(self.pool), 1)
+
+        self.pool.clear()
+        self.assertEqual(self.allocator.released, [1, 2])
+
+    def test_reclaim(self):
+        logging.debug('')
+        logging.debug('test_reclaim')
+
+        # An idle server doesn't block a direct allocation needing its slot.
+        self.allocator.slots = 1
+        orig_reclaimer = RAM._reclaimer
+        RAM.set_reclaimer(self.pool.reclaim)
+        try:
+            desc = {}
+            server, info, top = self.pool.get(desc)
+            self.pool.put(server, info, desc, 60)
+
+            results = []
+            def allocate():
+                results.append(RAM.allocate(desc))
+            waiter = threading.Thread(target=allocate)
+            waiter.daemon = True
+            waiter.start()
+            waiter.join(5)
+            self.assertEqual(len(results), 1)
+            other, other_info = results[0]
+            self.assertEqual(other.pid, 2)
+            self.assertEqual(self.allocator.released, [1])
+            self.assertEqual(len(self.pool), 0)
+            RAM.release(other)
+        finally:
+            RAM.set_reclaimer(orig_reclaimer)
+
+    def test_release(self):
+        logging.debug('')
+        logging.debug('test_release')
+
+        # Two owners keep servers with the same model.
+        desc = {}
+        servers = []
+        for i in range(3):
+            server, info, top = self.pool.get(desc)
+            info['egg_digest'] = 'abc'
+            servers.append((server, info))
+        theirs = self.pool.put(servers[0][0], servers[0][1], desc, 60,
+                               'model-abc')
+        mine = [self.pool.put(server, info, desc, 60, 'model-abc')
+                for server, info in servers[1:]]
+
+        # One of mine is reused and kept again by the other owner.
+        server, info, top = self.pool.get(desc, 'abc')
+        self.assertEqual(server.pid, 3)
+        self.pool.put(server, info, desc, 60, top)
+
+        # Only my server which is still idle is released.
+        self.pool.release(mine)
+        self.assertEqual(self.allocator.released, [2])
+        self.assertEqual(len(self.pool), 2)
+        self.pool.release([theirs])
+        self.assertEqual(self.allocator.released, [2, 1])
+
+    def test_digest(self):
+        logging.debug('')
+        logging.debug('test_digest')
+
+        model = set_as_top(Assembly())
+        model.add('comp', ExecComp(['y = 2.0*x']))
+        model.driver.workflow.add('comp')
+        model.run()
+        digest = model_digest(model)
+
+        # Execution counters and iteration coordinates are ignored.
+        model.run()
+        self.assertEqual(model.exec_count, 2)
+        self.assertEqual(model_digest(model), digest)
+
+        model.comp.x = 3.
+        self.assertNotEqual(model_digest(model), digest)
+
+
+
+if __name__ == '__main__':
+    sys.argv.append('--cover-package=openmdao.main')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()
@@ -0,0 +1,120 @@
+"""
+Measure time to send input files to a server, comparing the zip file
+method previously used by :class:`ExternalCode` with :func:`send_files`
+for the first case and for a following case where only a small file
+has changed.
+
+Usage: python xferperf.py [max_megabytes]
+"""
+
+import os.path
+import shutil
+import sys
+import time
+
+from openmdao.main.mp_util import read_server_config
+from openmdao.main.objserverfactory import connect, start_server
+from openmdao.util.filexfer import FileCache, file_digest, filexfer, \
+                                   pack_zipfile, send_files
+from openmdao.util.fileutil import onerror
+
+
+SIZES = (1, 16, 64, 256, 1024)  # Megabytes.
+
+
+def make_inputs(size):
+    """ Create a 'mesh' of `size` MB and a small 'params' file. """
+    with open('mesh', 'w') as out:
+        line = 0
+        nbytes = size << 20
+        while nbytes > 0:
+            text = '%10d %20.12e %20.12e %20.12e\n' \
+                   % (line, line * 0.1, line * 0.01, line * 0.001)
+            out.write(text)
+            nbytes -= len(text)
+            line += 1
+    write_params(0)
+
+def write_params(case):
+    """ Write parameters for `case`. """
+    with open('params', 'w') as out:
+        out.write('case %d\n' % case)
+
+
+def zip_send(server, patterns):
+    """ Send files the way :class:`ExternalCode` used to. """
+    filename = 'inputs.zip'
+    pack_zipfile(patterns, filename)
+    try:
+        filexfer(None, filename, server, filename, 'b')
+        server.unpack_zipfile(filename)
+    finally:
+        os.remove(filename)
+        server.remove(filename)
+
+
+def run_tests(server, sizes):
+    """ Time sending inputs of various sizes. """
+    patterns = ['mesh', 'params']
+    cache = FileCache()
+    for size in sizes:
+        make_inputs(size)
+        try:
+            start = time.time()
+            zip_send(server, patterns)
+            zipped = time.time() - start
+
+            start = time.time()
+            send_files(server, patterns)
+            first = time.time() - start
+
+            write_params(1)
+            start = time.time()
+            send_files(server, patterns)
+            repeat = time.time() - start
+
+            print '%4d MB: zip %.2f sec, first case %.2f sec,' \
+                  ' following case %.3f sec' % (size, zipped, first, repeat)
+            sys.stdout.flush()
+        finally:
+            # Don't leave test data in the cache.
+            for name in patterns:
+                path = os.path.join(cache.path, file_digest(name))
+                if os.path.exists(path):
+                    os.remove(path)
+            write_params(0)
+            path = os.path.join(cache.path, file_digest('params'))
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def main():
+    """ Run transfer tests, optionally limiting the file size. """
+    if len(sys.argv) > 1:
+        max_size = int(sys.argv[1])
+        sizes = [size for size in SIZES if size <= max_size]
+    else:
+        sizes = SIZES
+
+    name = 'Xfer'
+    if os.path.exists(name):
+        shutil.rmtree(name, onerror=onerror)
+    os.mkdir(name)
+    os.chdir(name)
+    try:
+        server_proc, server_cfg = start_server()
+        cfg = read_server_config(server_cfg)
+        factory = connect(cfg['address'], cfg['port'], pubkey=cfg['key'])
+        try:
+            server = factory.create('')
+            run_tests(server, sizes)
+        finally:
+            factory.cleanup()
+            server_proc.terminate(timeout=10)
+    finally:
+        os.chdir('..')
+        shutil.rmtree(name, onerror=onerror)
+
+
+if __name__ == '__main__':
+    main()
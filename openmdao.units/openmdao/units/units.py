@@ -646,7 +646,9 @@ def import_library(libfilepointer):
     """Imports a units library, replacing any existing definitions."""
     global _UNIT_LIB 
     global _UNIT_CACHE
+    global _CONVERSION_CACHE
     _UNIT_CACHE = {}
+    _CONVERSION_CACHE = {}
     _UNIT_LIB = ConfigParser.ConfigParser()
     _UNIT_LIB.optionxform = _do_nothing
     _UNIT_LIB.readfp(libfilepointer)
@@ -709,6 +711,9 @@ def update_library(filename):
 
 def _update_library(cfg):
     """ Update library from :class:`ConfigParser` `cfg`. """
+    # Cached units and conversions may refer to units being redefined.
+    _UNIT_CACHE.clear()
+    _CONVERSION_CACHE.clear()
     retry1 = set()
     for name, unit in cfg.items('units'):
         data = [item.strip() for item in unit.split(',')]
@@ -756,13 +761,30 @@ def _update_library(cfg):
                          ' defined units:%s' % [x[0] for x in retry1])
 
 
+_CONVERSION_CACHE = {}
+
+def get_conversion_tuple(units, convunits):
+    """Return the tuple (factor, offset) that converts a value given in
+    units to convunits as (value + offset) * factor. Results are cached, so
+    the unit strings are only parsed the first time a pair is seen.
+    """
+    try:
+        return _CONVERSION_CACHE[(units, convunits)]
+    except KeyError:
+        conv = _find_unit(units).conversion_tuple_to(_find_unit(convunits))
+        _CONVERSION_CACHE[(units, convunits)] = conv
+        return conv
+
+
 def convert_units(value, units, convunits):
     """Return the given value (given in units) converted 
-    to convunits.
+    to convunits. value may be a number or a numpy array, which is
+    converted as a whole and never modified in place.
     """
-    pq = PhysicalQuantity(value, units)
-    pq.convert_to_unit(convunits)
-    return pq.value
+    factor, offset = get_conversion_tuple(units, convunits)
+    if offset:
+        value = value + offset
+    return value * factor
     
 
 try:
@@ -1,13 +1,43 @@
+import collections
 import fnmatch
 import glob
+import hashlib
 import os
+import re
+import shutil
 import sys
+import threading
+import time
 import zipfile
+import zlib
 
 from openmdao.util.log import NullLogger
 
 
-def filexfer(src_server, src_path, dst_server, dst_path, mode=''):
+# Binary files at least this big are copied by several threads concurrently
+# when either side is remote.
+PARALLEL_SIZE = 1 << 26  # 64MB.
+PARALLEL_THREADS = 4
+
+# Used for compressed transfers, favoring speed over size.
+COMPRESSION_LEVEL = 1
+
+# Maps absolute path to (size, mtime, inode, digest) for file_digest(),
+# least recently used first.
+_DIGESTS = collections.OrderedDict()
+_DIGESTS_LOCK = threading.Lock()
+_MAX_DIGESTS = 10000
+
+# Valid FileCache entry name.
+_DIGEST_RE = re.compile(r'^[0-9a-f]{40}\Z')
+
+# Digests of files modified more recently than this (seconds) aren't
+# remembered, since a later write may not change the size or mtime.
+_MTIME_SLACK = 2.
+
+
+def filexfer(src_server, src_path, dst_server, dst_path, mode='',
+             compress=False):
     """
     Transfer a file from one place to another.
 
@@ -19,6 +49,10 @@ def filexfer(src_server, src_path, dst_server, dst_path, mode=''):
     After the copy has completed, permission bits from :meth:`stat` are set
     via :meth:`chmod`.
 
+    If either side is remote, binary files of at least `PARALLEL_SIZE` bytes
+    are copied in `PARALLEL_THREADS` sections concurrently. Remote files must
+    then support :meth:`seek` and :meth:`truncate`.
+
     src_server: Proxy
         Host to get file from.
 
@@ -33,41 +67,532 @@ def filexfer(src_server, src_path, dst_server, dst_path, mode=''):
 
     mode: string
         Mode settings for :func:`open`, not including 'r' or 'w'.
+
+    compress: bool
+        If True and either side is remote, data is transferred compressed.
+        Remote files must then support :meth:`read_compressed` or
+        :meth:`write_compressed`.
     """
     if src_server is None:
-        src_file = open(src_path, 'r'+mode)
+        src_stat = os.stat(src_path)
     else:
-        src_file = src_server.open(src_path, 'r'+mode)
-
-    try:
-        if dst_server is None:
-            dst_file = open(dst_path, 'w'+mode)
-        else:
-            dst_file = dst_server.open(dst_path, 'w'+mode)
-
-        if src_server is None and dst_server is None:
-            chunk = 1 << 20  # 1MB locally.
-        else:
-            chunk = 1 << 17  # 128KB over network.
+        src_stat = src_server.stat(src_path)
 
+    remote = src_server is not None or dst_server is not None
+    if remote and not compress:
+        chunk = 1 << 17  # 128KB over network.
+    else:
+        # 1MB locally, or before compression. Small compressed messages
+        # would otherwise stall on TCP delayed acknowledgement.
+        chunk = 1 << 20
+        compress = compress and remote
+
+    size = src_stat.st_size
+    if remote and 'b' in mode and size >= PARALLEL_SIZE:
+        _parallel_copy(src_server, src_path, dst_server, dst_path, mode,
+                       size, chunk, compress)
+    else:
+        src_file = _open(src_server, src_path, 'r'+mode)
         try:
-            data = src_file.read(chunk)
-            while data:
-                dst_file.write(data)
-                data = src_file.read(chunk)
+            dst_file = _open(dst_server, dst_path, 'w'+mode)
+            try:
+                _copy(src_file, src_server is not None,
+                      dst_file, dst_server is not None, chunk, compress)
+            finally:
+                dst_file.close()
         finally:
-            dst_file.close()
-    finally:
-        src_file.close()
+            src_file.close()
 
-    if src_server is None:
-        mode = os.stat(src_path).st_mode
-    else:
-        mode = src_server.stat(src_path).st_mode
     if dst_server is None:
-        os.chmod(dst_path, mode)
+        os.chmod(dst_path, src_stat.st_mode)
     else:
-        dst_server.chmod(dst_path, mode)
+        dst_server.chmod(dst_path, src_stat.st_mode)
+
+
+def _open(server, path, mode):
+    """ Open `path` on `server`, or locally if `server` is None. """
+    if server is None:
+        return open(path, mode)
+    return server.open(path, mode)
+
+
+def _copy(src_file, src_remote, dst_file, dst_remote, chunk, compress,
+          nbytes=None):
+    """ Copy `nbytes` from `src_file` to `dst_file`, or until EOF if None. """
+    while nbytes is None or nbytes > 0:
+        size = chunk if nbytes is None else min(chunk, nbytes)
+        if compress and src_remote:
+            data = src_file.read_compressed(size)
+        else:
+            data = src_file.read(size)
+            if compress and data:
+                data = zlib.compress(data, COMPRESSION_LEVEL)
+        if not data:
+            break
+        if compress and dst_remote:
+            dst_file.write_compressed(data)
+        elif compress:
+            dst_file.write(zlib.decompress(data))
+        else:
+            dst_file.write(data)
+        if nbytes is not None:
+            nbytes -= size
+
+
+def _parallel_copy(src_server, src_path, dst_server, dst_path, mode,
+                   size, chunk, compress):
+    """
+    Copy `size` bytes using a thread per section of the file. Each thread
+    opens its own files, so remote accesses use separate connections.
+    """
+    # Create full-size destination so sections can be written in any order.
+    dst_file = _open(dst_server, dst_path, 'w'+mode)
+    try:
+        dst_file.truncate(size)
+    finally:
+        dst_file.close()
+
+    # Threads need the caller's access credentials, which are kept
+    # as an attribute of the thread.
+    credentials = getattr(threading.current_thread(), 'credentials', None)
+    errors = []
+
+    def copy_section(start, nbytes):
+        """ Copy `nbytes` beginning at `start`. """
+        if credentials is not None:
+            threading.current_thread().credentials = credentials
+        try:
+            src_file = _open(src_server, src_path, 'r'+mode)
+            try:
+                dst_file = _open(dst_server, dst_path, 'r+'+mode)
+                try:
+                    src_file.seek(start)
+                    dst_file.seek(start)
+                    _copy(src_file, src_server is not None,
+                          dst_file, dst_server is not None, chunk, compress,
+                          nbytes)
+                finally:
+                    dst_file.close()
+            finally:
+                src_file.close()
+        except Exception as exc:
+            errors.append(exc)
+
+    section = (size + PARALLEL_THREADS - 1) // PARALLEL_THREADS
+    threads = []
+    for start in range(0, size, section):
+        thread = threading.Thread(target=copy_section,
+                                  args=(start, min(section, size-start)))
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+def file_digest(path):
+    """
+    Returns SHA-1 hex digest of the contents of `path`. Digests are
+    remembered along with file size, modification time, and inode, so
+    unchanged files are not read again. Files modified within the last
+    couple of seconds are always read, since mtime resolution may hide
+    a recent change.
+
+    path: string
+        Path to file.
+    """
+    info = os.stat(path)
+    key = os.path.abspath(path)
+    stamp = (info.st_size, info.st_mtime, info.st_ino)
+    with _DIGESTS_LOCK:
+        entry = _DIGESTS.pop(key, None)
+        if entry is not None and entry[:3] == stamp:
+            _DIGESTS[key] = entry  # Now most recently used.
+            return entry[3]
+    digest = _digest(path)
+    if time.time() - info.st_mtime > _MTIME_SLACK:
+        with _DIGESTS_LOCK:
+            _DIGESTS[key] = stamp + (digest,)
+            while len(_DIGESTS) > _MAX_DIGESTS:
+                _DIGESTS.popitem(last=False)
+    return digest
+
+
+def _digest(path):
+    """ Returns SHA-1 hex digest of the contents of `path`. """
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as inp:
+        data = inp.read(1 << 20)
+        while data:
+            sha1.update(data)
+            data = inp.read(1 << 20)
+    return sha1.hexdigest()
+
+
+class FileCache(object):
+    """
+    A directory of files named by the SHA-1 digest of their contents,
+    used to avoid repeated transfers of the same data. The directory may
+    be shared by several processes. When the total size of cached files
+    exceeds `max_bytes` the least recently used files are removed.
+
+    path: string
+        Directory for cached files. If None, the environment variable
+        ``OPENMDAO_FILE_CACHE`` is used, with a default of
+        ``~/.openmdao/file_cache``.
+
+    max_bytes: int
+        Maximum total size of cached files. If None, the environment
+        variable ``OPENMDAO_FILE_CACHE_MB`` is used, with a default of 8GB.
+    """
+
+    def __init__(self, path=None, max_bytes=None):
+        if path is None:
+            path = os.environ.get('OPENMDAO_FILE_CACHE',
+                                  os.path.join('~', '.openmdao', 'file_cache'))
+        self.path = os.path.abspath(os.path.expanduser(path))
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('OPENMDAO_FILE_CACHE_MB',
+                                           '8192')) << 20
+        self.max_bytes = max_bytes
+
+    def missing(self, digests):
+        """
+        Returns those of `digests` not in the cache.
+
+        digests: list
+            SHA-1 hex digests of file contents.
+        """
+        for digest in digests:
+            _check_digest(digest)
+        return [digest for digest in digests
+                if not os.path.exists(os.path.join(self.path, digest))]
+
+    def insert(self, filename, digest):
+        """
+        Move `filename` into the cache if its contents match `digest`.
+        The file is kept until it is no longer the most recently used,
+        even if it's larger than `max_bytes`.
+
+        filename: string
+            Path to file to be moved.
+
+        digest: string
+            Expected SHA-1 hex digest of the file contents.
+        """
+        _check_digest(digest)
+        actual = _digest(filename)
+        if actual != digest:
+            os.remove(filename)
+            raise ValueError('%r has digest %s, expected %s'
+                             % (filename, actual, digest))
+
+        if not os.path.exists(self.path):
+            try:
+                os.makedirs(self.path)
+            except OSError:
+                # Possibly created by another process.
+                if not os.path.isdir(self.path):
+                    raise
+
+        # Rename is atomic, so other processes never see a partial file.
+        path = os.path.join(self.path, digest)
+        tmp = '%s.%d.%d.tmp' % (path, os.getpid(),
+                                   threading.current_thread().ident)
+        shutil.move(filename, tmp)
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            # Windows won't replace a copy inserted by another process.
+            os.remove(tmp)
+            if not os.path.exists(path):
+                raise
+        os.utime(path, None)
+        self._evict(digest)
+
+    def install(self, digest, filename):
+        """
+        Copy the cached file for `digest` to `filename`. Returns its size,
+        or None if `digest` isn't in the cache (possibly evicted by another
+        process).
+
+        digest: string
+            SHA-1 hex digest of the file contents.
+
+        filename: string
+            Path to file to create.
+        """
+        _check_digest(digest)
+        path = os.path.join(self.path, digest)
+        try:
+            src = open(path, 'rb')
+        except IOError:
+            return None
+        with src:
+            with open(filename, 'wb') as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+        try:
+            os.utime(path, None)  # Mark as recently used.
+        except OSError:
+            pass  # Removed by another process.
+        return os.path.getsize(filename)
+
+    def _evict(self, keep):
+        """
+        Remove least recently used files until within `max_bytes`,
+        except for `keep`.
+        """
+        entries = []
+        total = 0
+        for name in os.listdir(self.path):
+            if name.endswith('.tmp') or name == keep:
+                continue
+            try:
+                info = os.stat(os.path.join(self.path, name))
+            except OSError:
+                continue  # Removed by another process.
+            entries.append((info.st_mtime, info.st_size, name))
+            total += info.st_size
+
+        entries.sort()
+        try:
+            total += os.path.getsize(os.path.join(self.path, keep))
+        except OSError:
+            pass  # Removed by another process.
+        for mtime, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                pass  # Removed by another process.
+            total -= size
+
+
+def _check_digest(digest):
+    """ Raises :class:`ValueError` if `digest` isn't a SHA-1 hex digest. """
+    if not isinstance(digest, basestring) or not _DIGEST_RE.match(digest):
+        raise ValueError('invalid digest %r' % (digest,))
+
+
+def send_files(server, patterns, textfiles=None, logger=None):
+    """
+    Send files matching `patterns` to `server`, transferring only those
+    whose contents are not already in `server`'s file cache.
+    Returns ``(nfiles, nbytes)`` installed by `server`.
+
+    server: Proxy
+        Host to send files to. Must support :meth:`cache_lookup`,
+        :meth:`cache_insert`, and :meth:`cache_install` in addition to the
+        requirements of :func:`filexfer`.
+
+    patterns: list
+        List of :mod:`glob` style patterns.
+
+    textfiles: list
+        List of :mod:`fnmatch` style patterns specifying which files are text
+        files possibly needing newline translation. If not supplied, the first
+        4KB of each is scanned for a zero byte. If not found, then the file
+        is assumed to be a text file.
+
+    logger: Logger
+        Used for recording progress.
+    """
+    logger = logger or NullLogger()
+
+    files = []
+    for pattern in patterns:
+        for path in glob.glob(pattern):
+            if os.path.isfile(path):
+                files.append((path, file_digest(path)))
+    missing = set(server.cache_lookup(list(set(digest for path, digest
+                                                      in files))))
+    nfiles = 0
+    nbytes = 0
+    for path, digest in files:
+        if digest in missing:
+            missing.remove(digest)
+            size = os.path.getsize(path)
+            logger.debug("sending '%s' (%d)...", path, size)
+            filename = '%s.xfer' % digest
+            filexfer(None, path, server, filename, 'b', compress=True)
+            server.cache_insert(filename, digest)
+            nfiles += 1
+            nbytes += size
+    logger.debug('sent %d of %d files (%d bytes)', nfiles, len(files), nbytes)
+
+    paths = {}
+    installs = []
+    for path, digest in files:
+        name = _portable_path(path)
+        paths[name] = path
+        installs.append((name, digest))
+    nfiles, nbytes, missing = server.cache_install(installs, textfiles,
+                                                   os.linesep)
+
+    # Files evicted from the cache before being installed are sent directly.
+    for name, digest in missing:
+        path = paths[name]
+        size = os.path.getsize(path)
+        logger.debug("resending '%s' (%d)...", path, size)
+        mode = 't' if _is_text(path, textfiles) else 'b'
+        filexfer(None, path, server, name, mode, compress=True)
+        nfiles += 1
+        nbytes += size
+    return (nfiles, nbytes)
+
+
+def install_files(cache, files, textfiles=None, linesep=None, logger=None):
+    """
+    Install `files` from `cache`, the receiving side of :func:`send_files`.
+    Returns ``(nfiles, nbytes, missing)``, where `missing` lists the
+    ``(name, digest)`` entries not found in `cache`.
+
+    cache: :class:`FileCache`
+        Cache containing the files.
+
+    files: list
+        List of ``(name, digest)``, where `name` is a relative '/' separated
+        path.
+
+    textfiles: list
+        List of :mod:`fnmatch` style patterns specifying which files are text
+        files possibly needing newline translation. If not supplied, the first
+        4KB of each is scanned for a zero byte. If not found, then the file
+        is assumed to be a text file.
+
+    linesep: string
+        Line separator of the system the files came from. If not the same as
+        :data:`os.linesep`, text files are translated.
+
+    logger: Logger
+        Used for recording progress.
+    """
+    logger = logger or NullLogger()
+
+    nfiles = 0
+    nbytes = 0
+    missing = []
+    for name, digest in files:
+        filename = _local_path(name)
+        logger.debug('installing %r...', filename)
+        directory = os.path.dirname(filename)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        size = cache.install(digest, filename)
+        if size is None:
+            logger.debug('%s not in cache', digest)
+            missing.append((name, digest))
+            continue
+        nbytes += size
+        if linesep is not None and linesep != os.linesep and \
+           _is_text(filename, textfiles):
+            logger.debug('translating %r...', filename)
+            translate_newlines(filename)
+        nfiles += 1
+    return (nfiles, nbytes, missing)
+
+
+def get_digests(patterns):
+    """
+    Returns ``[(name, size, digest), ...]`` for files matching `patterns`,
+    where `name` is the '/' separated path. Used by :func:`retrieve_files`.
+
+    patterns: list
+        List of :mod:`glob` style patterns.
+    """
+    digests = []
+    for pattern in patterns:
+        for path in glob.glob(pattern):
+            if os.path.isfile(path):
+                digests.append((path.replace(os.sep, '/'),
+                                os.path.getsize(path), file_digest(path)))
+    return digests
+
+
+def retrieve_files(server, patterns, textfiles=None, logger=None):
+    """
+    Retrieve files matching `patterns` from `server`, transferring only those
+    which differ from the local file of the same name.
+    Returns ``(nfiles, nbytes)``.
+
+    server: Proxy
+        Host to retrieve files from. Must support :meth:`get_digests` in
+        addition to the requirements of :func:`filexfer`.
+
+    patterns: list
+        List of :mod:`glob` style patterns.
+
+    textfiles: list
+        List of :mod:`fnmatch` style patterns specifying which files are text
+        files, transferred in text mode for newline translation. If not
+        supplied, files are transferred in binary mode.
+
+    logger: Logger
+        Used for recording progress.
+    """
+    logger = logger or NullLogger()
+
+    nfiles = 0
+    nbytes = 0
+    nsent = 0
+    for name, size, digest in server.get_digests(patterns):
+        filename = _local_path(name)
+        if os.path.isfile(filename) and file_digest(filename) == digest:
+            logger.debug('%r is unchanged', filename)
+        else:
+            logger.debug('retrieving %r (%d)...', filename, size)
+            directory = os.path.dirname(filename)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            mode = 'b'
+            for pattern in (textfiles or []):
+                if fnmatch.fnmatch(filename, pattern):
+                    mode = ''
+                    break
+            filexfer(server, name, None, filename, mode, compress=True)
+            # Text files may have been translated.
+            if mode == 'b' and file_digest(filename) != digest:
+                raise RuntimeError('%r digest mismatch after transfer'
+                                   % filename)
+            nsent += 1
+        nfiles += 1
+        nbytes += size
+    logger.debug('retrieved %d of %d files', nsent, nfiles)
+    return (nfiles, nbytes)
+
+
+def _portable_path(path):
+    """
+    Returns `path` as a relative '/' separated path without drive, '.', or
+    '..' components, like the names of :mod:`zipfile` members.
+    """
+    path = os.path.splitdrive(path)[1].replace(os.sep, '/')
+    return '/'.join([part for part in path.split('/')
+                              if part not in ('', os.curdir, os.pardir)])
+
+def _local_path(name):
+    """ Returns local form of :func:`_portable_path` `name`. """
+    parts = [part for part in name.split('/')
+                      if part not in ('', os.curdir, os.pardir)]
+    return os.path.join(*parts)
+
+
+def _is_text(filename, textfiles):
+    """
+    Returns True if `filename` matches one of the `textfiles` patterns,
+    or if `textfiles` is None and the first 4KB contains no zero byte.
+    """
+    if textfiles is None:
+        with open(filename, 'rb') as inp:
+            data = inp.read(1 << 12)
+        return '\0' not in data
+    for pattern in textfiles:
+        if fnmatch.fnmatch(filename, pattern):
+            return True
+    return False
 
 
 def pack_zipfile(patterns, filename, logger=None):
@@ -148,17 +673,9 @@ def unpack_zipfile(filename, logger=None, textfiles=None):
             zipped.extract(info)
             # Requires mismatched systems.
             if info.create_system != local_system:  # pragma no cover
-                if textfiles is None:
-                    with open(filename, 'rb') as inp:
-                        data = inp.read(1 << 12)
-                    if '\0' not in data:
-                        logger.debug('translating %r...', filename)
-                        translate_newlines(filename)
-                else:
-                    for pattern in textfiles:
-                        if fnmatch.fnmatch(filename, pattern):
-                            logger.debug('translating %r...', filename)
-                            translate_newlines(filename)
+                if _is_text(filename, textfiles):
+                    logger.debug('translating %r...', filename)
+                    translate_newlines(filename)
             nfiles += 1
             nbytes += size
     finally:
@@ -0,0 +1,278 @@
+"""
+Test file transfer utilities.
+"""
+
+import hashlib
+import logging
+import os.path
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+import zlib
+
+from openmdao.util import filexfer
+from openmdao.util.filexfer import FileCache, file_digest, install_files, \
+                                   send_files
+from openmdao.util.fileutil import onerror
+
+
+class FakeFile(object):
+    """ Stands in for a remote file. """
+
+    def __init__(self, path, mode):
+        self._file = open(path, mode)
+
+    def write_compressed(self, data):
+        self._file.write(zlib.decompress(data))
+
+    def close(self):
+        self._file.close()
+
+
+class FakeServer(object):
+    """
+    Stands in for a server whose cache entries are evicted between
+    :meth:`cache_lookup` and :meth:`cache_install`.
+    """
+
+    def __init__(self, cache, root):
+        self.cache = cache
+        self.root = root
+        self.lookups = 0
+
+    def cache_lookup(self, digests):
+        self.lookups += 1
+        return []
+
+    def cache_install(self, files, textfiles=None, linesep=None):
+        orig_dir = os.getcwd()
+        os.chdir(self.root)
+        try:
+            return install_files(self.cache, files, textfiles, linesep)
+        finally:
+            os.chdir(orig_dir)
+
+    def open(self, path, mode):
+        return FakeFile(os.path.join(self.root, path), mode)
+
+    def chmod(self, path, mode):
+        os.chmod(os.path.join(self.root, path), mode)
+
+
+class TestCase(unittest.TestCase):
+    """ Test file transfer utilities. """
+
+    def setUp(self):
+        self.startdir = os.getcwd()
+        self.tempdir = tempfile.mkdtemp()
+        os.chdir(self.tempdir)
+
+    def tearDown(self):
+        os.chdir(self.startdir)
+        shutil.rmtree(self.tempdir, onerror=onerror)
+
+    def test_digest(self):
+        logging.debug('')
+        logging.debug('test_digest')
+
+        mtime = int(time.time()) - 10
+        with open('data', 'wb') as out:
+            out.write('Hello world!\n')
+        os.utime('data', (mtime, mtime))
+        digest = hashlib.sha1('Hello world!\n').hexdigest()
+        self.assertEqual(file_digest('data'), digest)
+
+        # Remembered digest is used while size and mtime are unchanged.
+        with open('data', 'wb') as out:
+            out.write('Hello World!\n')
+        os.utime('data', (mtime, mtime))
+        self.assertEqual(file_digest('data'), digest)
+
+        os.utime('data', (mtime, mtime + 1))
+        self.assertEqual(file_digest('data'),
+                         hashlib.sha1('Hello World!\n').hexdigest())
+
+        # Recently modified files are always read, since a rewrite within
+        # the mtime resolution wouldn't be noticed.
+        mtime = int(time.time())
+        with open('data', 'wb') as out:
+            out.write('Hello again!\n')
+        os.utime('data', (mtime, mtime))
+        self.assertEqual(file_digest('data'),
+                         hashlib.sha1('Hello again!\n').hexdigest())
+        with open('data', 'wb') as out:
+            out.write('Hello AGAIN!\n')
+        os.utime('data', (mtime, mtime))
+        self.assertEqual(file_digest('data'),
+                         hashlib.sha1('Hello AGAIN!\n').hexdigest())
+
+        # Only the most recently used digests are remembered.
+        orig_max = filexfer._MAX_DIGESTS
+        filexfer._MAX_DIGESTS = 2
+        try:
+            mtime = int(time.time()) - 10
+            for name in ('a', 'b', 'c', 'a'):
+                with open(name, 'wb') as out:
+                    out.write(name)
+                os.utime(name, (mtime, mtime))
+                file_digest(name)
+            self.assertEqual(list(filexfer._DIGESTS.keys()),
+                             [os.path.abspath('c'), os.path.abspath('a')])
+        finally:
+            filexfer._MAX_DIGESTS = orig_max
+
+    def test_cache(self):
+        logging.debug('')
+        logging.debug('test_cache')
+
+        # Default location may be set via the environment.
+        orig_cache = os.environ.get('OPENMDAO_FILE_CACHE')
+        os.environ['OPENMDAO_FILE_CACHE'] = 'cache'
+        try:
+            self.assertEqual(FileCache().path, os.path.abspath('cache'))
+        finally:
+            if orig_cache is None:
+                del os.environ['OPENMDAO_FILE_CACHE']
+            else:
+                os.environ['OPENMDAO_FILE_CACHE'] = orig_cache
+
+        cache = FileCache('cache', max_bytes=250)
+        digests = []
+        for i in range(3):
+            data = str(i) * 100
+            digest = hashlib.sha1(data).hexdigest()
+            digests.append(digest)
+            with open('file%d' % i, 'wb') as out:
+                out.write(data)
+        self.assertEqual(cache.missing(digests), digests)
+
+        # Insert moves the file.
+        cache.insert('file0', digests[0])
+        self.assertFalse(os.path.exists('file0'))
+        self.assertEqual(cache.missing(digests), digests[1:])
+
+        # Mismatched digest is rejected and the file removed.
+        try:
+            cache.insert('file1', digests[0])
+        except ValueError as exc:
+            self.assertTrue('expected %s' % digests[0] in str(exc))
+        else:
+            self.fail('Expected ValueError')
+        self.assertFalse(os.path.exists('file1'))
+
+        # Install copies out of the cache, making it most recently used.
+        time.sleep(1.1)
+        self.assertEqual(cache.install(digests[0], 'copy0'), 100)
+        with open('copy0', 'rb') as inp:
+            self.assertEqual(inp.read(), '0' * 100)
+
+        # Exceeding max_bytes evicts the least recently used.
+        with open('file1', 'wb') as out:
+            out.write('1' * 100)
+        cache.insert('file1', digests[1])
+        time.sleep(1.1)
+        cache.install(digests[0], 'copy0')
+        time.sleep(1.1)
+        cache.insert('file2', digests[2])
+        self.assertEqual(cache.missing(digests), [digests[1]])
+
+        # Install into subdirectories, with newline translation.
+        with open('text', 'wb') as out:
+            out.write('line 1\r\nline 2\r\n')
+        text_digest = file_digest('text')
+        cache.insert('text', text_digest)
+        files = [('sub/dir/copy', digests[0]), ('sub/text', text_digest)]
+        linesep = '\r\n' if os.linesep == '\n' else '\n'
+        nfiles, nbytes, missing = install_files(cache, files, linesep=linesep)
+        self.assertEqual((nfiles, nbytes, missing), (2, 116, []))
+        self.assertEqual(os.path.getsize(os.path.join('sub', 'dir', 'copy')),
+                         100)
+        with open(os.path.join('sub', 'text'), 'rU') as inp:
+            self.assertEqual(inp.read(), 'line 1\nline 2\n')
+        if sys.platform != 'win32':
+            with open(os.path.join('sub', 'text'), 'rb') as inp:
+                self.assertEqual(inp.read(), 'line 1\nline 2\n')
+
+    def test_cache_limits(self):
+        logging.debug('')
+        logging.debug('test_cache_limits')
+
+        cache = FileCache('cache', max_bytes=50)
+
+        # Only SHA-1 hex digests name cache entries.
+        with open('data', 'wb') as out:
+            out.write('x' * 100)
+        digest = file_digest('data')
+        for bad in ('../data', os.path.abspath('data'), digest.upper(),
+                    digest + '\n', None):
+            for code in ('cache.missing([bad])',
+                         "cache.install(bad, 'copy')",
+                         "cache.insert('data', bad)"):
+                try:
+                    eval(code)
+                except ValueError as exc:
+                    self.assertEqual(str(exc), 'invalid digest %r' % (bad,))
+                else:
+                    self.fail('Expected ValueError for %s' % code)
+        self.assertTrue(os.path.exists('data'))
+        self.assertFalse(os.path.exists('copy'))
+
+        # A file larger than max_bytes is kept until another is inserted.
+        cache.insert('data', digest)
+        self.assertEqual(cache.missing([digest]), [])
+        self.assertEqual(cache.install(digest, 'copy'), 100)
+        with open('small', 'wb') as out:
+            out.write('y')
+        small = file_digest('small')
+        cache.insert('small', small)
+        self.assertEqual(cache.missing([digest, small]), [digest])
+
+        # Missing entries are reported rather than installed.
+        files = [('a', digest), ('b', small)]
+        self.assertEqual(install_files(cache, files), (1, 1, [('a', digest)]))
+        self.assertFalse(os.path.exists('a'))
+
+    def test_evicted(self):
+        logging.debug('')
+        logging.debug('test_evicted')
+
+        # Entries evicted between lookup and install are sent directly.
+        with open('data', 'wb') as out:
+            out.write('Hello world!\n')
+        os.mkdir('dst')
+        server = FakeServer(FileCache('cache'), 'dst')
+        self.assertEqual(send_files(server, ['data']), (1, 13))
+        self.assertEqual(server.lookups, 1)
+        with open(os.path.join('dst', 'data'), 'rb') as inp:
+            self.assertEqual(inp.read(), 'Hello world!\n')
+
+    def test_filexfer(self):
+        logging.debug('')
+        logging.debug('test_filexfer')
+
+        with open('src', 'wb') as out:
+            out.write(os.urandom(1 << 16) * 40)
+        os.chmod('src', 0640)
+        filexfer.filexfer(None, 'src', None, 'dst', 'b')
+        self.assertEqual(file_digest('dst'), file_digest('src'))
+        self.assertEqual(os.stat('dst').st_mode, os.stat('src').st_mode)
+
+    def test_paths(self):
+        logging.debug('')
+        logging.debug('test_paths')
+
+        path = os.path.join(os.pardir, 'a', os.curdir, 'b')
+        self.assertEqual(filexfer._portable_path(path), 'a/b')
+        self.assertEqual(filexfer._portable_path(os.path.abspath('c')),
+                         filexfer._portable_path(os.getcwd()) + '/c')
+        self.assertEqual(filexfer._local_path('../a/./b'),
+                         os.path.join('a', 'b'))
+
+
+if __name__ == '__main__':
+    import nose
+    sys.argv.append('--cover-package=openmdao.util')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()